@@ -0,0 +1,75 @@
+"""Benchmark workbook save options: time against output size.
+
+Builds the tutorial workbook once with the requested number of tracking rows,
+then saves it with each compression setting and prints a comparison table,
+followed by the uncompressed size of the worksheet XML a reader has to parse.
+
+    python scripts/bench_save.py --rows 50000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from budget_generator.generator import BudgetGenerator  # noqa: E402
+from budget_generator.utils.json_loader import load_json_spec  # noqa: E402
+from budget_generator.xlsx import SaveOptions  # noqa: E402
+
+
+SPEC_PATH = PROJECT_ROOT / "examples" / "tutorial_spec.json"
+
+
+def variants(workers: int) -> list[tuple[str, SaveOptions]]:
+    return [
+        ("deflate level 6", SaveOptions()),
+        ("deflate level 1", SaveOptions(level=1)),
+        ("deflate level 9", SaveOptions(level=9)),
+        ("store", SaveOptions(compression="store")),
+        (f"deflate level 6, {workers} workers", SaveOptions(workers=workers)),
+        (f"deflate level 1, {workers} workers", SaveOptions(level=1, workers=workers)),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000, help="Budget Tracking table rows.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--repeat", type=int, default=3, help="Saves per variant; best time is kept.")
+    args = parser.parse_args()
+
+    spec = copy.deepcopy(load_json_spec(SPEC_PATH))
+    spec.setdefault("sheets", {}).setdefault("Budget Tracking", {})["max_rows"] = args.rows
+    generator = BudgetGenerator(spec)
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+
+    print(f"{args.rows} tracking rows, {args.workers} workers, best of {args.repeat}")
+    print(f"{'variant':<32} {'seconds':>8} {'MiB':>8}")
+    with tempfile.TemporaryDirectory() as scratch:
+        output = Path(scratch) / "bench.xlsx"
+        for label, options in variants(args.workers):
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                generator.save_workbook(output, options=options)
+                best = min(best, time.perf_counter() - start)
+            size = output.stat().st_size / 1024 / 1024
+            print(f"{label:<32} {best:>8.2f} {size:>8.2f}")
+        with zipfile.ZipFile(output) as archive:
+            sheets = sum(info.file_size for info in archive.infolist() if "worksheets/" in info.filename)
+        print(f"{'worksheet XML, uncompressed':<32} {'':>8} {sheets / 1024 / 1024:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import sys
 from pathlib import Path
 from typing import Optional
 
@@ -49,23 +52,88 @@ def cli(verbose: bool) -> None:
     is_flag=True,
     help="Validate the JSON specification without writing a workbook.",
 )
-def generate(json_file: Path, output: Path, validate_only: bool) -> None:
+@click.option(
+    "--sheets",
+    default=None,
+    help="Comma-separated sheets to build (e.g. Tracking,Calculations); their dependencies are added.",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(["auto", "memory", "streaming"]),
+    default="auto",
+    show_default=True,
+    help="Generation engine; 'auto' picks one from the estimated workbook size.",
+)
+@click.option(
+    "--profile",
+    type=click.Choice(["full", "lean"]),
+    default="full",
+    show_default=True,
+    help="'lean' writes values, formulas, tables, names and validations without styling or charts.",
+)
+@click.option(
+    "--deterministic",
+    is_flag=True,
+    help="Write byte-reproducible output (implied when SOURCE_DATE_EPOCH is set).",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(["deflate", "store"]),
+    default="deflate",
+    show_default=True,
+    help="Zip compression; 'store' writes uncompressed parts for fast scratch output.",
+)
+@click.option(
+    "--compression-level",
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help="Deflate level (1 is fastest, 9 smallest).",
+)
+@click.option(
+    "--save-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Threads deflating large sheet parts concurrently while saving.",
+)
+@click.option(
+    "--export-csv",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Also write tracking.csv and planning.csv into this directory.",
+)
+@click.option(
+    "--export-sqlite",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Also write the tracking and planning tables to this SQLite database.",
+)
+@click.option(
+    "--export-parquet",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Also write tracking.parquet and planning.parquet into this directory (needs pyarrow).",
+)
+def generate(
+    json_file: Path,
+    output: Path,
+    validate_only: bool,
+    sheets: Optional[str],
+    engine: str,
+    profile: str,
+    deterministic: bool,
+    compression: str,
+    compression_level: int,
+    save_workers: int,
+    export_csv: Optional[Path],
+    export_sqlite: Optional[Path],
+    export_parquet: Optional[Path],
+) -> None:
     """Generate an Excel budget workbook from *JSON_FILE*."""
 
     logger = logging.getLogger(LOGGER_NAME)
-
-    if not json_file.exists():
-        raise click.ClickException(f"Specification not found: {json_file}")
-
-    try:
-        spec = json_loader.load_json_spec(json_file)
-        json_loader.validate_json_structure(spec)
-    except json_loader.SpecReadError as exc:
-        raise click.ClickException(str(exc))
-    except json_loader.SpecParseError as exc:
-        raise click.ClickException(str(exc))
-    except json_loader.SpecValidationError as exc:
-        raise click.ClickException(f"Specification validation failed: {exc}")
+    spec = _load_spec(json_file)
 
     if validate_only:
         message = "Specification validated successfully. No workbook written."
@@ -75,27 +143,509 @@ def generate(json_file: Path, output: Path, validate_only: bool) -> None:
 
     # Notebook generation is implemented in the dedicated generator module.  We
     # import lazily so that validation-only runs do not incur the dependency.
-    from .generator import BudgetGenerator  # local import to avoid cycle
+    from .engines import AUTO_ENGINE, create_generator, select_engine, share_tracking_ledger
+    from .estimate import estimate_spec
+    from .generator import GeneratorError  # local import to avoid cycle
+    from .xlsx import SaveOptions
 
-    generator = BudgetGenerator(spec)
+    selected = [name for name in sheets.split(",") if name.strip()] if sheets else None
+    try:
+        if engine == AUTO_ENGINE:
+            spec = share_tracking_ledger(spec)
+        size_estimate = estimate_spec(spec) if engine == AUTO_ENGINE else None
+        choice = select_engine(size_estimate, engine)
+        generator = create_generator(choice, spec, sheets=selected, profile=profile)
+    except (GeneratorError, ValueError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    logger.info("Using %s engine: %s", choice.name, choice.reason)
+    if selected is not None:
+        logger.info("Building sheet subset: %s", ", ".join(generator.build_plan.sheet_names))
 
     try:
         generator.create_workbook()
         generator.create_sheets(spec)
         generator.build_sheet_contents()
-        generator.save_workbook(output)
+        generator.save_workbook(
+            output,
+            deterministic=deterministic or bool(os.environ.get("SOURCE_DATE_EPOCH")),
+            options=SaveOptions(
+                compression=compression,
+                level=compression_level,
+                workers=save_workers,
+            ),
+        )
     except Exception as exc:  # pragma: no cover - exercised via integration
         raise click.ClickException(f"Workbook generation failed: {exc}") from exc
 
     logger.info("Workbook successfully written to %s", output)
     click.echo(f"Workbook successfully written to {output}")
 
+    from .exports import ExportError, ExportTargets, export_tables
+
+    targets = ExportTargets(csv_dir=export_csv, sqlite_path=export_sqlite, parquet_dir=export_parquet)
+    if targets:
+        try:
+            counts = export_tables(spec, targets)
+        except ExportError as exc:
+            raise click.ClickException(str(exc)) from exc
+        click.echo(
+            f"Exported {counts['tracking']} tracking and {counts['planning']} planning rows to "
+            + ", ".join(str(target) for target in (export_csv, export_sqlite, export_parquet) if target)
+        )
+
+
+@cli.command()
+@click.argument("json_file", type=click.Path(path_type=Path))
+@click.option(
+    "--strict",
+    is_flag=True,
+    help="Exit with an error when the estimate raises any warning.",
+)
+def estimate(json_file: Path, strict: bool) -> None:
+    """Estimate the size and build cost of *JSON_FILE* as JSON."""
+
+    from .estimate import estimate_spec  # local import keeps CLI start-up light
+
+    logger = logging.getLogger(LOGGER_NAME)
+    spec = _load_spec(json_file)
+    result = estimate_spec(spec)
+
+    for warning in result.warnings:
+        logger.warning(warning)
+    click.echo(json.dumps(result.to_dict(), indent=2))
+
+    if strict and result.warnings:
+        raise click.ClickException(f"Estimate raised {len(result.warnings)} warning(s).")
+
+
+@cli.command()
+@click.argument("output_dir", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--transactions", "-n", type=click.IntRange(min=0), default=10_000, show_default=True)
+@click.option(
+    "--categories",
+    type=click.IntRange(min=1),
+    default=12,
+    show_default=True,
+    help="Distinct categories used: the planning sheet defaults first, then synthetic ones.",
+)
+@click.option("--years", type=click.IntRange(min=1), default=3, show_default=True)
+@click.option("--start-year", type=int, default=2025, show_default=True)
+@click.option(
+    "--type-mix",
+    default="0.15,0.75,0.10",
+    show_default=True,
+    help="Income,Expense,Saving weights.",
+)
+@click.option(
+    "--late-income-share",
+    type=click.FloatRange(0, 1),
+    default=0.2,
+    show_default=True,
+    help="Fraction of income dated after the late income day.",
+)
+@click.option("--late-income-day", type=click.IntRange(1, 31), default=25, show_default=True)
+@click.option(
+    "--details",
+    type=click.IntRange(min=0),
+    default=200,
+    show_default=True,
+    help="Number of distinct detail texts (0 leaves Details empty).",
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "--format",
+    "file_format",
+    type=click.Choice(["csv", "jsonl"]),
+    default="csv",
+    show_default=True,
+    help="Transactions file format.",
+)
+@click.option(
+    "--base-spec",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Spec to start from instead of the built-in template.",
+)
+def synth(
+    output_dir: Path,
+    transactions: int,
+    categories: int,
+    years: int,
+    start_year: int,
+    type_mix: str,
+    late_income_share: float,
+    late_income_day: int,
+    details: int,
+    seed: int,
+    file_format: str,
+    base_spec: Optional[Path],
+) -> None:
+    """Write a seeded synthetic spec and transaction ledger into OUTPUT_DIR."""
+
+    from .synth import SynthConfig, SynthError, write_synthetic_dataset
+    from .utils.transactions import TransactionFileError
+
+    try:
+        weights = tuple(float(part) for part in type_mix.split(","))
+    except ValueError as exc:
+        raise click.BadParameter(f"'{type_mix}' is not a list of numbers", param_hint="--type-mix") from exc
+
+    try:
+        config = SynthConfig(
+            transactions=transactions,
+            categories=categories,
+            years=years,
+            start_year=start_year,
+            type_mix=weights,  # type: ignore[arg-type]
+            late_income_share=late_income_share,
+            late_income_day=late_income_day,
+            details=details,
+            seed=seed,
+        )
+        result = write_synthetic_dataset(
+            config,
+            output_dir,
+            file_format=file_format,
+            base_spec=_load_spec(base_spec) if base_spec is not None else None,
+        )
+    except (SynthError, TransactionFileError) as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    click.echo(
+        f"Wrote {result.transactions} transactions to {result.transactions_path} "
+        f"and spec {result.spec_path}"
+    )
+
+
+@cli.command()
+@click.argument("expected", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("actual", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--json", "as_json", is_flag=True, help="Print the differences as JSON.")
+@click.option(
+    "--limit",
+    type=click.IntRange(min=0),
+    default=50,
+    show_default=True,
+    help="Maximum number of differences to print (0 prints all).",
+)
+@click.pass_context
+def diff(ctx: click.Context, expected: Path, actual: Path, as_json: bool, limit: int) -> None:
+    """Compare workbook ACTUAL against EXPECTED; exit status 1 when they differ."""
+
+    from .xlsx import PackageError, diff_workbooks  # local import keeps CLI start-up light
+
+    try:
+        result = diff_workbooks(expected, actual)
+    except PackageError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    if as_json:
+        click.echo(json.dumps(result.to_dict(), indent=2))
+    else:
+        shown = result.differences if limit == 0 else result.differences[:limit]
+        for difference in shown:
+            click.echo(str(difference))
+        if len(shown) < len(result.differences):
+            click.echo(f"... {len(result.differences) - len(shown)} more difference(s)")
+        click.echo(
+            f"{len(result.differences)} difference(s); "
+            f"{result.parts_descended} of {result.parts_compared} parts inspected in detail."
+        )
+
+    if not result.identical:
+        ctx.exit(1)
+
+
+@cli.command()
+@click.argument("workbook", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--json", "as_json", is_flag=True, help="Print the inspection as JSON.")
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="Number of heaviest zip parts to list.",
+)
+def inspect(workbook: Path, as_json: bool, top: int) -> None:
+    """Report part sizes and object counts for WORKBOOK without loading it."""
+
+    from .xlsx import PackageError, inspect_workbook  # local import keeps CLI start-up light
+
+    try:
+        result = inspect_workbook(workbook, heaviest=top)
+    except PackageError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    if as_json:
+        click.echo(json.dumps(result.to_dict(), indent=2))
+        return
+
+    click.echo(
+        f"{result.path}: {result.compressed_bytes:,} bytes compressed, "
+        f"{result.uncompressed_bytes:,} uncompressed; "
+        f"{result.cell_styles} cell styles, {result.differential_styles} dxfs"
+    )
+    for sheet in result.sheets:
+        click.echo(
+            f"\n{sheet.name} ({sheet.part}): {sheet.compressed_bytes:,} / "
+            f"{sheet.uncompressed_bytes:,} bytes"
+        )
+        click.echo(
+            f"  cells {sheet.cells:,}  formulas {sheet.formulas:,}  styles {sheet.styles}  "
+            f"validations {sheet.data_validations:,}  cf rules {sheet.conditional_format_rules}  "
+            f"merges {sheet.merged_cells}"
+        )
+        for table in sheet.tables:
+            click.echo(f"  table {table.name} {table.ref}")
+        element, size = max(
+            ((tag, size) for tag, size in sheet.element_bytes.items() if tag != "sheetData"),
+            key=lambda item: item[1],
+            default=("", 0),
+        )
+        if sheet.uncompressed_bytes and size * 4 >= sheet.uncompressed_bytes:
+            click.echo(
+                f"  heaviest non-cell element: {element} ~{size:,} bytes "
+                f"({size / sheet.uncompressed_bytes:.0%} of the sheet)"
+            )
+
+    click.echo("\nHeaviest parts:")
+    for part in result.heaviest_parts:
+        click.echo(f"  {part.name}: {part.uncompressed_bytes:,} bytes ({part.compressed_bytes:,} compressed)")
+    click.echo(f"\nDefined names ({len(result.defined_names)}):")
+    for name, ref in result.defined_names.items():
+        click.echo(f"  {name} = {ref}")
+
+
+@cli.command()
+@click.argument("workbook", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--table",
+    type=click.Choice(["tracking", "planning"]),
+    default="tracking",
+    show_default=True,
+    help="Stream the tblTracking ledger or the planning category grids.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="File to write; records go to stdout when omitted.",
+)
+@click.option(
+    "--format",
+    "file_format",
+    type=click.Choice(["jsonl", "csv"]),
+    default=None,
+    help="Output format; inferred from the --output suffix, otherwise jsonl.",
+)
+def ingest(workbook: Path, table: str, output: Optional[Path], file_format: Optional[str]) -> None:
+    """Stream rows out of WORKBOOK as JSON Lines or CSV without loading it."""
+
+    from .utils.transactions import TransactionFileError, dump_records, transaction_format
+    from .xlsx import (  # local import keeps CLI start-up light
+        PLANNING_FIELDNAMES,
+        PackageError,
+        XlsxPackage,
+        iter_planning_records,
+        iter_table_records,
+        locate_table,
+    )
+
+    if file_format is None:
+        try:
+            file_format = transaction_format(output) if output is not None else "jsonl"
+        except TransactionFileError as exc:
+            raise click.BadParameter(str(exc), param_hint="--output") from exc
+
+    try:
+        with XlsxPackage(workbook) as package:
+            if table == "tracking":
+                location = locate_table(package)
+                fieldnames, records = location.fieldnames, iter_table_records(package, location)
+            else:
+                fieldnames, records = PLANNING_FIELDNAMES, iter_planning_records(package)
+            if output is None:
+                count = dump_records(sys.stdout, records, file_format, fieldnames)
+            else:
+                output.parent.mkdir(parents=True, exist_ok=True)
+                with output.open("w", encoding="utf-8", newline="") as stream:
+                    count = dump_records(stream, records, file_format, fieldnames)
+    except PackageError as exc:
+        raise click.ClickException(str(exc)) from exc
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); point stdout at devnull so the
+        # interpreter's final flush does not fail again, and stop quietly.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except OSError as exc:
+        raise click.ClickException(f"Unable to write {output or 'stdout'}: {exc}") from exc
+
+    click.echo(f"Wrote {count} {table} record(s)", err=True)
+
+
+@cli.command()
+@click.argument("workbook", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--transactions",
+    "-t",
+    "transactions_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    required=True,
+    help="CSV or JSON Lines ledger with date,type,category,amount,details columns.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the updated workbook here instead of updating WORKBOOK in place.",
+)
+def append(workbook: Path, transactions_file: Path, output: Optional[Path]) -> None:
+    """Append transactions to WORKBOOK's tracking table without regenerating it.
+
+    Only a single tblTracking table is supported; workbooks generated with
+    "partition": "year" (tblTracking2024, tblTracking2025, ...) are rejected.
+    """
+
+    from .sheets.tracking import TrackingConfig
+    from .utils.transactions import TransactionFileError, transaction_format
+    from .xlsx import PackageError, append_transactions  # local import keeps CLI start-up light
+
+    try:
+        transaction_format(transactions_file)
+        entries = TrackingConfig(transactions_file=transactions_file).entries()
+        result = append_transactions(workbook, entries, output)
+    except (TransactionFileError, ValueError) as exc:
+        raise click.BadParameter(str(exc), param_hint="--transactions") from exc
+    except PackageError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    if not result.rows:
+        click.echo(f"No transactions to append; {result.output} unchanged.")
+        return
+    click.echo(
+        f"Appended {result.rows} transaction(s) to rows {result.first_row}-{result.last_row} "
+        f"of {result.output}; table now spans {result.table_ref}"
+    )
+
+
+@cli.command()
+@click.argument("workbook", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the updated workbook here instead of updating WORKBOOK in place.",
+)
+def rollover(workbook: Path, output: Optional[Path]) -> None:
+    """Add the next year block to WORKBOOK's planning sheet without regenerating it."""
+
+    from .xlsx import PackageError, rollover_workbook  # local import keeps CLI start-up light
+
+    try:
+        result = rollover_workbook(workbook, output)
+    except PackageError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    message = f"Added planning year {result.offset + 1} in columns {result.columns} of {result.output}"
+    if result.years_list is not None:
+        message += f"; YearsList now spans {result.years_list}"
+    click.echo(message)
+
+
+@cli.command()
+@click.argument(
+    "workbooks",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=Path("household.xlsx"),
+    show_default=True,
+    help="Path of the consolidated workbook.",
+)
+@click.option(
+    "--base-spec",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Spec to build the consolidated workbook from instead of the built-in template.",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(["auto", "memory", "streaming"]),
+    default="auto",
+    show_default=True,
+    help="Generation engine; 'auto' picks one from the estimated workbook size.",
+)
+@click.option(
+    "--deterministic",
+    is_flag=True,
+    help="Write byte-reproducible output (implied when SOURCE_DATE_EPOCH is set).",
+)
+def consolidate(
+    workbooks: tuple[Path, ...],
+    output: Path,
+    base_spec: Optional[Path],
+    engine: str,
+    deterministic: bool,
+) -> None:
+    """Merge the tracking tables and planning grids of WORKBOOKS into one workbook."""
+
+    from .consolidate import ConsolidateError, consolidate_workbooks
+    from .generator import GeneratorError
+    from .utils.transactions import TransactionFileError
+    from .xlsx import PackageError
+
+    try:
+        result = consolidate_workbooks(
+            workbooks,
+            output,
+            base_spec=_load_spec(base_spec) if base_spec is not None else None,
+            engine=engine,
+            deterministic=deterministic or bool(os.environ.get("SOURCE_DATE_EPOCH")),
+        )
+    except (ConsolidateError, GeneratorError, PackageError, TransactionFileError, ValueError) as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    click.echo(
+        f"Merged {result.transactions} transaction(s) from {', '.join(result.sources)} "
+        f"into {result.output} ({result.engine} engine)"
+    )
+
+
+def _load_spec(json_file: Path) -> dict:
+    """Load and validate a spec, mapping loader errors onto CLI errors."""
+
+    if not json_file.exists():
+        raise click.ClickException(f"Specification not found: {json_file}")
+
+    try:
+        spec = json_loader.load_json_spec(json_file)
+        json_loader.validate_json_structure(spec)
+    except json_loader.SpecReadError as exc:
+        raise click.ClickException(str(exc))
+    except json_loader.SpecParseError as exc:
+        raise click.ClickException(str(exc))
+    except json_loader.SpecValidationError as exc:
+        raise click.ClickException(f"Specification validation failed: {exc}")
+
+    return spec
+
+
+def main(argv: Optional[list[str]] = None) -> Optional[int]:
+    """Entry point for console scripts (mirrors `python -m`).
 
-def main(argv: Optional[list[str]] = None) -> None:
-    """Entry point for console scripts (mirrors `python -m`)."""
+    Returns the exit status requested by commands such as ``diff``.
+    """
 
-    cli.main(args=argv, prog_name="budget-generator", standalone_mode=False)
+    return cli.main(args=argv, prog_name="budget-generator", standalone_mode=False)
 
 
 if __name__ == "__main__":  # pragma: no cover
-    main()
+    sys.exit(main())
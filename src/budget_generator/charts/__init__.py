@@ -1,5 +1,6 @@
 """Chart creation helpers for the budget dashboard."""
 
 from .doughnut import add_dashboard_doughnut_charts
+from .values import dashboard_chart_values
 
-__all__ = ["add_dashboard_doughnut_charts"]
+__all__ = ["add_dashboard_doughnut_charts", "dashboard_chart_values"]
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import NamedTuple
 
 from openpyxl.chart import DoughnutChart, Reference
+from openpyxl.chart.data_source import AxDataSource, NumData, NumVal, StrData, StrRef, StrVal
 from openpyxl.chart.label import DataLabelList
 from openpyxl.worksheet.worksheet import Worksheet
 
@@ -13,17 +15,30 @@ class ChartSpec(NamedTuple):
     title: str
     data_row: int
     anchor: str
+    section: str
 
 
 CHART_SPECS: tuple[ChartSpec, ...] = (
-    ChartSpec("Income (Budget vs Tracked)", data_row=3, anchor="E6"),
-    ChartSpec("Expenses (Budget vs Tracked)", data_row=4, anchor="I6"),
-    ChartSpec("Savings (Budget vs Tracked)", data_row=5, anchor="M6"),
+    ChartSpec("Income (Budget vs Tracked)", data_row=3, anchor="E6", section="Income"),
+    ChartSpec("Expenses (Budget vs Tracked)", data_row=4, anchor="I6", section="Expenses"),
+    ChartSpec("Savings (Budget vs Tracked)", data_row=5, anchor="M6", section="Savings"),
 )
 
+# Header cells F2:G2 on the Calculations sheet.
+CATEGORY_LABELS: tuple[str, ...] = ("BudgetedMonth", "TrackedMonth")
 
-def add_dashboard_doughnut_charts(dashboard_ws: Worksheet) -> None:
-    """Attach the trio of doughnut charts to *dashboard_ws*."""
+
+def add_dashboard_doughnut_charts(
+    dashboard_ws: Worksheet,
+    values: Mapping[str, tuple[float, float]] | None = None,
+) -> None:
+    """Attach the trio of doughnut charts to *dashboard_ws*.
+
+    *values* maps each section to its ``(budgeted, tracked)`` totals (see
+    :func:`~budget_generator.charts.values.dashboard_chart_values`); when
+    given they are embedded as the series caches so the charts draw without
+    a recalculation.
+    """
 
     workbook = dashboard_ws.parent
     calculations_ws = workbook["Calculations"]
@@ -34,6 +49,8 @@ def add_dashboard_doughnut_charts(dashboard_ws: Worksheet) -> None:
             title=spec.title,
             data_row=spec.data_row,
         )
+        if values is not None and spec.section in values:
+            _cache_values(chart, values[spec.section])
         dashboard_ws.add_chart(chart, spec.anchor)
 
 
@@ -75,3 +92,20 @@ def _build_doughnut_chart(
         series.dLbls = DataLabelList(showVal=True, showPercent=True)
 
     return chart
+
+
+def _cache_values(chart: DoughnutChart, values: tuple[float, float]) -> None:
+    """Embed *values* and the category labels as the caches of the chart's series."""
+
+    # One series per column, each holding a single point.
+    for series, value in zip(chart.series, values):
+        series.val.numRef.numCache = NumData(pt=[NumVal(idx=0, v=value)], ptCount=1)
+        series.cat = AxDataSource(
+            strRef=StrRef(
+                f=series.cat.numRef.f,
+                strCache=StrData(
+                    pt=[StrVal(idx=index, v=label) for index, label in enumerate(CATEGORY_LABELS)],
+                    ptCount=len(CATEGORY_LABELS),
+                ),
+            )
+        )
@@ -0,0 +1,92 @@
+"""Compute the dashboard chart values for the default selectors.
+
+The doughnut charts read the Budget-vs-Tracked table on the Calculations
+sheet, which only has values once Excel recalculates.  Viewers that never
+recalculate draw the chart caches instead, so these helpers evaluate the
+same formulas in Python for the spec's default ``DashYear``/``DashPeriod``.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from itertools import islice
+from typing import Any
+
+from ..sheets.calculations import SECTION_TRACKING_TYPES
+from ..sheets.planning import DEFAULT_STARTING_YEAR, MONTHS, planning_layout, with_starting_year
+from ..sheets.tracking import late_income_day, resolve_tracking_config
+
+
+_YEAR_FORMULA = re.compile(r"=\s*StartingYear\s*(?:([+-])\s*(\d+))?\s*", re.IGNORECASE)
+
+ChartValues = dict[str, tuple[float, float]]
+
+
+def dashboard_chart_values(sheet_specs: Mapping[str, Mapping[str, Any]]) -> ChartValues | None:
+    """Return ``{section: (budgeted, tracked)}`` for the dashboard's default selectors.
+
+    Budgeted totals come from the year 1 planning grid, as ``IncomeTotals``
+    and friends do; tracked totals sum the ledger rows of the section's type
+    whose Effective Date falls in the selected month and year, honouring the
+    late income settings.
+    Returns ``None`` when the default year or period is not something Python
+    can evaluate (such as a formula other than ``=StartingYear+N``).
+    """
+
+    settings = sheet_specs.get("Settings", {})
+    general = settings.get("general", {})
+    selectors = sheet_specs.get("Budget Dashboard", {}).get("selectors", {})
+
+    period = selectors.get("default_period", "Jan")
+    if period not in MONTHS:
+        return None
+    month = MONTHS.index(period) + 1
+    year = _selected_year(
+        selectors.get("default_year_formula", "=StartingYear"),
+        int(general.get("starting_year", DEFAULT_STARTING_YEAR)),
+    )
+    if year is None:
+        return None
+
+    planning = with_starting_year(sheet_specs.get("Budget-Planning", {}), settings)
+    budgeted = {
+        section.title: sum(float(amounts.get(0, [0] * len(MONTHS))[month - 1]) for _, amounts in section.rows)
+        for section in planning_layout(planning).sections
+    }
+
+    late_day = late_income_day(settings.get("late_income", {}))
+    config = resolve_tracking_config(sheet_specs.get("Budget Tracking", {}))
+    tracked = dict.fromkeys(SECTION_TRACKING_TYPES.values(), 0.0)
+    for entry in islice(config.entries(), config.capacity):
+        effective = entry.effective_date(late_day)
+        if (effective.year, effective.month) != (year, month):
+            continue
+        kind = entry.transaction_type.casefold()
+        for name in tracked:
+            # Excel compares text case-insensitively.
+            if name.casefold() == kind:
+                tracked[name] += float(entry.amount)
+
+    return {
+        section: (budgeted.get(section, 0.0), tracked[transaction_type])
+        for section, transaction_type in SECTION_TRACKING_TYPES.items()
+    }
+
+
+def _selected_year(formula: object, starting_year: int) -> int | None:
+    """Evaluate the ``DashYear`` default, or return ``None`` if it is not understood."""
+
+    if isinstance(formula, int):
+        return formula
+    text = str(formula)
+    if text.strip().isdigit():
+        return int(text)
+    match = _YEAR_FORMULA.fullmatch(text)
+    if match is None:
+        return None
+    sign, offset = match.groups()
+    if offset is None:
+        return starting_year
+    return starting_year + int(offset) if sign == "+" else starting_year - int(offset)
+
@@ -0,0 +1,198 @@
+"""Merge several generated workbooks into one household workbook.
+
+Each input's ``tblTracking`` rows are streamed straight from the worksheet XML
+and k-way merged by date with :func:`heapq.merge`, so only one pending row per
+input is held at a time.  The merged rows are spooled to a temporary JSON
+Lines ledger that the regular generator reads through ``transactions_file``;
+the planning grids of all inputs are summed cell-wise into the spec's
+``planned_amounts``.  The output therefore looks exactly like a workbook
+generated from a spec, with the source workbook recorded in each row's Details.
+"""
+
+from __future__ import annotations
+
+import copy
+import heapq
+import logging
+import tempfile
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from .engines import AUTO_ENGINE, create_generator, select_engine, share_tracking_ledger
+from .estimate import estimate_spec
+from .sheets.planning import MONTHS
+from .sheets.tracking import TrackingConfig
+from .synth import BASE_SPEC
+from .utils.transactions import write_transaction_records
+from .xlsx import XlsxPackage, iter_planning_records, iter_table_records, locate_table
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ConsolidateError(RuntimeError):
+    """Raised when workbooks cannot be consolidated."""
+
+
+@dataclass(frozen=True)
+class ConsolidateResult:
+    """What :func:`consolidate_workbooks` wrote."""
+
+    output: Path
+    transactions: int
+    sources: tuple[str, ...]
+    engine: str
+
+
+def source_labels(paths: Sequence[Path]) -> tuple[str, ...]:
+    """Label each input by its file stem, numbering repeated stems."""
+
+    seen: Counter[str] = Counter()
+    labels: list[str] = []
+    for path in paths:
+        seen[path.stem] += 1
+        labels.append(path.stem if seen[path.stem] == 1 else f"{path.stem}-{seen[path.stem]}")
+    return tuple(labels)
+
+
+def merge_tracking_records(
+    packages: Sequence[XlsxPackage], labels: Sequence[str]
+) -> Iterator[dict[str, Any]]:
+    """Yield the tracking rows of all *packages* in date order, tagged with their label.
+
+    Each input must be date-ordered already, as the generated ledger has to
+    be; :class:`ConsolidateError` is raised at the first row of an input that
+    is not.
+    """
+
+    streams = [
+        _tagged(iter_table_records(package, locate_table(package)), label)
+        for package, label in zip(packages, labels)
+    ]
+    return heapq.merge(*streams, key=_date_key)
+
+
+def sum_planning_grids(
+    packages: Iterable[XlsxPackage],
+) -> tuple[dict[str, dict[str, list[list[float]]]], int | None]:
+    """Sum the planning grids cell-wise by section, category, year and month.
+
+    Returns ``planned_amounts`` for the planning spec, with one list of
+    monthly amounts per year counted from the earliest starting year found
+    among the inputs, and that starting year.
+    """
+
+    cells: dict[tuple[str, str, int, int], float] = {}
+    years: set[int] = set()
+    for package in packages:
+        for record in iter_planning_records(package):
+            if not isinstance(record["year"], (int, float)):
+                continue
+            years.add(int(record["year"]))
+            amount = record["amount"]
+            if isinstance(amount, (int, float)):
+                month = MONTHS.index(record["month"])
+                key = (record["section"], str(record["category"]), int(record["year"]), month)
+                cells[key] = cells.get(key, 0) + amount
+    if not years:
+        return {}, None
+
+    starting_year = min(years)
+    last_year = max(year for _, _, year, _ in cells) if cells else starting_year
+    totals: dict[str, dict[str, list[list[float]]]] = {}
+    for (section, category, year, month), amount in cells.items():
+        grid = totals.setdefault(section, {}).setdefault(
+            category, [[0] * len(MONTHS) for _ in range(last_year - starting_year + 1)]
+        )
+        grid[year - starting_year][month] += amount
+    return totals, starting_year
+
+
+def consolidate_workbooks(
+    inputs: Sequence[Path | str],
+    output: Path | str,
+    *,
+    base_spec: Mapping[str, Any] | None = None,
+    engine: str = AUTO_ENGINE,
+    deterministic: bool = False,
+) -> ConsolidateResult:
+    """Write one workbook holding the merged ledgers and summed plans of *inputs*."""
+
+    paths = [Path(path) for path in inputs]
+    if not paths:
+        raise ConsolidateError("At least one workbook is required")
+    output = Path(output)
+    if output.resolve() in {path.resolve() for path in paths}:
+        raise ConsolidateError(f"Output {output} would overwrite one of the inputs")
+    labels = source_labels(paths)
+
+    with ExitStack() as stack, tempfile.TemporaryDirectory(prefix="consolidate-") as scratch:
+        packages = [stack.enter_context(XlsxPackage(path)) for path in paths]
+        ledger = Path(scratch) / "transactions.jsonl"
+        count = write_transaction_records(ledger, merge_tracking_records(packages, labels))
+        planned, starting_year = sum_planning_grids(packages)
+
+        spec = _consolidated_spec(base_spec, ledger, count, planned, starting_year)
+        if engine == AUTO_ENGINE:
+            spec = share_tracking_ledger(spec)
+        choice = select_engine(estimate_spec(spec) if engine == AUTO_ENGINE else None, engine)
+        LOGGER.info("Using %s engine: %s", choice.name, choice.reason)
+        generator = create_generator(choice, spec)
+        generator.create_workbook()
+        generator.create_sheets(spec)
+        generator.build_sheet_contents()
+        generator.save_workbook(output, deterministic=deterministic)
+    return ConsolidateResult(output, count, labels, choice.name)
+
+
+def _consolidated_spec(
+    base_spec: Mapping[str, Any] | None,
+    ledger: Path,
+    count: int,
+    planned: dict[str, dict[str, list[list[float]]]],
+    starting_year: int | None,
+) -> dict[str, Any]:
+    spec = copy.deepcopy(dict(base_spec if base_spec is not None else BASE_SPEC))
+    spec.setdefault("meta", {})["name"] = "Household Budget"
+    sheets = spec.setdefault("sheets", {})
+    if starting_year is not None:
+        sheets.setdefault("Settings", {}).setdefault("general", {})["starting_year"] = starting_year
+    planning = sheets.setdefault("Budget-Planning", {})
+    planning["planned_amounts"] = planned
+    year_count = max((len(grid) for section in planned.values() for grid in section.values()), default=1)
+    planning["scaffold_years"] = max(int(planning.get("scaffold_years", 2)), year_count)
+    tracking = sheets.setdefault("Budget Tracking", {})
+    tracking.pop("sample_entries", None)
+    tracking["max_rows"] = TrackingConfig().header_row + max(1, count)
+    tracking["transactions_file"] = str(ledger)
+    return spec
+
+
+def _tagged(records: Iterator[dict[str, Any]], label: str) -> Iterator[dict[str, Any]]:
+    previous: datetime | None = None
+    for record in records:
+        details = record.get("details")
+        record["details"] = f"[{label}] {details}" if details not in (None, "") else f"[{label}]"
+        when = _date_key(record)
+        if previous is not None and when < previous:
+            raise ConsolidateError(
+                f"{label} is not in date order ({when:%Y-%m-%d} follows {previous:%Y-%m-%d}); "
+                "sort its tracking table by Date first"
+            )
+        previous = when
+        yield record
+
+
+def _date_key(record: Mapping[str, Any]) -> datetime:
+    # Rows without a date sort last; plain dates and datetimes compare together.
+    value = record.get("date")
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.max
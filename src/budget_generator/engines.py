@@ -0,0 +1,86 @@
+"""Generation engine selection based on the estimated workbook size."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+from .estimate import WorkbookEstimate
+from .formatting.styles import FULL_PROFILE
+from .generator import TRACKING_SHEET, BudgetGenerator, GeneratorError
+from .sheets.tracking import resolve_tracking_config
+from .streaming import StreamingBudgetGenerator
+
+
+AUTO_ENGINE = "auto"
+ENGINES: dict[str, type[BudgetGenerator]] = {
+    "memory": BudgetGenerator,
+    "streaming": StreamingBudgetGenerator,
+}
+# Above this many cells the in-memory engine's RAM use outweighs the streaming
+# engine's fixed scratch-workbook overhead (about 50k tracking rows).
+STREAMING_CELL_THRESHOLD = 250_000
+
+
+@dataclass(frozen=True)
+class EngineChoice:
+    """The engine picked for a run and why."""
+
+    name: str
+    reason: str
+
+
+def select_engine(
+    estimate: WorkbookEstimate | None,
+    requested: str = AUTO_ENGINE,
+    *,
+    threshold: int = STREAMING_CELL_THRESHOLD,
+) -> EngineChoice:
+    """Pick the engine for *estimate*, honouring an explicit *requested* name."""
+
+    if requested != AUTO_ENGINE:
+        if requested not in ENGINES:
+            raise GeneratorError(
+                f"Unknown engine '{requested}'; choose from {', '.join([AUTO_ENGINE, *ENGINES])}"
+            )
+        return EngineChoice(requested, "requested explicitly")
+
+    if estimate is None:
+        return EngineChoice("memory", "no size estimate available")
+    if estimate.cells > threshold:
+        return EngineChoice(
+            "streaming",
+            f"estimated {estimate.cells} cells exceed the {threshold}-cell in-memory threshold",
+        )
+    return EngineChoice(
+        "memory",
+        f"estimated {estimate.cells} cells fit under the {threshold}-cell in-memory threshold",
+    )
+
+
+def share_tracking_ledger(spec: Mapping[str, Any]) -> dict[str, Any]:
+    """Return *spec* with its transactions file read into the tracking spec's ``ledger``.
+
+    The ``auto`` estimate and the generator then take the entries from the
+    spec instead of each parsing the file.  Raises ``ValueError`` for a
+    ledger out of date order.
+    """
+
+    sheets = spec.get("sheets")
+    tracking = sheets.get(TRACKING_SHEET) if isinstance(sheets, Mapping) else None
+    if not isinstance(tracking, Mapping) or not tracking.get("transactions_file"):
+        return dict(spec)
+    ledger = resolve_tracking_config(tracking).ledger
+    return {**spec, "sheets": {**sheets, TRACKING_SHEET: {**tracking, "ledger": ledger}}}
+
+
+def create_generator(
+    choice: EngineChoice,
+    spec: Mapping[str, Any],
+    *,
+    sheets: Iterable[str] | None = None,
+    profile: str = FULL_PROFILE,
+) -> BudgetGenerator:
+    """Instantiate the generator class implementing *choice*."""
+
+    return ENGINES[choice.name](spec, sheets=sheets, profile=profile)
@@ -0,0 +1,288 @@
+"""Pre-flight cost estimation for workbook generation.
+
+Fixed-size sheets are probed by building them into a scratch workbook.  The
+Budget Tracking sheet scales with ``max_rows`` so it is probed at two small
+sizes and extrapolated linearly to the configured row count.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Mapping
+
+from openpyxl import Workbook
+
+from .sheets.calculations import category_rows
+from .sheets.planning import with_starting_year
+from .sheets.registry import DEFAULT_REGISTRY, SheetBuilder, SheetRegistry
+from .sheets.tracking import DATA_FORMATS, DEFAULT_SAMPLE_ENTRIES, TrackingEntry, resolve_tracking_config
+
+
+EXCEL_MAX_ROWS = 1_048_576
+TRACKING_SHEET = "Budget Tracking"
+PLANNING_SHEET = "Budget-Planning"
+# Rows used for the two tracking probes; both sit past the default sample entries.
+PROBE_ROWS = (8, 24)
+
+
+@dataclass(frozen=True)
+class ElementCosts:
+    """Per-element build/save costs in microseconds and compressed bytes.
+
+    Calibrated with openpyxl 3.1 on CPython 3.11 by timing 50k-element sheets;
+    re-measure when either dependency moves a major version.
+    """
+
+    cell_build_us: float = 6.0
+    cell_save_us: float = 20.0
+    formula_extra_us: float = 0.8
+    validation_build_us: float = 35.0
+    validation_save_us: float = 35.0
+    cell_bytes: float = 3.5
+    validation_bytes: float = 9.5
+    base_seconds: float = 0.15
+    base_bytes: int = 20_000
+
+
+DEFAULT_COSTS = ElementCosts()
+
+
+@dataclass(frozen=True)
+class Thresholds:
+    """Limits above which the estimate reports a warning."""
+
+    cells: int = 1_000_000
+    data_validations: int = 10_000
+    output_bytes: int = 50 * 1024 * 1024
+    build_seconds: float = 60.0
+
+
+DEFAULT_THRESHOLDS = Thresholds()
+
+
+@dataclass
+class SheetEstimate:
+    """Expected object counts for a single worksheet."""
+
+    name: str
+    cells: int = 0
+    styled_cells: int = 0
+    formulas: int = 0
+    data_validations: int = 0
+    conditional_format_rules: int = 0
+    charts: int = 0
+
+
+@dataclass
+class WorkbookEstimate:
+    """Expected size and cost of generating a workbook."""
+
+    sheets: list[SheetEstimate]
+    styles: int
+    output_bytes: int
+    build_seconds: float
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def cells(self) -> int:
+        return sum(sheet.cells for sheet in self.sheets)
+
+    @property
+    def formulas(self) -> int:
+        return sum(sheet.formulas for sheet in self.sheets)
+
+    @property
+    def data_validations(self) -> int:
+        return sum(sheet.data_validations for sheet in self.sheets)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cells": self.cells,
+            "styles": self.styles,
+            "formulas": self.formulas,
+            "data_validations": self.data_validations,
+            "output_bytes": self.output_bytes,
+            "build_seconds": round(self.build_seconds, 3),
+            "sheets": [asdict(sheet) for sheet in self.sheets],
+            "warnings": list(self.warnings),
+        }
+
+
+def estimate_spec(
+    spec: Mapping[str, Any],
+    *,
+    costs: ElementCosts = DEFAULT_COSTS,
+    thresholds: Thresholds = DEFAULT_THRESHOLDS,
+    registry: SheetRegistry = DEFAULT_REGISTRY,
+) -> WorkbookEstimate:
+    """Estimate the cost of generating *spec* without building the workbook."""
+
+    sheet_specs = _sheet_specs(spec)
+    scratch = Workbook()
+    scratch.remove(scratch.active)
+    for builder in registry.plan().builders:
+        scratch.create_sheet(builder.sheet_name)
+
+    sheets: list[SheetEstimate] = []
+    styles: set[tuple[int, ...]] = set()
+    warnings: list[str] = []
+    for builder in registry.plan().builders:
+        sheet_spec = sheet_specs.get(builder.sheet_name, {})
+        if builder.sheet_name == TRACKING_SHEET:
+            sheets.append(_estimate_tracking(builder, sheet_spec, styles, warnings))
+        else:
+            sheets.append(_probe(scratch, builder, sheet_spec, styles))
+
+    estimate = WorkbookEstimate(
+        sheets=sheets,
+        styles=len(styles),
+        output_bytes=0,
+        build_seconds=0.0,
+        warnings=warnings,
+    )
+    estimate.output_bytes = int(
+        costs.base_bytes
+        + estimate.cells * costs.cell_bytes
+        + estimate.data_validations * costs.validation_bytes
+    )
+    estimate.build_seconds = (
+        costs.base_seconds
+        + estimate.cells * (costs.cell_build_us + costs.cell_save_us) / 1e6
+        + estimate.formulas * costs.formula_extra_us / 1e6
+        + estimate.data_validations
+        * (costs.validation_build_us + costs.validation_save_us)
+        / 1e6
+    )
+    _check_thresholds(estimate, thresholds)
+    return estimate
+
+
+def _probe(
+    workbook: Workbook,
+    builder: SheetBuilder,
+    spec: Mapping[str, Any],
+    styles: set[tuple[int, ...]],
+) -> SheetEstimate:
+    worksheet = workbook[builder.sheet_name]
+    builder.build(worksheet, spec)
+
+    estimate = SheetEstimate(name=builder.sheet_name)
+    for cell in worksheet._cells.values():  # type: ignore[attr-defined]
+        estimate.cells += 1
+        if cell.has_style:
+            estimate.styled_cells += 1
+            styles.add(tuple(cell._style))
+        if cell.data_type == "f":
+            estimate.formulas += 1
+    estimate.data_validations = len(worksheet.data_validations.dataValidation)
+    estimate.conditional_format_rules = sum(
+        len(entry.rules) for entry in worksheet.conditional_formatting
+    )
+    estimate.charts = len(worksheet._charts)  # type: ignore[attr-defined]
+    return estimate
+
+
+def _estimate_tracking(
+    builder: SheetBuilder,
+    spec: Mapping[str, Any],
+    styles: set[tuple[int, ...]],
+    warnings: list[str],
+) -> SheetEstimate:
+    config = resolve_tracking_config(spec)
+    probe_spec = {
+        key: value
+        for key, value in spec.items()
+        if key not in ("sample_entries", "transactions_file", "ledger", "partition")
+    }
+
+    small, large = (
+        _probe_tracking(builder, probe_spec, config.data_start_row + rows, styles)
+        for rows in PROBE_ROWS
+    )
+    probe_rows = PROBE_ROWS[1] - PROBE_ROWS[0]
+    extra_rows = max(0, config.end_row - (config.data_start_row + PROBE_ROWS[0]))
+
+    estimate = SheetEstimate(name=builder.sheet_name)
+    for name in ("cells", "styled_cells", "formulas", "data_validations"):
+        per_row = (getattr(large, name) - getattr(small, name)) / probe_rows
+        setattr(estimate, name, int(round(getattr(small, name) + per_row * extra_rows)))
+    estimate.conditional_format_rules = large.conditional_format_rules
+
+    # Probes carry the default sample entries; each real entry adds a cell for
+    # every filled unformatted input column, which blank rows leave out.
+    capacity = config.capacity
+    default_cells, _ = _entry_cells(DEFAULT_SAMPLE_ENTRIES, capacity)
+    cells, entries = _entry_cells(config.entries(), capacity)
+    estimate.cells += cells - default_cells
+
+    if entries > capacity:
+        warnings.append(
+            f"{TRACKING_SHEET}: {entries} entries exceed the "
+            f"{capacity} table rows; {entries - capacity} will be dropped."
+        )
+    if config.end_row > EXCEL_MAX_ROWS:
+        warnings.append(
+            f"{TRACKING_SHEET}: max_rows {config.end_row} exceeds Excel's {EXCEL_MAX_ROWS} row limit."
+        )
+    return estimate
+
+
+def _entry_cells(entries: Iterable[TrackingEntry], capacity: int) -> tuple[int, int]:
+    """Return the unformatted input cells of the first *capacity* entries, plus the entry count."""
+
+    cells = count = 0
+    for count, entry in enumerate(entries, start=1):
+        if count > capacity:
+            continue
+        for value, number_format in zip(entry.values(), DATA_FORMATS):
+            if value is not None and number_format is None:
+                cells += 1
+    return cells, count
+
+
+def _probe_tracking(
+    builder: SheetBuilder,
+    spec: Mapping[str, Any],
+    max_rows: int,
+    styles: set[tuple[int, ...]],
+) -> SheetEstimate:
+    workbook = Workbook()
+    workbook.active.title = builder.sheet_name
+    return _probe(workbook, builder, {**spec, "max_rows": max_rows}, styles)
+
+
+def _check_thresholds(estimate: WorkbookEstimate, thresholds: Thresholds) -> None:
+    for sheet in estimate.sheets:
+        if sheet.data_validations > thresholds.data_validations:
+            estimate.warnings.append(
+                f"{sheet.name}: {sheet.data_validations} data validations; per-row validations "
+                "dominate save time and sheet XML size at this scale."
+            )
+    if estimate.cells > thresholds.cells:
+        estimate.warnings.append(
+            f"Workbook will hold about {estimate.cells} cells; in-memory generation keeps "
+            "every one of them in RAM until the save completes."
+        )
+    if estimate.output_bytes > thresholds.output_bytes:
+        estimate.warnings.append(
+            f"Output is expected to be about {estimate.output_bytes / 1024 / 1024:.1f} MiB."
+        )
+    if estimate.build_seconds > thresholds.build_seconds:
+        estimate.warnings.append(
+            f"Generation is expected to take about {estimate.build_seconds:.0f}s."
+        )
+
+
+def _sheet_specs(spec: Mapping[str, Any]) -> dict[str, Mapping[str, Any]]:
+    sheets_config = spec.get("sheets", {})
+    if not isinstance(sheets_config, Mapping):
+        return {}
+    result = {
+        str(name): cfg for name, cfg in sheets_config.items() if isinstance(cfg, Mapping)
+    }
+    if PLANNING_SHEET in result:
+        result[PLANNING_SHEET] = with_starting_year(result[PLANNING_SHEET], result.get("Settings"))
+    rows = category_rows(result.get(PLANNING_SHEET))
+    for name in ("Calculations", "Budget Dashboard"):
+        result[name] = {**result.get(name, {}), "category_rows": rows}
+    return result
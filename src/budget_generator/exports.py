@@ -0,0 +1,265 @@
+"""Export the tracking ledger and planning grid as plain tables.
+
+The rows come from the spec exactly as the sheet builders see them: tracking
+entries through :meth:`TrackingConfig.entries` (truncated to the table's
+capacity, like the workbook) and planning rows through :func:`planning_layout`.
+Nothing is read back from the xlsx.  Rows are gathered into column batches of
+:data:`BATCH_ROWS` and handed to every requested sink at once, so the ledger
+is read a single time however many formats are written.
+
+Parquet output needs the optional ``pyarrow`` dependency
+(``pip install budget-excel-tracker[parquet]``); CSV and SQLite use the
+standard library.
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import sqlite3
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from .sheets.planning import DEFAULT_STARTING_YEAR, MONTHS, planning_layout, with_starting_year
+from .sheets.tracking import resolve_tracking_config
+
+
+BATCH_ROWS = 10_000
+TRACKING_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("date", "date"),
+    ("type", "text"),
+    ("category", "text"),
+    ("amount", "real"),
+    ("details", "text"),
+)
+PLANNING_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("section", "text"),
+    ("category", "text"),
+    ("year", "integer"),
+    ("month", "text"),
+    ("amount", "real"),
+)
+TABLES: dict[str, tuple[tuple[str, str], ...]] = {
+    "tracking": TRACKING_COLUMNS,
+    "planning": PLANNING_COLUMNS,
+}
+
+Batch = dict[str, list[Any]]
+
+
+class ExportError(RuntimeError):
+    """Raised when an export target cannot be written."""
+
+
+@dataclass(frozen=True)
+class ExportTargets:
+    """Where to write the exported tables; ``None`` skips a format."""
+
+    csv_dir: Path | None = None
+    sqlite_path: Path | None = None
+    parquet_dir: Path | None = None
+
+    def __bool__(self) -> bool:
+        return any(target is not None for target in (self.csv_dir, self.sqlite_path, self.parquet_dir))
+
+
+def iter_tracking_rows(spec: Mapping[str, Any]) -> Iterator[tuple[Any, ...]]:
+    """Yield the tracking rows the workbook holds, in TRACKING_COLUMNS order."""
+
+    config = resolve_tracking_config(_sheet_spec(spec, "Budget Tracking"))
+    for entry in itertools.islice(config.entries(), config.capacity):
+        values = entry.values()
+        yield (values[0].date(), *values[1:])
+
+
+def iter_planning_rows(spec: Mapping[str, Any]) -> Iterator[tuple[Any, ...]]:
+    """Yield one row per named category and month of every planning grid."""
+
+    planning = with_starting_year(_sheet_spec(spec, "Budget-Planning"), _sheet_spec(spec, "Settings"))
+    year = int(planning.get("starting_year", DEFAULT_STARTING_YEAR))
+    layout = planning_layout(planning)
+    empty = [0] * len(MONTHS)
+    for offset in layout.years:
+        for section in layout.sections:
+            for category, amounts in section.rows:
+                if not category:
+                    continue
+                for month, amount in zip(MONTHS, amounts.get(offset, empty)):
+                    yield section.title, category, year + offset, month, amount
+
+
+def export_tables(spec: Mapping[str, Any], targets: ExportTargets) -> dict[str, int]:
+    """Write the tracking and planning tables to *targets*; return row counts per table."""
+
+    sinks = _open_sinks(targets)
+    counts: dict[str, int] = {}
+    try:
+        for table, rows in (("tracking", iter_tracking_rows(spec)), ("planning", iter_planning_rows(spec))):
+            counts[table] = 0
+            for sink in sinks:
+                sink.begin(table, TABLES[table])
+            for batch, size in _batches(rows, TABLES[table]):
+                for sink in sinks:
+                    sink.write(table, batch)
+                counts[table] += size
+            for sink in sinks:
+                sink.end(table)
+    except OSError as exc:
+        raise ExportError(f"Unable to write export: {exc}") from exc
+    except sqlite3.Error as exc:
+        raise ExportError(f"Unable to write SQLite export: {exc}") from exc
+    finally:
+        for sink in sinks:
+            sink.close()
+    return counts
+
+
+def _batches(rows: Iterator[tuple[Any, ...]], columns: Sequence[tuple[str, str]]) -> Iterator[tuple[Batch, int]]:
+    names = [name for name, _ in columns]
+    while True:
+        chunk = list(itertools.islice(rows, BATCH_ROWS))
+        if not chunk:
+            return
+        yield {name: list(values) for name, values in zip(names, zip(*chunk))}, len(chunk)
+
+
+def _open_sinks(targets: ExportTargets) -> list["_Sink"]:
+    sinks: list[_Sink] = []
+    try:
+        if targets.parquet_dir is not None:
+            sinks.append(_ParquetSink(targets.parquet_dir))
+        if targets.csv_dir is not None:
+            sinks.append(_CsvSink(targets.csv_dir))
+        if targets.sqlite_path is not None:
+            sinks.append(_SqliteSink(targets.sqlite_path))
+    except (OSError, sqlite3.Error) as exc:
+        for sink in sinks:
+            sink.close()
+        raise ExportError(f"Unable to open export target: {exc}") from exc
+    return sinks
+
+
+def _sheet_spec(spec: Mapping[str, Any], name: str) -> Mapping[str, Any]:
+    sheets = spec.get("sheets", {})
+    sheet = sheets.get(name, {}) if isinstance(sheets, Mapping) else {}
+    return sheet if isinstance(sheet, Mapping) else {}
+
+
+class _Sink(ABC):
+    """An export target; subclasses must implement :meth:`begin` and :meth:`write`."""
+
+    @abstractmethod
+    def begin(self, table: str, columns: Sequence[tuple[str, str]]) -> None:
+        """Start *table* with the ``(name, type)`` *columns*."""
+
+    @abstractmethod
+    def write(self, table: str, batch: Batch) -> None:
+        """Append one column-oriented *batch* of rows to *table*."""
+
+    def end(self, table: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class _CsvSink(_Sink):
+    """One ``<table>.csv`` per table; dates are written as ISO strings."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.stream: Any = None
+
+    def begin(self, table: str, columns: Sequence[tuple[str, str]]) -> None:
+        self.stream = (self.directory / f"{table}.csv").open("w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.stream)
+        self.writer.writerow([name for name, _ in columns])
+
+    def write(self, table: str, batch: Batch) -> None:
+        columns = [
+            ["" if value is None else value.isoformat() if isinstance(value, date) else value for value in values]
+            for values in batch.values()
+        ]
+        self.writer.writerows(zip(*columns))
+
+    def end(self, table: str) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+
+class _SqliteSink(_Sink):
+    """Tables ``tracking`` and ``planning`` in one database, replaced on every run."""
+
+    TYPES = {"date": "TEXT", "text": "TEXT", "real": "REAL", "integer": "INTEGER"}
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.insert = ""
+
+    def begin(self, table: str, columns: Sequence[tuple[str, str]]) -> None:
+        definition = ", ".join(f'"{name}" {self.TYPES[kind]}' for name, kind in columns)
+        self.connection.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self.connection.execute(f'CREATE TABLE "{table}" ({definition})')
+        placeholders = ", ".join("?" for _ in columns)
+        self.insert = f'INSERT INTO "{table}" VALUES ({placeholders})'
+
+    def write(self, table: str, batch: Batch) -> None:
+        columns = [
+            [value.isoformat() if isinstance(value, date) else value for value in values]
+            for values in batch.values()
+        ]
+        self.connection.executemany(self.insert, zip(*columns))
+
+    def end(self, table: str) -> None:
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class _ParquetSink(_Sink):
+    """One ``<table>.parquet`` per table, written a record batch at a time."""
+
+    def __init__(self, directory: Path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ExportError(
+                "Parquet export needs pyarrow; install it with 'pip install budget-excel-tracker[parquet]'"
+            ) from exc
+        self.pa, self.pq = pa, pq
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.writer: Any = None
+
+    def begin(self, table: str, columns: Sequence[tuple[str, str]]) -> None:
+        pa = self.pa
+        types = {"date": pa.date32(), "text": pa.string(), "real": pa.float64(), "integer": pa.int64()}
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self.writer = self.pq.ParquetWriter(self.directory / f"{table}.parquet", self.schema)
+
+    def write(self, table: str, batch: Batch) -> None:
+        arrays = [
+            self.pa.array(values, type=field.type) for field, values in zip(self.schema, batch.values())
+        ]
+        self.writer.write_batch(self.pa.record_batch(arrays, schema=self.schema))
+
+    def end(self, table: str) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 from openpyxl.formatting.rule import CellIsRule, FormulaRule
 from openpyxl.styles import PatternFill
 from openpyxl.worksheet.worksheet import Worksheet
 
 
 def add_unallocated_conditional_formatting(
-    worksheet: Worksheet, start_col: str, end_col: str, row: int
+    worksheet: Worksheet, start_col: str, end_col: str, row: int, total_rows: Sequence[int]
 ) -> None:
-    """Attach the three-state colouring rules for the Unallocated row."""
+    """Attach the three-state colouring rules for the Unallocated row.
+
+    *total_rows* are the section total rows; a month with all of them at zero
+    is greyed out.
+    """
 
     range_str = f"{start_col}{row}:{end_col}{row}"
 
@@ -21,7 +27,7 @@ def add_unallocated_conditional_formatting(
     rule_less_than = CellIsRule(operator="lessThan", formula=["0"], fill=red_fill)
 
     gray_fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-    formula = f"AND({start_col}13=0,{start_col}26=0,{start_col}34=0)"
+    formula = "AND(" + ",".join(f"{start_col}{total_row}=0" for total_row in total_rows) + ")"
     rule_all_zero = FormulaRule(formula=[formula], fill=gray_fill)
 
     worksheet.conditional_formatting.add(range_str, rule_equal_zero)
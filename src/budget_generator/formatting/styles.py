@@ -2,12 +2,32 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping, Sequence
+from copy import copy
 from typing import Optional
 
-from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.styleable import StyleableObject
+from openpyxl.utils import range_boundaries
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 from openpyxl.worksheet.worksheet import Worksheet
 
 
+FULL_PROFILE = "full"
+# Values, formulas, number formats, tables, named ranges and validations only:
+# no fonts, fills, borders, alignment, merges, conditional formats or charts.
+LEAN_PROFILE = "lean"
+PROFILES: tuple[str, ...] = (FULL_PROFILE, LEAN_PROFILE)
+
+
+def is_lean(spec: Mapping[str, object] | None) -> bool:
+    """Return whether the sheet *spec* asks for the lean output profile."""
+
+    return isinstance(spec, Mapping) and spec.get("profile") == LEAN_PROFILE
+
+
 def apply_fill(cell, hex_color: str):
     """Apply a solid fill to *cell* using a hex colour (#RRGGBB or RRGGBB)."""
 
@@ -41,3 +61,124 @@ def merge_and_format(
     if fill_color is not None:
         apply_fill(anchor, fill_color)
     return anchor
+
+
+def write_only_copy(worksheet: WriteOnlyWorksheet, cell: Cell) -> WriteOnlyCell | None:
+    """Copy *cell*'s value and style into a cell for write-only *worksheet*.
+
+    Returns ``None`` for cells without value or style so streamed rows stay
+    sparse.
+    """
+
+    if cell.value is None and not cell.has_style:
+        return None
+
+    target = WriteOnlyCell(worksheet, value=cell.value)
+    if cell.has_style:
+        target.font = copy(cell.font)
+        target.fill = copy(cell.fill)
+        target.border = copy(cell.border)
+        target.alignment = copy(cell.alignment)
+        target.protection = copy(cell.protection)
+        target.number_format = cell.number_format
+    return target
+
+
+def write_block(
+    worksheet: Worksheet,
+    row: int,
+    column: int,
+    rows: Iterable[Sequence[object]],
+    *,
+    number_format: Optional[str] = None,
+    font: Optional[Font] = None,
+    fill: Optional[PatternFill] = None,
+    border: Optional[Border] = None,
+) -> None:
+    """Write a 2D block of values with its top-left corner at (*row*, *column*).
+
+    The style is resolved once into a prototype cell and every cell gets a
+    copy of its style array, skipping the per-cell style lookups that
+    ``worksheet.cell(...)`` plus attribute assignment pay.  Existing cells in
+    the block are replaced.
+    """
+
+    prototype = Cell(worksheet)
+    _restyle(prototype, _style_ids(worksheet, number_format=number_format, font=font, fill=fill, border=border))
+    style = prototype._style if prototype.has_style else None
+
+    cells = worksheet._cells
+    for row_index, values in enumerate(rows, start=row):
+        for column_index, value in enumerate(values, start=column):
+            cells[(row_index, column_index)] = Cell(
+                worksheet,
+                row=row_index,
+                column=column_index,
+                value=value,
+                style_array=StyleArray(style) if style is not None else None,
+            )
+
+
+def style_range(
+    worksheet: Worksheet,
+    cell_range: str,
+    *,
+    number_format: Optional[str] = None,
+    font: Optional[Font] = None,
+    fill: Optional[PatternFill] = None,
+    border: Optional[Border] = None,
+    alignment: Optional[Alignment] = None,
+) -> None:
+    """Apply the given style attributes to every cell of *cell_range*.
+
+    Each attribute is registered with the workbook once and cells only have
+    their style-array ids rewritten, so existing cells keep their other
+    attributes.  Blank cells in the range are created: a column style would
+    also reach the rows outside the range.
+    """
+
+    ids = _style_ids(
+        worksheet, number_format=number_format, font=font, fill=fill, border=border, alignment=alignment
+    )
+    if not ids:
+        return
+    min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+    cells = worksheet._cells
+    for row in range(min_row, max_row + 1):
+        for column in range(min_col, max_col + 1):
+            cell = cells.get((row, column))
+            if cell is None:
+                cell = worksheet.cell(row=row, column=column)
+            _restyle(cell, ids)
+
+
+# Style attribute -> StyleArray field holding its index in the workbook tables.
+_STYLE_FIELDS = {
+    "number_format": "numFmtId",
+    "font": "fontId",
+    "fill": "fillId",
+    "border": "borderId",
+    "alignment": "alignmentId",
+}
+
+
+def _style_ids(worksheet: Worksheet | WriteOnlyWorksheet, **attributes: object) -> dict[str, int]:
+    """Register *attributes* with the workbook once and return their style-array ids."""
+
+    prototype = Cell(worksheet)
+    ids: dict[str, int] = {}
+    for name, value in attributes.items():
+        if value is not None:
+            setattr(prototype, name, value)
+            field = _STYLE_FIELDS[name]
+            ids[field] = getattr(prototype._style, field)
+    return ids
+
+
+def _restyle(styleable: StyleableObject, ids: Mapping[str, int]) -> None:
+    """Point the given style-array fields of a cell at *ids*."""
+
+    if styleable._style is None:
+        styleable._style = StyleArray()
+    for field, value in ids.items():
+        setattr(styleable._style, field, value)
@@ -5,20 +5,109 @@ from __future__ import annotations
 from collections.abc import Sequence
 
 
-def build_choose_month_formula(cells: Sequence[str], month_name: str = "MonthIdx") -> str:
-    """Return a CHOOSE formula selecting the month-specific value."""
+def build_index_month_formula(range_name: str, month_name: str = "MonthIdx") -> str:
+    """Return an INDEX formula picking the month's cell from a one-row named range."""
 
-    values = ",".join(cells)
-    return f"=CHOOSE({month_name},{values})"
+    return f"=INDEX({range_name},{month_name})"
 
 
-def build_monthly_tracking_sumproduct(
+def build_tracking_sumifs(
     transaction_type: str,
+    month: str,
+    *,
+    table: str = "tblTracking",
+    category: str | None = None,
+    year: str | None = None,
+) -> str:
+    """Return a SUMIFS totalling a transaction type for one month of *table*.
+
+    *month* (a cell reference or month number) is matched against the table's
+    ``Month Key`` helper column, so no per-row array is evaluated; *category*,
+    an expression such as a cell reference, narrows the total to one category.
+    *year*, likewise an expression, keeps only the rows whose Effective Date
+    falls in that year.
+    """
+
+    criteria = f'{table}[Type],"{transaction_type}",{table}[Month Key],{month}'
+    if category is not None:
+        criteria += f",{table}[Category],{category}"
+    if year is not None:
+        effective = f"{table}[Effective Date]"
+        criteria += f',{effective},">="&DATE({year},1,1),{effective},"<"&DATE({year}+1,1,1)'
+    return f"=SUMIFS({table}[Amount],{criteria})"
+
+
+def build_tracking_slice_sumifs(
+    transaction_type: str,
+    month: str,
+    slices: Sequence[tuple[str, str]],
+    *,
+    table: str = "tblTracking",
+    category: str | None = None,
+) -> str:
+    """Return SUMIFS totals like :func:`build_tracking_sumifs` over row slices of *table*.
+
+    Each ``(first, last)`` pair (cell references or numbers) bounds a run of
+    data rows, read as ``INDEX(column,first):INDEX(column,last)`` ranges so
+    only those rows are summed.  Empty slices (``last < first``) give 0.
+    """
+
+    terms = []
+    for first, last in slices:
+        bounds = (table, first, last)
+        criteria = f'{_rows("Type", *bounds)},"{transaction_type}",{_rows("Month Key", *bounds)},{month}'
+        if category is not None:
+            criteria += f",{_rows('Category', *bounds)},{category}"
+        terms.append(f"IF({last}<{first},0,SUMIFS({_rows('Amount', *bounds)},{criteria}))")
+    return "=" + "+".join(terms)
+
+
+def build_month_bound_formulas(year_month: int | str, *, table: str = "tblTracking") -> tuple[str, str]:
+    """Return formulas for the first and last data row of *table* in *year_month*.
+
+    *year_month* is a ``Year Month`` key such as 202503, or an expression
+    giving one.  The column must be ascending (the ledger in date order), so
+    approximate ``MATCH`` finds both ends with a binary search.  A month
+    without rows ends one row before it starts.
+    """
+
+    keys = f"{table}[Year Month]"
+    previous = year_month - 1 if isinstance(year_month, int) else f"{year_month}-1"
+    return (
+        f"=IFERROR(MATCH({previous},{keys},1),0)+1",
+        f"=IFERROR(MATCH({year_month},{keys},1),0)",
+    )
+
+
+def build_year_choice_formula(formulas: Sequence[str], *, year_name: str = "TrackingYearIdx") -> str:
+    """Return a CHOOSE picking the per-year *formulas* entry for the selected year.
+
+    Years without an entry (``year_name`` is #N/A) give 0.
+    """
+
+    branches = ",".join(formula[1:] for formula in formulas)
+    return f"=IFERROR(CHOOSE({year_name},{branches}),0)"
+
+
+def build_month_lookup_formula(
+    range_name: str,
+    column: int,
     *,
     month_name: str = "MonthIdx",
+    year_name: str | None = None,
+    months: int = 12,
+    fallback: str = "0",
 ) -> str:
-    """Return SUMPRODUCT formula computing tracked totals for a transaction type."""
+    """Return an INDEX reading the selected month from a months x columns matrix.
+
+    With *year_name* the matrix stacks one block of *months* rows per year and
+    the year's block is picked first; years without a block give *fallback*.
+    """
+
+    if year_name is None:
+        return f"=INDEX({range_name},{month_name},{column})"
+    return f"=IFERROR(INDEX({range_name},({year_name}-1)*{months}+{month_name},{column}),{fallback})"
+
 
-    month_clause = f"(MONTH(tblTracking[Effective Date])={month_name})"
-    type_clause = f'(tblTracking[Type]="{transaction_type}")'
-    return f"=SUMPRODUCT({month_clause}*{type_clause}*tblTracking[Amount])"
+def _rows(column: str, table: str, first: str, last: str) -> str:
+    return f"INDEX({table}[{column}],{first}):INDEX({table}[{column}],{last})"
@@ -0,0 +1,65 @@
+"""Excel shared formulas: one formula text for a run of cells.
+
+A shared-formula group stores its text once, on the top-left cell, with the
+``ref`` of the whole run; every other cell only names the group's ``si``
+index and Excel shifts the relative references for it.  Row totals, column
+totals and the tracking table's calculated columns repeat one formula down a
+run of cells, so writing them as groups keeps the text out of every row.
+"""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Iterator
+from weakref import WeakKeyDictionary
+
+from openpyxl.utils.cell import range_boundaries
+from openpyxl.worksheet.formula import ArrayFormula
+
+
+class SharedFormula(ArrayFormula):
+    """The value of one cell in a shared-formula group.
+
+    openpyxl writes :class:`ArrayFormula` attributes onto the ``<f>`` element
+    and its text as the formula, so the anchor carries ``ref`` and the text
+    while the other cells carry neither.
+    """
+
+    t = "shared"
+
+    def __init__(self, si: int, ref: str | None = None, text: str | None = None):
+        super().__init__(ref, text)
+        self.si = si
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        yield "t", self.t
+        if self.ref:
+            yield "ref", self.ref
+        yield "si", str(self.si)
+
+    def __repr__(self) -> str:
+        return f"SharedFormula(si={self.si}, ref={self.ref!r}, text={self.text!r})"
+
+
+# Group indexes only need to be unique within a worksheet.
+_GROUP_INDEXES: "WeakKeyDictionary[object, itertools.count[int]]" = WeakKeyDictionary()
+
+
+def share_formula(worksheet: object, formula: str, ref: str) -> list[object]:
+    """Return the cell values that share *formula* over the single row or column *ref*.
+
+    *formula* is written as it reads in the first cell of *ref*.  Values are
+    in row order for a column and column order for a row.  A one-cell *ref*
+    gets the plain formula back.
+    """
+
+    min_col, min_row, max_col, max_row = range_boundaries(ref)
+    if min_col != max_col and min_row != max_row:
+        raise ValueError(f"Shared formula range {ref} must be a single row or column")
+    count = (max_col - min_col) + (max_row - min_row) + 1
+    if count == 1:
+        return [formula]
+    indexes = _GROUP_INDEXES.setdefault(worksheet, itertools.count())
+    si = next(indexes)
+    # Cells other than the anchor are identical, so they share one value.
+    return [SharedFormula(si, ref, formula), *[SharedFormula(si)] * (count - 1)]
@@ -0,0 +1,109 @@
+"""Formula forms chosen per spreadsheet target.
+
+The spec's ``workbook.target_excel`` names the application the workbook is
+built for.  Without it the generator emits array formulas (``SUMPRODUCT``
+over boolean products, ``LOOKUP(2,1/...)``) that every version evaluates;
+with a target it emits the cheapest equivalent that target supports:
+
+* ``2010`` and ``libreoffice``: ``SUMIFS`` and ``INDEX``/``COUNTA``.
+* ``365``: as above, with ``XLOOKUP`` for the last filled row.
+
+``2013`` and ``2016`` are accepted as aliases of ``2010``: the perpetual
+releases between 2010 and 2019 added no function these formulas could use
+(``MAXIFS`` and ``IFS`` first shipped outside 365 in Excel 2019).
+
+All strategies give the same results for ledgers filled from the top, which
+is how the generator and ``append`` write them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+# Tracking types that add to, and take from, the running balance.
+INFLOW_TYPES: tuple[str, ...] = ("Income",)
+OUTFLOW_TYPES: tuple[str, ...] = ("Expense", "Saving")
+
+
+@dataclass(frozen=True)
+class FormulaStrategy:
+    """Array formulas understood by every spreadsheet application."""
+
+    name: str = "compatible"
+
+    def running_balance(self, table: str, opening: str | None = None) -> str:
+        """Return the balance formula for a data row of *table*.
+
+        Year tables add *opening*, the cell holding the previous years'
+        closing balance, so each row only scans its own year.
+        """
+
+        income = f'SUMPRODUCT(({table}[Date]<=[@Date])*({table}[Type]="Income")*{table}[Amount])'
+        outflow = (
+            f'SUMPRODUCT(({table}[Date]<=[@Date])*(({table}[Type]="Expense")+'
+            f'({table}[Type]="Saving"))*{table}[Amount])'
+        )
+        return f"={_opening(opening)}{income}-{outflow}"
+
+    def last_value(self, table: str, key: str, value: str) -> str:
+        """Return a formula reading *value* on the last row of *table* with a *key*."""
+
+        return f"=IFERROR(LOOKUP(2,1/({table}[{key}]<>\"\"),{table}[{value}]),0)"
+
+
+@dataclass(frozen=True)
+class ConditionalFormulas(FormulaStrategy):
+    """``SUMIFS`` totals and ``INDEX``/``COUNTA`` lookups (Excel 2010+, LibreOffice)."""
+
+    def running_balance(self, table: str, opening: str | None = None) -> str:
+        # Blank rows match nothing in the array form either, so they show 0.
+        totals = _signed_sumifs(table, f'{table}[Date],"<="&[@Date]')
+        return f'={_opening(opening)}IF([@Date]="",0,{totals})'
+
+    def last_value(self, table: str, key: str, value: str) -> str:
+        count = f"COUNTA({table}[{key}])"
+        return f"=IF({count}=0,0,INDEX({table}[{value}],{count}))"
+
+
+@dataclass(frozen=True)
+class LookupFormulas(ConditionalFormulas):
+    """Conditional forms plus ``XLOOKUP`` searching from the end (Microsoft 365)."""
+
+    def last_value(self, table: str, key: str, value: str) -> str:
+        # Functions newer than Excel 2007 are stored with the _xlfn. prefix.
+        return f'=_xlfn.XLOOKUP(TRUE,{table}[{key}]<>"",{table}[{value}],0,0,-1)'
+
+
+COMPATIBLE_FORMULAS = FormulaStrategy()
+TARGET_STRATEGIES: dict[str, FormulaStrategy] = {
+    "2010": ConditionalFormulas("2010"),
+    "libreoffice": ConditionalFormulas("libreoffice"),
+    "365": LookupFormulas("365"),
+}
+TARGET_ALIASES: dict[str, str] = {"2013": "2010", "2016": "2010"}
+
+
+def formula_strategy(target: object = None) -> FormulaStrategy:
+    """Return the strategy for a ``target_excel`` value (``None`` for the array forms)."""
+
+    if target is None:
+        return COMPATIBLE_FORMULAS
+    key = str(target).lower()
+    try:
+        return TARGET_STRATEGIES[TARGET_ALIASES.get(key, key)]
+    except KeyError:
+        choices = ", ".join([*TARGET_STRATEGIES, *TARGET_ALIASES])
+        raise ValueError(f"Unknown target_excel {target!r}; choose from {choices}") from None
+
+
+def _opening(opening: str | None) -> str:
+    return f"{opening}+" if opening else ""
+
+
+def _signed_sumifs(table: str, criteria: str) -> str:
+    terms = [
+        f'{sign}SUMIFS({table}[Amount],{criteria},{table}[Type],"{kind}")'
+        for sign, kinds in (("+", INFLOW_TYPES), ("-", OUTFLOW_TYPES))
+        for kind in kinds
+    ]
+    return "".join(terms).lstrip("+")
@@ -4,23 +4,27 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Iterable
+from dataclasses import replace
 from pathlib import Path
 from typing import Any, Mapping
 
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
-from .charts import add_dashboard_doughnut_charts
-from .sheets.calculations import (
-    build_calculations_sheet,
-    register_calculations_named_ranges,
-)
-from .sheets.dashboard import build_dashboard_sheet, register_dashboard_named_ranges
-from .sheets.dropdown import build_dropdown_sheet, register_dropdown_named_ranges
-from .sheets.planning import build_planning_sheet, register_planning_named_ranges
-from .sheets.settings import build_settings_sheet, register_settings_named_ranges
-from .sheets.tracking import build_tracking_sheet
+from .charts import dashboard_chart_values
+from .formatting.styles import FULL_PROFILE, LEAN_PROFILE, PROFILES
+from .formulas.strategy import formula_strategy
+from .sheets.calculations import category_rows
+from .sheets.planning import with_starting_year
+from .sheets.registry import DEFAULT_REGISTRY, BuildPlan, SheetRegistry, SheetRegistryError
+from .sheets.tracking import resolve_tracking_config
 from .utils.named_ranges import NamedRangeManager
+from .xlsx import DEFAULT_SAVE_OPTIONS, PackageError, SaveError, SaveOptions, save_package
+
+
+TRACKING_SHEET = "Budget Tracking"
+PLANNING_SHEET = "Budget-Planning"
+DASHBOARD_SHEET = "Budget Dashboard"
 
 
 class GeneratorError(RuntimeError):
@@ -38,9 +42,30 @@ class SheetMissingError(GeneratorError):
 class BudgetGenerator:
     """Generate the Excel workbook defined by the specification."""
 
-    def __init__(self, spec: Mapping[str, Any]):
+    def __init__(
+        self,
+        spec: Mapping[str, Any],
+        *,
+        sheets: Iterable[str] | None = None,
+        registry: SheetRegistry = DEFAULT_REGISTRY,
+        profile: str = FULL_PROFILE,
+    ):
         self.spec = spec
         self.workbook: Workbook | None = None
+        self.subset = sheets is not None
+        if profile not in PROFILES:
+            raise GeneratorError(f"Unknown profile '{profile}'; choose from {', '.join(PROFILES)}")
+        self.profile = profile
+        workbook_spec = spec.get("workbook", {})
+        self.target_excel = workbook_spec.get("target_excel") if isinstance(workbook_spec, Mapping) else None
+        try:
+            formula_strategy(self.target_excel)
+        except ValueError as exc:
+            raise GeneratorError(str(exc)) from exc
+        try:
+            self.build_plan: BuildPlan = registry.plan(sheets)
+        except SheetRegistryError as exc:
+            raise GeneratorError(str(exc)) from exc
 
     # ------------------------------------------------------------------
     # Workbook structure helpers
@@ -55,7 +80,10 @@ class BudgetGenerator:
         return workbook
 
     def create_sheets(self, spec: Mapping[str, Any] | None = None) -> None:
-        """Instantiate worksheets using the workbook.sheets metadata."""
+        """Instantiate worksheets using the workbook.sheets metadata.
+
+        Subset generators only create the sheets in their build plan.
+        """
 
         workbook = self._require_workbook()
         active_spec = spec or self.spec
@@ -68,61 +96,64 @@ class BudgetGenerator:
             if not isinstance(name, str) or not name:
                 raise GeneratorError("Sheet metadata must include a non-empty 'name'.")
 
+            if self.subset and name not in self.build_plan.sheet_names:
+                continue
+
             worksheet = workbook.create_sheet(title=name)
             if visibility in {"hidden", "veryHidden"}:
                 worksheet.sheet_state = visibility
 
     def build_sheet_contents(self) -> None:
-        """Populate worksheets and register named ranges according to the PRD."""
+        """Populate worksheets and register named ranges according to the PRD.
+
+        Builders run in the dependency order resolved by the sheet registry;
+        each registers its named ranges straight after building its sheet.
+        """
 
         workbook = self._require_workbook()
         sheet_specs = self._sheet_specs()
         manager = NamedRangeManager(workbook)
 
-        settings_ws = self._get_sheet("Settings")
-        LOGGER.info("Building Settings sheet")
-        build_settings_sheet(settings_ws, sheet_specs.get("Settings", {}))
-        register_settings_named_ranges(manager)
-
-        dropdown_ws = self._get_sheet("Dropdown Data")
-        LOGGER.info("Building Dropdown Data sheet")
-        build_dropdown_sheet(dropdown_ws, sheet_specs.get("Dropdown Data", {}))
-        register_dropdown_named_ranges(manager)
-
-        planning_ws = self._get_sheet("Budget-Planning")
-        LOGGER.info("Building Budget-Planning sheet")
-        build_planning_sheet(planning_ws, sheet_specs.get("Budget-Planning", {}))
-        register_planning_named_ranges(manager)
-
-        tracking_ws = self._get_sheet("Budget Tracking")
-        LOGGER.info("Building Budget Tracking sheet")
-        build_tracking_sheet(tracking_ws, sheet_specs.get("Budget Tracking", {}))
-
-        calculations_ws = self._get_sheet("Calculations")
-        LOGGER.info("Building Calculations sheet")
-        build_calculations_sheet(calculations_ws, sheet_specs.get("Calculations", {}))
-        register_calculations_named_ranges(manager)
-
-        dashboard_ws = self._get_sheet("Budget Dashboard")
-        LOGGER.info("Building Dashboard sheet")
-        build_dashboard_sheet(dashboard_ws, sheet_specs.get("Budget Dashboard", {}))
-        register_dashboard_named_ranges(manager)
-        add_dashboard_doughnut_charts(dashboard_ws)
+        for builder in self.build_plan.builders:
+            worksheet = self._get_sheet(builder.sheet_name)
+            LOGGER.info("Building %s sheet", builder.sheet_name)
+            sheet_spec = sheet_specs.get(builder.sheet_name, {})
+            builder.build(worksheet, sheet_spec)
+            if builder.register is not None:
+                builder.register(manager, sheet_spec)
 
         # Ensure helper sheets remain hidden.
         for sheet_name in ("Dropdown Data", "Calculations"):
             if sheet_name in workbook.sheetnames:
                 workbook[sheet_name].sheet_state = "hidden"
 
-    def save_workbook(self, output_path: Path) -> Path:
-        """Persist the workbook to disk while surfacing I/O errors clearly."""
+    def save_workbook(
+        self,
+        output_path: Path,
+        *,
+        deterministic: bool = False,
+        options: SaveOptions = DEFAULT_SAVE_OPTIONS,
+    ) -> Path:
+        """Persist the workbook to disk while surfacing I/O errors clearly.
+
+        *options* selects the compression mode, level and deflate workers.
+        With ``deterministic`` the saved package has pinned timestamps (see
+        :func:`~budget_generator.xlsx.build_timestamp`), sorted zip members and
+        sorted defined names, so identical specs produce identical bytes.
+        """
 
         workbook = self._require_workbook()
+        if deterministic:
+            options = replace(options, deterministic=True)
+        if options.deterministic:
+            NamedRangeManager(workbook).sort_names()
 
         output_path = Path(output_path)
         try:
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            workbook.save(output_path)
+            save_package(workbook, output_path, options)
+        except (PackageError, SaveError) as exc:
+            raise GeneratorError(str(exc)) from exc
         except OSError as exc:  # pragma: no cover - relies on OS failures
             raise GeneratorError(f"Failed to write workbook to {output_path}: {exc}") from exc
 
@@ -144,6 +175,63 @@ class BudgetGenerator:
         for name, cfg in sheets_config.items():
             if isinstance(cfg, Mapping):
                 result[str(name)] = cfg
+
+        # The ledger is read once here; the tracking sheet (and the cached
+        # chart values) get its entries rather than reading the file again.
+        # Calculations picks the year table for DashYear, so it needs the layout
+        # the tracking sheet derives from its ledger.
+        # An unpartitioned ledger is totalled per year it holds entries for.
+        tracking = result.get(TRACKING_SHEET, {})
+        if TRACKING_SHEET in self.build_plan.sheet_names:
+            try:
+                config = resolve_tracking_config(tracking)
+                tracking = result[TRACKING_SHEET] = {**tracking, "ledger": config.ledger}
+                if "Calculations" in self.build_plan.sheet_names:
+                    layout = {"tracking_partitions": config.partitions} if config.partitions else {}
+                    layout["tracking_years"] = config.years
+                    result["Calculations"] = {**result.get("Calculations", {}), **layout}
+            except ValueError as exc:
+                raise GeneratorError(f"{TRACKING_SHEET}: {exc}") from exc
+
+        # Static Effective Dates shift late income by the Settings defaults.
+        if tracking.get("static_effective_dates"):
+            late_income = result.get("Settings", {}).get("late_income", {})
+            result[TRACKING_SHEET] = {**tracking, "late_income": late_income}
+
+        if PLANNING_SHEET in result:
+            result[PLANNING_SHEET] = with_starting_year(result[PLANNING_SHEET], result.get("Settings"))
+
+        # The per-category breakdown lists the planning categories on both the
+        # Calculations block and the dashboard table that looks into it.
+        if {PLANNING_SHEET, "Calculations"} <= set(self.build_plan.sheet_names):
+            try:
+                rows = category_rows(result.get(PLANNING_SHEET))
+            except ValueError as exc:
+                raise GeneratorError(f"{PLANNING_SHEET}: {exc}") from exc
+            for name in ("Calculations", DASHBOARD_SHEET):
+                result[name] = {**result.get(name, {}), "category_rows": rows}
+
+        # Cached chart values are computed from the raw sheet specs, which the
+        # dashboard builder alone never sees.
+        dashboard = result.get(DASHBOARD_SHEET, {})
+        charts = dashboard.get("charts", {})
+        if isinstance(charts, Mapping) and charts.get("cache_values"):
+            try:
+                chart_values = dashboard_chart_values(result)
+            except ValueError as exc:
+                raise GeneratorError(f"{DASHBOARD_SHEET}: {exc}") from exc
+            if chart_values is not None:
+                result[DASHBOARD_SHEET] = {**dashboard, "chart_values": chart_values}
+
+        # Builders pick their formula forms from their own spec.
+        if self.target_excel is not None:
+            for name in self.build_plan.sheet_names:
+                result[name] = {**result.get(name, {}), "target_excel": self.target_excel}
+
+        # Builders read the profile from their own spec and skip their styling.
+        if self.profile == LEAN_PROFILE:
+            for name in self.build_plan.sheet_names:
+                result[name] = {**result.get(name, {}), "profile": LEAN_PROFILE}
         return result
 
     def _get_sheet(self, name: str) -> Worksheet:
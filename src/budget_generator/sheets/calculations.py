@@ -2,22 +2,106 @@
 
 from __future__ import annotations
 
-from typing import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
 
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
-from openpyxl.utils.cell import column_index_from_string
 from openpyxl.worksheet.worksheet import Worksheet
 
+from ..formatting.styles import is_lean, style_range, write_block
+from ..formulas import build_year_formula
 from ..formulas.calculations import (
-    build_choose_month_formula,
-    build_monthly_tracking_sumproduct,
+    build_index_month_formula,
+    build_month_bound_formulas,
+    build_month_lookup_formula,
+    build_tracking_slice_sumifs,
+    build_tracking_sumifs,
+    build_year_choice_formula,
 )
+from ..formulas.strategy import formula_strategy
 from ..utils.named_ranges import NamedRangeManager, NamedRangeSpec
-from .planning import ACCOUNTING_FORMAT, MONTHS
+from .planning import ACCOUNTING_FORMAT, MONTHS, PlanningSheetBuilder, planning_layout
+from .tracking import TrackingTable
 
 METRIC_HEADER_FILL = "EAD1DC"
 METRIC_HEADER_VALUES = ("Metric", "Value", "Notes")
+YEAR_MAP_COLUMN = 13  # Column M
+CATEGORY_BLOCK_COLUMN = 16  # Column P: Type, Category, then Jan..Dec
+CATEGORY_BLOCK_HEADER_ROW = 2
+TRACKED_MATRIX_COLUMN = 31  # Column AE: Year, Month, one column per section, then row bounds
+TRACKED_MATRIX_HEADER_ROW = 2
+
+# Planning section -> the tracking Type its transactions carry.
+SECTION_TRACKING_TYPES: dict[str, str] = {
+    "Income": "Income",
+    "Expenses": "Expense",
+    "Savings": "Saving",
+}
+
+
+@dataclass(frozen=True)
+class CategoryRow:
+    """One named planning category in the per-category breakdown."""
+
+    section: str
+    range_prefix: str
+    index: int  # 1-based row within the section's grid
+    planning_row: int
+
+    @property
+    def tracking_type(self) -> str:
+        return SECTION_TRACKING_TYPES[self.section]
+
+    @property
+    def category_ref(self) -> str:
+        column = get_column_letter(PlanningSheetBuilder.CATEGORY_COLUMN)
+        return f"'Budget-Planning'!${column}${self.planning_row}"
+
+
+def category_rows(planning: Mapping[str, object] | None) -> tuple[CategoryRow, ...]:
+    """Return the named categories of every planning section in sheet order."""
+
+    rows: list[CategoryRow] = []
+    for section in planning_layout(planning).sections:
+        for index, (category, _) in enumerate(section.rows, start=1):
+            if category:
+                planning_row = section.start_row + index - 1
+                rows.append(CategoryRow(section.title, section.range_prefix, index, planning_row))
+    return tuple(rows)
+
+
+def tracking_partitions(spec: Mapping[str, Any] | None) -> tuple[TrackingTable, ...]:
+    """Return the per-year tracking tables the generator passed in *spec*."""
+
+    return tuple((spec or {}).get("tracking_partitions", ()))
+
+
+def tracking_years(spec: Mapping[str, Any] | None) -> tuple[int, ...]:
+    """Return the ledger years the generator passed in *spec*."""
+
+    return tuple((spec or {}).get("tracking_years", ()))
+
+
+def year_blocks(spec: Mapping[str, Any] | None) -> list[tuple[object, str]]:
+    """Return ``(year, table)`` for each year block of the tracked matrix.
+
+    Year tables give one block each.  An unpartitioned ledger gets a block per
+    year it holds entries for, all reading ``tblTracking``, or one for
+    ``StartingYear`` when it is empty.
+    """
+
+    partitions = tracking_partitions(spec)
+    if partitions:
+        return [(table.year, table.table_name) for table in partitions]
+    years: list[object] = list(tracking_years(spec)) or [build_year_formula(0)]
+    return [(year, "tblTracking") for year in years]
+
+
+def spec_category_rows(spec: Mapping[str, Any] | None) -> tuple[CategoryRow, ...]:
+    """Return the breakdown categories the generator passed in *spec*."""
+
+    return tuple((spec or {}).get("category_rows", ()))
 
 
 class CalculationsSheetBuilder:
@@ -26,11 +110,20 @@ class CalculationsSheetBuilder:
     def __init__(self, worksheet: Worksheet, spec: Mapping[str, object] | None = None):
         self.ws = worksheet
         self.spec = spec or {}
+        self.partitions = tracking_partitions(self.spec)
+        self.blocks = year_blocks(self.spec)
+        self.category_rows = spec_category_rows(self.spec)
+        self.styled = not is_lean(self.spec)
+        self.formulas = formula_strategy(self.spec.get("target_excel"))
 
     def build(self) -> None:
         self._build_metric_tiles()
         self._build_month_map()
+        self._build_year_map()
+        self._build_tracked_matrix()
         self._build_budget_vs_tracked_table()
+        if self.category_rows:
+            self._build_category_block()
 
     def _build_metric_tiles(self) -> None:
         header_fill = PatternFill(start_color=METRIC_HEADER_FILL, end_color=METRIC_HEADER_FILL, fill_type="solid")
@@ -39,25 +132,24 @@ class CalculationsSheetBuilder:
 
         for column, value in enumerate(METRIC_HEADER_VALUES, start=2):
             cell = self.ws.cell(row=2, column=column, value=value)
+            if not self.styled:
+                continue
             cell.font = header_font
             cell.alignment = header_alignment
             cell.fill = header_fill
 
+        tables = [table.table_name for table in self.partitions] or ["tblTracking"]
+        dates = ",".join(f"{table}[Date]" for table in tables)
+        last = tables[-1]
         metrics: Sequence[tuple[str, str, str]] = (
             ("Current Date", "=TODAY()", ""),
-            ("Last Record Date", "=MAX(tblTracking[Date])", ""),
-            ("Number of Records", "=COUNTA(tblTracking[Date])", ""),
-            (
-                "Tracking Balance",
-                "=IFERROR(LOOKUP(2,1/(tblTracking[Date]<>\"\"),tblTracking[Balance]),0)",
-                "",
-            ),
+            ("Last Record Date", f"=MAX({dates})", ""),
+            ("Number of Records", f"=COUNTA({dates})", ""),
+            ("Tracking Balance", self.formulas.last_value(last, "Date", "Balance"), ""),
         )
 
         for index, (label, formula, notes) in enumerate(metrics, start=3):
             label_cell = self.ws.cell(row=index, column=2, value=label)
-            if index == 6:
-                label_cell.font = Font(bold=True)
             value_cell = self.ws.cell(row=index, column=3, value=formula)
             notes_cell = self.ws.cell(row=index, column=4, value=notes)
 
@@ -66,7 +158,10 @@ class CalculationsSheetBuilder:
             elif index == 6:
                 value_cell.number_format = ACCOUNTING_FORMAT
 
-            notes_cell.alignment = Alignment(wrap_text=True)
+            if self.styled:
+                if index == 6:
+                    label_cell.font = Font(bold=True)
+                notes_cell.alignment = Alignment(wrap_text=True)
 
         self._apply_border("B2", "D6")
 
@@ -82,6 +177,97 @@ class CalculationsSheetBuilder:
         month_idx_cell = self.ws.cell(row=1, column=index_column)
         month_idx_cell.value = "=INDEX(INDEX(MonthMap,0,2),MATCH(DashPeriod,INDEX(MonthMap,0,1),0))"
 
+    def _build_year_map(self) -> None:
+        """Map each year block to its tracking table; TrackingYearIdx picks DashYear's."""
+
+        for offset, (year, table) in enumerate(self.blocks):
+            row = 2 + offset
+            self.ws.cell(row=row, column=YEAR_MAP_COLUMN, value=year)
+            self.ws.cell(row=row, column=YEAR_MAP_COLUMN + 1, value=table)
+
+        year_idx_cell = self.ws.cell(row=1, column=YEAR_MAP_COLUMN + 1)
+        year_idx_cell.value = "=MATCH(DashYear,INDEX(TrackingYearMap,0,1),0)"
+
+    def _build_tracked_matrix(self) -> None:
+        """Total the ledger per month and section with SUMIFS on the Month Key column.
+
+        One block of twelve month rows per year block (see :func:`year_blocks`).
+        The ledger is in date order, so each block also holds the first and
+        last row of each month, found by binary search on the Year Month
+        column, and each total only sums the rows of its month and the one
+        before (late income rolls forward one month).  Nothing here depends
+        on the dashboard selectors, so changing them only re-runs INDEX
+        lookups.
+        """
+
+        types = tuple(SECTION_TRACKING_TYPES.values())
+        headers = ("Year", "Month", *types, "First Row", "Last Row")
+        for column, title in enumerate(headers, start=TRACKED_MATRIX_COLUMN):
+            cell = self.ws.cell(row=TRACKED_MATRIX_HEADER_ROW, column=column, value=title)
+            if self.styled:
+                cell.font = Font(bold=True)
+
+        month_column = get_column_letter(TRACKED_MATRIX_COLUMN + 1)
+        year_column = get_column_letter(TRACKED_MATRIX_COLUMN)
+        keys: list[list[object]] = []
+        totals: list[list[object]] = []
+        bounds: list[list[object]] = []
+        row = TRACKED_MATRIX_HEADER_ROW + 1
+        for block, (year, table) in enumerate(self.blocks):
+            for month in range(1, len(MONTHS) + 1):
+                keys.append([year, month])
+                month_ref = f"${month_column}{row}"
+                # The StartingYear block of an empty ledger has no year to spell out.
+                key = year * 100 + month if isinstance(year, int) else f"${year_column}{row}*100+{month_ref}"
+                bounds.append(list(build_month_bound_formulas(key, table=table)))
+                totals.append([self._slice_total(kind, month_ref, block, month) for kind in types])
+                row += 1
+
+        first_row = TRACKED_MATRIX_HEADER_ROW + 1
+        write_block(self.ws, first_row, TRACKED_MATRIX_COLUMN, keys)
+        write_block(self.ws, first_row, TRACKED_MATRIX_COLUMN + 2, totals, number_format=ACCOUNTING_FORMAT)
+        write_block(self.ws, first_row, TRACKED_MATRIX_COLUMN + 2 + len(types), bounds)
+
+    def _slice_total(self, kind: str, month: str, block: int, month_number: int, **criteria: str) -> str:
+        """Return the slice SUMIFS for one month of year *block*, across its tables."""
+
+        terms = [
+            build_tracking_slice_sumifs(kind, month, slices, table=table, **criteria)
+            for table, slices in self._month_slices(block, month_number)
+        ]
+        return "=" + "+".join(term[1:] for term in terms)
+
+    def _month_slices(self, block: int, month: int) -> list[tuple[str, list[tuple[str, str]]]]:
+        """Return ``(table, row bounds)`` pairs holding month *month*'s entries for year *block*.
+
+        Entries of a month carry its Month Key when dated in it or, for late
+        income, in the month before.  For January that is December of the
+        previous year's block, if there is one: the end of the previous year
+        table, or the rows just above January in a single table.
+        """
+
+        first_column, last_column = (
+            get_column_letter(TRACKED_MATRIX_COLUMN + 2 + len(SECTION_TRACKING_TYPES) + offset)
+            for offset in (0, 1)
+        )
+
+        def row(block: int, month: int) -> int:
+            return TRACKED_MATRIX_HEADER_ROW + block * len(MONTHS) + month
+
+        def bounds(start: tuple[int, int], end: tuple[int, int]) -> list[tuple[str, str]]:
+            return [(f"${first_column}${row(*start)}", f"${last_column}${row(*end)}")]
+
+        year, table = self.blocks[block]
+        if month > 1:
+            return [(table, bounds((block, month - 1), (block, month)))]
+        previous_year, previous_table = self.blocks[block - 1] if block else (None, None)
+        if not isinstance(year, int) or previous_year != year - 1:
+            return [(table, bounds((block, 1), (block, 1)))]
+        december = (block - 1, len(MONTHS))
+        if previous_table == table:
+            return [(table, bounds(december, (block, 1)))]
+        return [(table, bounds((block, 1), (block, 1))), (str(previous_table), bounds(december, december))]
+
     def _build_budget_vs_tracked_table(self) -> None:
         header_fill = PatternFill(start_color="DEEAF6", end_color="DEEAF6", fill_type="solid")
         header_font = Font(bold=True)
@@ -90,26 +276,33 @@ class CalculationsSheetBuilder:
         headers = ("Section", "BudgetedMonth", "TrackedMonth", "Remaining")
         for column_offset, title in enumerate(headers, start=5):
             cell = self.ws.cell(row=2, column=column_offset, value=title)
+            if not self.styled:
+                continue
             cell.font = header_font
             cell.alignment = header_alignment
             cell.fill = header_fill
 
+        # Planning totals are read through their named ranges, so the rows
+        # follow the planning layout however far its sections grow.
         budget_rows = {
-            3: ("Income", 13, "Income"),
-            4: ("Expenses", 26, "Expense"),
-            5: ("Savings", 34, "Saving"),
+            3: ("Income", "IncomeTotals", "Income"),
+            4: ("Expenses", "ExpenseTotals", "Expense"),
+            5: ("Savings", "SavingsTotals", "Saving"),
         }
 
-        month_columns = [get_column_letter(index) for index in range(4, 16)]
-
-        for row, (label, planning_row, tracking_type) in budget_rows.items():
+        types = tuple(SECTION_TRACKING_TYPES.values())
+        for row, (label, totals_name, tracking_type) in budget_rows.items():
             self.ws.cell(row=row, column=5, value=label)
 
-            choose_cells = [f"{column_letter}{planning_row}" for column_letter in month_columns]
-            choose_formula = build_choose_month_formula(choose_cells)
-            tracked_formula = build_monthly_tracking_sumproduct(tracking_type)
+            budget_formula = build_index_month_formula(totals_name)
+            tracked_formula = build_month_lookup_formula(
+                "TrackedMonthly",
+                types.index(tracking_type) + 1,
+                year_name="TrackingYearIdx",
+                fallback=self._dash_year_total(tracking_type, "MonthIdx"),
+            )
 
-            budget_cell = self.ws.cell(row=row, column=6, value=choose_formula)
+            budget_cell = self.ws.cell(row=row, column=6, value=budget_formula)
             tracked_cell = self.ws.cell(row=row, column=7, value=tracked_formula)
             remaining_cell = self.ws.cell(row=row, column=8, value=f"=F{row}-G{row}")
 
@@ -119,30 +312,99 @@ class CalculationsSheetBuilder:
 
         self._apply_border("E2", "H5")
 
+    def _build_category_block(self) -> None:
+        """Total every category's tracked amounts for each month, one row per category.
+
+        The block does not depend on ``MonthIdx``, so the dashboard breakdown
+        picks a month with ``INDEX`` and changing the period recalculates no
+        ledger scans.  Like the tracked matrix it totals ``DashYear`` only.
+        """
+
+        headers = ("Type", "Category", *MONTHS)
+        for column, title in enumerate(headers, start=CATEGORY_BLOCK_COLUMN):
+            cell = self.ws.cell(row=CATEGORY_BLOCK_HEADER_ROW, column=column, value=title)
+            if self.styled:
+                cell.font = Font(bold=True)
+
+        category_column = get_column_letter(CATEGORY_BLOCK_COLUMN + 1)
+        labels: list[list[object]] = []
+        totals: list[list[object]] = []
+        for row, category in enumerate(self.category_rows, start=CATEGORY_BLOCK_HEADER_ROW + 1):
+            labels.append([category.tracking_type, f"={category.category_ref}"])
+            reference = f"${category_column}{row}"
+            cells: list[object] = []
+            for month in range(1, len(MONTHS) + 1):
+                if self.partitions:
+                    sums = [
+                        self._slice_total(
+                            category.tracking_type, str(month), block, month, category=reference
+                        )
+                        for block in range(len(self.blocks))
+                    ]
+                    cells.append(build_year_choice_formula(sums))
+                else:
+                    cells.append(
+                        build_tracking_sumifs(
+                            category.tracking_type, str(month), category=reference, year="DashYear"
+                        )
+                    )
+            totals.append(cells)
+
+        first_row = CATEGORY_BLOCK_HEADER_ROW + 1
+        write_block(self.ws, first_row, CATEGORY_BLOCK_COLUMN, labels)
+        write_block(self.ws, first_row, CATEGORY_BLOCK_COLUMN + 2, totals, number_format=ACCOUNTING_FORMAT)
+
+    def _dash_year_total(self, kind: str, month: str) -> str:
+        """Return what to show for a ``DashYear`` outside the year blocks.
+
+        Year tables hold every ledger row, so that is 0.  An unpartitioned
+        table may gain rows for other years after it is built (by ``append``),
+        and late income can reach into the next year, so those are totalled
+        directly.
+        """
+
+        if self.partitions:
+            return "0"
+        return build_tracking_sumifs(kind, month, year="DashYear")[1:]
+
     def _apply_border(self, start_cell: str, end_cell: str) -> None:
+        if not self.styled:
+            return
         border = Border(
             left=Side(style="thin"),
             right=Side(style="thin"),
             top=Side(style="thin"),
             bottom=Side(style="thin"),
         )
-        start_column = column_index_from_string(self.ws[start_cell].column_letter)
-        start_row = self.ws[start_cell].row
-        end_column = column_index_from_string(self.ws[end_cell].column_letter)
-        end_row = self.ws[end_cell].row
-
-        for row in range(start_row, end_row + 1):
-            for column in range(start_column, end_column + 1):
-                self.ws.cell(row=row, column=column).border = border
+        style_range(self.ws, f"{start_cell}:{end_cell}", border=border)
 
 
 def build_calculations_sheet(worksheet: Worksheet, spec: Mapping[str, object] | None = None) -> None:
     CalculationsSheetBuilder(worksheet, spec).build()
 
 
-def register_calculations_named_ranges(manager: NamedRangeManager) -> None:
-    specs = (
+def register_calculations_named_ranges(
+    manager: NamedRangeManager, spec: Mapping[str, Any] | None = None
+) -> None:
+    specs = [
         NamedRangeSpec("MonthMap", "Calculations", "$J$2:$K$13"),
         NamedRangeSpec("MonthIdx", "Calculations", "$K$1"),
-    )
+    ]
+    blocks = len(year_blocks(spec))
+    year, table = (get_column_letter(YEAR_MAP_COLUMN + offset) for offset in (0, 1))
+    specs += [
+        NamedRangeSpec("TrackingYearMap", "Calculations", f"${year}$2:${table}${1 + blocks}"),
+        NamedRangeSpec("TrackingYearIdx", "Calculations", f"${table}$1"),
+    ]
+    last_offset = 1 + len(SECTION_TRACKING_TYPES)
+    first, last = (get_column_letter(TRACKED_MATRIX_COLUMN + offset) for offset in (2, last_offset))
+    start = TRACKED_MATRIX_HEADER_ROW + 1
+    end = start + len(MONTHS) * blocks - 1
+    specs.append(NamedRangeSpec("TrackedMonthly", "Calculations", f"${first}${start}:${last}${end}"))
+    rows = spec_category_rows(spec)
+    if rows:
+        first, last = (get_column_letter(CATEGORY_BLOCK_COLUMN + offset) for offset in (2, 1 + len(MONTHS)))
+        start = CATEGORY_BLOCK_HEADER_ROW + 1
+        end = start + len(rows) - 1
+        specs.append(NamedRangeSpec("CategoryMonthly", "Calculations", f"${first}${start}:${last}${end}"))
     manager.register_many(specs)
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Mapping
+from typing import Any, Mapping
 
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.worksheet.worksheet import Worksheet
 
+from ..formatting.styles import is_lean, write_block
 from ..utils.named_ranges import NamedRangeManager, NamedRangeSpec
+from .calculations import CATEGORY_BLOCK_COLUMN, CATEGORY_BLOCK_HEADER_ROW, spec_category_rows
+from .planning import ACCOUNTING_FORMAT
 
 HEADER_FILL = "DAEEF3"
 SELECTOR_FILL = "E7F3F9"
@@ -22,6 +26,8 @@ HEADER_VALUES = (
     "% of Budget",
     "Remaining",
 )
+# The per-category breakdown sits below the doughnut charts (rows 6-21).
+BREAKDOWN_HEADER_ROW = 23
 
 
 def build_dashboard_sheet(worksheet: Worksheet, spec: Mapping[str, object] | None = None) -> None:
@@ -40,12 +46,15 @@ def build_dashboard_sheet(worksheet: Worksheet, spec: Mapping[str, object] | Non
         "=IFERROR(Calculations!G5/SUM(Calculations!F3:F5),0)",
     )
 
-    _build_header_row(worksheet)
-    _build_selectors(worksheet, default_year_formula, default_period)
-    _build_kpi_tiles(worksheet, tracking_balance_formula, savings_rate_formula)
+    styled = not is_lean(config)
+    _build_header_row(worksheet, styled=styled)
+    _build_selectors(worksheet, default_year_formula, default_period, styled=styled)
+    _build_kpi_tiles(worksheet, tracking_balance_formula, savings_rate_formula, styled=styled)
+    if spec_category_rows(config):
+        _build_category_breakdown(worksheet, config, styled=styled)
 
 
-def _build_header_row(worksheet: Worksheet) -> None:
+def _build_header_row(worksheet: Worksheet, *, styled: bool = True, row: int = 2) -> None:
     header_font = Font(bold=True)
     header_alignment = Alignment(horizontal="center")
     header_fill = PatternFill(
@@ -55,7 +64,9 @@ def _build_header_row(worksheet: Worksheet) -> None:
     )
 
     for column_index, value in enumerate(HEADER_VALUES, start=2):  # column B onwards
-        cell = worksheet.cell(row=2, column=column_index, value=value)
+        cell = worksheet.cell(row=row, column=column_index, value=value)
+        if not styled:
+            continue
         cell.font = header_font
         cell.alignment = header_alignment
         cell.fill = header_fill
@@ -65,6 +76,8 @@ def _build_selectors(
     worksheet: Worksheet,
     default_year_formula: str,
     default_period: str,
+    *,
+    styled: bool = True,
 ) -> None:
     label_font = Font(bold=True)
     selector_alignment = Alignment(horizontal="center")
@@ -75,20 +88,20 @@ def _build_selectors(
     )
 
     worksheet["B3"].value = "Year"
-    worksheet["B3"].font = label_font
-
     worksheet["B4"].value = "Period"
-    worksheet["B4"].font = label_font
 
     year_cell = worksheet["C3"]
     year_cell.value = default_year_formula
-    year_cell.alignment = selector_alignment
-    year_cell.fill = selector_fill
 
     period_cell = worksheet["C4"]
     period_cell.value = default_period
-    period_cell.alignment = selector_alignment
-    period_cell.fill = selector_fill
+
+    if styled:
+        worksheet["B3"].font = label_font
+        worksheet["B4"].font = label_font
+        for cell in (year_cell, period_cell):
+            cell.alignment = selector_alignment
+            cell.fill = selector_fill
 
     year_validation = DataValidation(type="list", formula1="=YearsList", allow_blank=False)
     period_validation = DataValidation(type="list", formula1="=MonthsList", allow_blank=False)
@@ -103,6 +116,8 @@ def _build_kpi_tiles(
     worksheet: Worksheet,
     tracking_balance_formula: str,
     savings_rate_formula: str,
+    *,
+    styled: bool = True,
 ) -> None:
     label_font = Font(bold=True)
     value_alignment = Alignment(horizontal="center")
@@ -126,27 +141,74 @@ def _build_kpi_tiles(
     )
     for cell_ref, label in labels:
         worksheet[cell_ref].value = label
-        worksheet[cell_ref].font = label_font
 
     worksheet["C6"].value = "=DashYear"
     worksheet["C7"].value = "=DashPeriod"
     worksheet["C8"].value = tracking_balance_formula
     worksheet["C9"].value = savings_rate_formula
 
+    worksheet["C8"].number_format = '_($* #,##0_);_($* (#,##0);_($* "-"??_);_(@_)'
+    worksheet["C9"].number_format = "0.0%"
+
+    if not styled:
+        return
+
+    for cell_ref, _ in labels:
+        worksheet[cell_ref].font = label_font
+
     for coord in ("C6", "C7", "C8", "C9"):
         cell = worksheet[coord]
         cell.alignment = value_alignment
         cell.fill = value_fill
 
-    worksheet["C8"].number_format = '_($* #,##0_);_($* (#,##0);_($* "-"??_);_(@_)'
-    worksheet["C9"].number_format = "0.0%"
-
     for row in range(6, 10):
         for col in range(2, 4):
             worksheet.cell(row=row, column=col).border = border
 
 
-def register_dashboard_named_ranges(manager: NamedRangeManager) -> None:
+def _build_category_breakdown(
+    worksheet: Worksheet,
+    spec: Mapping[str, object],
+    *,
+    styled: bool = True,
+) -> None:
+    """Fill the header columns with one row per planning category for the selected month.
+
+    Tracked amounts are ``INDEX`` lookups into the Calculations
+    ``CategoryMonthly`` block and budgeted amounts into the section grids, so
+    switching ``DashPeriod`` only re-runs these lookups.
+    """
+
+    _build_header_row(worksheet, styled=styled, row=BREAKDOWN_HEADER_ROW)
+
+    category_column = get_column_letter(CATEGORY_BLOCK_COLUMN + 1)
+    labels: list[list[object]] = []
+    amounts: list[list[object]] = []
+    shares: list[list[object]] = []
+    remaining: list[list[object]] = []
+    for index, category in enumerate(spec_category_rows(spec), start=1):
+        row = BREAKDOWN_HEADER_ROW + index
+        block_row = CATEGORY_BLOCK_HEADER_ROW + index
+        labels.append(["=DashYear", "=DashPeriod", f"=Calculations!${category_column}${block_row}"])
+        amounts.append(
+            [
+                f"=INDEX(CategoryMonthly,{index},MonthIdx)",
+                f"=INDEX({category.range_prefix}Grid,{category.index},MonthIdx)",
+            ]
+        )
+        shares.append([f"=IFERROR(E{row}/F{row},0)"])
+        remaining.append([f"=F{row}-E{row}"])
+
+    first_row = BREAKDOWN_HEADER_ROW + 1
+    write_block(worksheet, first_row, 2, labels)
+    write_block(worksheet, first_row, 5, amounts, number_format=ACCOUNTING_FORMAT)
+    write_block(worksheet, first_row, 7, shares, number_format="0.0%")
+    write_block(worksheet, first_row, 8, remaining, number_format=ACCOUNTING_FORMAT)
+
+
+def register_dashboard_named_ranges(
+    manager: NamedRangeManager, spec: Mapping[str, Any] | None = None
+) -> None:
     """Register dashboard-specific named ranges."""
 
     specs = (
@@ -7,7 +7,7 @@ from typing import Any, Iterable, Mapping
 from openpyxl.styles import Alignment, Font
 from openpyxl.worksheet.worksheet import Worksheet
 
-from ..formatting.styles import apply_fill
+from ..formatting.styles import apply_fill, is_lean
 from ..formulas import build_year_formula
 from ..utils.named_ranges import NamedRangeManager, NamedRangeSpec
 
@@ -32,17 +32,22 @@ MONTHS: tuple[str, ...] = (
 def build_dropdown_sheet(worksheet: Worksheet, spec: Mapping[str, Any] | None = None) -> None:
     """Populate the dropdown data worksheet with years and month names."""
 
-    spec = spec or {}
-    years_config = spec.get("years", {}) if isinstance(spec, Mapping) else {}
-    year_count = int(years_config.get("count", 5))
-    start_row = int(years_config.get("start_row", 3))
+    start_row, year_count = years_layout(spec)
 
-    _add_headers(worksheet)
+    _add_headers(worksheet, styled=not is_lean(spec))
     _populate_years(worksheet, start_row=start_row, count=year_count)
     _populate_months(worksheet, start_row=start_row)
 
 
-def _add_headers(worksheet: Worksheet) -> None:
+def years_layout(spec: Mapping[str, Any] | None = None) -> tuple[int, int]:
+    """Return ``(start_row, count)`` of the year list described by *spec*."""
+
+    spec = spec or {}
+    years_config = spec.get("years", {}) if isinstance(spec, Mapping) else {}
+    return int(years_config.get("start_row", 3)), int(years_config.get("count", 5))
+
+
+def _add_headers(worksheet: Worksheet, *, styled: bool = True) -> None:
     headers = {
         "B2": "Years",
         "C2": "Months",
@@ -50,6 +55,8 @@ def _add_headers(worksheet: Worksheet) -> None:
     for cell_ref, text in headers.items():
         cell = worksheet[cell_ref]
         cell.value = text
+        if not styled:
+            continue
         cell.font = Font(bold=True)
         cell.alignment = Alignment(horizontal="center")
         apply_fill(cell, HEADER_FILL)
@@ -70,11 +77,19 @@ def _month_list() -> Iterable[str]:
     return MONTHS
 
 
-def register_dropdown_named_ranges(manager: NamedRangeManager) -> None:
-    """Register named ranges used for dropdown list sources."""
+def register_dropdown_named_ranges(
+    manager: NamedRangeManager, spec: Mapping[str, Any] | None = None
+) -> None:
+    """Register named ranges used for dropdown list sources.
+
+    ``YearsList`` follows the ``years`` block of *spec* so it always covers
+    every year written by :func:`build_dropdown_sheet`.
+    """
 
+    start_row, year_count = years_layout(spec)
+    last_row = start_row + max(year_count, 1) - 1
     specs = (
-        NamedRangeSpec("YearsList", "Dropdown Data", "$B$3:$B$7"),
-        NamedRangeSpec("MonthsList", "Dropdown Data", "$C$3:$C$14"),
+        NamedRangeSpec("YearsList", "Dropdown Data", f"$B${start_row}:$B${last_row}"),
+        NamedRangeSpec("MonthsList", "Dropdown Data", f"$C${start_row}:$C${start_row + len(MONTHS) - 1}"),
     )
     manager.register_many(specs)
@@ -3,14 +3,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Mapping
 
+from openpyxl.cell import Cell
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
 
 from ..formatting.conditional import add_unallocated_conditional_formatting
+from ..formatting.styles import is_lean, style_range, write_block
+from ..formulas import build_year_formula
+from ..formulas.shared import share_formula
 from ..utils.named_ranges import NamedRangeManager, NamedRangeSpec
+from ..utils.planned_amounts import PlannedAmountsError, load_planned_amounts
 
 
 MONTHS: tuple[str, ...] = (
@@ -30,11 +37,25 @@ MONTHS: tuple[str, ...] = (
 
 
 ACCOUNTING_FORMAT = '_($* #,##0_);_($* (#,##0);_($* "-"??_);_(@_)'
+THIN_BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin"),
+)
+DEFAULT_STARTING_YEAR = 2025
+
+# Monthly amounts of one category keyed by year offset (0 is year 1).
+YearAmounts = Mapping[int, list[float]]
 
 
 @dataclass(frozen=True)
 class SectionDefinition:
-    """Metadata that describes a planning sheet section."""
+    """Metadata that describes a planning sheet section.
+
+    The rows are the section's default position; :func:`planning_layout` moves
+    a section down when an earlier one grows past its default capacity.
+    """
 
     title: str
     title_row: int
@@ -42,6 +63,71 @@ class SectionDefinition:
     total_row: int
     fill_color: str
     categories: Iterable[str]
+    range_prefix: str
+
+    @property
+    def capacity(self) -> int:
+        return self.total_row - self.start_row
+
+
+@dataclass(frozen=True)
+class SectionLayout:
+    """Where one section sits on the sheet and the rows it holds."""
+
+    definition: SectionDefinition
+    title_row: int
+    start_row: int
+    total_row: int
+    rows: tuple[tuple[str, YearAmounts], ...]
+
+    @property
+    def title(self) -> str:
+        return self.definition.title
+
+    @property
+    def fill_color(self) -> str:
+        return self.definition.fill_color
+
+    @property
+    def range_prefix(self) -> str:
+        return self.definition.range_prefix
+
+    @property
+    def end_row(self) -> int:
+        """Return the last category row."""
+
+        return self.total_row - 1
+
+
+@dataclass(frozen=True)
+class PlanningLayout:
+    """Every anchor on the planning sheet, computed once from the spec."""
+
+    sections: tuple[SectionLayout, ...]
+
+    @property
+    def years(self) -> tuple[int, ...]:
+        """Return the year offsets that get a grid: year 1 plus any with planned amounts."""
+
+        offsets = {0}
+        for section in self.sections:
+            for _, amounts in section.rows:
+                offsets.update(amounts)
+        return tuple(sorted(offsets))
+
+    @property
+    def first_row(self) -> int:
+        return self.sections[0].start_row
+
+    @property
+    def total_rows(self) -> tuple[int, ...]:
+        return tuple(section.total_row for section in self.sections)
+
+    def section(self, title: str) -> SectionLayout:
+        for section in self.sections:
+            if section.title == title:
+                return section
+        raise KeyError(title)
 
 
 class PlanningSheetBuilder:
@@ -50,7 +136,11 @@ class PlanningSheetBuilder:
     CATEGORY_COLUMN = 4  # Column D
     YEAR_START_COLUMN = 5  # Column E
     GAP_BETWEEN_BLOCKS = 1
+    YEAR_BLOCK_WIDTH = len(MONTHS) + 1 + GAP_BETWEEN_BLOCKS
+    BANNER_ROW = 5
+    MONTH_HEADER_ROW = 6
     UNALLOCATED_ROW = 7
+    NOTE_ROW = 8
 
     SECTION_DEFINITIONS: tuple[SectionDefinition, ...] = (
         SectionDefinition(
@@ -65,6 +155,7 @@ class PlanningSheetBuilder:
                 "Investments",
                 "Other",
             ),
+            range_prefix="Income",
         ),
         SectionDefinition(
             title="Expenses",
@@ -84,6 +175,7 @@ class PlanningSheetBuilder:
                 "Subscriptions",
                 "Miscellaneous",
             ),
+            range_prefix="Expense",
         ),
         SectionDefinition(
             title="Savings",
@@ -98,17 +190,17 @@ class PlanningSheetBuilder:
                 "Vacation",
                 "Other",
             ),
+            range_prefix="Savings",
         ),
     )
 
     def __init__(self, worksheet: Worksheet, spec: Mapping[str, object]):
         self.ws = worksheet
         self.spec = spec
-        self.month_columns = tuple(
-            range(self.YEAR_START_COLUMN, self.YEAR_START_COLUMN + len(MONTHS))
-        )
-        self.total_column = self.YEAR_START_COLUMN + len(MONTHS)
-        self.year_block_width = len(MONTHS) + 1 + self.GAP_BETWEEN_BLOCKS
+        self.layout = planning_layout(spec)
+        self.year_block_width = self.YEAR_BLOCK_WIDTH
+        self.styled = not is_lean(spec)
+        self.border = THIN_BORDER if self.styled else None
 
     # ------------------------------------------------------------------
     # Public API
@@ -117,11 +209,13 @@ class PlanningSheetBuilder:
         self._build_hero_header()
         self._build_year_blocks()
         self._label_unallocated_row()
-        for section in self.SECTION_DEFINITIONS:
+        for section in self.layout.sections:
             self._render_section(section)
-        self._populate_unallocated_formulas()
-        self._apply_conditional_formatting()
-        self.ws.freeze_panes = "E12"
+        for offset in self.layout.years:
+            self._populate_unallocated_formulas(offset)
+            if self.styled:
+                self._apply_conditional_formatting(offset)
+        self.ws.freeze_panes = self.ws.cell(row=self.layout.first_row, column=self.YEAR_START_COLUMN).coordinate
 
     # ------------------------------------------------------------------
     # Hero + year scaffolding
@@ -135,129 +229,179 @@ class PlanningSheetBuilder:
 
         hero_cell = self.ws["C1"]
         hero_cell.value = title
-        hero_cell.font = Font(bold=True, size=16)
 
         subtitle_cell = self.ws["C3"]
         subtitle_cell.value = subtitle
-        subtitle_cell.font = Font(italic=True, size=11)
-        subtitle_cell.alignment = Alignment(wrap_text=True)
+
+        if self.styled:
+            hero_cell.font = Font(bold=True, size=16)
+            subtitle_cell.font = Font(italic=True, size=11)
+            subtitle_cell.alignment = Alignment(wrap_text=True)
 
     def _build_year_blocks(self) -> None:
         scaffold_years = max(1, int(self.spec.get("scaffold_years", 2)))
+        if self.layout.years[-1] >= scaffold_years:
+            raise ValueError(
+                f"Planned amounts cover year {self.layout.years[-1] + 1} "
+                f"but only {scaffold_years} scaffold years are configured"
+            )
         for offset in range(scaffold_years):
             self._build_year_block(offset)
 
+    @classmethod
+    def year_start_column(cls, offset: int) -> int:
+        """Return the first column of the year block at *offset*."""
+
+        return cls.YEAR_START_COLUMN + offset * cls.YEAR_BLOCK_WIDTH
+
+    @staticmethod
+    def year_note(offset: int) -> str:
+        return "Year 1 overview" if offset == 0 else f"Year {offset + 1} scaffold – extend rows as needed"
+
     def _build_year_block(self, offset: int) -> None:
-        start_col = self.YEAR_START_COLUMN + offset * self.year_block_width
+        start_col = self.year_start_column(offset)
         month_columns = tuple(range(start_col, start_col + len(MONTHS)))
         total_column = start_col + len(MONTHS)
 
         # Year banner (row 5)
-        banner_cell = self.ws.cell(row=5, column=start_col)
-        banner_cell.value = f"=StartingYear+{offset}"
+        banner_cell = self.ws.cell(row=self.BANNER_ROW, column=start_col)
+        banner_cell.value = build_year_formula(offset)
+
+        header_cells = []
+        for column, month in zip(month_columns, MONTHS):
+            letter = get_column_letter(column)
+            header_cell = self.ws.cell(row=self.MONTH_HEADER_ROW, column=column)
+            header_cell.value = f'=IF({letter}{self.UNALLOCATED_ROW}=0,"{month} ✓","{month}")'
+            header_cells.append(header_cell)
+
+        total_letter = get_column_letter(total_column)
+        total_header = self.ws.cell(row=self.MONTH_HEADER_ROW, column=total_column)
+        total_header.value = f'=IF({total_letter}{self.UNALLOCATED_ROW}=0,"Total ✓","Total")'
+        header_cells.append(total_header)
+
+        note_cell = self.ws.cell(row=self.NOTE_ROW, column=start_col)
+        note_cell.value = self.year_note(offset)
+
+        if not self.styled:
+            return
+
         banner_cell.font = Font(bold=True, size=13)
         banner_cell.alignment = Alignment(horizontal="center")
         banner_fill = PatternFill(start_color="CFE2F3", end_color="CFE2F3", fill_type="solid")
         banner_cell.fill = banner_fill
         if total_column > start_col:
-            self.ws.merge_cells(start_row=5, start_column=start_col, end_row=5, end_column=total_column)
+            self.ws.merge_cells(
+                start_row=self.BANNER_ROW,
+                start_column=start_col,
+                end_row=self.BANNER_ROW,
+                end_column=total_column,
+            )
 
         header_fill = PatternFill(start_color="DAE3F3", end_color="DAE3F3", fill_type="solid")
         header_font = Font(bold=True)
         header_alignment = Alignment(horizontal="center")
-
-        for column, month in zip(month_columns, MONTHS):
-            letter = get_column_letter(column)
-            header_cell = self.ws.cell(row=6, column=column)
-            header_cell.value = f'=IF({letter}{self.UNALLOCATED_ROW}=0,"{month} ✓","{month}")'
+        for header_cell in header_cells:
             header_cell.font = header_font
             header_cell.alignment = header_alignment
             header_cell.fill = header_fill
 
-        total_letter = get_column_letter(total_column)
-        total_header = self.ws.cell(row=6, column=total_column)
-        total_header.value = f'=IF({total_letter}{self.UNALLOCATED_ROW}=0,"Total ✓","Total")'
-        total_header.font = header_font
-        total_header.alignment = header_alignment
-        total_header.fill = header_fill
-
-        note_row = 8
-        note_cell = self.ws.cell(row=note_row, column=start_col)
-        note_cell.value = (
-            "Year 1 overview" if offset == 0 else f"Year {offset + 1} scaffold – extend rows as needed"
-        )
         note_cell.font = Font(size=10, italic=True)
         note_cell.alignment = Alignment(wrap_text=True)
 
     # ------------------------------------------------------------------
     # Sections
     # ------------------------------------------------------------------
-    def _render_section(self, section: SectionDefinition) -> None:
+    def _render_section(self, section: SectionLayout) -> None:
         title_cell = self.ws.cell(row=section.title_row, column=self.CATEGORY_COLUMN)
         title_cell.value = section.title
+        total_label = self.ws.cell(row=section.total_row, column=self.CATEGORY_COLUMN)
+        total_label.value = f"Total {section.title}"
+        if self.styled:
+            self._style_section_labels(section, title_cell, total_label)
+
+        write_block(
+            self.ws,
+            section.start_row,
+            self.CATEGORY_COLUMN,
+            ([category] for category, _ in section.rows),
+            border=self.border,
+        )
+        for offset in self.layout.years:
+            self._initialise_category_rows(section, offset)
+            self._write_section_totals(section, offset)
+
+    @staticmethod
+    def _style_section_labels(section: SectionLayout, title_cell: Cell, total_label: Cell) -> None:
         title_cell.font = Font(bold=True, color="FFFFFF")
         title_cell.fill = PatternFill(
             start_color=section.fill_color, end_color=section.fill_color, fill_type="solid"
         )
         title_cell.alignment = Alignment(horizontal="left")
+        title_cell.border = THIN_BORDER
 
-        self._initialise_category_rows(section)
-        self._write_section_totals(section)
-        self._apply_section_borders(section)
-
-    def _initialise_category_rows(self, section: SectionDefinition) -> None:
-        row_count = section.total_row - section.start_row
-        categories = list(section.categories)
-        if len(categories) < row_count:
-            categories.extend([""] * (row_count - len(categories)))
-
-        for offset, category in enumerate(categories):
-            row = section.start_row + offset
-            category_cell = self.ws.cell(row=row, column=self.CATEGORY_COLUMN)
-            category_cell.value = category
-
-            for column in self.month_columns:
-                cell = self.ws.cell(row=row, column=column)
-                cell.value = 0
-                cell.number_format = ACCOUNTING_FORMAT
-
-            total_cell = self.ws.cell(row=row, column=self.total_column)
-            total_cell.value = self._row_total_formula(row)
-            total_cell.number_format = ACCOUNTING_FORMAT
-
-    def _write_section_totals(self, section: SectionDefinition) -> None:
-        total_label = self.ws.cell(row=section.total_row, column=self.CATEGORY_COLUMN)
-        total_label.value = f"Total {section.title}"
         total_label.font = Font(bold=True)
         total_label.fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+        total_label.border = THIN_BORDER
+
+    def _initialise_category_rows(self, section: SectionLayout, offset: int) -> None:
+        """Write the amounts of *section* for one year as a block, then its row totals.
+
+        The row totals are one shared formula down the total column.
+        """
+
+        start_col = self.year_start_column(offset)
+        first = get_column_letter(start_col)
+        last = get_column_letter(start_col + len(MONTHS) - 1)
+        total = get_column_letter(start_col + len(MONTHS))
+        empty = [0] * len(MONTHS)
+        write_block(
+            self.ws,
+            section.start_row,
+            start_col,
+            (amounts.get(offset, empty) for _, amounts in section.rows),
+            number_format=ACCOUNTING_FORMAT,
+            border=self.border,
+        )
+        totals = share_formula(
+            self.ws,
+            f"=SUM({first}{section.start_row}:{last}{section.start_row})",
+            f"{total}{section.start_row}:{total}{section.end_row}",
+        )
+        write_block(
+            self.ws,
+            section.start_row,
+            start_col + len(MONTHS),
+            ([value] for value in totals),
+            number_format=ACCOUNTING_FORMAT,
+            border=self.border,
+        )
 
-        for column in self.month_columns:
-            column_letter = get_column_letter(column)
-            cell = self.ws.cell(row=section.total_row, column=column)
-            start_row = section.start_row
-            end_row = section.total_row - 1
-            cell.value = f"=SUM({column_letter}{start_row}:{column_letter}{end_row})"
-            cell.number_format = ACCOUNTING_FORMAT
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-
-        total_letter = get_column_letter(self.total_column)
-        total_cell = self.ws.cell(row=section.total_row, column=self.total_column)
-        total_cell.value = f"=SUM({total_letter}{section.start_row}:{total_letter}{section.total_row - 1})"
-        total_cell.number_format = ACCOUNTING_FORMAT
-        total_cell.font = Font(bold=True)
-        total_cell.fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-
-    def _apply_section_borders(self, section: SectionDefinition) -> None:
-        border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
+    def _write_section_totals(self, section: SectionLayout, offset: int) -> None:
+        start_col = self.year_start_column(offset)
+        columns = range(start_col, start_col + len(MONTHS) + 1)
+        if self.styled:
+            style_range(
+                self.ws,
+                f"{get_column_letter(start_col)}{section.title_row}:{get_column_letter(columns[-1])}{section.title_row}",
+                border=THIN_BORDER,
+            )
+        first, last = get_column_letter(columns[0]), get_column_letter(columns[-1])
+        write_block(
+            self.ws,
+            section.total_row,
+            start_col,
+            [
+                share_formula(
+                    self.ws,
+                    f"=SUM({first}{section.start_row}:{first}{section.end_row})",
+                    f"{first}{section.total_row}:{last}{section.total_row}",
+                )
+            ],
+            number_format=ACCOUNTING_FORMAT,
+            font=Font(bold=True) if self.styled else None,
+            fill=PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid") if self.styled else None,
+            border=self.border,
         )
-        for row in range(section.title_row, section.total_row + 1):
-            for column in range(self.CATEGORY_COLUMN, self.total_column + 1):
-                self.ws.cell(row=row, column=column).border = border
 
     # ------------------------------------------------------------------
     # Unallocated row
@@ -265,37 +409,157 @@ class PlanningSheetBuilder:
     def _label_unallocated_row(self) -> None:
         label_cell = self.ws.cell(row=self.UNALLOCATED_ROW, column=self.CATEGORY_COLUMN)
         label_cell.value = "Unallocated (per month)"
-        label_cell.font = Font(bold=True)
-
-    def _populate_unallocated_formulas(self) -> None:
-        income_total_row = self.SECTION_DEFINITIONS[0].total_row
-        expense_total_row = self.SECTION_DEFINITIONS[1].total_row
-        savings_total_row = self.SECTION_DEFINITIONS[2].total_row
-
-        for column in self.month_columns + (self.total_column,):
-            letter = get_column_letter(column)
-            income_ref = f"{letter}{income_total_row}"
-            expense_ref = f"{letter}{expense_total_row}"
-            savings_ref = f"{letter}{savings_total_row}"
-            cell = self.ws.cell(row=self.UNALLOCATED_ROW, column=column)
-            cell.value = f"={income_ref}-{expense_ref}-{savings_ref}"
-            cell.number_format = ACCOUNTING_FORMAT
-            cell.font = Font(bold=True)
+        if self.styled:
+            label_cell.font = Font(bold=True)
+
+    def _populate_unallocated_formulas(self, offset: int) -> None:
+        start_col = self.year_start_column(offset)
+        first = get_column_letter(start_col)
+        last = get_column_letter(start_col + len(MONTHS))
+        write_block(
+            self.ws,
+            self.UNALLOCATED_ROW,
+            start_col,
+            [
+                share_formula(
+                    self.ws,
+                    "=" + "-".join(f"{first}{row}" for row in self.layout.total_rows),
+                    f"{first}{self.UNALLOCATED_ROW}:{last}{self.UNALLOCATED_ROW}",
+                )
+            ],
+            number_format=ACCOUNTING_FORMAT,
+            font=Font(bold=True) if self.styled else None,
+        )
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
-    def _row_total_formula(self, row: int) -> str:
-        start_letter = get_column_letter(self.month_columns[0])
-        end_letter = get_column_letter(self.month_columns[-1])
-        return f"=SUM({start_letter}{row}:{end_letter}{row})"
-
-    def _apply_conditional_formatting(self) -> None:
-        start_letter = get_column_letter(self.month_columns[0])
-        end_letter = get_column_letter(self.total_column)
+    def _apply_conditional_formatting(self, offset: int) -> None:
+        start_col = self.year_start_column(offset)
+        start_letter = get_column_letter(start_col)
+        end_letter = get_column_letter(start_col + len(MONTHS))
         add_unallocated_conditional_formatting(
-            self.ws, start_letter, end_letter, self.UNALLOCATED_ROW
+            self.ws, start_letter, end_letter, self.UNALLOCATED_ROW, self.layout.total_rows
+        )
+
+
+def planning_layout(spec: Mapping[str, object] | None = None) -> PlanningLayout:
+    """Lay out the planning sections in one pass over their rows.
+
+    A section with more categories than its default capacity grows, and every
+    later section moves down by the same number of rows; otherwise sections
+    keep their default rows.
+    """
+
+    spec = spec or {}
+    planned = planned_amounts(spec)
+    sections: list[SectionLayout] = []
+    shift = 0
+    for definition in PlanningSheetBuilder.SECTION_DEFINITIONS:
+        rows = tuple(section_rows(definition, spec, planned.get(definition.title, {})))
+        start_row = definition.start_row + shift
+        total_row = start_row + len(rows)
+        sections.append(
+            SectionLayout(definition, definition.title_row + shift, start_row, total_row, rows)
         )
+        shift = total_row - definition.total_row
+    return PlanningLayout(tuple(sections))
+
+
+def section_rows(
+    section: SectionDefinition,
+    spec: Mapping[str, object] | None = None,
+    planned: Mapping[str, YearAmounts] | None = None,
+) -> list[tuple[str, YearAmounts]]:
+    """Return ``(category, amounts by year offset)`` for every grid row of *section*.
+
+    Categories come from the spec's ``categories`` for the section (or the
+    section definition's defaults) followed by any extra categories named in
+    the planned amounts; short lists are padded with blank rows up to the
+    section's default capacity.  *planned* defaults to the section's entry in
+    :func:`planned_amounts`.
+    """
+
+    spec = spec or {}
+    if planned is None:
+        planned = planned_amounts(spec).get(section.title, {})
+    categories = section_categories(section, spec)
+    categories.extend(name for name in planned if name not in categories)
+    categories.extend([""] * (section.capacity - len(categories)))
+    return [(category, planned.get(category, {})) for category in categories]
+
+
+def section_categories(section: SectionDefinition, spec: Mapping[str, object]) -> list[str]:
+    """Return the configured categories of *section*, or its defaults."""
+
+    configured = spec.get("categories", {})
+    names = configured.get(section.title) if isinstance(configured, Mapping) else None
+    return [str(name) for name in names] if names is not None else list(section.categories)
+
+
+def planned_amounts(spec: Mapping[str, object]) -> dict[str, dict[str, dict[int, list[float]]]]:
+    """Return ``{section: {category: {year offset: 12 amounts}}}`` for the planning grids.
+
+    Amounts come from ``planned_amounts_file`` (CSV or ``.npz``, see
+    :mod:`budget_generator.utils.planned_amounts`) overlaid with the inline
+    ``planned_amounts``, where each category holds one list of monthly amounts
+    for year 1 or a list of such lists, one per year.
+    """
+
+    sections = PlanningSheetBuilder.SECTION_DEFINITIONS
+    planned: dict[str, dict[str, dict[int, list[float]]]] = {}
+    path = spec.get("planned_amounts_file")
+    if path:
+        categories = tuple((section.title, tuple(section_categories(section, spec))) for section in sections)
+        starting_year = int(spec.get("starting_year", DEFAULT_STARTING_YEAR))
+        path = Path(str(path))
+        try:
+            loaded = _load_planned_amounts_file(path, path.stat().st_mtime_ns, starting_year, categories)
+        except OSError as exc:
+            raise ValueError(f"Unable to read planned amounts {path}: {exc}") from exc
+        except PlannedAmountsError as exc:
+            raise ValueError(str(exc)) from exc
+        for title, section_amounts in loaded.items():
+            planned[title] = {category: dict(years) for category, years in section_amounts.items()}
+
+    inline = spec.get("planned_amounts", {})
+    if not isinstance(inline, Mapping):
+        return planned
+    for section in sections:
+        section_amounts = planned.setdefault(section.title, {})
+        for category, values in inline.get(section.title, {}).items():
+            years = values if values and all(isinstance(value, (list, tuple)) for value in values) else [values]
+            for offset, months in enumerate(years):
+                if len(months) > len(MONTHS):
+                    raise ValueError(f"{section.title} / {category} has more than {len(MONTHS)} monthly amounts")
+                amounts = [0 if value is None else value for value in months]
+                amounts.extend([0] * (len(MONTHS) - len(amounts)))
+                section_amounts.setdefault(str(category), {})[offset] = amounts
+    return planned
+
+
+def with_starting_year(
+    planning: Mapping[str, object], settings: Mapping[str, object] | None
+) -> Mapping[str, object]:
+    """Return *planning* with the Settings starting year filled in.
+
+    Planned amounts files name calendar years, which the grid counts from the
+    starting year; an explicit ``starting_year`` in *planning* wins.
+    """
+
+    general = settings.get("general", {}) if isinstance(settings, Mapping) else {}
+    if "starting_year" in planning or not isinstance(general, Mapping) or "starting_year" not in general:
+        return planning
+    return {**planning, "starting_year": general["starting_year"]}
+
+
+@lru_cache(maxsize=4)
+def _load_planned_amounts_file(
+    path: Path, mtime_ns: int, starting_year: int, categories: tuple[tuple[str, tuple[str, ...]], ...]
+) -> Mapping[str, Mapping[str, Mapping[int, list[float]]]]:
+    # The builder, the named-range pass and exports all lay the sheet out, so
+    # read each file once.  Callers copy before merging inline amounts.
+    return load_planned_amounts(path, starting_year=starting_year, categories=dict(categories), months=MONTHS)
 
 
 def build_planning_sheet(worksheet: Worksheet, spec: Mapping[str, object] | None = None) -> None:
@@ -303,23 +567,26 @@ def build_planning_sheet(worksheet: Worksheet, spec: Mapping[str, object] | None
     builder.build()
 
 
-def register_planning_named_ranges(manager: NamedRangeManager) -> None:
+def register_planning_named_ranges(
+    manager: NamedRangeManager, spec: Mapping[str, Any] | None = None
+) -> None:
     """Register named ranges for the Budget-Planning sheet."""
 
-    specs = [
-        NamedRangeSpec("IncomeCats", "Budget-Planning", "$D$12:$D$23"),
-        NamedRangeSpec("ExpenseCats", "Budget-Planning", "$D$33:$D$44"),
-        NamedRangeSpec("SavingsCats", "Budget-Planning", "$D$55:$D$66"),
-        NamedRangeSpec("IncomeGrid", "Budget-Planning", "$E$12:$Q$23"),
-        NamedRangeSpec("ExpenseGrid", "Budget-Planning", "$E$33:$Q$44"),
-        NamedRangeSpec("SavingsGrid", "Budget-Planning", "$E$55:$Q$66"),
-        NamedRangeSpec("IncomeHeader", "Budget-Planning", "$D$10"),
-        NamedRangeSpec("ExpenseHeader", "Budget-Planning", "$D$31"),
-        NamedRangeSpec("SavingsHeader", "Budget-Planning", "$D$53"),
-        NamedRangeSpec("IncomeTotals", "Budget-Planning", "$E$24:$Q$24"),
-        NamedRangeSpec("ExpenseTotals", "Budget-Planning", "$E$45:$Q$45"),
-        NamedRangeSpec("SavingsTotals", "Budget-Planning", "$E$67:$Q$67"),
-        NamedRangeSpec("UnallocatedRow", "Budget-Planning", "$E$7:$Q$7"),
-    ]
+    category = get_column_letter(PlanningSheetBuilder.CATEGORY_COLUMN)
+    first = get_column_letter(PlanningSheetBuilder.YEAR_START_COLUMN)
+    last = get_column_letter(PlanningSheetBuilder.YEAR_START_COLUMN + len(MONTHS))
+    sheet = "Budget-Planning"
+
+    specs: list[NamedRangeSpec] = []
+    for section in planning_layout(spec).sections:
+        prefix = section.range_prefix
+        specs += [
+            NamedRangeSpec(f"{prefix}Cats", sheet, f"${category}${section.start_row}:${category}${section.end_row}"),
+            NamedRangeSpec(f"{prefix}Grid", sheet, f"${first}${section.start_row}:${last}${section.end_row}"),
+            NamedRangeSpec(f"{prefix}Header", sheet, f"${category}${section.title_row}"),
+            NamedRangeSpec(f"{prefix}Totals", sheet, f"${first}${section.total_row}:${last}${section.total_row}"),
+        ]
+    unallocated = PlanningSheetBuilder.UNALLOCATED_ROW
+    specs.append(NamedRangeSpec("UnallocatedRow", sheet, f"${first}${unallocated}:${last}${unallocated}"))
 
     manager.register_many(specs)
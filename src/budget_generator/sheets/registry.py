@@ -0,0 +1,293 @@
+"""Registry of sheet builders and the named ranges they exchange."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from openpyxl.worksheet.worksheet import Worksheet
+
+from ..charts import add_dashboard_doughnut_charts
+from ..formatting.styles import is_lean
+from ..utils.named_ranges import NamedRangeManager
+from .calculations import build_calculations_sheet, register_calculations_named_ranges
+from .dashboard import build_dashboard_sheet, register_dashboard_named_ranges
+from .dropdown import build_dropdown_sheet, register_dropdown_named_ranges
+from .planning import build_planning_sheet, register_planning_named_ranges
+from .settings import build_settings_sheet, register_settings_named_ranges
+from .tracking import build_tracking_sheet
+
+
+BuildFunction = Callable[[Worksheet, Mapping[str, Any]], None]
+RegisterFunction = Callable[[NamedRangeManager, Mapping[str, Any]], None]
+
+
+class SheetRegistryError(RuntimeError):
+    """Base exception for sheet registry failures."""
+
+
+class UnknownSheetError(SheetRegistryError):
+    """Raised when a requested sheet has no registered builder."""
+
+
+class DependencyError(SheetRegistryError):
+    """Raised when builder dependencies cannot be satisfied or ordered."""
+
+
+@dataclass(frozen=True)
+class SheetBuilder:
+    """Describe how one worksheet is built and which names it exchanges.
+
+    ``provides`` lists the named ranges (and tables) the sheet defines while
+    ``consumes`` lists those its formulas and validations reference.
+    ``references`` lists names it reads from a sheet that may be built after
+    it: they pull their provider into subset builds without ordering it
+    first, which is how Calculations and the dashboard read each other.
+    """
+
+    key: str
+    sheet_name: str
+    build: BuildFunction
+    register: RegisterFunction | None = None
+    provides: frozenset[str] = field(default_factory=frozenset)
+    consumes: frozenset[str] = field(default_factory=frozenset)
+    references: frozenset[str] = field(default_factory=frozenset)
+
+
+@dataclass(frozen=True)
+class BuildPlan:
+    """Topologically ordered builders grouped into dependency waves.
+
+    Builders inside one wave do not depend on each other.  They still run one
+    after the other because openpyxl's shared style tables are not safe to
+    mutate from several threads.
+    """
+
+    waves: tuple[tuple[SheetBuilder, ...], ...]
+
+    @property
+    def builders(self) -> tuple[SheetBuilder, ...]:
+        return tuple(builder for wave in self.waves for builder in wave)
+
+    @property
+    def sheet_names(self) -> tuple[str, ...]:
+        return tuple(builder.sheet_name for builder in self.builders)
+
+
+class SheetRegistry:
+    """Keep sheet builders and resolve dependency-closed build plans."""
+
+    def __init__(self, builders: Iterable[SheetBuilder] = ()):
+        self._builders: dict[str, SheetBuilder] = {}
+        for builder in builders:
+            self.register(builder)
+
+    def register(self, builder: SheetBuilder) -> None:
+        if builder.key in self._builders:
+            raise SheetRegistryError(f"Sheet builder '{builder.key}' already registered")
+        self._builders[builder.key] = builder
+
+    def __iter__(self):
+        return iter(self._builders.values())
+
+    def get(self, name: str) -> SheetBuilder:
+        """Return the builder matching a registry key or sheet name.
+
+        Lookups ignore case and also accept the last word of the sheet name, so
+        ``Tracking`` resolves to the ``Budget Tracking`` builder.
+        """
+
+        wanted = name.strip().lower()
+        for builder in self._builders.values():
+            aliases = {
+                builder.key.lower(),
+                builder.sheet_name.lower(),
+                builder.sheet_name.replace("-", " ").split()[-1].lower(),
+            }
+            if wanted in aliases:
+                return builder
+        raise UnknownSheetError(f"No sheet builder registered for '{name}'")
+
+    def plan(self, names: Iterable[str] | None = None) -> BuildPlan:
+        """Return the build plan for *names* plus everything they consume.
+
+        ``None`` plans every registered builder.
+        """
+
+        if names is None:
+            selected = list(self._builders.values())
+        else:
+            selected = self._dependency_closure(self.get(name) for name in names)
+        return BuildPlan(waves=self._order(selected))
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _providers(self) -> dict[str, SheetBuilder]:
+        providers: dict[str, SheetBuilder] = {}
+        for builder in self._builders.values():
+            for name in builder.provides:
+                if name in providers:
+                    raise DependencyError(
+                        f"'{name}' is provided by both '{providers[name].key}' and '{builder.key}'"
+                    )
+                providers[name] = builder
+        return providers
+
+    def _dependencies(self, builder: SheetBuilder, *, ordered: bool = True) -> set[str]:
+        """Return the keys of the builders providing what *builder* needs.
+
+        Only ``consumes`` orders the build; the closure also follows
+        ``references`` (``ordered=False``).
+        """
+
+        providers = self._providers()
+        names = builder.consumes if ordered else builder.consumes | builder.references
+        keys: set[str] = set()
+        for name in names - builder.provides:
+            provider = providers.get(name)
+            if provider is None:
+                raise DependencyError(f"No sheet builder provides '{name}' (needed by '{builder.key}')")
+            keys.add(provider.key)
+        return keys
+
+    def _dependency_closure(self, requested: Iterable[SheetBuilder]) -> list[SheetBuilder]:
+        pending = list(requested)
+        seen: set[str] = set()
+        while pending:
+            builder = pending.pop()
+            if builder.key in seen:
+                continue
+            seen.add(builder.key)
+            pending.extend(self._builders[key] for key in self._dependencies(builder, ordered=False))
+        # Preserve registration order so plans stay stable between runs.
+        return [builder for key, builder in self._builders.items() if key in seen]
+
+    def _order(self, selected: list[SheetBuilder]) -> tuple[tuple[SheetBuilder, ...], ...]:
+        remaining = {builder.key: self._dependencies(builder) for builder in selected}
+        waves: list[tuple[SheetBuilder, ...]] = []
+        done: set[str] = set()
+        while remaining:
+            ready = [builder for builder in selected if builder.key in remaining and remaining[builder.key] <= done]
+            if not ready:
+                cycle = ", ".join(sorted(remaining))
+                raise DependencyError(f"Dependency cycle between sheet builders: {cycle}")
+            waves.append(tuple(ready))
+            for builder in ready:
+                done.add(builder.key)
+                del remaining[builder.key]
+        return tuple(waves)
+
+
+def _build_dashboard_with_charts(worksheet: Worksheet, spec: Mapping[str, Any]) -> None:
+    build_dashboard_sheet(worksheet, spec)
+    # Charts read from Calculations, which every plan with the dashboard holds.
+    if not is_lean(spec):
+        add_dashboard_doughnut_charts(worksheet, spec.get("chart_values"))
+
+
+DEFAULT_REGISTRY = SheetRegistry(
+    (
+        SheetBuilder(
+            key="settings",
+            sheet_name="Settings",
+            build=build_settings_sheet,
+            register=register_settings_named_ranges,
+            provides=frozenset({"StartingYear", "LateIncomeEnabled", "LateIncomeDay"}),
+        ),
+        SheetBuilder(
+            key="dropdown",
+            sheet_name="Dropdown Data",
+            build=build_dropdown_sheet,
+            register=register_dropdown_named_ranges,
+            provides=frozenset({"YearsList", "MonthsList"}),
+            consumes=frozenset({"StartingYear"}),
+        ),
+        SheetBuilder(
+            key="planning",
+            sheet_name="Budget-Planning",
+            build=build_planning_sheet,
+            register=register_planning_named_ranges,
+            provides=frozenset(
+                {
+                    "IncomeCats",
+                    "ExpenseCats",
+                    "SavingsCats",
+                    "IncomeGrid",
+                    "ExpenseGrid",
+                    "SavingsGrid",
+                    "IncomeHeader",
+                    "ExpenseHeader",
+                    "SavingsHeader",
+                    "IncomeTotals",
+                    "ExpenseTotals",
+                    "SavingsTotals",
+                    "UnallocatedRow",
+                }
+            ),
+            consumes=frozenset({"StartingYear"}),
+        ),
+        SheetBuilder(
+            key="tracking",
+            sheet_name="Budget Tracking",
+            build=build_tracking_sheet,
+            provides=frozenset({"tblTracking"}),
+            consumes=frozenset(
+                {"IncomeCats", "ExpenseCats", "SavingsCats", "LateIncomeEnabled", "LateIncomeDay"}
+            ),
+        ),
+        SheetBuilder(
+            key="calculations",
+            sheet_name="Calculations",
+            build=build_calculations_sheet,
+            register=register_calculations_named_ranges,
+            provides=frozenset(
+                {
+                    "MonthMap",
+                    "MonthIdx",
+                    "TrackedMonthly",
+                    "TrackingYearMap",
+                    "TrackingYearIdx",
+                    "CategoryMonthly",
+                }
+            ),
+            consumes=frozenset(
+                {
+                    "StartingYear",
+                    "tblTracking",
+                    "DashYear",
+                    "DashPeriod",
+                    "MonthMap",
+                    "TrackingYearMap",
+                    "TrackedMonthly",
+                    "TrackingYearIdx",
+                    "IncomeTotals",
+                    "ExpenseTotals",
+                    "SavingsTotals",
+                }
+            ),
+        ),
+        SheetBuilder(
+            key="dashboard",
+            sheet_name="Budget Dashboard",
+            build=_build_dashboard_with_charts,
+            register=register_dashboard_named_ranges,
+            provides=frozenset({"DashYear", "DashPeriod"}),
+            consumes=frozenset(
+                {
+                    "StartingYear",
+                    "YearsList",
+                    "MonthsList",
+                    "DashYear",
+                    "DashPeriod",
+                    "IncomeGrid",
+                    "ExpenseGrid",
+                    "SavingsGrid",
+                }
+            ),
+            # The tiles, category breakdown and charts read Calculations cells.
+            references=frozenset({"MonthIdx", "CategoryMonthly"}),
+        ),
+    )
+)
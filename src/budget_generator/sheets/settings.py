@@ -7,6 +7,7 @@ from typing import Any, Mapping
 from openpyxl.styles import Alignment, Font
 from openpyxl.worksheet.worksheet import Worksheet
 
+from ..formatting.styles import is_lean
 from ..utils.named_ranges import NamedRangeManager, NamedRangeSpec
 
 
@@ -52,40 +53,36 @@ def build_settings_sheet(worksheet: Worksheet, spec: Mapping[str, Any]) -> None:
     late_income_day = late_income_settings.get("day_default", 25)
 
     worksheet["C1"].value = hero_title
-    worksheet["C1"].font = Font(bold=True, size=16)
-
     worksheet["C6"].value = general_label
-    worksheet["C6"].font = Font(bold=True)
-
     worksheet["D8"].value = starting_year_label
-    worksheet["D8"].font = Font(bold=True)
     worksheet["E8"].value = starting_year
     worksheet["E8"].number_format = "0"
     worksheet["G8"].value = starting_year_help
-    worksheet["G8"].alignment = Alignment(wrap_text=True)
-
     worksheet["C12"].value = tracking_section_title
-    worksheet["C12"].font = Font(bold=True)
-
     worksheet["D14"].value = late_income_section
-    worksheet["D14"].font = Font(bold=True)
     worksheet["D16"].value = late_income_status_label
-    worksheet["D16"].font = Font(bold=True)
     worksheet["E16"].value = late_income_status_display
     worksheet["G16"].value = late_income_help
-    worksheet["G16"].alignment = Alignment(wrap_text=True)
     worksheet["D18"].value = late_income_day_label
-    worksheet["D18"].font = Font(bold=True)
     worksheet["E18"].value = late_income_day
     worksheet["E18"].number_format = "0"
     worksheet["E19"].value = " "
 
+    if not is_lean(spec):
+        worksheet["C1"].font = Font(bold=True, size=16)
+        for cell_ref in ("C6", "D8", "C12", "D14", "D16", "D18"):
+            worksheet[cell_ref].font = Font(bold=True)
+        for cell_ref in ("G8", "G16"):
+            worksheet[cell_ref].alignment = Alignment(wrap_text=True)
+
     # Hidden boolean cell used for formulas via named range.
     worksheet["J16"].value = late_income_enabled
     worksheet.column_dimensions["J"].hidden = True
 
 
-def register_settings_named_ranges(manager: NamedRangeManager) -> None:
+def register_settings_named_ranges(
+    manager: NamedRangeManager, spec: Mapping[str, Any] | None = None
+) -> None:
     """Register named ranges originating from the Settings sheet."""
 
     specs = (
@@ -2,16 +2,29 @@
 
 from __future__ import annotations
 
+import itertools
+import warnings
 from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Mapping, Sequence
+from functools import cached_property
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Sequence
 
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.filters import AutoFilter
+from openpyxl.worksheet.table import Table, TableColumn, TableFormula, TableStyleInfo
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 from openpyxl.worksheet.worksheet import Worksheet
 
+from ..formatting.styles import is_lean, style_range, write_block, write_only_copy
+from ..formulas.shared import share_formula
+from ..formulas.strategy import COMPATIBLE_FORMULAS, FormulaStrategy, formula_strategy
+from ..utils.transactions import iter_transaction_records
+
 
 HEADERS: tuple[str, ...] = (
     "Date",
@@ -21,10 +34,97 @@ HEADERS: tuple[str, ...] = (
     "Details",
     "Balance",
     "Effective Date",
+    "Month Key",
+    "Year Month",
+    "Signed Amount",
 )
+# Trailing HEADERS filled by formulas rather than by entries.
+FORMULA_HEADERS: tuple[str, ...] = HEADERS[5:]
+EFFECTIVE_DATE_COLUMN = FORMULA_HEADERS.index("Effective Date")
 
 ACCOUNTING_FORMAT = '_($* #,##0_);_($* (#,##0);_($* "-"??_);_(@_)'
 DATE_FORMAT = "yyyy-mm-dd"
+# Number format of every data-row cell, aligned with HEADERS.
+DATA_FORMATS: tuple[str | None, ...] = (
+    DATE_FORMAT,
+    None,
+    None,
+    ACCOUNTING_FORMAT,
+    "@",
+    ACCOUNTING_FORMAT,
+    DATE_FORMAT,
+    None,
+    None,
+    ACCOUNTING_FORMAT,
+)
+OPENING_FORMAT = '"Opening balance "#,##0.00;"Opening balance "(#,##0.00)'
+EFFECTIVE_DATE_FORMULA = (
+    "=IF(AND(LateIncomeEnabled,[@Type]=\"Income\",DAY([@Date])>LateIncomeDay),"
+    "DATE(YEAR([@Date]),MONTH([@Date])+1,1),[@Date])"
+)
+# Month of the Effective Date, so monthly totals are plain SUMIFS criteria.
+MONTH_KEY_FORMULA = '=IF([@Date]="","",MONTH([@[Effective Date]]))'
+# Sortable month of the Date (2025 Mar is 202503); ledgers in date order keep
+# it ascending, so approximate MATCH finds where each month starts and ends.
+YEAR_MONTH_FORMULA = '=IF([@Date]="","",YEAR([@Date])*100+MONTH([@Date]))'
+# Amount with the sign it has in the running balance.
+SIGNED_AMOUNT_FORMULA = '=([@Type]="Income")*[@Amount]-(([@Type]="Expense")+([@Type]="Saving"))*[@Amount]'
+
+
+def balance_formula(table: str = "tblTracking", opening: str | None = None) -> str:
+    """Return the array-form running-balance formula for a data row of *table*.
+
+    Year tables add *opening*, the cell holding the previous years' closing
+    balance, so each row only scans its own year.  See
+    :mod:`budget_generator.formulas.strategy` for the per-target forms.
+    """
+
+    return COMPATIBLE_FORMULAS.running_balance(table, opening)
+
+
+BALANCE_FORMULA = balance_formula()
+
+
+def late_income_day(late_income: Mapping[str, object] | None) -> int | None:
+    """Return the day after which income shifts to next month, or ``None`` when disabled.
+
+    *late_income* is the Settings spec's ``late_income`` block, whose
+    ``enabled_default`` and ``day_default`` seed the ``LateIncomeEnabled``
+    and ``LateIncomeDay`` cells.
+    """
+
+    late_income = late_income or {}
+    if not late_income.get("enabled_default", False):
+        return None
+    return int(late_income.get("day_default", 25))  # type: ignore[arg-type]
+
+
+@dataclass(frozen=True)
+class TrackingTable:
+    """One Excel table on the tracking sheet.
+
+    Unpartitioned sheets hold a single table with ``year`` set to ``None``;
+    year-partitioned sheets stack one table per ledger year.
+    """
+
+    year: int | None
+    table_name: str
+    header_row: int
+    end_row: int
+    entries: int
+
+    @property
+    def data_start_row(self) -> int:
+        return self.header_row + 1
+
+    @property
+    def opening_cell(self) -> str | None:
+        return f"$B${self.header_row}" if self.year is not None else None
+
+    def ref(self, start_column: int, end_column: int) -> str:
+        start_letter = get_column_letter(start_column)
+        end_letter = get_column_letter(end_column)
+        return f"{start_letter}{self.header_row}:{end_letter}{self.end_row}"
 
 
 @dataclass(frozen=True)
@@ -35,6 +135,51 @@ class TrackingEntry:
     amount: float
     details: str | None = None
 
+    def values(self) -> tuple[object, ...]:
+        """Return the cell values for the Date..Details columns."""
+
+        return (self.date, self.transaction_type, self.category, self.amount, self.details)
+
+    def effective_date(self, late_day: int | None) -> datetime:
+        """Return what :data:`EFFECTIVE_DATE_FORMULA` gives for this entry.
+
+        With *late_day* set, income dated after that day counts from the 1st
+        of the next month.
+        """
+
+        # Excel compares text case-insensitively.
+        if late_day is None or self.transaction_type.casefold() != "income" or self.date.day <= late_day:
+            return self.date
+        if self.date.month == 12:
+            return datetime(self.date.year + 1, 1, 1)
+        return datetime(self.date.year, self.date.month + 1, 1)
+
+
+# Shown when the spec gives neither sample_entries nor a transactions_file.
+DEFAULT_SAMPLE_ENTRIES: tuple[TrackingEntry, ...] = (
+    TrackingEntry(
+        date=datetime(2017, 1, 1),
+        transaction_type="Income",
+        category="DiDi",
+        amount=7700.5,
+        details=None,
+    ),
+    TrackingEntry(
+        date=datetime(2017, 3, 2),
+        transaction_type="Savings",
+        category="ETFs",
+        amount=5000,
+        details=None,
+    ),
+    TrackingEntry(
+        date=datetime(2017, 3, 3),
+        transaction_type="Expenses",
+        category="Groceries",
+        amount=500,
+        details=None,
+    ),
+)
+
 
 @dataclass
 class TrackingConfig:
@@ -49,14 +194,134 @@ class TrackingConfig:
     tutorial_note: str = "Tutorial at 1h 14min"
     pause_note: str = "Parei at 1h 14min "
     sample_entries: tuple[TrackingEntry, ...] = ()
+    transactions_file: Path | None = None
+    partition: str | None = None
+    spare_rows: int = 20
+    styled: bool = True  # False for the lean profile
+    formulas: FormulaStrategy = COMPATIBLE_FORMULAS
+    static_effective_dates: bool = False
+    late_income_day: int | None = None  # see late_income_day()
+
+    @cached_property
+    def ledger(self) -> tuple[TrackingEntry, ...]:
+        """Return the inline sample entries, then those read from the transactions file.
+
+        Entries come in date order, partitioned or not: the running balance
+        and month lookups rely on it.  :func:`resolve_tracking_config` sorts
+        the inline entries; a ledger file must already be sorted, and a row
+        dated before the one preceding it raises ``ValueError``.  The file
+        is read once per config, so the sizing and writing passes share it.
+        """
+
+        entries: Iterable[TrackingEntry] = self.sample_entries
+        if self.transactions_file is not None:
+            records = iter_transaction_records(self.transactions_file)
+            entries = itertools.chain(entries, _iter_entries(records))
+        ledger = tuple(entries)
+        for previous, entry in itertools.pairwise(ledger):
+            if entry.date < previous.date:
+                raise ValueError(
+                    f"Tracking needs entries in date order; {entry.date:%Y-%m-%d} "
+                    f"follows {previous.date:%Y-%m-%d}"
+                )
+        return ledger
+
+    def entries(self) -> Iterator[TrackingEntry]:
+        """Yield the :attr:`ledger` entries in date order."""
+
+        return iter(self.ledger)
 
     @property
     def data_start_row(self) -> int:
         return self.header_row + 1
 
+    @cached_property
+    def year_counts(self) -> dict[int, int]:
+        """Return how many entries fall in each year, in date order.
+
+        The table layout, :attr:`entry_count` and :attr:`years` all derive
+        from it.
+        """
+
+        counts: dict[int, int] = {}
+        for entry in self.ledger:
+            counts[entry.date.year] = counts.get(entry.date.year, 0) + 1
+        return counts
+
+    @cached_property
+    def partitions(self) -> tuple[TrackingTable, ...]:
+        """Return the per-year tables, or ``()`` unless partitioned by year.
+
+        Each year gets a table sized to its entries plus ``spare_rows`` blank
+        rows, stacked directly below the previous year's table, in the date
+        order :meth:`entries` guarantees.
+        """
+
+        if self.partition != "year":
+            return ()
+        counts = self.year_counts
+        if not counts:
+            raise ValueError("Partitioned tracking needs at least one entry")
+
+        tables: list[TrackingTable] = []
+        header_row = self.header_row
+        for year, count in counts.items():
+            end_row = header_row + count + self.spare_rows
+            tables.append(TrackingTable(year, f"{self.table_name}{year}", header_row, end_row, count))
+            header_row = end_row + 1
+        return tuple(tables)
+
+    @property
+    def tables(self) -> tuple[TrackingTable, ...]:
+        """Return every table on the sheet in row order."""
+
+        if self.partitions:
+            return self.partitions
+        return (TrackingTable(None, self.table_name, self.header_row, self.max_rows, self.capacity),)
+
+    @property
+    def capacity(self) -> int:
+        """Return how many entries the sheet holds; later entries are dropped."""
+
+        if self.partitions:
+            return sum(table.entries for table in self.partitions)
+        return max(0, self.max_rows - self.data_start_row + 1)
+
+    @cached_property
+    def entry_count(self) -> int:
+        """Return how many entries the sheet holds."""
+
+        if self.partitions:
+            return self.capacity
+        return min(self.capacity, sum(self.year_counts.values()))
+
+    @property
+    def years(self) -> tuple[int, ...]:
+        """Return the years the entries on the sheet are dated in, in order."""
+
+        years: list[int] = []
+        remaining = self.capacity
+        for year, count in self.year_counts.items():
+            if remaining <= 0:
+                break
+            years.append(year)
+            remaining -= count
+        return tuple(years)
+
+    def static_rows(self, table: TrackingTable) -> int:
+        """Return how many leading rows of *table* hold a static Effective Date.
+
+        With ``static_effective_dates`` the filled rows get the date the
+        formula would compute, and only the blank rows keep the formula.
+        """
+
+        if not self.static_effective_dates:
+            return 0
+        return table.entries if self.partitions else self.entry_count
+
     @property
     def end_row(self) -> int:
-        return self.max_rows
+        return self.partitions[-1].end_row if self.partitions else self.max_rows
 
     @property
     def end_column(self) -> int:
@@ -64,28 +329,79 @@ class TrackingConfig:
 
     @property
     def table_ref(self) -> str:
-        start_letter = get_column_letter(self.start_column)
-        end_letter = get_column_letter(self.end_column)
-        return f"{start_letter}{self.header_row}:{end_letter}{self.end_row}"
+        return self.tables[0].ref(self.start_column, self.end_column)
 
 
 def build_tracking_sheet(worksheet: Worksheet, spec: Mapping[str, object] | None = None) -> None:
     """Build the Budget Tracking sheet end-to-end."""
 
-    config = _resolve_config(spec)
+    config = resolve_tracking_config(spec)
     _apply_intro_content(worksheet, config)
     _render_headers(worksheet, config)
     _set_column_widths(worksheet)
     _populate_sample_entries(worksheet, config)
-    _create_table(worksheet, config)
+    for table in config.tables:
+        _create_table(worksheet, config, table)
     _apply_number_formats(worksheet, config)
     add_tracking_validations(worksheet, config)
     add_tracking_formulas(worksheet, config)
     add_tracking_conditional_formatting(worksheet, config)
 
 
+def stream_tracking_sheet(worksheet: WriteOnlyWorksheet, spec: Mapping[str, object] | None = None) -> None:
+    """Write the Budget Tracking sheet row by row into a write-only worksheet.
+
+    Produces the same cells, table, validations and conditional formats as
+    :func:`build_tracking_sheet` without holding the data rows' cells in memory.
+    """
+
+    config = resolve_tracking_config(spec)
+    _set_column_widths(worksheet)
+
+    template = Workbook().active
+    _apply_intro_content(template, config)
+    _render_headers(template, config)
+    for row in template.iter_rows(min_row=1, max_row=config.header_row):
+        worksheet.append([write_only_copy(worksheet, cell) for cell in row])
+
+    entries = config.entries()
+    leading = [None] * (config.start_column - 1)
+    for table in config.tables:
+        if table.header_row != config.header_row:
+            for row in template.iter_rows(min_row=table.header_row, max_row=table.header_row):
+                worksheet.append([write_only_copy(worksheet, cell) for cell in row])
+        table_entries = itertools.islice(entries, table.entries)
+        for calculated in zip(*_formula_columns(worksheet, config, table)):
+            entry = next(table_entries, None)
+            if entry is not None and calculated[EFFECTIVE_DATE_COLUMN] is None:
+                effective = entry.effective_date(config.late_income_day)
+                index = EFFECTIVE_DATE_COLUMN
+                calculated = calculated[:index] + (effective,) + calculated[index + 1 :]
+            values: tuple[object, ...] = (entry.values() if entry is not None else (None,) * 5) + calculated
+            cells: list[object] = list(leading)
+            for value, number_format in zip(values, DATA_FORMATS):
+                if number_format is None:
+                    cells.append(value)
+                    continue
+                cell = WriteOnlyCell(worksheet, value=value)
+                cell.number_format = number_format
+                cells.append(cell)
+            worksheet.append(cells)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)  # columns are declared explicitly
+        for table in config.tables:
+            _create_table(worksheet, config, table)
+    add_tracking_validations(worksheet, config)
+    add_tracking_conditional_formatting(worksheet, config)
+
+
 def add_tracking_validations(worksheet: Worksheet, config: TrackingConfig | None = None) -> None:
-    """Attach date/type/category validations required by the PRD."""
+    """Attach date/type/category validations required by the PRD.
+
+    Validations are appended to ``data_validations`` directly so write-only
+    worksheets from the streaming engine are supported too.
+    """
 
     cfg = config or TrackingConfig()
 
@@ -96,54 +412,62 @@ def add_tracking_validations(worksheet: Worksheet, config: TrackingConfig | None
         formula2="DATE(2100,12,31)",
         allow_blank=True,
     )
-    worksheet.add_data_validation(date_validation)
+    worksheet.data_validations.append(date_validation)
     first_col_letter = get_column_letter(cfg.start_column)
-    date_validation.add(
-        f"{first_col_letter}{cfg.data_start_row}:{first_col_letter}{cfg.end_row}"
-    )
+    for table in cfg.tables:
+        date_validation.add(
+            f"{first_col_letter}{table.data_start_row}:{first_col_letter}{table.end_row}"
+        )
 
     type_validation = DataValidation(
         type="list",
         formula1='"Income,Expense,Saving"',
         allow_blank=False,
     )
-    worksheet.add_data_validation(type_validation)
+    worksheet.data_validations.append(type_validation)
     type_col_letter = get_column_letter(cfg.start_column + 1)
-    type_validation.add(
-        f"{type_col_letter}{cfg.data_start_row}:{type_col_letter}{cfg.end_row}"
-    )
+    for table in cfg.tables:
+        type_validation.add(
+            f"{type_col_letter}{table.data_start_row}:{type_col_letter}{table.end_row}"
+        )
 
-    for row in range(cfg.data_start_row, cfg.end_row + 1):
+    for row in _data_rows(cfg):
         category_letter = get_column_letter(cfg.start_column + 2)
         formula = (
             f'=IF(${type_col_letter}{row}="Income",IncomeCats,'
             f'IF(${type_col_letter}{row}="Expense",ExpenseCats,SavingsCats))'
         )
         category_validation = DataValidation(type="list", formula1=formula, allow_blank=True)
-        worksheet.add_data_validation(category_validation)
+        worksheet.data_validations.append(category_validation)
         category_validation.add(f"{category_letter}{row}")
 
 
 def add_tracking_formulas(worksheet: Worksheet, config: TrackingConfig | None = None) -> None:
-    """Populate balance and effective-date formulas."""
+    """Populate balance, effective-date and month-key formulas.
 
-    cfg = config or TrackingConfig()
-    for row in range(cfg.data_start_row, cfg.end_row + 1):
-        balance_cell = worksheet.cell(row=row, column=cfg.start_column + 5)
-        balance_cell.value = (
-            "=SUMPRODUCT((tblTracking[Date]<=[@Date])*(tblTracking[Type]=\"Income\")*"
-            "tblTracking[Amount])"
-            "-SUMPRODUCT((tblTracking[Date]<=[@Date])*((tblTracking[Type]=\"Expense\")+"
-            "(tblTracking[Type]=\"Saving\"))*tblTracking[Amount])"
-        )
-        balance_cell.number_format = ACCOUNTING_FORMAT
+    Each column of each table is one shared-formula group, so the formula
+    text is stored once per column rather than on every row.  With
+    ``static_effective_dates`` the filled rows get their Effective Date as
+    a value instead.
+    """
 
-        effective_cell = worksheet.cell(row=row, column=cfg.start_column + 6)
-        effective_cell.value = (
-            "=IF(AND(LateIncomeEnabled,[@Type]=\"Income\",DAY([@Date])>LateIncomeDay),"
-            "DATE(YEAR([@Date]),MONTH([@Date])+1,1),[@Date])"
-        )
-        effective_cell.number_format = DATE_FORMAT
+    cfg = config or TrackingConfig()
+    entries = cfg.entries()
+    for table in cfg.tables:
+        columns = _formula_columns(worksheet, cfg, table)
+        rows = cfg.static_rows(table)
+        if rows:
+            columns[EFFECTIVE_DATE_COLUMN][:rows] = [
+                entry.effective_date(cfg.late_income_day) for entry in itertools.islice(entries, rows)
+            ]
+        for offset, values in enumerate(columns, start=len(HEADERS) - len(FORMULA_HEADERS)):
+            write_block(
+                worksheet,
+                table.data_start_row,
+                cfg.start_column + offset,
+                ([value] for value in values),
+                number_format=DATA_FORMATS[offset],
+            )
 
 
 def add_tracking_conditional_formatting(
@@ -152,33 +476,39 @@ def add_tracking_conditional_formatting(
     """Apply conditional formatting rules called out in the PRD."""
 
     cfg = config or TrackingConfig()
-    start_row = cfg.data_start_row
-    end_row = cfg.end_row
+    if not cfg.styled:
+        return
 
     from openpyxl.formatting.rule import FormulaRule
 
     category_letter = get_column_letter(cfg.start_column + 2)
     type_letter = get_column_letter(cfg.start_column + 1)
-    cat_range = f"{category_letter}{start_row}:{category_letter}{end_row}"
-    worksheet.conditional_formatting.add(
-        cat_range,
-        FormulaRule(
-            formula=[f"ISNA({category_letter}{start_row})"],
-            fill=PatternFill(start_color="FCE5CD", end_color="FCE5CD", fill_type="solid"),
-        ),
-    )
+    for table in cfg.tables:
+        start_row = table.data_start_row
+        end_row = table.end_row
+
+        cat_range = f"{category_letter}{start_row}:{category_letter}{end_row}"
+        worksheet.conditional_formatting.add(
+            cat_range,
+            FormulaRule(
+                formula=[f"ISNA({category_letter}{start_row})"],
+                fill=PatternFill(start_color="FCE5CD", end_color="FCE5CD", fill_type="solid"),
+            ),
+        )
+
+        amt_range = f"{category_letter}{start_row}:{category_letter}{end_row}"
+        worksheet.conditional_formatting.add(
+            amt_range,
+            FormulaRule(
+                formula=[f"${type_letter}{start_row}=\"Income\""],
+                fill=PatternFill(start_color="D9EAD3", end_color="D9EAD3", fill_type="solid"),
+            ),
+        )
 
-    amt_range = f"{category_letter}{start_row}:{category_letter}{end_row}"
-    worksheet.conditional_formatting.add(
-        amt_range,
-        FormulaRule(
-            formula=[f"${type_letter}{start_row}=\"Income\""],
-            fill=PatternFill(start_color="D9EAD3", end_color="D9EAD3", fill_type="solid"),
-        ),
-    )
 
+def resolve_tracking_config(spec: Mapping[str, object] | None) -> TrackingConfig:
+    """Resolve the Budget Tracking sheet spec into a :class:`TrackingConfig`."""
 
-def _resolve_config(spec: Mapping[str, object] | None) -> TrackingConfig:
     spec = spec or {}
     max_rows = int(spec.get("max_rows", 200))
 
@@ -188,31 +518,20 @@ def _resolve_config(spec: Mapping[str, object] | None) -> TrackingConfig:
     if isinstance(spec, Mapping):
         entries_spec = spec.get("sample_entries", ())  # type: ignore[assignment]
 
-    sample_entries = _coerce_entries(entries_spec)
-    if not sample_entries:
-        sample_entries = (
-            TrackingEntry(
-                date=datetime(2017, 1, 1),
-                transaction_type="Income",
-                category="DiDi",
-                amount=7700.5,
-                details=None,
-            ),
-            TrackingEntry(
-                date=datetime(2017, 3, 2),
-                transaction_type="Savings",
-                category="ETFs",
-                amount=5000,
-                details=None,
-            ),
-            TrackingEntry(
-                date=datetime(2017, 3, 3),
-                transaction_type="Expenses",
-                category="Groceries",
-                amount=500,
-                details=None,
-            ),
-        )
+    transactions_file = spec.get("transactions_file") if isinstance(spec, Mapping) else None
+    # The generator reads the ledger once per build and hands the entries on.
+    ledger = spec.get("ledger") if isinstance(spec, Mapping) else None
+    partition = spec.get("partition") if isinstance(spec, Mapping) else None
+    if partition not in (None, "year"):
+        raise ValueError(f"Unknown tracking partition {partition!r}; expected 'year'")
+
+    # Entries must be in date order (see TrackingConfig.ledger); inline ones
+    # are put in it here, file ledgers must already be sorted.
+    sample_entries = tuple(sorted(_coerce_entries(entries_spec), key=lambda entry: entry.date))
+    if ledger is not None:
+        sample_entries, transactions_file = tuple(ledger), None
+    elif not sample_entries and not transactions_file:
+        sample_entries = DEFAULT_SAMPLE_ENTRIES
 
     return TrackingConfig(
         max_rows=max_rows,
@@ -221,6 +540,13 @@ def _resolve_config(spec: Mapping[str, object] | None) -> TrackingConfig:
         tutorial_note=str(notes.get("tutorial_label", "Tutorial at 1h 14min")),
         pause_note=str(notes.get("pause_label", "Parei at 1h 14min ")),
         sample_entries=sample_entries,
+        transactions_file=Path(str(transactions_file)) if transactions_file else None,
+        partition=partition,
+        spare_rows=int(spec.get("spare_rows", 20)),
+        styled=not is_lean(spec),
+        formulas=formula_strategy(spec.get("target_excel")),
+        static_effective_dates=bool(spec.get("static_effective_dates", False)),
+        late_income_day=late_income_day(spec.get("late_income")),  # type: ignore[arg-type]
     )
 
 
@@ -229,12 +555,61 @@ def _render_headers(worksheet: Worksheet, config: TrackingConfig) -> None:
     header_font = Font(bold=True)
     header_alignment = Alignment(horizontal="center")
 
-    for offset, header in enumerate(HEADERS):
-        column = config.start_column + offset
-        cell = worksheet.cell(row=config.header_row, column=column, value=header)
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.fill = header_fill
+    previous: TrackingTable | None = None
+    for table in config.tables:
+        for offset, header in enumerate(HEADERS):
+            column = config.start_column + offset
+            cell = worksheet.cell(row=table.header_row, column=column, value=header)
+            if config.styled:
+                cell.font = header_font
+                cell.alignment = header_alignment
+                cell.fill = header_fill
+        if table.opening_cell is not None:
+            opening_value = _opening_formula(previous)
+            opening = worksheet.cell(row=table.header_row, column=2, value=opening_value)
+            opening.number_format = OPENING_FORMAT
+            if config.styled:
+                opening.font = header_font
+        previous = table
+
+
+def _opening_formula(previous: TrackingTable | None) -> object:
+    """Carry the previous year's closing balance into the next year table."""
+
+    if previous is None:
+        return 0
+    return f"=B{previous.header_row}+SUM({previous.table_name}[Signed Amount])"
+
+
+def _calculated_columns(config: TrackingConfig, table: TrackingTable) -> tuple[str, ...]:
+    """Return the formulas of *table*'s FORMULA_HEADERS columns."""
+
+    balance = config.formulas.running_balance(table.table_name, table.opening_cell)
+    return balance, EFFECTIVE_DATE_FORMULA, MONTH_KEY_FORMULA, YEAR_MONTH_FORMULA, SIGNED_AMOUNT_FORMULA
+
+
+def _formula_columns(
+    worksheet: Worksheet, config: TrackingConfig, table: TrackingTable
+) -> list[list[object]]:
+    """Return the cell values of each calculated column of *table*, top to bottom."""
+
+    columns = []
+    first = config.end_column - len(FORMULA_HEADERS) + 1
+    for index, formula in enumerate(_calculated_columns(config, table)):
+        # Static Effective Dates are left as None for the caller to fill.
+        static = config.static_rows(table) if index == EFFECTIVE_DATE_COLUMN else 0
+        start_row = table.data_start_row + static
+        letter = get_column_letter(first + index)
+        values: list[object] = [None] * static
+        if start_row <= table.end_row:
+            values += share_formula(worksheet, formula, f"{letter}{start_row}:{letter}{table.end_row}")
+        columns.append(values)
+    return columns
+
+
+def _data_rows(config: TrackingConfig) -> Iterator[int]:
+    for table in config.tables:
+        yield from range(table.data_start_row, table.end_row + 1)
 
 
 def _set_column_widths(worksheet: Worksheet) -> None:
@@ -247,13 +622,27 @@ def _set_column_widths(worksheet: Worksheet) -> None:
         "G": 30,
         "H": 16,
         "I": 16,
+        "J": 11,
+        "K": 12,
+        "L": 16,
     }
     for column, width in widths.items():
         worksheet.column_dimensions[column].width = width
 
 
-def _create_table(worksheet: Worksheet, config: TrackingConfig) -> None:
-    table = Table(displayName=config.table_name, ref=config.table_ref)
+def _create_table(worksheet: Worksheet, config: TrackingConfig, layout: TrackingTable) -> None:
+    ref = layout.ref(config.start_column, config.end_column)
+    table = Table(displayName=layout.table_name, ref=ref)
+    # Declare the columns up front; write-only worksheets cannot read headers back.
+    table.tableColumns = [
+        TableColumn(id=config.start_column + offset, name=header)
+        for offset, header in enumerate(HEADERS)
+    ]
+    # Calculated columns let Excel fill the formulas into rows typed below the table.
+    calculated = zip(table.tableColumns[-len(FORMULA_HEADERS):], _calculated_columns(config, layout))
+    for column, formula in calculated:
+        column.calculatedColumnFormula = TableFormula(attr_text=formula[1:])
+    table.autoFilter = AutoFilter(ref=ref)
     table.tableStyleInfo = TableStyleInfo(
         name="TableStyleMedium2",
         showFirstColumn=False,
@@ -269,11 +658,13 @@ def _apply_intro_content(worksheet: Worksheet, config: TrackingConfig) -> None:
 
     title_cell = worksheet["B1"]
     title_cell.value = config.intro_title
-    title_cell.font = Font(bold=True, size=16)
 
     duration_cell = worksheet["E5"]
     duration_cell.value = config.intro_duration
-    duration_cell.font = Font(italic=True)
+
+    if config.styled:
+        title_cell.font = Font(bold=True, size=16)
+        duration_cell.font = Font(italic=True)
 
     worksheet["B6"].value = config.tutorial_note
     worksheet["B7"].value = config.pause_note
@@ -282,33 +673,41 @@ def _apply_intro_content(worksheet: Worksheet, config: TrackingConfig) -> None:
 def _populate_sample_entries(worksheet: Worksheet, config: TrackingConfig) -> None:
     """Insert illustrative rows that match the expected design."""
 
-    for offset, entry in enumerate(config.sample_entries):
-        row = config.data_start_row + offset
-        if row > config.end_row:
-            break
-
-        worksheet.cell(row=row, column=config.start_column, value=entry.date)
-        worksheet.cell(
-            row=row,
-            column=config.start_column + 1,
-            value=entry.transaction_type,
-        )
-        worksheet.cell(row=row, column=config.start_column + 2, value=entry.category)
-        worksheet.cell(row=row, column=config.start_column + 3, value=entry.amount)
-        if entry.details:
-            worksheet.cell(row=row, column=config.start_column + 4, value=entry.details)
+    entries = config.entries()
+    for table in config.tables:
+        table_entries = itertools.islice(entries, table.entries)
+        for row, entry in zip(itertools.count(table.data_start_row), table_entries):
+            worksheet.cell(row=row, column=config.start_column, value=entry.date)
+            worksheet.cell(
+                row=row,
+                column=config.start_column + 1,
+                value=entry.transaction_type,
+            )
+            worksheet.cell(row=row, column=config.start_column + 2, value=entry.category)
+            worksheet.cell(row=row, column=config.start_column + 3, value=entry.amount)
+            if entry.details:
+                worksheet.cell(row=row, column=config.start_column + 4, value=entry.details)
 
 
 def _apply_number_formats(worksheet: Worksheet, config: TrackingConfig) -> None:
-    for row in range(config.data_start_row, config.end_row + 1):
-        date_cell = worksheet.cell(row=row, column=config.start_column)
-        date_cell.number_format = DATE_FORMAT
+    """Format the input columns of every table row, blank rows included."""
+
+    for offset, number_format in _input_formats():
+        letter = get_column_letter(config.start_column + offset)
+        for table in config.tables:
+            style_range(
+                worksheet,
+                f"{letter}{table.data_start_row}:{letter}{table.end_row}",
+                number_format=number_format,
+            )
+
 
-        amount_cell = worksheet.cell(row=row, column=config.start_column + 3)
-        amount_cell.number_format = ACCOUNTING_FORMAT
+def _input_formats() -> Iterator[tuple[int, str]]:
+    """Yield ``(column offset, number format)`` for the formatted input columns."""
 
-        details_cell = worksheet.cell(row=row, column=config.start_column + 4)
-        details_cell.number_format = "@"
+    for offset, number_format in enumerate(DATA_FORMATS[:5]):
+        if number_format is not None:
+            yield offset, number_format
 
 
 def _coerce_entries(
@@ -316,7 +715,12 @@ def _coerce_entries(
 ) -> tuple[TrackingEntry, ...]:
     """Convert raw mapping data into :class:`TrackingEntry` records."""
 
-    coerced: list[TrackingEntry] = []
+    return tuple(_iter_entries(entries))
+
+
+def _iter_entries(entries: Iterable[Mapping[str, object]]) -> Iterator[TrackingEntry]:
+    """Lazily coerce mappings, skipping those missing required fields."""
+
     for entry in entries:
         if not isinstance(entry, Mapping):
             continue
@@ -330,18 +734,14 @@ def _coerce_entries(
             continue
 
         details_value = entry.get("details")
-        coerced.append(
-            TrackingEntry(
-                date=when,
-                transaction_type=str(transaction_type),
-                category=str(category),
-                amount=float(amount),
-                details=str(details_value) if details_value not in (None, "") else None,
-            )
+        yield TrackingEntry(
+            date=when,
+            transaction_type=str(transaction_type),
+            category=str(category),
+            amount=float(amount),
+            details=str(details_value) if details_value not in (None, "") else None,
         )
 
-    return tuple(coerced)
-
 
 def _coerce_datetime(value: object) -> datetime | None:
     if isinstance(value, datetime):
@@ -0,0 +1,92 @@
+"""Streaming generation engine backed by openpyxl's write-only mode."""
+
+from __future__ import annotations
+
+import logging
+from copy import copy
+
+from openpyxl import Workbook
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from openpyxl.worksheet.worksheet import Worksheet
+
+from .formatting.styles import write_only_copy
+from .generator import BudgetGenerator
+from .sheets.tracking import stream_tracking_sheet
+from .utils.named_ranges import NamedRangeManager
+
+
+TRACKING_SHEET = "Budget Tracking"
+
+
+class StreamingBudgetGenerator(BudgetGenerator):
+    """Generate the workbook through openpyxl's write-only worksheets.
+
+    Budget Tracking rows are streamed straight to disk as they are produced.
+    The remaining sheets are small; they are built by their regular builders
+    into a scratch workbook and copied across row by row.
+    """
+
+    def create_workbook(self) -> Workbook:
+        workbook = Workbook(write_only=True)
+        self.workbook = workbook
+        return workbook
+
+    def build_sheet_contents(self) -> None:
+        workbook = self._require_workbook()
+        sheet_specs = self._sheet_specs()
+        manager = NamedRangeManager(workbook)
+
+        scratch = Workbook()
+        scratch.remove(scratch.active)
+        for name in workbook.sheetnames:
+            scratch.create_sheet(title=name)
+
+        for builder in self.build_plan.builders:
+            sheet_spec = sheet_specs.get(builder.sheet_name, {})
+            if builder.sheet_name != TRACKING_SHEET:
+                LOGGER.info("Building %s sheet", builder.sheet_name)
+                builder.build(scratch[builder.sheet_name], sheet_spec)
+            if builder.register is not None:
+                builder.register(manager, sheet_spec)
+
+        # Write-only sheets must be filled in workbook order, one at a time.
+        for worksheet in workbook.worksheets:
+            if worksheet.title == TRACKING_SHEET:
+                LOGGER.info("Streaming %s sheet", worksheet.title)
+                stream_tracking_sheet(worksheet, sheet_specs.get(TRACKING_SHEET, {}))
+            elif worksheet.title in self.build_plan.sheet_names:
+                _copy_worksheet(scratch[worksheet.title], worksheet)
+
+        for sheet_name in ("Dropdown Data", "Calculations"):
+            if sheet_name in workbook.sheetnames:
+                workbook[sheet_name].sheet_state = "hidden"
+
+
+def _copy_worksheet(source: Worksheet, target: WriteOnlyWorksheet) -> None:
+    """Transfer cells, layout and worksheet-level objects into *target*."""
+
+    # Column widths and panes must be set before the first row is written.
+    for key, dimension in source.column_dimensions.items():
+        target.column_dimensions[key].width = dimension.width
+        target.column_dimensions[key].hidden = dimension.hidden
+        if dimension.has_style:
+            target.column_dimensions[key].number_format = dimension.number_format
+            target.column_dimensions[key].font = copy(dimension.font)
+            target.column_dimensions[key].alignment = copy(dimension.alignment)
+    target.freeze_panes = source.freeze_panes
+
+    for row in source.iter_rows(min_row=1, max_row=source.max_row):
+        target.append([write_only_copy(target, cell) for cell in row])
+
+    for cell_range in source.merged_cells.ranges:
+        target.merged_cells.add(cell_range.coord)
+    for formatting in source.conditional_formatting:
+        for rule in formatting.rules:
+            target.conditional_formatting.add(str(formatting.sqref), rule)
+    for validation in source.data_validations.dataValidation:
+        target.data_validations.append(validation)
+    for chart in source._charts:  # type: ignore[attr-defined]
+        target.add_chart(chart)
+
+
+LOGGER = logging.getLogger(__name__)
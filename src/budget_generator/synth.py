@@ -0,0 +1,262 @@
+"""Seeded synthetic specs and transaction ledgers for load testing.
+
+Everything is drawn from a single ``random.Random(seed)`` so the same
+configuration always yields byte-identical files.  Ledgers are generated one
+month at a time and streamed to disk, so million-row files use little memory.
+"""
+
+from __future__ import annotations
+
+import calendar
+import copy
+import itertools
+import json
+import math
+import random
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from .sheets.dropdown import years_layout
+from .sheets.planning import PlanningSheetBuilder
+from .sheets.tracking import TrackingConfig
+from .utils.transactions import transaction_format, write_transaction_records
+
+
+TRANSACTION_TYPES: tuple[str, ...] = ("Income", "Expense", "Saving")
+# Planning section titles differ from the Type values used on the tracking sheet.
+SECTION_TYPES = {"Income": "Income", "Expenses": "Expense", "Savings": "Saving"}
+# Median amount per transaction type; amounts are log-normally distributed.
+MEDIAN_AMOUNTS = {"Income": 2500.0, "Expense": 45.0, "Saving": 300.0}
+AMOUNT_SIGMA = 0.6
+
+BASE_SPEC: dict[str, Any] = {
+    "meta": {"name": "Synthetic Budget", "version": "1.0.0"},
+    "workbook": {
+        "sheets": [
+            {"name": "Settings", "visibility": "visible"},
+            {"name": "Dropdown Data", "visibility": "hidden"},
+            {"name": "Budget-Planning", "visibility": "visible"},
+            {"name": "Budget Tracking", "visibility": "visible"},
+            {"name": "Calculations", "visibility": "hidden"},
+            {"name": "Budget Dashboard", "visibility": "visible"},
+        ],
+        "named_ranges": {
+            "StartingYear": {"sheet": "Settings", "ref": "E8"},
+            "LateIncomeEnabled": {"sheet": "Settings", "ref": "J16"},
+            "LateIncomeDay": {"sheet": "Settings", "ref": "E18"},
+            "YearsList": {"sheet": "Dropdown Data", "ref": "B3:B7"},
+            "MonthsList": {"sheet": "Dropdown Data", "ref": "C3:C14"},
+            "DashYear": {"sheet": "Budget Dashboard", "ref": "C3"},
+            "DashPeriod": {"sheet": "Budget Dashboard", "ref": "C4"},
+            "MonthIdx": {"sheet": "Calculations", "ref": "K1"},
+        },
+    },
+    "sheets": {
+        "Settings": {"general": {}, "late_income": {}},
+        "Dropdown Data": {"years": {"count": 5, "start_row": 3}},
+        "Budget-Planning": {},
+        "Budget Tracking": {},
+        "Budget Dashboard": {
+            "selectors": {"default_period": "Jan", "default_year_formula": "=StartingYear"}
+        },
+    },
+}
+
+
+class SynthError(RuntimeError):
+    """Raised when a synthetic dataset cannot be generated as configured."""
+
+
+@dataclass(frozen=True)
+class SynthConfig:
+    """Shape of a synthetic dataset.
+
+    ``type_mix`` weights Income, Expense and Saving transactions.
+    ``late_income_share`` is the fraction of income dated after
+    ``late_income_day``; ``details`` is the number of distinct detail texts
+    (0 leaves Details empty).
+    """
+
+    transactions: int = 10_000
+    categories: int = 12
+    years: int = 3
+    start_year: int = 2025
+    type_mix: tuple[float, float, float] = (0.15, 0.75, 0.10)
+    late_income_share: float = 0.2
+    late_income_day: int = 25
+    details: int = 200
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.transactions < 0:
+            raise SynthError("Transaction count cannot be negative")
+        if self.years < 1:
+            raise SynthError("At least one year is required")
+        if len(self.type_mix) != len(TRANSACTION_TYPES) or any(w < 0 for w in self.type_mix):
+            raise SynthError("Type mix needs three non-negative weights (income, expense, saving)")
+        if not sum(self.type_mix):
+            raise SynthError("Type mix weights cannot all be zero")
+        if not 0 <= self.late_income_share <= 1:
+            raise SynthError("Late income share must be between 0 and 1")
+        if not 1 <= self.late_income_day <= 31:
+            raise SynthError("Late income day must be between 1 and 31")
+        if self.details < 0:
+            raise SynthError("Detail cardinality cannot be negative")
+        active = sum(1 for weight in self.type_mix if weight)
+        if self.categories < active:
+            raise SynthError(f"Category count must be at least {active}, one per weighted transaction type")
+
+
+@dataclass(frozen=True)
+class SynthResult:
+    """Files written by :func:`write_synthetic_dataset`."""
+
+    spec_path: Path
+    transactions_path: Path
+    transactions: int
+
+
+def planning_categories() -> dict[str, tuple[str, ...]]:
+    """Return the planning sheet's categories keyed by tracking Type value."""
+
+    return {
+        SECTION_TYPES[section.title]: tuple(section.categories)
+        for section in PlanningSheetBuilder.SECTION_DEFINITIONS
+    }
+
+
+def select_categories(config: SynthConfig) -> dict[str, tuple[str, ...]]:
+    """Pick ``config.categories`` categories, interleaving the transaction types.
+
+    The planning sheet's categories are used first; beyond those, synthetic
+    names such as ``Expense 001`` are added round-robin.
+    """
+
+    available = planning_categories()
+    pools = {
+        kind: list(available[kind])
+        for kind, weight in zip(TRANSACTION_TYPES, config.type_mix)
+        if weight
+    }
+    chosen: dict[str, list[str]] = {kind: [] for kind in pools}
+    remaining = min(config.categories, sum(len(pool) for pool in pools.values()))
+    while remaining:
+        for kind, pool in pools.items():
+            if pool and remaining:
+                chosen[kind].append(pool.pop(0))
+                remaining -= 1
+    extra = itertools.count(1)
+    while sum(len(names) for names in chosen.values()) < config.categories:
+        index = next(extra)
+        for kind in chosen:
+            if sum(len(names) for names in chosen.values()) < config.categories:
+                chosen[kind].append(f"{kind} {index:03d}")
+    return {kind: tuple(names) for kind, names in chosen.items()}
+
+
+def iter_transactions(config: SynthConfig) -> Iterator[dict[str, Any]]:
+    """Yield transaction records in date order."""
+
+    rng = random.Random(config.seed)
+    categories = select_categories(config)
+    kinds = list(categories)
+    weights = [config.type_mix[TRANSACTION_TYPES.index(kind)] for kind in kinds]
+    months = config.years * 12
+    per_month, remainder = divmod(config.transactions, months)
+
+    for index in range(months):
+        year = config.start_year + index // 12
+        month = index % 12 + 1
+        days = calendar.monthrange(year, month)[1]
+        batch = []
+        for _ in range(per_month + (1 if index < remainder else 0)):
+            kind = rng.choices(kinds, weights)[0]
+            batch.append(
+                {
+                    "date": date(year, month, _pick_day(rng, kind, days, config)),
+                    "type": kind,
+                    "category": rng.choice(categories[kind]),
+                    "amount": round(
+                        rng.lognormvariate(math.log(MEDIAN_AMOUNTS[kind]), AMOUNT_SIGMA), 2
+                    ),
+                    "details": f"Payee {rng.randrange(config.details):05d}" if config.details else None,
+                }
+            )
+        batch.sort(key=lambda record: record["date"])
+        yield from batch
+
+
+def synth_spec(
+    config: SynthConfig,
+    transactions_file: str,
+    base_spec: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Return a spec whose tracking table holds the synthetic ledger."""
+
+    spec = copy.deepcopy(dict(base_spec if base_spec is not None else BASE_SPEC))
+    spec.setdefault("meta", {})["name"] = (
+        f"Synthetic Budget ({config.transactions} transactions, seed {config.seed})"
+    )
+    sheets = spec.setdefault("sheets", {})
+
+    settings = sheets.setdefault("Settings", {})
+    settings.setdefault("general", {})["starting_year"] = config.start_year
+    late_income = settings.setdefault("late_income", {})
+    late_income["enabled_default"] = config.late_income_share > 0
+    late_income["day_default"] = config.late_income_day
+
+    dropdown = sheets.setdefault("Dropdown Data", {})
+    years = dropdown.setdefault("years", {})
+    years["count"] = max(int(years.get("count", 5)), config.years)
+    named_ranges = spec.setdefault("workbook", {}).setdefault("named_ranges", {})
+    if "YearsList" in named_ranges:
+        start_row, count = years_layout(dropdown)
+        named_ranges["YearsList"]["ref"] = f"B{start_row}:B{start_row + count - 1}"
+
+    planning = sheets.setdefault("Budget-Planning", {})
+    planning["scaffold_years"] = config.years
+    # Categories beyond the planning defaults need rows of their own.
+    defaults = planning_categories()
+    chosen = select_categories(config)
+    if any(name not in defaults[kind] for kind, names in chosen.items() for name in names):
+        planning["categories"] = {
+            section: [*defaults[kind], *(name for name in chosen.get(kind, ()) if name not in defaults[kind])]
+            for section, kind in SECTION_TYPES.items()
+        }
+
+    tracking = sheets.setdefault("Budget Tracking", {})
+    tracking.pop("sample_entries", None)
+    tracking["max_rows"] = TrackingConfig().header_row + max(1, config.transactions)
+    tracking["transactions_file"] = transactions_file
+    return spec
+
+
+def write_synthetic_dataset(
+    config: SynthConfig,
+    output_dir: Path,
+    *,
+    file_format: str = "csv",
+    base_spec: Mapping[str, Any] | None = None,
+) -> SynthResult:
+    """Write ``spec.json`` and a transactions ledger into *output_dir*."""
+
+    output_dir = Path(output_dir)
+    transactions_path = output_dir / f"transactions.{file_format}"
+    transaction_format(transactions_path)  # reject unknown formats before writing
+    count = write_transaction_records(transactions_path, iter_transactions(config))
+
+    spec_path = output_dir / "spec.json"
+    spec = synth_spec(config, transactions_path.name, base_spec)
+    spec_path.write_text(json.dumps(spec, indent=2) + "\n", encoding="utf-8")
+    return SynthResult(spec_path=spec_path, transactions_path=transactions_path, transactions=count)
+
+
+def _pick_day(rng: random.Random, kind: str, days: int, config: SynthConfig) -> int:
+    if kind != "Income" or config.late_income_day >= days:
+        return rng.randint(1, days)
+    if rng.random() < config.late_income_share:
+        return rng.randint(config.late_income_day + 1, days)
+    return rng.randint(1, config.late_income_day)
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, Mapping
 
+from ..formulas.strategy import formula_strategy
 
 REQUIRED_TOP_LEVEL_KEYS = {"meta", "workbook", "sheets"}
 REQUIRED_SHEET_NAMES = {
@@ -17,6 +18,11 @@ REQUIRED_SHEET_NAMES = {
     "Calculations",
     "Budget Dashboard",
 }
+# Spec values naming files; relative paths are resolved against the spec's folder.
+SPEC_PATH_KEYS: tuple[tuple[str, str], ...] = (
+    ("Budget Tracking", "transactions_file"),
+    ("Budget-Planning", "planned_amounts_file"),
+)
 
 
 class JSONLoaderError(RuntimeError):
@@ -58,11 +64,35 @@ def load_json_spec(filepath: Path) -> Dict[str, Any]:
         raise SpecReadError(f"Unable to read specification {filepath}: {exc}") from exc
 
     try:
-        return json.loads(raw_text)
+        spec = json.loads(raw_text)
     except json.JSONDecodeError as exc:
         message = f"Invalid JSON in {filepath}: {exc.msg} (line {exc.lineno}, column {exc.colno})"
         raise SpecParseError(message) from exc
 
+    resolve_spec_paths(spec, filepath.parent)
+    return spec
+
+
+def resolve_spec_paths(spec: Any, base_dir: Path) -> None:
+    """Make file references in *spec* absolute, relative to *base_dir*.
+
+    Specs refer to companion files (such as transaction ledgers) relative to
+    their own location so a spec and its data can be moved together.
+    """
+
+    if not isinstance(spec, dict):
+        return
+    sheets = spec.get("sheets")
+    if not isinstance(sheets, dict):
+        return
+    for sheet_name, key in SPEC_PATH_KEYS:
+        sheet_spec = sheets.get(sheet_name)
+        if not isinstance(sheet_spec, dict) or not isinstance(sheet_spec.get(key), str):
+            continue
+        path = Path(sheet_spec[key])
+        if not path.is_absolute():
+            sheet_spec[key] = str(base_dir / path)
+
 
 def validate_json_structure(spec: Mapping[str, Any]) -> ValidationResult:
     """Ensure the loaded specification matches the structural contract.
@@ -86,10 +116,13 @@ def validate_json_structure(spec: Mapping[str, Any]) -> ValidationResult:
     else:
         _validate_sheets_section(workbook, errors)
         _validate_named_ranges(workbook, errors)
+        _validate_target_excel(workbook, errors)
 
     sheets_payload = spec.get("sheets")
     if not isinstance(sheets_payload, Mapping):
         errors.append("'sheets' must be an object keyed by sheet name.")
+    else:
+        _validate_spec_paths(sheets_payload, errors)
 
     if errors:
         raise SpecValidationError("; ".join(errors))
@@ -128,6 +161,29 @@ def _validate_sheets_section(workbook: Mapping[str, Any], errors: list[str]) ->
         errors.append(f"Missing required sheets: {sorted(missing)}")
 
 
+def _validate_spec_paths(sheets: Mapping[str, Any], errors: list[str]) -> None:
+    """Check that file references in sheet specs point at existing files."""
+
+    for sheet_name, key in SPEC_PATH_KEYS:
+        sheet_spec = sheets.get(sheet_name)
+        if not isinstance(sheet_spec, Mapping) or sheet_spec.get(key) is None:
+            continue
+        value = sheet_spec[key]
+        if not isinstance(value, str) or not value:
+            errors.append(f"'{sheet_name}.{key}' must be a file path string.")
+        elif not Path(value).is_file():
+            errors.append(f"'{sheet_name}.{key}' file not found: {value}")
+
+
+def _validate_target_excel(workbook: Mapping[str, Any], errors: list[str]) -> None:
+    """Validate the optional workbook.target_excel formula target."""
+
+    try:
+        formula_strategy(workbook.get("target_excel"))
+    except ValueError as exc:
+        errors.append(str(exc))
+
+
 def _validate_named_ranges(workbook: Mapping[str, Any], errors: list[str]) -> None:
     """Validate the workbook.named_ranges mapping."""
 
@@ -64,6 +64,21 @@ class NamedRangeManager:
         for spec in specs:
             self.create_range(spec.name, spec.sheet, spec.ref)
 
+    def sort_names(self) -> None:
+        """Reorder defined names alphabetically, as Excel itself stores them.
+
+        Registration order follows the build plan; sorting makes the saved
+        ``definedNames`` block independent of which builders ran first.
+        """
+
+        names = sorted(
+            self.workbook.defined_names.values(),
+            key=lambda defined: (defined.name.lower(), defined.localSheetId or -1),
+        )
+        self.workbook.defined_names.clear()
+        for defined_name in names:
+            self.workbook.defined_names.add(defined_name)
+
     def _resolve_sheet_index(self, scope: str) -> int:
         if scope.isdigit():
             return int(scope)
@@ -0,0 +1,159 @@
+"""Read planned budget amounts from CSV files or NumPy ``.npz`` archives.
+
+Both readers return ``{section: {category: {year_offset: monthly_amounts}}}``
+where offset 0 is the first planning year.
+
+* CSV files use the long ``section,category,year,month,amount`` layout that
+  ``ingest --table planning`` and ``generate --export-csv`` write; ``year`` is
+  a calendar year and ``month`` a month name (``Jan``) or number (``1``).
+* ``.npz`` archives (as written by ``numpy.savez``) hold one array per section,
+  named after it, shaped ``(categories, 12)`` for the first year or
+  ``(years, categories, 12)``.  Rows follow the section's category order.
+  The arrays are decoded with the standard library, so NumPy is not needed.
+"""
+
+from __future__ import annotations
+
+import ast
+import csv
+import struct
+import sys
+import zipfile
+from array import array
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+
+PlannedAmounts = dict[str, dict[str, dict[int, list[float]]]]
+
+# NumPy dtype kind+size -> array typecode.
+_ARRAY_TYPECODES = {
+    "f8": "d",
+    "f4": "f",
+    "i8": "q",
+    "i4": "i",
+    "i2": "h",
+    "i1": "b",
+    "u8": "Q",
+    "u4": "I",
+    "u2": "H",
+    "u1": "B",
+}
+
+
+class PlannedAmountsError(RuntimeError):
+    """Raised when a planned amounts file cannot be read."""
+
+
+def load_planned_amounts(
+    path: Path,
+    *,
+    starting_year: int,
+    categories: Mapping[str, Sequence[str]],
+    months: Sequence[str],
+) -> PlannedAmounts:
+    """Read the planned amounts in *path* for the sections in *categories*."""
+
+    path = Path(path)
+    suffix = path.suffix.lower()
+    try:
+        if suffix == ".csv":
+            return _read_csv(path, starting_year, categories, months)
+        if suffix == ".npz":
+            return _read_npz(path, categories, len(months))
+    except OSError as exc:
+        raise PlannedAmountsError(f"Unable to read planned amounts {path}: {exc}") from exc
+    raise PlannedAmountsError(f"Unsupported planned amounts file '{path}'; use .csv or .npz")
+
+
+def read_npy(data: bytes) -> tuple[tuple[int, ...], array]:
+    """Decode a C-ordered numeric ``.npy`` payload into its shape and flat values."""
+
+    if data[:6] != b"\x93NUMPY":
+        raise PlannedAmountsError("Not a .npy array")
+    if data[6] == 1:
+        (header_length,) = struct.unpack_from("<H", data, 8)
+        offset = 10
+    else:
+        (header_length,) = struct.unpack_from("<I", data, 8)
+        offset = 12
+    header = ast.literal_eval(data[offset : offset + header_length].decode("latin-1"))
+    descr, shape = header["descr"], tuple(header["shape"])
+    if header.get("fortran_order"):
+        raise PlannedAmountsError("Fortran-ordered arrays are not supported")
+    typecode = _ARRAY_TYPECODES.get(descr[1:])
+    if typecode is None or array(typecode).itemsize != int(descr[2:]):
+        raise PlannedAmountsError(f"Unsupported array dtype {descr!r}")
+
+    values = array(typecode)
+    values.frombytes(data[offset + header_length :])
+    if descr[0] in "<>" and (descr[0] == "<") != (sys.byteorder == "little"):
+        values.byteswap()
+    expected = 1
+    for size in shape:
+        expected *= size
+    if len(values) != expected:
+        raise PlannedAmountsError(f"Array holds {len(values)} values, shape {shape} needs {expected}")
+    return shape, values
+
+
+def _read_csv(
+    path: Path,
+    starting_year: int,
+    categories: Mapping[str, Sequence[str]],
+    months: Sequence[str],
+) -> PlannedAmounts:
+    month_index = {month.lower(): index for index, month in enumerate(months)}
+    planned: PlannedAmounts = {}
+    with path.open(encoding="utf-8", newline="") as stream:
+        for line, row in enumerate(csv.DictReader(stream), start=2):
+            try:
+                section = row["section"]
+                offset = int(row["year"]) - starting_year
+                month = row["month"].strip()
+                index = int(month) - 1 if month.isdigit() else month_index[month.lower()]
+                amount = float(row["amount"]) if row["amount"] not in (None, "") else 0.0
+            except (KeyError, TypeError, ValueError) as exc:
+                raise PlannedAmountsError(f"{path} line {line}: invalid planned amount row") from exc
+            if section not in categories:
+                raise PlannedAmountsError(f"{path} line {line}: unknown section {section!r}")
+            if offset < 0 or not 0 <= index < len(months):
+                raise PlannedAmountsError(
+                    f"{path} line {line}: {row['year']}-{month} is outside the planning years"
+                )
+            values = planned.setdefault(section, {}).setdefault(row["category"], {}).setdefault(
+                offset, [0.0] * len(months)
+            )
+            values[index] = amount
+    return planned
+
+
+def _read_npz(path: Path, categories: Mapping[str, Sequence[str]], month_count: int) -> PlannedAmounts:
+    planned: PlannedAmounts = {}
+    with zipfile.ZipFile(path) as archive:
+        for member in archive.namelist():
+            section = member[: -len(".npy")] if member.endswith(".npy") else member
+            if section not in categories:
+                raise PlannedAmountsError(f"{path}: unknown section array {member!r}")
+            shape, values = read_npy(archive.read(member))
+            if len(shape) == 2:
+                shape = (1, *shape)
+            if len(shape) != 3 or shape[2] != month_count:
+                raise PlannedAmountsError(
+                    f"{path}: {section} must be shaped (categories, {month_count}) "
+                    f"or (years, categories, {month_count}), got {shape}"
+                )
+            years, rows, _ = shape
+            names = categories[section]
+            if rows > len(names):
+                raise PlannedAmountsError(
+                    f"{path}: {section} has {rows} rows but only {len(names)} categories"
+                )
+            section_amounts = planned.setdefault(section, {})
+            for year in range(years):
+                for row in range(rows):
+                    start = (year * rows + row) * month_count
+                    section_amounts.setdefault(names[row], {})[year] = [
+                        float(value) for value in values[start : start + month_count]
+                    ]
+    return planned
@@ -0,0 +1,112 @@
+"""Read and write transaction ledgers as CSV or JSON Lines.
+
+Records are plain mappings with the keys in :data:`FIELDNAMES`; the tracking
+sheet coerces them into ``TrackingEntry`` rows.  Both directions stream, so
+ledgers with millions of rows never have to fit in memory.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, TextIO
+
+
+FIELDNAMES: tuple[str, ...] = ("date", "type", "category", "amount", "details")
+CSV_SUFFIXES = {".csv"}
+JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+
+
+class TransactionFileError(RuntimeError):
+    """Raised when a transactions file cannot be read or written."""
+
+
+def transaction_format(path: Path) -> str:
+    """Return ``"csv"`` or ``"jsonl"`` based on the suffix of *path*."""
+
+    suffix = path.suffix.lower()
+    if suffix in CSV_SUFFIXES:
+        return "csv"
+    if suffix in JSONL_SUFFIXES:
+        return "jsonl"
+    raise TransactionFileError(
+        f"Unsupported transactions file '{path}'; use .csv, .jsonl or .ndjson"
+    )
+
+
+def iter_transaction_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield one mapping per transaction stored in *path*."""
+
+    path = Path(path)
+    file_format = transaction_format(path)
+    try:
+        with path.open(encoding="utf-8", newline="") as stream:
+            if file_format == "csv":
+                for row in csv.DictReader(stream):
+                    yield {key: (value if value != "" else None) for key, value in row.items()}
+                return
+            for line_number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise TransactionFileError(
+                        f"Invalid JSON in {path} line {line_number}: {exc.msg}"
+                    ) from exc
+                if isinstance(record, Mapping):
+                    yield dict(record)
+    except OSError as exc:
+        raise TransactionFileError(f"Unable to read transactions {path}: {exc}") from exc
+
+
+def write_transaction_records(path: Path, records: Iterable[Mapping[str, Any]]) -> int:
+    """Write *records* to *path* and return how many were written."""
+
+    path = Path(path)
+    file_format = transaction_format(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8", newline="") as stream:
+            return dump_records(stream, records, file_format)
+    except OSError as exc:
+        raise TransactionFileError(f"Unable to write transactions {path}: {exc}") from exc
+
+
+def dump_records(
+    stream: TextIO,
+    records: Iterable[Mapping[str, Any]],
+    file_format: str,
+    fieldnames: Sequence[str] = FIELDNAMES,
+) -> int:
+    """Write *records* to an open text *stream* and return how many were written.
+
+    Only the keys in *fieldnames* are written; dates become ISO strings.
+    """
+
+    count = 0
+    if file_format == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(fieldnames)
+        for record in records:
+            writer.writerow(
+                ["" if record.get(key) is None else _plain(record.get(key)) for key in fieldnames]
+            )
+            count += 1
+    else:
+        for record in records:
+            payload = {key: _plain(record.get(key)) for key in fieldnames}
+            stream.write(json.dumps(payload, separators=(",", ":")) + "\n")
+            count += 1
+    return count
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
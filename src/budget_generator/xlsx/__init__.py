@@ -0,0 +1,24 @@
+"""Lightweight helpers that read and write xlsx packages at the zip level."""
+
+from .append import AppendResult, append_transactions  # noqa: F401
+from .diff import Difference, WorkbookDiff, diff_workbooks, part_digest  # noqa: F401
+from .ingest import (  # noqa: F401
+    PLANNING_FIELDNAMES,
+    TRACKING_TABLE,
+    TableLocation,
+    iter_planning_records,
+    iter_table_records,
+    locate_table,
+)
+from .inspect import SheetInspection, WorkbookInspection, inspect_workbook  # noqa: F401
+from .package import CellRecord, PackageError, XlsxPackage, split_reference  # noqa: F401
+from .patch import PartRewriter, patch_package  # noqa: F401
+from .reproducible import ZIP_EPOCH, build_timestamp, part_order_key  # noqa: F401
+from .rollover import RolloverResult, rollover_workbook  # noqa: F401
+from .save import (  # noqa: F401
+    COMPRESSIONS,
+    DEFAULT_SAVE_OPTIONS,
+    SaveError,
+    SaveOptions,
+    save_package,
+)
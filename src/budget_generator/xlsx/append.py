@@ -0,0 +1,496 @@
+"""Append transactions to the tracking table of an existing workbook.
+
+Only the tracking sheet and its table part are rewritten; every other part is
+copied as raw compressed bytes by :func:`patch_package`, so edits made in the
+other sheets survive untouched.  The sheet XML is streamed once at the byte
+level, finding the last filled table row and a template row on the way and
+splicing in the new rows.  New rows fill the table's blank capacity rows
+first; once those run out the table ``ref``, the sheet dimension and every
+validation or conditional-format range that ends on the table's last row are
+extended.  Strings are written inline so ``sharedStrings.xml`` is not touched.
+Tracking sheets split into one table per year are rejected.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO
+from xml.sax.saxutils import unescape
+
+from openpyxl.formula.translate import Translator
+from openpyxl.utils.cell import get_column_letter, range_boundaries
+from openpyxl.utils.datetime import to_excel
+
+from ..sheets.tracking import HEADERS, TrackingEntry
+from .ingest import DATE_COLUMNS, TRACKING_TABLE, TableLocation, locate_table
+from .package import PackageError, XlsxPackage, qn
+from .patch import patch_package
+from .sheetxml import (
+    READ_BYTES,
+    cell_xml,
+    grow_reference,
+    iter_cells,
+    iter_tokens,
+    new_row,
+    replace_cells,
+    row_number,
+    tag_attributes,
+)
+
+
+# Tracking columns filled from a TrackingEntry, in TrackingEntry.values() order.
+INPUT_COLUMNS: tuple[str, ...] = HEADERS[:5]
+# Elements besides rows that append reads or edits.
+_TAGS = ("col", "dimension", "dataValidation", "conditionalFormatting", "/sheetData")
+# Held-back sheet XML stays in memory up to this size, then spills to disk.
+_SPOOL_BYTES = 16 * READ_BYTES
+
+_FORMULA = re.compile(rb"<f\b([^>]*?)(?:/>|>(.*?)</f>)", re.DOTALL)
+_SHARED = re.compile(rb'\bt="shared"')
+_SI = re.compile(rb'\bsi="(\d+)"')
+_VALUE = re.compile(rb"<(?:v>[^<]|is>)")
+_SQREF = re.compile(rb'\bsqref="([^"]*)"')
+_REF = re.compile(rb'\bref="([^"]*)"')
+_ENTITIES = {"&quot;": '"', "&apos;": "'"}
+_PARTITION = re.compile(rf"{TRACKING_TABLE}\d{{4}}", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class AppendResult:
+    """Where :func:`append_transactions` put the new rows."""
+
+    rows: int
+    first_row: int
+    last_row: int
+    table_ref: str
+    output: Path
+
+
+@dataclass(frozen=True)
+class _TemplateCell:
+    style: bytes | None
+    formula: str | None
+    # The style comes from the column's <col> element, which already formats
+    # blank cells, so only values need a cell.
+    inherited: bool = False
+
+
+def append_transactions(
+    workbook: Path | str,
+    entries: Iterable[TrackingEntry],
+    output: Path | str | None = None,
+    *,
+    table: str = TRACKING_TABLE,
+) -> AppendResult:
+    """Append *entries* after the last filled row of *table* in *workbook*.
+
+    The workbook is updated in place unless *output* is given.  Tracking
+    sheets partitioned into one table per year are not supported.
+    """
+
+    workbook = Path(workbook)
+    target = Path(output) if output is not None else workbook
+    rows = list(entries)  # needed up front to size the table; one batch of new rows
+    with XlsxPackage(workbook) as package:
+        location = _locate(package, table)
+        table_part = _table_part(package, location)
+        calculated = _calculated_formulas(package, table_part, location)
+        splice = _Splice(location, rows, package.date_epoch(), calculated)
+        if not rows:
+            # Nothing to write; read the sheet only to report where rows would go.
+            with package.open(location.part) as stream, open(os.devnull, "wb") as sink:
+                splice(stream, sink)
+
+    if not rows:
+        if target != workbook:
+            patch_package(workbook, {}, target)
+        return AppendResult(0, splice.first_row, splice.first_row - 1, splice.table_ref, target)
+
+    old_ref = _table_ref(location.bounds).encode()
+
+    def rewrite_table(original: IO[bytes], sink: IO[bytes]) -> None:
+        sink.write(original.read().replace(b'ref="%s"' % old_ref, b'ref="%s"' % splice.table_ref.encode()))
+
+    # The sheet is rewritten first: the table's new ref depends on it.
+    patch_package(workbook, {location.part: splice, table_part: rewrite_table}, target)
+    return AppendResult(len(rows), splice.first_row, splice.last_row, splice.table_ref, target)
+
+
+def _locate(package: XlsxPackage, table: str) -> TableLocation:
+    try:
+        return locate_table(package, table)
+    except PackageError:
+        partitions = sorted(
+            name
+            for part in package.sheet_parts().values()
+            for table_part in package.table_parts(part)
+            if _PARTITION.fullmatch(name := package.parse(table_part).get("displayName", ""))
+        )
+        if table.lower() != TRACKING_TABLE.lower() or not partitions:
+            raise
+        raise PackageError(
+            f"{package.path.name} keeps one tracking table per year ({', '.join(partitions)}); "
+            "append only supports a single tblTracking table"
+        ) from None
+
+
+def _table_ref(bounds: tuple[int, int, int, int]) -> str:
+    min_col, min_row, max_col, max_row = bounds
+    return f"{get_column_letter(min_col)}{min_row}:{get_column_letter(max_col)}{max_row}"
+
+
+def _calculated_formulas(package: XlsxPackage, table_part: str, location: TableLocation) -> dict[int, str]:
+    """Map sheet columns to the ``calculatedColumnFormula`` the table declares for them."""
+
+    formulas = {}
+    for offset, column in enumerate(package.parse(table_part).iter(qn("tableColumn"))):
+        formula = column.find(qn("calculatedColumnFormula"))
+        if formula is not None and formula.text:
+            formulas[location.bounds[0] + offset] = formula.text
+    return formulas
+
+
+def _table_part(package: XlsxPackage, location: TableLocation) -> str:
+    for part in package.table_parts(location.part):
+        if package.parse(part).get("displayName") == location.name:
+            return part
+    raise PackageError(f"Table part for {location.name} not found")
+
+
+class _Splice:
+    """Rewrite the tracking sheet XML with the new rows in one streamed pass.
+
+    Where the new rows go is only known at the end of the table, after the
+    ``dimension`` element and the blank rows that take the first entries.
+    Output is held back in a spooled temporary file until then, and only
+    those parts are edited as it is copied out.  After a call, ``first_row``
+    and ``last_row`` say where the rows went and ``table_ref`` is the table's
+    new reference.
+    """
+
+    def __init__(
+        self,
+        location: TableLocation,
+        entries: list[TrackingEntry],
+        epoch: datetime,
+        calculated: dict[int, str],
+    ):
+        self.location = location
+        self.entries = entries
+        self.epoch = epoch
+        self.calculated = calculated
+        self.first_row = self.last_row = self.new_end = 0
+
+    @property
+    def table_ref(self) -> str:
+        min_col, header_row, max_col, _ = self.location.bounds
+        return _table_ref((min_col, header_row, max_col, self.new_end))
+
+    def _calculated(self, inputs: dict[int, int], first_row: int, template_row: int) -> dict[int, str]:
+        # Calculated column formulas are written for the first data row.
+        return {
+            column: Translator(f"={formula}", f"{get_column_letter(column)}{first_row}").translate_formula(
+                f"{get_column_letter(column)}{template_row}"
+            )[1:]
+            for column, formula in self.calculated.items()
+            if column not in inputs
+        }
+
+    def __call__(self, original: IO[bytes], sink: IO[bytes]) -> None:
+        min_col, header_row, max_col, old_end = self.location.bounds
+        inputs = _input_columns(self.location)
+        old_end_text = b"%d" % old_end
+        new_end = old_end
+        shared: dict[bytes, tuple[str, str]] = {}
+        column_styles: dict[int, bytes] = {}
+        last_filled, filled = header_row, b""
+        blank: tuple[int, bytes] | None = None  # first blank row after the last filled one
+        blank_at = dimension_at = 0  # spool offsets of the held-back parts
+        dimension: bytes | None = None
+        new_rows: dict[int, TrackingEntry] = {}
+        pending: Iterator[int] = iter(())
+        next_row: int | None = None
+        writer: _CellWriter | None = None
+        spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_BYTES)
+        target: IO[bytes] = spool
+        # Rows are small; batching them keeps per-write deflate overhead down.
+        out = bytearray()
+
+        def flush() -> None:
+            target.write(bytes(out))
+            out.clear()
+
+        def flush_before(limit: int | None) -> None:
+            nonlocal next_row
+            while next_row is not None and (limit is None or next_row < limit):
+                assert writer is not None  # rows are only pending once the table end is known
+                out.extend(new_row(next_row, writer.render(next_row, new_rows[next_row])))
+                next_row = next(pending, None)
+
+        def emit_row(token: bytes) -> None:
+            nonlocal next_row
+            row = row_number(token)
+            if next_row is not None and next_row <= row:
+                flush_before(row)
+            if row not in new_rows:
+                out.extend(token)
+                return
+            # Cells of shared-formula groups stay: the group anchor holds the
+            # text its other cells refer to.
+            kept = {column for column, _, body in iter_cells(token) if _SHARED.search(body or b"")}
+            assert writer is not None
+            rendered = writer.render(row, new_rows[row])
+            rendered = {column: cell for column, cell in rendered.items() if column not in kept}
+            out.extend(replace_cells(token, rendered, (min_col, max_col), keep=kept))
+            next_row = next(pending, None)
+
+        def finish_table() -> None:
+            nonlocal target, writer, new_rows, pending, next_row, new_end
+            flush()
+            self.first_row = last_filled + 1
+            self.last_row = self.first_row + len(self.entries) - 1
+            new_end = self.new_end = max(old_end, self.last_row)
+            template_row, template_token = blank or (last_filled, filled)
+            writer = _CellWriter(
+                self.location,
+                template_row,
+                _template(
+                    template_token,
+                    (min_col, max_col),
+                    shared,
+                    column_styles,
+                    self._calculated(inputs, header_row + 1, template_row),
+                ),
+                self.epoch,
+            )
+            new_rows = {self.first_row + offset: entry for offset, entry in enumerate(self.entries)}
+            pending = iter(sorted(new_rows))
+            next_row = next(pending, None)
+
+            end = spool.tell()
+            spool.seek(0)
+            target = sink
+            _copy(spool, sink, dimension_at)
+            if dimension is not None:
+                sink.write(
+                    _REF.sub(lambda m: b'ref="%s"' % grow_reference(m.group(1), max_row=new_end), dimension)
+                )
+            _copy(spool, sink, (blank_at if blank is not None else end) - dimension_at)
+            for text, token in iter_tokens(spool) if blank is not None else ():
+                out.extend(text)
+                if token is not None:
+                    emit_row(token)
+            spool.close()
+
+        for text, token in iter_tokens(original, _TAGS):
+            out.extend(text)
+            if token is None:
+                pass
+            elif token.startswith(b"<row"):
+                row = row_number(token)
+                if target is spool and header_row < row <= old_end:
+                    has_input = False
+                    for column, attributes, body in iter_cells(token):
+                        has_input = has_input or (column in inputs and bool(_VALUE.search(body or b"")))
+                        if min_col <= column <= max_col and b"</f>" in (body or b""):
+                            _formula_text(attributes, body, shared)  # records shared-formula anchors
+                    if has_input:
+                        last_filled, filled, blank = row, token, None
+                    elif blank is None:
+                        flush()
+                        blank, blank_at = (row, token), spool.tell()
+                    out.extend(token)
+                    continue
+                if target is spool and row > old_end:
+                    finish_table()
+                if target is spool:
+                    out.extend(token)
+                else:
+                    emit_row(token)
+            elif token.startswith(b"<col"):
+                attributes = tag_attributes(token)
+                if b"style" in attributes:
+                    for column in range(int(attributes[b"min"]), int(attributes[b"max"]) + 1):
+                        column_styles[column] = attributes[b"style"]
+                out.extend(token)
+            elif token.startswith(b"<dimension") and target is spool:
+                flush()
+                dimension, dimension_at = token, spool.tell()
+            elif token == b"</sheetData>":
+                if target is spool:
+                    finish_table()
+                flush_before(None)
+                out.extend(token)
+            elif new_end > old_end and old_end_text in token:
+                out.extend(
+                    _SQREF.sub(
+                        lambda m: b'sqref="%s"' % _extend(m.group(1), min_col, max_col, old_end, new_end),
+                        token,
+                    )
+                )
+            else:
+                out.extend(token)
+            if len(out) >= READ_BYTES:
+                flush()
+        if target is spool:
+            finish_table()
+        flush()
+
+
+def _template(
+    row: bytes,
+    span: tuple[int, int],
+    shared: dict[bytes, tuple[str, str]],
+    column_styles: dict[int, bytes],
+    calculated: dict[int, str],
+) -> dict[int, _TemplateCell]:
+    """Return the template cells of *row* within the table's column *span*.
+
+    The template row is the first blank row after the last filled one (a
+    styled capacity row) or, when the table is full, the last filled row
+    itself.  Columns the row leaves out fall back to their column style, and
+    calculated columns holding a value rather than a formula (such as a
+    static Effective Date) take the table's *calculated* formula.
+    """
+
+    min_col, max_col = span
+    template: dict[int, _TemplateCell] = {}
+    for column, attributes, body in iter_cells(row):
+        if min_col <= column <= max_col:
+            template[column] = _TemplateCell(
+                style=attributes.get(b"s"),
+                formula=_formula_text(attributes, body, shared),
+            )
+    for column, style in column_styles.items():
+        if min_col <= column <= max_col and column not in template:
+            template[column] = _TemplateCell(style, None, inherited=True)
+    for column, formula in calculated.items():
+        cell = template.get(column, _TemplateCell(None, None))
+        if cell.formula is None:
+            template[column] = _TemplateCell(cell.style, formula, cell.inherited)
+    return template
+
+
+def _copy(source: IO[bytes], sink: IO[bytes], size: int) -> None:
+    while size > 0:
+        chunk = source.read(min(size, READ_BYTES))
+        if not chunk:
+            break
+        sink.write(chunk)
+        size -= len(chunk)
+
+
+def _formula_text(
+    attributes: dict[bytes, bytes], body: bytes | None, shared: dict[bytes, tuple[str, str]]
+) -> str | None:
+    """Return a cell's formula, spelling out cells of shared-formula groups.
+
+    Group anchors are recorded in *shared* as they are met; the sheet lists
+    them before the cells that refer to them.
+    """
+
+    formula = _FORMULA.search(body or b"")
+    if formula is None:
+        return None
+    tag, raw = formula.groups()
+    text = unescape(raw.decode("utf-8"), _ENTITIES) if raw else None
+    si = _SI.search(tag)
+    if si is None or not _SHARED.search(tag):
+        return text
+    ref = attributes.get(b"r", b"").decode("ascii")
+    if text:
+        shared[si.group(1)] = (text, ref)
+        return text
+    if si.group(1) not in shared:
+        return None
+    text, anchor = shared[si.group(1)]
+    return Translator(f"={text}", anchor).translate_formula(ref)[1:]
+
+
+def _extend(ranges: bytes, min_col: int, max_col: int, old_end: int, new_end: int) -> bytes:
+    """Stretch ranges inside the column span that end on *old_end* to *new_end*."""
+
+    if new_end <= old_end:
+        return ranges
+    extended = []
+    for reference in ranges.decode("ascii").split():
+        first_col, first_row, last_col, last_row = range_boundaries(reference)
+        if (
+            first_col is not None
+            and min_col <= first_col <= last_col <= max_col
+            and last_row == old_end
+        ):
+            reference = (
+                f"{get_column_letter(first_col)}{first_row}:{get_column_letter(last_col)}{new_end}"
+            )
+        extended.append(reference)
+    return " ".join(extended).encode("ascii")
+
+
+class _CellWriter:
+    """Render the table cells of one new row from a template row."""
+
+    def __init__(
+        self,
+        location: TableLocation,
+        template_row: int,
+        template: dict[int, _TemplateCell],
+        epoch: datetime,
+    ):
+        self.epoch = epoch
+        self.template_row = template_row
+        self.template = template
+        self.inputs = _input_columns(location)
+        self.dates = {
+            location.bounds[0] + offset
+            for offset, column in enumerate(location.columns)
+            if column in DATE_COLUMNS
+        }
+        self.columns = range(location.bounds[0], location.bounds[2] + 1)
+        self._translators: dict[str, Translator] = {}
+
+    def render(self, row: int, entry: TrackingEntry) -> dict[int, bytes]:
+        values = entry.values()
+        cells: dict[int, bytes] = {}
+        for column in self.columns:
+            cell = self.template.get(column, _TemplateCell(None, None))
+            if column in self.inputs:
+                value = values[self.inputs[column]]
+                if isinstance(value, datetime) and column in self.dates:
+                    value = to_excel(value, self.epoch)
+                if value is not None or (cell.style and not cell.inherited):
+                    cells[column] = cell_xml(column, row, value, style=cell.style)
+            elif cell.formula is not None:
+                formula = self._translate(get_column_letter(column), cell.formula, row)
+                cells[column] = cell_xml(column, row, style=cell.style, formula=formula)
+            elif cell.style and not cell.inherited:
+                cells[column] = cell_xml(column, row, style=cell.style)
+        return cells
+
+    def _translate(self, letter: str, formula: str, row: int) -> str:
+        # Structured references do not move; plain A1 references shift with the row.
+        if row == self.template_row:
+            return formula
+        # Tokenising the formula is the expensive part, so do it once per column.
+        translator = self._translators.get(letter)
+        if translator is None:
+            translator = Translator(f"={formula}", f"{letter}{self.template_row}")
+            self._translators[letter] = translator
+        return translator.translate_formula(f"{letter}{row}")[1:]
+
+
+def _input_columns(location: TableLocation) -> dict[int, int]:
+    """Map sheet columns to their index in ``TrackingEntry.values()``."""
+
+    positions = {}
+    for name in INPUT_COLUMNS:
+        if name not in location.columns:
+            raise PackageError(f"Table {location.name} has no {name} column")
+        positions[location.bounds[0] + location.columns.index(name)] = INPUT_COLUMNS.index(name)
+    return positions
@@ -0,0 +1,385 @@
+"""Structural comparison of two xlsx packages.
+
+Parts are compared cheaply first (zip CRC and size), then by a hash of their
+canonical XML so attribute order and document timestamps do not count as
+changes.  Only parts whose canonical hashes differ are parsed further and
+reported at cell, validation, conditional format and defined-name level.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+from xml.etree import ElementTree as ET
+
+from .package import XlsxPackage, canonical_element, qn
+
+
+CORE_PROPS_NS = "http://purl.org/dc/terms/"
+TIMESTAMP_TAGS = frozenset(
+    {
+        qn("created", CORE_PROPS_NS),
+        qn("modified", CORE_PROPS_NS),
+        qn("lastPrinted", "http://schemas.openxmlformats.org/package/2006/metadata/core-properties"),
+    }
+)
+XML_SUFFIXES = (".xml", ".rels", ".vml")
+# Parts whose content is resolved through the worksheets that reference them.
+SHARED_PARTS = ("sharedStrings.xml", "styles.xml")
+
+
+@dataclass(frozen=True)
+class Difference:
+    """One reported difference between the expected and actual workbook."""
+
+    kind: str
+    location: str
+    expected: str | None = None
+    actual: str | None = None
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.location}: {self.expected!r} -> {self.actual!r}"
+
+
+@dataclass
+class WorkbookDiff:
+    """The differences found between two workbooks."""
+
+    differences: list[Difference] = field(default_factory=list)
+    parts_compared: int = 0
+    parts_descended: int = 0
+
+    @property
+    def identical(self) -> bool:
+        return not self.differences
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "identical": self.identical,
+            "parts_compared": self.parts_compared,
+            "parts_descended": self.parts_descended,
+            "differences": [asdict(item) for item in self.differences],
+        }
+
+
+@dataclass
+class _SheetContent:
+    cells: dict[str, tuple[str | None, str | None, str | None]] = field(default_factory=dict)
+    validations: dict[str, str] = field(default_factory=dict)
+    conditional_formats: dict[str, list[str]] = field(default_factory=dict)
+    merges: set[str] = field(default_factory=set)
+
+
+def diff_workbooks(expected: Path | str, actual: Path | str) -> WorkbookDiff:
+    """Compare *actual* against *expected* and return every difference found."""
+
+    with XlsxPackage(expected) as left, XlsxPackage(actual) as right:
+        result = WorkbookDiff()
+        left_names, right_names = set(left.names()), set(right.names())
+        changed: list[str] = []
+        for name in sorted(left_names | right_names):
+            result.parts_compared += 1
+            if name not in right_names:
+                result.differences.append(Difference("part", name, "present", None))
+            elif name not in left_names:
+                result.differences.append(Difference("part", name, None, "present"))
+            elif not _same_part(left, right, name):
+                changed.append(name)
+
+        left_sheets = {part: sheet for sheet, part in left.sheet_parts().items()}
+        right_sheets = {part: sheet for sheet, part in right.sheet_parts().items()}
+        # A changed string or style table alters cells without touching sheet XML.
+        shared_changed = any(name.endswith(SHARED_PARTS) for name in changed)
+        sheet_parts = sorted(set(left_sheets) & set(right_sheets))
+        to_descend = [
+            name
+            for name in changed
+            if not name.endswith(SHARED_PARTS) and name not in sheet_parts
+        ]
+        to_descend += [
+            name for name in sheet_parts if shared_changed or name in changed
+        ]
+
+        for name in to_descend:
+            result.parts_descended += 1
+            if name in left_sheets:
+                found = _diff_sheet(left, right, name, left_sheets[name])
+            elif name == left.workbook_part:
+                found = _diff_workbook_part(left, right)
+            else:
+                found = []
+            if not found and name in changed:
+                # A sheet's cells were compared above; only its other elements are left.
+                found = _diff_elements(left, right, name, content_fallback=name not in left_sheets)
+            result.differences.extend(found)
+        return result
+
+
+def part_digest(package: XlsxPackage, name: str) -> str:
+    """Return the SHA-256 of *name*'s canonical form (raw bytes for binaries)."""
+
+    digest = hashlib.sha256()
+    if not name.endswith(XML_SUFFIXES):
+        digest.update(package.read(name))
+        return digest.hexdigest()
+
+    if name.startswith("docProps/"):
+        root = package.parse(name)
+        for element in [child for child in root if child.tag in TIMESTAMP_TAGS]:
+            root.remove(element)
+        digest.update(canonical_element(root).encode("utf-8"))
+        return digest.hexdigest()
+
+    with package.open(name) as stream:
+        ET.canonicalize(from_file=stream, out=_HashWriter(digest), strip_text=True)
+    return digest.hexdigest()
+
+
+def _same_part(left: XlsxPackage, right: XlsxPackage, name: str) -> bool:
+    left_info, right_info = left.info(name), right.info(name)
+    if left_info.CRC == right_info.CRC and left_info.file_size == right_info.file_size:
+        return True
+    return part_digest(left, name) == part_digest(right, name)
+
+
+def _diff_workbook_part(left: XlsxPackage, right: XlsxPackage) -> list[Difference]:
+    found: list[Difference] = []
+    left_sheets, right_sheets = list(left.sheet_parts()), list(right.sheet_parts())
+    if left_sheets != right_sheets:
+        found.append(Difference("sheets", "workbook", ", ".join(left_sheets), ", ".join(right_sheets)))
+
+    left_names, right_names = left.defined_names(), right.defined_names()
+    for name in sorted(set(left_names) | set(right_names)):
+        if left_names.get(name) != right_names.get(name):
+            found.append(Difference("defined-name", name, left_names.get(name), right_names.get(name)))
+    return found
+
+
+def _diff_sheet(
+    left: XlsxPackage,
+    right: XlsxPackage,
+    part: str,
+    sheet: str,
+) -> list[Difference]:
+    expected, actual = _read_sheet(left, part), _read_sheet(right, part)
+    found: list[Difference] = []
+
+    for ref in sorted(set(expected.cells) | set(actual.cells), key=_cell_sort_key):
+        before = expected.cells.get(ref, (None, None, None))
+        after = actual.cells.get(ref, (None, None, None))
+        for index, kind in enumerate(("cell-value", "cell-formula", "cell-style")):
+            if before[index] != after[index]:
+                found.append(Difference(kind, f"{sheet}!{ref}", before[index], after[index]))
+
+    for sqref in sorted(set(expected.validations) | set(actual.validations)):
+        if expected.validations.get(sqref) != actual.validations.get(sqref):
+            found.append(
+                Difference(
+                    "validation",
+                    f"{sheet}!{sqref}",
+                    expected.validations.get(sqref),
+                    actual.validations.get(sqref),
+                )
+            )
+
+    for sqref in sorted(set(expected.conditional_formats) | set(actual.conditional_formats)):
+        before_rules = expected.conditional_formats.get(sqref)
+        after_rules = actual.conditional_formats.get(sqref)
+        if before_rules != after_rules:
+            found.append(
+                Difference(
+                    "conditional-format",
+                    f"{sheet}!{sqref}",
+                    "\n".join(before_rules) if before_rules else None,
+                    "\n".join(after_rules) if after_rules else None,
+                )
+            )
+
+    for ref in sorted(expected.merges ^ actual.merges):
+        found.append(
+            Difference(
+                "merge",
+                f"{sheet}!{ref}",
+                "merged" if ref in expected.merges else None,
+                "merged" if ref in actual.merges else None,
+            )
+        )
+    return found
+
+
+def _diff_elements(
+    left: XlsxPackage, right: XlsxPackage, part: str, *, content_fallback: bool = True
+) -> list[Difference]:
+    """Fall back to the top-level elements of *part* that differ, child by child.
+
+    Children are matched by their ``name`` (or ``ref``) attribute, so a
+    changed defined name reports that name and the attributes that changed.
+    Elements that only differ in child order are named with ``(order)``.
+    When nothing else differs the part is reported as a whole, unless
+    *content_fallback* is off: worksheet XML also changes when only style
+    indexes are renumbered or shared formulas are spelled out, which the
+    resolved cell comparison has already judged.
+    """
+
+    expected, actual = _top_level_elements(left, part), _top_level_elements(right, part)
+    found: list[Difference] = []
+    reordered: list[str] = []
+    for tag in dict.fromkeys([*expected, *actual]):
+        before, after = expected.get(tag, {}), actual.get(tag, {})
+        if before == after:
+            if list(before) != list(after):
+                reordered.append(tag)
+            continue
+        for key in dict.fromkeys([*before, *after]):
+            if before.get(key) != after.get(key):
+                location = f"{part}:{tag}/{key}" if key else f"{part}:{tag}"
+                changed = _changed_attributes(before.get(key), after.get(key))
+                found.append(Difference("element", location, *changed))
+    if reordered:
+        found.append(Difference("part", part, ", ".join(f"{tag} (order)" for tag in reordered)))
+    if not found and content_fallback:
+        found.append(Difference("part", part, "content differs", "content differs"))
+    return found
+
+
+_Summary = dict[str, str]  # attribute -> value, plus "text" and "children"
+
+
+def _changed_attributes(before: _Summary | None, after: _Summary | None) -> tuple[str | None, str | None]:
+    """Describe the attributes that differ between two element summaries."""
+
+    if before is None or after is None:
+        return ("present" if before is not None else None, "present" if after is not None else None)
+    keys = [key for key in dict.fromkeys([*before, *after]) if before.get(key) != after.get(key)]
+
+    def describe(summary: _Summary) -> str | None:
+        return ", ".join(f"{key}={summary[key]!r}" for key in keys if key in summary) or None
+
+    return describe(before), describe(after)
+
+
+def _summary(element: ET.Element) -> _Summary:
+    summary = {key.rsplit("}", 1)[-1]: value for key, value in element.attrib.items()}
+    if element.text and element.text.strip():
+        summary["text"] = element.text.strip()
+    if len(element):
+        summary["children"] = "".join(canonical_element(child) for child in element)
+    return summary
+
+
+def _identity(element: ET.Element) -> str | None:
+    for attribute in ("name", "ref", "sqref"):
+        value = element.get(attribute)
+        if value is not None:
+            scope = element.get("localSheetId")
+            return value if scope is None else f"{value}@{scope}"
+    return None
+
+
+def _child_key(child: ET.Element, index: int) -> str:
+    identity = _identity(child)
+    return f"{child.tag.rsplit('}', 1)[-1]}[{index if identity is None else identity}]"
+
+
+def _top_level_elements(package: XlsxPackage, part: str) -> dict[str, dict[str, _Summary]]:
+    """Return each top-level element of *part* as ``{child key: summary}``.
+
+    An element without children is summarised under the empty key.
+    """
+
+    if not part.endswith(XML_SUFFIXES):
+        return {}
+    elements: dict[str, dict[str, _Summary]] = {}
+    depth = 0
+    with package.open(part) as stream:
+        for event, element in ET.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if element.tag == qn("row"):
+                element.clear()
+            elif depth == 1:
+                # Cells are compared separately; keep the summary to layout.
+                tag = element.tag.rsplit("}", 1)[-1]
+                children = elements.setdefault(tag, {})
+                # Repeated elements such as conditionalFormatting carry an sqref.
+                own = _child_key(element, 0) if _identity(element) is not None else ""
+                if tag == "sheetData":
+                    pass
+                elif tag == "sheetViews":
+                    _fill_selection_defaults(element)
+                elif len(element):
+                    for index, child in enumerate(element):
+                        key = _child_key(child, index)
+                        children[f"{own}/{key}" if own else key] = _summary(child)
+                else:
+                    children[own] = _summary(element)
+                element.clear()
+    return elements
+
+
+def _fill_selection_defaults(views: ET.Element) -> None:
+    """Spell out the defaults of each pane ``selection`` so omitting them is no change.
+
+    ``sqref`` defaults to ``A1`` and the active cell is the first selected one.
+    """
+
+    for selection in views.iter(qn("selection")):
+        sqref = selection.attrib.setdefault("sqref", "A1")
+        selection.attrib.setdefault("activeCell", sqref.split()[0].split(":")[0])
+
+
+def _read_sheet(package: XlsxPackage, part: str) -> _SheetContent:
+    content = _SheetContent()
+    styles = package.cell_styles()
+    for cell in package.iter_cells(part):
+        style = styles[cell.style] if cell.style < len(styles) else str(cell.style)
+        content.cells[cell.ref] = (cell.value, cell.formula, style)
+
+    dxfs = package.differential_styles()
+    with package.open(part) as stream:
+        for _, element in ET.iterparse(stream):
+            if element.tag == qn("row"):
+                element.clear()
+            elif element.tag == qn("dataValidation"):
+                content.validations[element.get("sqref", "")] = canonical_element(element)
+            elif element.tag == qn("conditionalFormatting"):
+                rules = []
+                for rule in element.findall(qn("cfRule")):
+                    # Priorities and dxf indexes depend on write order, not content.
+                    rule.attrib.pop("priority", None)
+                    dxf_id = rule.attrib.pop("dxfId", None)
+                    description = canonical_element(rule)
+                    if dxf_id is not None and int(dxf_id) < len(dxfs):
+                        description += dxfs[int(dxf_id)]
+                    rules.append(description)
+                sqref = element.get("sqref", "")
+                content.conditional_formats.setdefault(sqref, []).extend(rules)
+            elif element.tag == qn("mergeCell"):
+                content.merges.add(element.get("ref", ""))
+    for rules in content.conditional_formats.values():
+        rules.sort()
+    return content
+
+
+def _cell_sort_key(ref: str) -> tuple[int, int]:
+    letters = ref.rstrip("0123456789")
+    column = 0
+    for char in letters:
+        column = column * 26 + ord(char.upper()) - 64
+    row = int(ref[len(letters):] or 0)
+    return row, column
+
+
+class _HashWriter:
+    """File-like adapter feeding canonical XML text into a hash."""
+
+    def __init__(self, digest: "hashlib._Hash"):
+        self.digest = digest
+
+    def write(self, text: str) -> int:
+        self.digest.update(text.encode("utf-8"))
+        return len(text)
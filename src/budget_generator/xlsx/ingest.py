@@ -0,0 +1,201 @@
+"""Stream the tracking ledger and planning grids back out of a workbook.
+
+Rows are read straight from the worksheet XML with :meth:`XlsxPackage.iter_rows`,
+so a million-row tracking table is converted with flat memory and the rest of
+the workbook is never parsed.  Only values are read; formulas without cached
+results (as openpyxl writes them) come back as ``None``.
+"""
+
+from __future__ import annotations
+
+import calendar
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from openpyxl.utils.cell import coordinate_to_tuple
+from openpyxl.utils.datetime import from_excel
+
+from ..sheets.planning import PlanningSheetBuilder
+from .package import CellRecord, PackageError, XlsxPackage, qn, split_reference
+
+
+TRACKING_TABLE = "tblTracking"
+# Table columns holding date serials that are converted to ISO dates.
+DATE_COLUMNS = frozenset({"Date", "Effective Date"})
+# (section, grid name, category name) for each planning block.
+PLANNING_GRIDS: tuple[tuple[str, str, str], ...] = (
+    ("Income", "IncomeGrid", "IncomeCats"),
+    ("Expenses", "ExpenseGrid", "ExpenseCats"),
+    ("Savings", "SavingsGrid", "SavingsCats"),
+)
+PLANNING_FIELDNAMES: tuple[str, ...] = ("section", "category", "year", "month", "amount")
+MONTHS: tuple[str, ...] = tuple(calendar.month_abbr[1:])
+
+_BANNER = re.compile(r"StartingYear\+(\d+)")
+
+
+@dataclass(frozen=True)
+class TableLocation:
+    """Where a worksheet table lives inside the package."""
+
+    name: str
+    sheet: str
+    part: str
+    bounds: tuple[int, int, int, int]
+    columns: tuple[str, ...]
+
+    @property
+    def fieldnames(self) -> tuple[str, ...]:
+        """Record keys for the table columns, e.g. ``Effective Date`` -> ``effective_date``."""
+
+        return tuple(_field_name(column) for column in self.columns)
+
+
+def locate_table(package: XlsxPackage, name: str = TRACKING_TABLE) -> TableLocation:
+    """Find the worksheet table called *name* (matched case-insensitively)."""
+
+    for sheet, part in package.sheet_parts().items():
+        for table_part in package.table_parts(part):
+            table = package.parse(table_part)
+            if table.get("displayName", table.get("name", "")).lower() != name.lower():
+                continue
+            min_col, min_row, max_col, max_row = split_reference(f"'{sheet}'!{table.get('ref', '')}")[1]
+            columns = tuple(column.get("name", "") for column in table.iter(qn("tableColumn")))
+            if int(table.get("headerRowCount", "1")) != 1:
+                raise PackageError(f"Table {name} has no single header row")
+            return TableLocation(
+                name=table.get("displayName", name),
+                sheet=sheet,
+                part=part,
+                bounds=(min_col, min_row, max_col, max_row),
+                columns=columns,
+            )
+    raise PackageError(f"{package.path.name} has no table named {name}")
+
+
+def iter_table_records(package: XlsxPackage, location: TableLocation) -> Iterator[dict[str, Any]]:
+    """Yield one record per non-empty data row of the table at *location*."""
+
+    min_col, min_row, max_col, max_row = location.bounds
+    fieldnames = location.fieldnames
+    dates = {min_col + offset for offset, column in enumerate(location.columns) if column in DATE_COLUMNS}
+    epoch = package.date_epoch()
+    for _, cells in package.iter_rows(location.part, min_row=min_row + 1, max_row=max_row):
+        record: dict[str, Any] = dict.fromkeys(fieldnames)
+        for cell in cells:
+            column = coordinate_to_tuple(cell.ref)[1]
+            if min_col <= column <= max_col:
+                record[fieldnames[column - min_col]] = _cell_value(cell, column in dates, epoch)
+        if any(value is not None for value in record.values()):
+            yield record
+
+
+def iter_planning_records(package: XlsxPackage) -> Iterator[dict[str, Any]]:
+    """Yield one record per category, year and month of the planning grids.
+
+    Categories come from the ``*Cats`` named ranges and year 1 amounts from
+    the matching ``*Grid`` ranges; later years sit in the same rows, one year
+    block further right each, found by their ``StartingYear+N`` banners.
+    The grid's trailing Total column is skipped because it is derived.  Rows
+    without a category name are ignored, as are year blocks after the first
+    that hold no amounts for the row.
+    """
+
+    names = package.defined_names()
+    sheets = package.sheet_parts()
+    epoch = package.date_epoch()
+    year = _named_value(package, names, sheets, "StartingYear", epoch)
+    blocks: dict[str, list[tuple[int, int]]] = {}
+    for section, grid_name, cats_name in PLANNING_GRIDS:
+        if grid_name not in names or cats_name not in names:
+            raise PackageError(f"{package.path.name} does not define {grid_name} and {cats_name}")
+        sheet, (min_col, min_row, max_col, max_row) = split_reference(names[grid_name])
+        cats_sheet, (cats_col, cats_min, _, cats_max) = split_reference(names[cats_name])
+        if cats_sheet != sheet or (cats_min, cats_max) != (min_row, max_row):
+            raise PackageError(f"{cats_name} does not line up with {grid_name}")
+        if sheet not in sheets:
+            raise PackageError(f"{grid_name} points at missing sheet {sheet}")
+        if sheet not in blocks:
+            blocks[sheet] = _year_blocks(package, sheets[sheet], min_col)
+        months = MONTHS[: max_col - min_col + 1]
+        for _, cells in package.iter_rows(sheets[sheet], min_row=min_row, max_row=max_row):
+            values = {coordinate_to_tuple(cell.ref)[1]: cell for cell in cells}
+            category = values.get(cats_col)
+            if category is None or not category.value:
+                continue
+            for offset, start in blocks[sheet]:
+                amounts = [values.get(start + position) for position in range(len(months))]
+                if offset and all(cell is None or cell.value is None for cell in amounts):
+                    continue
+                for month, cell in zip(months, amounts):
+                    yield {
+                        "section": section,
+                        "category": _cell_value(category, False, epoch),
+                        "year": year + offset if isinstance(year, int) else year,
+                        "month": month,
+                        "amount": _cell_value(cell, False, epoch) if cell is not None else None,
+                    }
+
+
+def _year_blocks(package: XlsxPackage, part: str, first_column: int) -> list[tuple[int, int]]:
+    """Return ``(year offset, first column)`` of each planning year block on *part*.
+
+    Year 1 starts at *first_column*; later years are the ``StartingYear+N``
+    banners found on the banner row at the layout's block spacing.
+    """
+
+    blocks = {0: first_column}
+    width = PlanningSheetBuilder.YEAR_BLOCK_WIDTH
+    banner_row = PlanningSheetBuilder.BANNER_ROW
+    for _, cells in package.iter_rows(part, min_row=banner_row, max_row=banner_row):
+        for cell in cells:
+            match = _BANNER.fullmatch((cell.formula or "").lstrip("="))
+            column = coordinate_to_tuple(cell.ref)[1]
+            if match is not None and column == first_column + int(match.group(1)) * width:
+                blocks[int(match.group(1))] = column
+    return sorted(blocks.items())
+
+
+def _named_value(
+    package: XlsxPackage,
+    names: dict[str, str],
+    sheets: dict[str, str],
+    name: str,
+    epoch: datetime,
+) -> Any:
+    if name not in names:
+        return None
+    sheet, (column, row, _, _) = split_reference(names[name])
+    if sheet not in sheets:
+        return None
+    for _, cells in package.iter_rows(sheets[sheet], min_row=row, max_row=row):
+        for cell in cells:
+            if coordinate_to_tuple(cell.ref)[1] == column:
+                return _cell_value(cell, False, epoch)
+    return None
+
+
+def _cell_value(cell: CellRecord, is_date: bool, epoch: datetime) -> Any:
+    if cell.value is None:
+        return None
+    if cell.data_type in ("s", "inlineStr", "str", "e"):
+        return cell.value
+    if cell.data_type == "b":
+        return cell.value == "1"
+    try:
+        number = float(cell.value)
+    except ValueError:
+        return cell.value
+    if is_date:
+        moment = from_excel(number, epoch)
+        if isinstance(moment, datetime) and moment.time() == datetime.min.time():
+            return moment.date()
+        return moment if isinstance(moment, (date, datetime)) else number
+    return int(number) if number.is_integer() else number
+
+
+def _field_name(column: str) -> str:
+    return "_".join(column.lower().split())
@@ -0,0 +1,157 @@
+"""Size and object breakdown of an xlsx package, read straight from the zip."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+from xml.etree import ElementTree as ET
+
+from .package import XlsxPackage, qn
+
+
+HEAVIEST_PARTS = 5
+
+
+@dataclass
+class PartSize:
+    """Compressed and uncompressed size of one zip member."""
+
+    name: str
+    compressed_bytes: int
+    uncompressed_bytes: int
+
+
+@dataclass
+class TableInfo:
+    """A table defined on a worksheet."""
+
+    name: str
+    ref: str
+    part: str
+
+
+@dataclass
+class SheetInspection:
+    """Object counts and sizes for one worksheet part."""
+
+    name: str
+    part: str
+    compressed_bytes: int = 0
+    uncompressed_bytes: int = 0
+    cells: int = 0
+    formulas: int = 0
+    styles: int = 0
+    data_validations: int = 0
+    validation_ranges: int = 0
+    conditional_format_rules: int = 0
+    merged_cells: int = 0
+    tables: list[TableInfo] = field(default_factory=list)
+    # Uncompressed bytes per top-level worksheet element, e.g. sheetData.  Other
+    # elements are re-serialised to measure them, so the split is approximate.
+    element_bytes: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class WorkbookInspection:
+    """Everything ``budget-generator inspect`` reports for a workbook."""
+
+    path: str
+    compressed_bytes: int
+    uncompressed_bytes: int
+    cell_styles: int
+    differential_styles: int
+    sheets: list[SheetInspection]
+    defined_names: dict[str, str]
+    heaviest_parts: list[PartSize]
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def inspect_workbook(path: Path | str, *, heaviest: int = HEAVIEST_PARTS) -> WorkbookInspection:
+    """Stream the package at *path* and summarise where its bytes go."""
+
+    with XlsxPackage(path) as package:
+        sizes = [
+            PartSize(info.filename, info.compress_size, info.file_size)
+            for info in package.archive.infolist()
+        ]
+        sheets = [
+            _inspect_sheet(package, name, part)
+            for name, part in package.sheet_parts().items()
+        ]
+        return WorkbookInspection(
+            path=str(path),
+            compressed_bytes=sum(size.compressed_bytes for size in sizes),
+            uncompressed_bytes=sum(size.uncompressed_bytes for size in sizes),
+            cell_styles=len(package.cell_styles()),
+            differential_styles=len(package.differential_styles()),
+            sheets=sheets,
+            defined_names=package.defined_names(),
+            heaviest_parts=sorted(sizes, key=lambda size: size.uncompressed_bytes, reverse=True)[
+                :heaviest
+            ],
+        )
+
+
+def _inspect_sheet(package: XlsxPackage, name: str, part: str) -> SheetInspection:
+    info = package.info(part)
+    sheet = SheetInspection(
+        name=name,
+        part=part,
+        compressed_bytes=info.compress_size,
+        uncompressed_bytes=info.file_size,
+    )
+
+    styles: set[str] = set()
+    depth = 0
+    sheet_data = None
+    with package.open(part) as stream:
+        for event, element in ET.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if element.tag == qn("sheetData"):
+                    sheet_data = element
+                continue
+            depth -= 1
+            tag = element.tag
+            if tag == qn("c"):
+                sheet.cells += 1
+                styles.add(element.get("s", "0"))
+            elif tag == qn("f"):
+                sheet.formulas += 1
+            elif tag == qn("row"):
+                element.clear()
+                if sheet_data is not None:
+                    sheet_data.remove(element)
+            elif tag == qn("dataValidation"):
+                sheet.data_validations += 1
+                sheet.validation_ranges += len(element.get("sqref", "").split())
+            elif tag == qn("cfRule"):
+                sheet.conditional_format_rules += 1
+            elif tag == qn("mergeCell"):
+                sheet.merged_cells += 1
+
+            if depth == 1 and tag != qn("sheetData"):
+                local = tag.rsplit("}", 1)[-1]
+                size = len(ET.tostring(element, encoding="unicode").encode("utf-8"))
+                sheet.element_bytes[local] = sheet.element_bytes.get(local, 0) + size
+                element.clear()
+
+    # Cells are cleared while streaming, so sheetData takes the remainder.
+    sheet.element_bytes["sheetData"] = max(
+        0, sheet.uncompressed_bytes - sum(sheet.element_bytes.values())
+    )
+    sheet.styles = len(styles)
+
+    for table_part in package.table_parts(part):
+        table = package.parse(table_part)
+        sheet.tables.append(
+            TableInfo(
+                name=table.get("displayName") or table.get("name", ""),
+                ref=table.get("ref", ""),
+                part=table_part,
+            )
+        )
+    return sheet
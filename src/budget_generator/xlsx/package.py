@@ -0,0 +1,350 @@
+"""Read-only access to the parts of an xlsx package without openpyxl.
+
+The helpers stream zip members and parse only the XML parts they are asked
+for, which keeps inspection of large workbooks cheap.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import zipfile
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO
+from xml.etree import ElementTree as ET
+
+from openpyxl.formula.translate import Translator
+from openpyxl.utils.cell import range_boundaries
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+DOC_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_DOCUMENT_REL = f"{DOC_REL_NS}/officeDocument"
+
+
+def qn(tag: str, namespace: str = MAIN_NS) -> str:
+    """Return the Clark-notation name of *tag* in *namespace*."""
+
+    return f"{{{namespace}}}{tag}"
+
+
+_FORMULA_TAG, _VALUE_TAG, _TEXT_TAG = qn("f"), qn("v"), qn("t")
+
+
+class PackageError(RuntimeError):
+    """Raised when a file is not a readable xlsx package."""
+
+
+@dataclass(frozen=True)
+class CellRecord:
+    """A single ``<c>`` element from a worksheet part."""
+
+    ref: str
+    data_type: str
+    value: str | None
+    formula: str | None
+    style: int
+
+
+class XlsxPackage:
+    """Wrap an xlsx zip archive and resolve its workbook structure."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        try:
+            self.archive = zipfile.ZipFile(self.path)
+        except (OSError, zipfile.BadZipFile) as exc:
+            raise PackageError(f"Cannot open {self.path} as an xlsx package: {exc}") from exc
+        self._shared_strings: list[str] | None = None
+        self._cell_styles: list[str] | None = None
+        self._dxfs: list[str] | None = None
+
+    def __enter__(self) -> "XlsxPackage":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.archive.close()
+
+    # ------------------------------------------------------------------
+    # Raw parts
+    # ------------------------------------------------------------------
+    def names(self) -> list[str]:
+        return self.archive.namelist()
+
+    def info(self, name: str) -> zipfile.ZipInfo:
+        return self.archive.getinfo(name)
+
+    def read(self, name: str) -> bytes:
+        return self.archive.read(name)
+
+    def open(self, name: str) -> IO[bytes]:
+        return self.archive.open(name)
+
+    def parse(self, name: str) -> ET.Element:
+        with self.open(name) as stream:
+            return ET.parse(stream).getroot()
+
+    # ------------------------------------------------------------------
+    # Relationships and workbook structure
+    # ------------------------------------------------------------------
+    def relationships(self, part: str) -> dict[str, tuple[str, str]]:
+        """Return ``{rId: (type, target part)}`` for *part*'s relationships."""
+
+        folder, filename = posixpath.split(part)
+        rels_name = posixpath.join(folder, "_rels", f"{filename}.rels")
+        if rels_name not in self.names():
+            return {}
+        result: dict[str, tuple[str, str]] = {}
+        for rel in self.parse(rels_name).iter(qn("Relationship", PKG_REL_NS)):
+            target = rel.get("Target", "")
+            if rel.get("TargetMode") == "External":
+                continue
+            if target.startswith("/"):
+                resolved = target.lstrip("/")
+            else:
+                resolved = posixpath.normpath(posixpath.join(folder, target))
+            result[rel.get("Id", "")] = (rel.get("Type", ""), resolved)
+        return result
+
+    @property
+    def workbook_part(self) -> str:
+        for rel_type, target in self.relationships("").values():
+            if rel_type == OFFICE_DOCUMENT_REL:
+                return target
+        return "xl/workbook.xml"
+
+    def sheet_parts(self) -> dict[str, str]:
+        """Return worksheet names mapped to their part paths, in tab order."""
+
+        workbook = self.parse(self.workbook_part)
+        rels = self.relationships(self.workbook_part)
+        sheets: dict[str, str] = {}
+        for sheet in workbook.iter(qn("sheet")):
+            rel_id = sheet.get(qn("id", DOC_REL_NS), "")
+            if rel_id in rels:
+                sheets[sheet.get("name", "")] = rels[rel_id][1]
+        return sheets
+
+    def defined_names(self) -> dict[str, str]:
+        workbook = self.parse(self.workbook_part)
+        names: dict[str, str] = {}
+        for defined in workbook.iter(qn("definedName")):
+            key = defined.get("name", "")
+            if defined.get("localSheetId") is not None:
+                key = f"{key}[{defined.get('localSheetId')}]"
+            names[key] = defined.text or ""
+        return names
+
+    def date_epoch(self) -> datetime:
+        """Return the epoch date serials count from (1900, or 1904 when flagged)."""
+
+        properties = self.parse(self.workbook_part).find(qn("workbookPr"))
+        if properties is not None and properties.get("date1904") in ("1", "true"):
+            return CALENDAR_MAC_1904
+        return CALENDAR_WINDOWS_1900
+
+    def table_parts(self, sheet_part: str) -> list[str]:
+        return [
+            target
+            for rel_type, target in self.relationships(sheet_part).values()
+            if rel_type.endswith("/table")
+        ]
+
+    # ------------------------------------------------------------------
+    # Shared tables
+    # ------------------------------------------------------------------
+    def shared_strings(self) -> list[str]:
+        if self._shared_strings is None:
+            self._shared_strings = []
+            part = self._workbook_target("/sharedStrings")
+            if part is not None:
+                for item in self.parse(part).iter(qn("si")):
+                    self._shared_strings.append("".join(t.text or "" for t in item.iter(qn("t"))))
+        return self._shared_strings
+
+    def cell_styles(self) -> list[str]:
+        """Describe each ``cellXfs`` entry by its resolved format components."""
+
+        if self._cell_styles is None:
+            self._load_styles()
+        return self._cell_styles or []
+
+    def differential_styles(self) -> list[str]:
+        if self._dxfs is None:
+            self._load_styles()
+        return self._dxfs or []
+
+    def _load_styles(self) -> None:
+        self._cell_styles, self._dxfs = [], []
+        part = self._workbook_target("/styles")
+        if part is None:
+            return
+        root = self.parse(part)
+        formats = {
+            fmt.get("numFmtId", ""): fmt.get("formatCode", "")
+            for fmt in root.iter(qn("numFmt"))
+        }
+
+        def collection(tag: str, child: str) -> list[str]:
+            parent = root.find(qn(tag))
+            if parent is None:
+                return []
+            return [canonical_element(item) for item in parent.findall(qn(child))]
+
+        fonts = collection("fonts", "font")
+        fills = collection("fills", "fill")
+        borders = collection("borders", "border")
+        xfs = root.find(qn("cellXfs"))
+        for xf in xfs.findall(qn("xf")) if xfs is not None else []:
+            number_format = xf.get("numFmtId", "0")
+            parts = [
+                f"numFmt={formats.get(number_format, number_format)}",
+                f"font={_pick(fonts, xf.get('fontId'))}",
+                f"fill={_pick(fills, xf.get('fillId'))}",
+                f"border={_pick(borders, xf.get('borderId'))}",
+            ]
+            for child in ("alignment", "protection"):
+                element = xf.find(qn(child))
+                if element is not None:
+                    parts.append(f"{child}={canonical_element(element)}")
+            self._cell_styles.append(";".join(parts))
+        self._dxfs = collection("dxfs", "dxf")
+
+    def _workbook_target(self, suffix: str) -> str | None:
+        for rel_type, target in self.relationships(self.workbook_part).values():
+            if rel_type.endswith(suffix):
+                return target
+        return None
+
+    # ------------------------------------------------------------------
+    # Cells
+    # ------------------------------------------------------------------
+    def iter_rows(
+        self,
+        sheet_part: str,
+        *,
+        min_row: int = 1,
+        max_row: int | None = None,
+    ) -> Iterator[tuple[int, list[CellRecord]]]:
+        """Stream ``(row number, cells)`` pairs from *sheet_part*.
+
+        Parsed rows are detached from the tree as soon as they are yielded so
+        memory stays flat however long the sheet is.  Parsing stops once
+        *max_row* has been passed or the cell data ends, so the validation and
+        formatting elements after ``sheetData`` are never built.  Cells of a
+        shared-formula group report the group's formula as it reads in them.
+        """
+
+        sheet_data_tag, row_tag, cell_tag = qn("sheetData"), qn("row"), qn("c")
+        shared: dict[str, tuple[str, str]] = {}
+        with self.open(sheet_part) as stream:
+            sheet_data = None
+            index = 0
+            for event, element in ET.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    if element.tag == sheet_data_tag:
+                        sheet_data = element
+                    continue
+                if element.tag == sheet_data_tag:
+                    return
+                if element.tag != row_tag:
+                    continue
+                index = int(element.get("r", index + 1))
+                if max_row is not None and index > max_row:
+                    return
+                if index >= min_row:
+                    yield index, [self._cell_record(cell, shared) for cell in element.iter(cell_tag)]
+                else:
+                    # Shared-formula anchors above min_row still serve the rows below.
+                    for cell in element.iter(cell_tag):
+                        formula_el = cell.find(_FORMULA_TAG)
+                        if formula_el is not None:
+                            _shared_formula(formula_el, cell.get("r", ""), shared)
+                element.clear()
+                if sheet_data is not None:
+                    sheet_data.remove(element)
+
+    def iter_cells(self, sheet_part: str) -> Iterator[CellRecord]:
+        """Stream the cells of *sheet_part* without building the whole tree."""
+
+        for _, cells in self.iter_rows(sheet_part):
+            yield from cells
+
+    def _cell_record(self, element: ET.Element, shared: dict[str, tuple[str, str]]) -> CellRecord:
+        ref = element.get("r", "")
+        data_type = element.get("t", "n")
+        formula_el = element.find(_FORMULA_TAG)
+        formula = _shared_formula(formula_el, ref, shared) if formula_el is not None else None
+        value_el = element.find(_VALUE_TAG)
+        value = value_el.text if value_el is not None else None
+        if data_type == "s" and value is not None:
+            value = self.shared_strings()[int(value)]
+        elif data_type == "inlineStr":
+            value = "".join(t.text or "" for t in element.iter(_TEXT_TAG))
+        return CellRecord(
+            ref=ref,
+            data_type=data_type,
+            value=value,
+            formula=formula,
+            style=int(element.get("s", "0")),
+        )
+
+
+def _shared_formula(formula: ET.Element, ref: str, shared: dict[str, tuple[str, str]]) -> str | None:
+    """Return the text of *formula*, spelling out cells of shared-formula groups.
+
+    Groups are read in row order, so the anchor holding the text (and
+    recorded in *shared*) comes before the cells that refer to it.
+    """
+
+    if formula.get("t") != "shared" or formula.get("si") is None:
+        return formula.text
+    si = formula.get("si", "")
+    if formula.text:
+        shared[si] = (formula.text, ref)
+        return formula.text
+    if si not in shared:
+        return None
+    text, anchor = shared[si]
+    return Translator(f"={text}", anchor).translate_formula(ref)[1:]
+
+
+def split_reference(reference: str) -> tuple[str, tuple[int, int, int, int]]:
+    """Split ``'Sheet'!$A$1:$B$2`` into the sheet name and 1-based bounds.
+
+    Bounds are ``(min_col, min_row, max_col, max_row)``; a single cell
+    reference yields equal minimum and maximum bounds.
+    """
+
+    sheet, separator, cells = reference.rpartition("!")
+    if not separator or not sheet:
+        raise PackageError(f"Reference '{reference}' does not name a sheet")
+    if sheet.startswith("'") and sheet.endswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    try:
+        min_col, min_row, max_col, max_row = range_boundaries(cells.replace("$", ""))
+    except ValueError as exc:
+        raise PackageError(f"Reference '{reference}' is not a cell range") from exc
+    if None in (min_col, min_row, max_col, max_row):
+        raise PackageError(f"Reference '{reference}' is not a bounded cell range")
+    return sheet, (min_col, min_row, max_col, max_row)  # type: ignore[return-value]
+
+
+def canonical_element(element: ET.Element) -> str:
+    """Serialise *element* in canonical (C14N 2.0) form with sorted attributes."""
+
+    return ET.canonicalize(ET.tostring(element, encoding="unicode"), strip_text=True)
+
+
+def _pick(items: list[str], index: str | None) -> str:
+    try:
+        return items[int(index or 0)]
+    except (IndexError, ValueError):
+        return ""
@@ -0,0 +1,212 @@
+"""Rewrite selected parts of an existing xlsx package in place.
+
+Parts that are not being changed are copied as raw compressed bytes, so
+patching a large workbook costs a streamed copy plus whatever the rewritten
+parts cost to produce.  Rewritten parts are deflated as they are produced and
+their zip header is filled in afterwards, so they never sit in memory whole.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import tempfile
+import zipfile
+import zlib
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import IO
+
+from .package import PackageError
+
+
+# Receives the decompressed original part and a sink for the new content.
+PartRewriter = Callable[[IO[bytes], IO[bytes]], None]
+
+_COPY_BYTES = 1024 * 1024
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_ZIP_LIMIT = 0xFFFFFFFF
+
+
+def patch_package(
+    source: Path | str,
+    rewriters: Mapping[str, PartRewriter],
+    target: Path | str | None = None,
+    *,
+    level: int = 6,
+) -> Path:
+    """Write *source* to *target* with the parts named in *rewriters* replaced.
+
+    Rewriters run in the order of *rewriters*, so one may use what an earlier
+    one found; a part reached before the rewriters ahead of it have run is
+    written after them, while the zip directory keeps the original order.
+    *target* defaults to *source*; the new package is written to a temporary
+    file next to it and moved into place only once complete.
+    """
+
+    source = Path(source)
+    target = Path(target) if target is not None else source
+    try:
+        archive = zipfile.ZipFile(source)
+    except (OSError, zipfile.BadZipFile) as exc:
+        raise PackageError(f"Cannot open {source} as an xlsx package: {exc}") from exc
+
+    missing = set(rewriters) - set(archive.namelist())
+    if missing:
+        archive.close()
+        raise PackageError(f"{source.name} has no part {', '.join(sorted(missing))}")
+
+    handle, scratch = tempfile.mkstemp(prefix=f".{target.name}.", dir=target.parent)
+    try:
+        with archive, open(source, "rb") as raw, os.fdopen(handle, "wb") as stream:
+            _copy_entries(archive, raw, stream, rewriters, level)
+        os.replace(scratch, target)
+    except BaseException:
+        Path(scratch).unlink(missing_ok=True)
+        raise
+    return target
+
+
+def _copy_entries(
+    archive: zipfile.ZipFile,
+    raw: IO[bytes],
+    stream: IO[bytes],
+    rewriters: Mapping[str, PartRewriter],
+    level: int,
+) -> None:
+    infos = archive.infolist()
+    if len(infos) > 0xFFFF:
+        raise PackageError("Workbook has too many parts for a zip without Zip64")
+    records: dict[str, bytes] = {}
+    order = list(rewriters)
+    waiting: dict[str, zipfile.ZipInfo] = {}
+    for info in infos:
+        if info.filename not in rewriters:
+            records[info.filename] = _copy_entry(archive, raw, stream, info, None, level)
+            continue
+        waiting[info.filename] = info
+        while order and order[0] in waiting:
+            name = order.pop(0)
+            records[name] = _copy_entry(archive, raw, stream, waiting.pop(name), rewriters[name], level)
+
+    central = b"".join(records[info.filename] for info in infos)
+    start = stream.tell()
+    stream.write(central)
+    stream.write(
+        struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, len(infos), len(infos), len(central), start, 0)
+    )
+
+
+def _copy_entry(
+    archive: zipfile.ZipFile,
+    raw: IO[bytes],
+    stream: IO[bytes],
+    info: zipfile.ZipInfo,
+    rewriter: PartRewriter | None,
+    level: int,
+) -> bytes:
+    """Write one local entry, rewritten or copied raw, and return its directory record."""
+
+    offset = stream.tell()
+    name = info.filename.encode("utf-8")
+    flags = 0 if info.filename.isascii() else 0x800
+    year, month, day, hour, minute, second = info.date_time
+    dos_time = (hour << 11) | (minute << 5) | (second // 2)
+    dos_date = ((year - 1980) << 9) | (month << 5) | day
+
+    if rewriter is not None:
+        method = zipfile.ZIP_DEFLATED
+        stream.write(_local_header(flags, method, dos_time, dos_date, 0, 0, 0, name))
+        sink = _DeflateSink(stream, level)
+        with archive.open(info) as original:
+            rewriter(original, sink)
+        crc, compressed, size = sink.finish()
+        end = stream.tell()
+        stream.seek(offset + 14)
+        stream.write(struct.pack("<III", crc, compressed, size))
+        stream.seek(end)
+    else:
+        method, crc = info.compress_type, info.CRC
+        compressed, size = info.compress_size, info.file_size
+        stream.write(_local_header(flags, method, dos_time, dos_date, crc, compressed, size, name))
+        # The source's local header may carry extra fields; skip past them.
+        raw.seek(info.header_offset)
+        header = raw.read(_LOCAL_HEADER.size)
+        extra = sum(struct.unpack("<HH", header[26:30]))
+        raw.seek(info.header_offset + _LOCAL_HEADER.size + extra)
+        _copy_bytes(raw, stream, compressed)
+
+    if max(compressed, size, offset) > _ZIP_LIMIT:
+        raise PackageError(f"Part {info.filename} is too large for a zip without Zip64")
+    return (
+        struct.pack(
+            "<IHHHHHHIIIHHHHHII",
+            0x02014B50,
+            20,
+            20,
+            flags,
+            method,
+            dos_time,
+            dos_date,
+            crc,
+            compressed,
+            size,
+            len(name),
+            0,
+            0,
+            0,
+            0,
+            info.external_attr,
+            offset,
+        )
+        + name
+    )
+
+
+def _local_header(
+    flags: int,
+    method: int,
+    dos_time: int,
+    dos_date: int,
+    crc: int,
+    compressed: int,
+    size: int,
+    name: bytes,
+) -> bytes:
+    fields = (20, flags, method, dos_time, dos_date, crc, compressed, size, len(name), 0)
+    return _LOCAL_HEADER.pack(0x04034B50, *fields) + name
+
+
+def _copy_bytes(source: IO[bytes], sink: IO[bytes], remaining: int) -> None:
+    while remaining:
+        block = source.read(min(remaining, _COPY_BYTES))
+        if not block:
+            raise PackageError("Package ended inside a compressed part")
+        sink.write(block)
+        remaining -= len(block)
+
+
+class _DeflateSink:
+    """Write-only stream that deflates into the output zip as data arrives."""
+
+    def __init__(self, stream: IO[bytes], level: int):
+        self.stream = stream
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        self.crc = 0
+        self.size = 0
+        self.compressed = 0
+
+    def write(self, data: bytes) -> int:
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        self._emit(self.compressor.compress(data))
+        return len(data)
+
+    def finish(self) -> tuple[int, int, int]:
+        self._emit(self.compressor.flush())
+        return self.crc, self.compressed, self.size
+
+    def _emit(self, block: bytes) -> None:
+        self.compressed += len(block)
+        self.stream.write(block)
+
@@ -0,0 +1,42 @@
+"""Settings that make saved xlsx packages byte-reproducible.
+
+openpyxl stamps ``docProps/core.xml`` and every zip entry with the current
+time.  Deterministic saves (see :mod:`budget_generator.xlsx.save`) pin those
+timestamps with :func:`build_timestamp` and order members by
+:func:`part_order_key`.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Mapping
+from datetime import datetime, timezone
+
+from .package import PackageError
+
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+# The earliest timestamp a zip entry can record.
+ZIP_EPOCH = datetime(1980, 1, 1, tzinfo=timezone.utc)
+
+
+def build_timestamp(environ: Mapping[str, str] = os.environ) -> datetime:
+    """Return the timestamp to embed, honouring ``SOURCE_DATE_EPOCH``.
+
+    Without the variable the zip epoch is used so output stays stable.
+    """
+
+    value = environ.get("SOURCE_DATE_EPOCH")
+    if value is None or not value.strip():
+        return ZIP_EPOCH
+    try:
+        seconds = int(value)
+    except ValueError as exc:
+        raise PackageError(f"SOURCE_DATE_EPOCH must be an integer, got '{value}'") from exc
+    return max(datetime.fromtimestamp(seconds, tz=timezone.utc), ZIP_EPOCH)
+
+
+def part_order_key(name: str) -> tuple[bool, str]:
+    """Sort key placing content types first, as Office does, then by name."""
+
+    return name != CONTENT_TYPES_PART, name
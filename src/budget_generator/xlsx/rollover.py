@@ -0,0 +1,258 @@
+"""Extend an existing workbook by one planning year.
+
+``rollover_workbook`` appends the next year block to Budget-Planning with the
+layout :class:`PlanningSheetBuilder` uses (banner, month headers and note),
+grows the Dropdown Data year list so it covers the new year and repoints the
+``YearsList`` defined name.  Only the planning sheet, the dropdown sheet and
+``workbook.xml`` are rewritten; every other part is copied as raw compressed
+bytes by :func:`patch_package`.  Styles and header formulas are copied from the
+last existing year block, so edits made to it carry over to the new year.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+from xml.sax.saxutils import escape
+
+from openpyxl.formula.translate import Translator
+from openpyxl.utils.cell import coordinate_to_tuple, get_column_letter
+
+from ..formulas import build_year_formula
+from ..sheets.planning import MONTHS, PlanningSheetBuilder
+from .package import CellRecord, PackageError, XlsxPackage, split_reference
+from .patch import PartRewriter, patch_package
+from .sheetxml import (
+    READ_BYTES,
+    cell_xml,
+    grow_reference,
+    iter_tokens,
+    new_row,
+    replace_cells,
+    row_number,
+)
+
+
+PLANNING_SHEET = "Budget-Planning"
+YEARS_NAME = "YearsList"
+
+_BANNER = re.compile(r"^StartingYear\+(\d+)$")
+_COUNT = re.compile(rb'\bcount="(\d+)"')
+_REF = re.compile(rb'\bref="([^"]*)"')
+_TAGS = ("dimension", "mergeCells", "/mergeCells", "/sheetData")
+_BLOCK_ROWS = (
+    PlanningSheetBuilder.BANNER_ROW,
+    PlanningSheetBuilder.MONTH_HEADER_ROW,
+    PlanningSheetBuilder.NOTE_ROW,
+)
+
+
+@dataclass(frozen=True)
+class RolloverResult:
+    """What :func:`rollover_workbook` added."""
+
+    offset: int
+    columns: str
+    years_list: str | None
+    output: Path
+
+
+def rollover_workbook(workbook: Path | str, output: Path | str | None = None) -> RolloverResult:
+    """Append the next planning year block to *workbook*.
+
+    The workbook is updated in place unless *output* is given.
+    """
+
+    workbook = Path(workbook)
+    target = Path(output) if output is not None else workbook
+    with XlsxPackage(workbook) as package:
+        sheets = package.sheet_parts()
+        if PLANNING_SHEET not in sheets:
+            raise PackageError(f"{workbook.name} has no {PLANNING_SHEET} sheet")
+        planning_part = sheets[PLANNING_SHEET]
+        offset, block = _last_year_block(package, planning_part)
+        offset += 1
+        start = PlanningSheetBuilder.year_start_column(offset)
+        planning_rows = _new_block(block, offset, start - block.start)
+
+        rewriters: dict[str, PartRewriter] = {
+            planning_part: _sheet_rewriter(planning_rows, merge=(start, start + len(MONTHS)))
+        }
+        years_list = None
+        names = package.defined_names()
+        if YEARS_NAME in names:
+            years_sheet, bounds = split_reference(names[YEARS_NAME])
+            if years_sheet not in sheets:
+                raise PackageError(f"{YEARS_NAME} points at missing sheet {years_sheet}")
+            years_rows, years_list = _extend_years(
+                package, sheets[years_sheet], names[YEARS_NAME], bounds, offset
+            )
+            rewriters[sheets[years_sheet]] = _sheet_rewriter(years_rows)
+            rewriters[package.workbook_part] = _names_rewriter(YEARS_NAME, years_list)
+
+    patch_package(workbook, rewriters, target)
+    columns = f"{get_column_letter(start)}:{get_column_letter(start + len(MONTHS))}"
+    return RolloverResult(offset, columns, years_list, target)
+
+
+@dataclass(frozen=True)
+class _YearBlock:
+    start: int
+    cells: dict[int, dict[int, CellRecord]]  # row -> column offset in block -> cell
+
+
+def _last_year_block(package: XlsxPackage, part: str) -> tuple[int, _YearBlock]:
+    """Return the offset and the banner, header and note cells of the last year."""
+
+    rows: dict[int, list[CellRecord]] = {}
+    for row, cells in package.iter_rows(part, min_row=min(_BLOCK_ROWS), max_row=max(_BLOCK_ROWS)):
+        if row in _BLOCK_ROWS:
+            rows[row] = cells
+
+    banners = []
+    for cell in rows.get(PlanningSheetBuilder.BANNER_ROW, []):
+        match = _BANNER.match((cell.formula or "").lstrip("="))
+        if match is not None:
+            banners.append((int(match.group(1)), coordinate_to_tuple(cell.ref)[1]))
+    if not banners:
+        raise PackageError(f"{PLANNING_SHEET} has no year banners to roll over")
+    offset, start = max(banners)
+    if start != PlanningSheetBuilder.year_start_column(offset):
+        raise PackageError(
+            f"Year block {offset + 1} of {PLANNING_SHEET} is not where the layout expects it"
+        )
+
+    width = len(MONTHS) + 1
+    block: dict[int, dict[int, CellRecord]] = {row: {} for row in _BLOCK_ROWS}
+    for row, cells in rows.items():
+        for cell in cells:
+            column = coordinate_to_tuple(cell.ref)[1]
+            if start <= column < start + width:
+                block[row][column - start] = cell
+    return offset, _YearBlock(start, block)
+
+
+def _new_block(block: _YearBlock, offset: int, shift: int) -> dict[int, dict[int, bytes]]:
+    builder = PlanningSheetBuilder
+    start = block.start + shift
+    rows: dict[int, dict[int, bytes]] = {row: {} for row in _BLOCK_ROWS}
+    for row, cells in block.cells.items():
+        for position, cell in cells.items():
+            column = start + position
+            style = str(cell.style).encode("ascii")
+            if row == builder.BANNER_ROW and position == 0:
+                formula = build_year_formula(offset)[1:]
+                rows[row][column] = cell_xml(column, row, style=style, formula=formula)
+            elif row == builder.NOTE_ROW and position == 0:
+                rows[row][column] = cell_xml(column, row, builder.year_note(offset), style=style)
+            elif cell.formula:
+                origin = f"{get_column_letter(column - shift)}{row}"
+                formula = Translator(f"={cell.formula}", origin).translate_formula(
+                    f"{get_column_letter(column)}{row}"
+                )
+                rows[row][column] = cell_xml(column, row, style=style, formula=formula[1:])
+            else:
+                rows[row][column] = cell_xml(column, row, cell.value, style=style)
+    return rows
+
+
+def _extend_years(
+    package: XlsxPackage,
+    part: str,
+    reference: str,
+    bounds: tuple[int, int, int, int],
+    offset: int,
+) -> tuple[dict[int, dict[int, bytes]], str]:
+    """Add list entries up to *offset*, always growing the list by at least one year."""
+
+    column, first_row, _, last_row = bounds
+    style = b"0"
+    for row, cells in package.iter_rows(part, min_row=last_row, max_row=last_row):
+        for cell in cells:
+            if coordinate_to_tuple(cell.ref)[1] == column:
+                style = str(cell.style).encode("ascii")
+    count = last_row - first_row + 1
+    rows = {
+        first_row + index: {
+            column: cell_xml(column, first_row + index, style=style, formula=build_year_formula(index)[1:])
+        }
+        for index in range(count, max(offset, count) + 1)
+    }
+    letter = get_column_letter(column)
+    sheet = reference.rpartition("!")[0]
+    return rows, f"{sheet}!${letter}${first_row}:${letter}${max(rows)}"
+
+
+def _sheet_rewriter(
+    rows: Mapping[int, Mapping[int, bytes]], merge: tuple[int, int] | None = None
+) -> PartRewriter:
+    """Return a rewriter that adds *rows* of cells and optionally one merged banner."""
+
+    max_row = max(rows)
+    max_col = max(column for cells in rows.values() for column in cells)
+    merged = b""
+    if merge is not None:
+        banner = PlanningSheetBuilder.BANNER_ROW
+        merged = (
+            f'<mergeCell ref="{get_column_letter(merge[0])}{banner}:{get_column_letter(merge[1])}{banner}" />'
+        ).encode("ascii")
+        max_col = max(max_col, merge[1])
+
+    def grow(match: re.Match[bytes]) -> bytes:
+        return b'ref="%s"' % grow_reference(match.group(1), max_col=max_col, max_row=max_row)
+
+    def rewrite(original: IO[bytes], sink: IO[bytes]) -> None:
+        pending = sorted(rows)
+        merge_pending = bool(merged)
+        out = bytearray()
+        for text, token in iter_tokens(original, _TAGS):
+            out.extend(text)
+            if token is None:
+                pass
+            elif token.startswith(b"<row"):
+                row = row_number(token)
+                while pending and pending[0] < row:
+                    out.extend(new_row(pending[0], rows[pending.pop(0)]))
+                if pending and pending[0] == row:
+                    token = replace_cells(token, rows[pending.pop(0)])
+                out.extend(token)
+            elif token == b"</sheetData>":
+                while pending:
+                    out.extend(new_row(pending[0], rows[pending.pop(0)]))
+                out.extend(token)
+            elif token.startswith(b"<dimension"):
+                out.extend(_REF.sub(grow, token))
+            elif token.startswith(b"<mergeCells") and merged:
+                out.extend(_COUNT.sub(lambda m: b'count="%d"' % (int(m.group(1)) + 1), token))
+            elif token == b"</mergeCells>" and merge_pending:
+                out.extend(merged + token)
+                merge_pending = False
+            else:
+                out.extend(token)
+            if len(out) >= READ_BYTES:
+                sink.write(bytes(out))
+                out.clear()
+        if merge_pending:
+            raise PackageError(f"{PLANNING_SHEET} has no merged year banners to extend")
+        sink.write(bytes(out))
+
+    return rewrite
+
+
+def _names_rewriter(name: str, reference: str) -> PartRewriter:
+    pattern = re.compile(
+        rb'(<definedName\b[^>]*\bname="%s"[^>]*>)[^<]*(</definedName>)' % re.escape(name.encode("utf-8"))
+    )
+
+    def rewrite(original: IO[bytes], sink: IO[bytes]) -> None:
+        text, count = pattern.subn(
+            lambda m: m.group(1) + escape(reference).encode("utf-8") + m.group(2), original.read()
+        )
+        if count != 1:
+            raise PackageError(f"Defined name {name} not found in workbook.xml")
+        sink.write(text)
+
+    return rewrite
@@ -0,0 +1,179 @@
+"""Byte-level streaming edits of worksheet XML.
+
+Commands that patch an existing workbook (``append``, ``rollover``) copy the
+bulk of a worksheet through untouched and only rebuild the handful of rows
+and tags they change.  Parsing and re-serialising the whole sheet with an XML
+library would rewrite every byte (and drop namespace prefixes Excel relies
+on), so these helpers split the raw XML into pass-through text and the
+elements of interest instead.  Rows are always returned whole; other elements
+are returned as their start or end tag.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from collections.abc import Collection, Iterator, Mapping
+from typing import IO
+from xml.sax.saxutils import escape
+
+from openpyxl.utils.cell import column_index_from_string, get_column_letter, range_boundaries
+
+from .package import PackageError
+
+
+READ_BYTES = 1024 * 1024
+
+_ROW = rb"<row\b[^>]*?(?:/>|>.*?</row>)"
+_ROW_OPEN = re.compile(rb"<row\b[^>]*?(/?)>")
+_ROW_NUMBER = re.compile(rb'<row\b[^>]*?\br="(\d+)"')
+_CELL = re.compile(rb"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.DOTALL)
+_ATTRIBUTE = re.compile(rb'([\w:]+)="([^"]*)"')
+
+
+def iter_tokens(stream: IO[bytes], tags: tuple[str, ...] = ()) -> Iterator[tuple[bytes, bytes | None]]:
+    """Split worksheet XML into pass-through text and the elements to edit.
+
+    Yields ``(text, element)`` pairs where *element* is a whole ``row`` or the
+    start/end tag of one of *tags* (``"dimension"``, ``"/sheetData"``...), and
+    *text* is everything before it.  The final pair has ``None`` as element.
+    Joining every ``text`` and ``element`` reproduces the input exactly.
+    """
+
+    start_pattern, token_pattern = _patterns(tags)
+    buffer = b""
+    position = 0
+    finished = False
+    while True:
+        start = start_pattern.search(buffer, position)
+        if start is not None:
+            match = token_pattern.match(buffer, start.start())
+            if match is not None:
+                yield buffer[position:start.start()], match.group(0)
+                position = match.end()
+                continue
+            if finished:
+                raise PackageError("Worksheet XML ends inside an element")
+            keep = start.start()
+        elif finished:
+            yield buffer[position:], None
+            return
+        else:
+            keep = buffer.rfind(b"<", position)
+            keep = len(buffer) if keep == -1 else keep
+        if keep > position:
+            yield buffer[position:keep], None
+        chunk = stream.read(READ_BYTES)
+        finished = not chunk
+        buffer, position = buffer[keep:] + chunk, 0
+
+
+@functools.lru_cache(maxsize=None)
+def _patterns(tags: tuple[str, ...]) -> tuple[re.Pattern[bytes], re.Pattern[bytes]]:
+    names = [re.escape(tag.encode("ascii")) for tag in tags]
+    start = re.compile(rb"<(?:row|%s)\b" % b"|".join(names) if names else rb"<row\b")
+    tag = rb"|<(?:%s)\b[^>]*>" % b"|".join(names) if names else b""
+    return start, re.compile(_ROW + tag, re.DOTALL)
+
+
+def row_number(row: bytes) -> int:
+    """Return the ``r`` attribute of a row element."""
+
+    number = _ROW_NUMBER.match(row)
+    if number is None:
+        raise PackageError("Worksheet rows must carry their row number")
+    return int(number.group(1))
+
+
+def iter_cells(row: bytes) -> Iterator[tuple[int, dict[bytes, bytes], bytes | None]]:
+    """Yield ``(column, attributes, body)`` for each cell of a row element."""
+
+    for match in _CELL.finditer(row):
+        attributes = tag_attributes(match.group(1))
+        yield cell_column(attributes.get(b"r", b"")), attributes, match.group(2)
+
+
+def tag_attributes(text: bytes) -> dict[bytes, bytes]:
+    return dict(_ATTRIBUTE.findall(text))
+
+
+def cell_column(reference: bytes) -> int:
+    letters = reference.rstrip(b"0123456789").decode("ascii")
+    return column_index_from_string(letters) if letters else 0
+
+
+def replace_cells(
+    row: bytes,
+    cells: Mapping[int, bytes],
+    clear: tuple[int, int] | None = None,
+    *,
+    keep: Collection[int] = (),
+) -> bytes:
+    """Return *row* with *cells* (keyed by column) merged in column order.
+
+    Existing cells in the columns of *cells*, or inside the inclusive *clear*
+    column span unless their column is in *keep*, are dropped; the row's own
+    attributes are kept.
+    """
+
+    opening = _ROW_OPEN.match(row)
+    if opening is None:
+        raise PackageError("Not a worksheet row element")
+    merged = dict(cells)
+    for match in _CELL.finditer(row):
+        column = cell_column(tag_attributes(match.group(1)).get(b"r", b""))
+        if column in merged or (clear is not None and clear[0] <= column <= clear[1] and column not in keep):
+            continue
+        merged[column] = match.group(0)
+    start = opening.group(0)
+    if opening.group(1):
+        start = start[:-2].rstrip() + b">"
+    return start + b"".join(merged[column] for column in sorted(merged)) + b"</row>"
+
+
+def new_row(row: int, cells: Mapping[int, bytes]) -> bytes:
+    return b'<row r="%d">' % row + b"".join(cells[column] for column in sorted(cells)) + b"</row>"
+
+
+def cell_xml(
+    column: int,
+    row: int,
+    value: object = None,
+    *,
+    style: bytes | None = None,
+    formula: str | None = None,
+) -> bytes:
+    """Serialise one cell; strings are written inline, formulas without a cached value."""
+
+    ref = f"{get_column_letter(column)}{row}".encode("ascii")
+    style_attr = b' s="%s"' % style if style and style != b"0" else b""
+    if formula is not None:
+        return b'<c r="%s"%s><f>%s</f></c>' % (ref, style_attr, escape(formula).encode("utf-8"))
+    if value is None:
+        return b'<c r="%s"%s/>' % (ref, style_attr)
+    if isinstance(value, bool):
+        return b'<c r="%s"%s t="b"><v>%d</v></c>' % (ref, style_attr, value)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, (int, float)):
+        return b'<c r="%s"%s><v>%s</v></c>' % (ref, style_attr, repr(value).encode("ascii"))
+    text = escape(str(value))
+    space = b' xml:space="preserve"' if text != text.strip() else b""
+    return b'<c r="%s"%s t="inlineStr"><is><t%s>%s</t></is></c>' % (
+        ref,
+        style_attr,
+        space,
+        text.encode("utf-8"),
+    )
+
+
+def grow_reference(reference: bytes, *, max_col: int = 0, max_row: int = 0) -> bytes:
+    """Widen an ``A1:B2`` reference so it reaches at least *max_col*/*max_row*."""
+
+    first_col, first_row, last_col, last_row = range_boundaries(reference.decode("ascii"))
+    if None in (first_col, first_row, last_col, last_row):
+        return reference
+    last_col, last_row = max(last_col, max_col), max(last_row, max_row)
+    return (
+        f"{get_column_letter(first_col)}{first_row}:{get_column_letter(last_col)}{last_row}"
+    ).encode("ascii")
@@ -32,3 +32,24 @@ def test_generate_missing_file_reports_error(tmp_path: Path) -> None:
     result = runner.invoke(cli, ["generate", str(missing), "--validate-only"])
     assert result.exit_code != 0
     assert "Specification not found" in result.output
+
+
+def test_generate_lean_profile(tmp_path: Path) -> None:
+    output = tmp_path / "lean.xlsx"
+    result = CliRunner().invoke(
+        cli,
+        ["generate", str(fixture_path("valid_spec.json")), "-o", str(output), "--profile", "lean"],
+    )
+    assert result.exit_code == 0, result.output
+    assert output.exists()
+
+
+def test_generate_sheet_subset(tmp_path: Path) -> None:
+    runner = CliRunner()
+    output = tmp_path / "subset.xlsx"
+    result = runner.invoke(
+        cli,
+        ["generate", str(fixture_path("valid_spec.json")), "-o", str(output), "--sheets", "Settings"],
+    )
+    assert result.exit_code == 0, result.output
+    assert output.exists()
@@ -0,0 +1,111 @@
+"""Tests for consolidating several workbooks into a household workbook."""
+
+from __future__ import annotations
+
+import copy
+from datetime import date, datetime
+from pathlib import Path
+
+import openpyxl
+import pytest
+from click.testing import CliRunner
+
+from budget_generator.__main__ import cli
+from budget_generator.consolidate import ConsolidateError, consolidate_workbooks, source_labels
+from budget_generator.generator import BudgetGenerator
+from budget_generator.synth import BASE_SPEC
+from budget_generator.xlsx import XlsxPackage, iter_planning_records, iter_table_records, locate_table
+
+
+def _person(path: Path, entries: list[dict], salary: list[float]) -> Path:
+    spec = copy.deepcopy(BASE_SPEC)
+    spec["sheets"]["Settings"]["general"]["starting_year"] = 2024
+    spec["sheets"]["Budget-Planning"]["planned_amounts"] = {"Income": {"Salary": salary}}
+    spec["sheets"]["Budget Tracking"].update(max_rows=11 + len(entries) + 2, sample_entries=entries)
+    generator = BudgetGenerator(spec)
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    return generator.save_workbook(path, deterministic=True)
+
+
+def _entry(day: int, amount: float, details: str | None = None) -> dict:
+    return {
+        "date": f"2024-01-{day:02d}",
+        "type": "Expense",
+        "category": "Groceries",
+        "amount": amount,
+        "details": details,
+    }
+
+
+def test_ledgers_are_merged_by_date_and_plans_summed(tmp_path: Path) -> None:
+    alice = _person(tmp_path / "alice.xlsx", [_entry(2, 10), _entry(9, 30, "Market")], [1000] * 12)
+    bob = _person(tmp_path / "bob.xlsx", [_entry(1, 5), _entry(5, 20), _entry(30, 40)], [500, 750])
+
+    result = consolidate_workbooks([alice, bob], tmp_path / "household.xlsx", deterministic=True)
+
+    assert (result.transactions, result.sources, result.engine) == (5, ("alice", "bob"), "memory")
+    with XlsxPackage(result.output) as package:
+        rows = list(iter_table_records(package, locate_table(package)))
+        plan = {
+            (record["category"], record["month"]): record["amount"]
+            for record in iter_planning_records(package)
+            if record["section"] == "Income"
+        }
+        years = {record["year"] for record in iter_planning_records(package)}
+    assert [row["date"] for row in rows] == [date(2024, 1, day) for day in (1, 2, 5, 9, 30)]
+    assert [row["details"] for row in rows] == ["[bob]", "[alice]", "[bob]", "[alice] Market", "[bob]"]
+    assert (plan["Salary", "Jan"], plan["Salary", "Feb"], plan["Salary", "Mar"]) == (1500, 1750, 1000)
+    assert years == {2024}
+
+
+def test_consolidate_refuses_to_overwrite_an_input(tmp_path: Path) -> None:
+    alice = _person(tmp_path / "alice.xlsx", [_entry(2, 10)], [])
+
+    with pytest.raises(ConsolidateError):
+        consolidate_workbooks([alice], alice)
+    assert source_labels([Path("a/me.xlsx"), Path("b/me.xlsx")]) == ("me", "me-2")
+
+
+def test_consolidate_rejects_an_input_out_of_date_order(tmp_path: Path) -> None:
+    alice = _person(tmp_path / "alice.xlsx", [_entry(2, 10), _entry(5, 20)], [])
+    workbook = openpyxl.load_workbook(alice)
+    workbook["Budget Tracking"]["C12"] = datetime(2024, 1, 9)
+    workbook.save(alice)
+    bob = _person(tmp_path / "bob.xlsx", [_entry(1, 5)], [])
+    output = tmp_path / "household.xlsx"
+
+    with pytest.raises(ConsolidateError, match=r"alice is not in date order \(2024-01-05 follows 2024-01-09\)"):
+        consolidate_workbooks([alice, bob], output)
+    assert not output.exists()
+
+
+def test_consolidate_command(tmp_path: Path) -> None:
+    alice = _person(tmp_path / "alice.xlsx", [_entry(2, 10)], [])
+    bob = _person(tmp_path / "bob.xlsx", [_entry(1, 5)], [])
+    output = tmp_path / "household.xlsx"
+
+    result = CliRunner().invoke(
+        cli, ["consolidate", str(alice), str(bob), "-o", str(output), "--engine", "streaming"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Merged 2 transaction(s) from alice, bob" in result.output
+    assert "streaming engine" in result.output
+    assert output.exists()
+
+
+def test_later_planning_years_are_summed_by_calendar_year(tmp_path: Path) -> None:
+    alice = _person(tmp_path / "alice.xlsx", [_entry(2, 10)], [[100] * 12, [200] * 12])
+    bob = _person(tmp_path / "bob.xlsx", [_entry(1, 5)], [[10] * 12, [20] * 12])
+
+    result = consolidate_workbooks([alice, bob], tmp_path / "household.xlsx")
+
+    with XlsxPackage(result.output) as package:
+        salary = {
+            (record["year"], record["month"]): record["amount"]
+            for record in iter_planning_records(package)
+            if record["category"] == "Salary"
+        }
+    assert (salary[2024, "Jan"], salary[2025, "Dec"]) == (110, 220)
@@ -0,0 +1,161 @@
+"""Tests for engine selection and the streaming engine."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import openpyxl
+import pytest
+from click.testing import CliRunner
+
+from budget_generator.__main__ import cli
+from budget_generator.engines import create_generator, select_engine
+from budget_generator.estimate import estimate_spec
+from budget_generator.generator import BudgetGenerator, GeneratorError
+from budget_generator.sheets import tracking
+from budget_generator.streaming import StreamingBudgetGenerator
+from budget_generator.utils.json_loader import load_json_spec
+from budget_generator.utils.transactions import iter_transaction_records
+
+SPEC_PATH = Path("examples/tutorial_spec.json")
+
+
+def _generate(generator: BudgetGenerator, output: Path) -> Path:
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    return generator.save_workbook(output)
+
+
+def test_select_engine_uses_estimated_size() -> None:
+    spec = load_json_spec(SPEC_PATH)
+    small = select_engine(estimate_spec(spec))
+    assert small.name == "memory"
+    assert "threshold" in small.reason
+
+    spec["sheets"]["Budget Tracking"]["max_rows"] = 150_000  # two formula cells per blank row
+    large = select_engine(estimate_spec(spec))
+    assert large.name == "streaming"
+
+    forced = select_engine(None, "streaming")
+    assert forced == select_engine(estimate_spec(spec), "streaming")
+    assert isinstance(create_generator(forced, spec), StreamingBudgetGenerator)
+
+    with pytest.raises(GeneratorError):
+        select_engine(None, "template")
+
+
+@pytest.mark.integration
+def test_streaming_engine_matches_memory_engine(tmp_path: Path) -> None:
+    spec = load_json_spec(SPEC_PATH)
+    memory_path = _generate(BudgetGenerator(spec), tmp_path / "memory.xlsx")
+    streaming_path = _generate(StreamingBudgetGenerator(spec), tmp_path / "streaming.xlsx")
+
+    memory = openpyxl.load_workbook(memory_path)
+    streaming = openpyxl.load_workbook(streaming_path)
+    try:
+        assert memory.sheetnames == streaming.sheetnames
+        assert sorted(memory.defined_names) == sorted(streaming.defined_names)
+        for name in memory.sheetnames:
+            expected, actual = memory[name], streaming[name]
+            assert expected.sheet_state == actual.sheet_state
+            assert list(expected.iter_rows(values_only=True)) == list(
+                actual.iter_rows(values_only=True)
+            ), name
+            assert len(expected.data_validations.dataValidation) == len(
+                actual.data_validations.dataValidation
+            )
+            assert {str(r) for r in expected.merged_cells.ranges} == {
+                str(r) for r in actual.merged_cells.ranges
+            }
+
+        tracking = streaming["Budget Tracking"]
+        assert tracking.tables["tblTracking"].ref == "C11:L200"
+        assert tracking["C12"].number_format == "yyyy-mm-dd"
+        assert tracking["H30"].number_format.startswith("_($*")
+        assert tracking["C200"].number_format == "yyyy-mm-dd"
+        assert tracking["G200"].number_format == "@"
+        assert tracking.column_dimensions["C"].number_format == "General"
+        assert len(streaming["Budget Dashboard"]._charts) == 3  # type: ignore[attr-defined]
+    finally:
+        memory.close()
+        streaming.close()
+
+
+def test_generate_cli_engine_override(tmp_path: Path) -> None:
+    runner = CliRunner()
+    output = tmp_path / "streamed.xlsx"
+    result = runner.invoke(
+        cli, ["generate", str(SPEC_PATH), "-o", str(output), "--engine", "streaming"]
+    )
+    assert result.exit_code == 0, result.output
+    assert output.exists()
+
+
+def test_auto_engine_reads_the_ledger_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    ledger = tmp_path / "ledger.jsonl"
+    ledger.write_text(
+        "".join(
+            f'{{"date": "2025-01-{day:02d}", "type": "Expense", "category": "Groceries", "amount": {day}}}\n'
+            for day in range(1, 29)
+        ),
+        encoding="utf-8",
+    )
+    spec = load_json_spec(SPEC_PATH)
+    spec["sheets"]["Budget Tracking"]["transactions_file"] = str(ledger)
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(spec), encoding="utf-8")
+    reads: list[Path] = []
+
+    def counting_reader(path: Path) -> Iterator[dict]:
+        reads.append(path)
+        return iter_transaction_records(path)
+
+    monkeypatch.setattr(tracking, "iter_transaction_records", counting_reader)
+    output = tmp_path / "auto.xlsx"
+    result = CliRunner().invoke(cli, ["generate", str(spec_path), "-o", str(output)])
+
+    assert result.exit_code == 0, result.output
+    assert reads == [ledger]
+
+
+@pytest.mark.parametrize("static_effective_dates", [False, True])
+def test_engines_agree_on_year_partitioned_tracking(tmp_path: Path, static_effective_dates: bool) -> None:
+    spec = load_json_spec(SPEC_PATH)
+    spec["sheets"]["Settings"]["late_income"].update(enabled_default=True, day_default=1)
+    spec["sheets"]["Budget Tracking"].update(
+        partition="year",
+        static_effective_dates=static_effective_dates,
+        sample_entries=[
+            {"date": f"{year}-03-0{day}", "type": "Income", "category": "Salary", "amount": 100 * day}
+            for year in (2024, 2025)
+            for day in (1, 2)
+        ],
+    )
+    memory_path = _generate(BudgetGenerator(spec), tmp_path / "memory.xlsx")
+    streaming_path = _generate(StreamingBudgetGenerator(spec), tmp_path / "streaming.xlsx")
+
+    memory = openpyxl.load_workbook(memory_path)
+    streaming = openpyxl.load_workbook(streaming_path)
+    try:
+        for workbook in (memory, streaming):
+            assert dict(workbook["Budget Tracking"].tables.items()) == {
+                "tblTracking2024": "C11:L33",
+                "tblTracking2025": "C34:L56",
+            }
+            assert "TrackingYearIdx" in workbook.defined_names
+            effective = workbook["Budget Tracking"]["I13"].value  # 2024-03-02 income, late after day 1
+            if static_effective_dates:
+                assert effective == datetime(2024, 4, 1)
+            else:
+                assert effective.startswith("=IF(AND(LateIncomeEnabled,")
+        for name in ("Budget Tracking", "Calculations"):
+            assert list(memory[name].iter_rows(values_only=True)) == list(
+                streaming[name].iter_rows(values_only=True)
+            ), name
+    finally:
+        memory.close()
+        streaming.close()
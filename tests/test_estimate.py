@@ -0,0 +1,59 @@
+"""Tests for the pre-flight generation cost estimator."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from budget_generator.__main__ import cli
+from budget_generator.estimate import estimate_spec
+from budget_generator.generator import BudgetGenerator
+from budget_generator.utils.json_loader import load_json_spec
+
+SPEC_PATH = Path("examples/tutorial_spec.json")
+
+
+def _with_rows(max_rows: int) -> dict:
+    spec = load_json_spec(SPEC_PATH)
+    spec["sheets"]["Budget Tracking"]["max_rows"] = max_rows
+    return spec
+
+
+def test_estimate_matches_generated_counts() -> None:
+    spec = _with_rows(400)
+    estimate = estimate_spec(spec)
+
+    generator = BudgetGenerator(spec)
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    assert generator.workbook is not None
+
+    for sheet in estimate.sheets:
+        worksheet = generator.workbook[sheet.name]
+        assert sheet.cells == len(worksheet._cells), sheet.name  # type: ignore[attr-defined]
+        assert sheet.data_validations == len(worksheet.data_validations.dataValidation)
+    assert estimate.styles > 0
+    assert not estimate.warnings
+
+
+def test_estimate_scales_with_rows_and_warns() -> None:
+    small = estimate_spec(_with_rows(200))
+    large = estimate_spec(_with_rows(100_000))
+
+    assert large.cells > small.cells * 100
+    assert large.output_bytes > small.output_bytes
+    assert large.build_seconds > small.build_seconds
+    assert any("data validations" in warning for warning in large.warnings)
+
+
+def test_estimate_cli_emits_json() -> None:
+    runner = CliRunner()
+    result = runner.invoke(cli, ["estimate", str(SPEC_PATH)])
+    assert result.exit_code == 0, result.output
+
+    payload = json.loads(result.output)
+    assert {"cells", "styles", "formulas", "output_bytes", "build_seconds", "warnings"} <= payload.keys()
+    assert [sheet["name"] for sheet in payload["sheets"]][0] == "Settings"
@@ -0,0 +1,139 @@
+"""Tests for the columnar exports written alongside a generated workbook."""
+
+from __future__ import annotations
+
+import copy
+import csv
+import importlib.util
+import json
+import sqlite3
+from datetime import date
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from budget_generator import exports
+from budget_generator.__main__ import cli
+from budget_generator.exports import ExportError, ExportTargets, export_tables
+from budget_generator.synth import BASE_SPEC
+
+
+def _spec() -> dict:
+    spec = copy.deepcopy(BASE_SPEC)
+    spec["sheets"]["Settings"]["general"]["starting_year"] = 2024
+    spec["sheets"]["Budget-Planning"]["planned_amounts"] = {"Income": {"Salary": [1500, 1750]}}
+    spec["sheets"]["Budget Tracking"].update(
+        max_rows=13,
+        sample_entries=[
+            {"date": "2024-01-03", "type": "Expense", "category": "Groceries", "amount": 42.5},
+            {"date": "2024-01-09", "type": "Income", "category": "Salary", "amount": 1500, "details": "Jan"},
+            {"date": "2024-01-20", "type": "Expense", "category": "Rent", "amount": 900},
+        ],
+    )
+    return spec
+
+
+def test_sqlite_and_csv_hold_the_same_rows(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(exports, "BATCH_ROWS", 7)  # several batches per table
+    targets = ExportTargets(csv_dir=tmp_path / "csv", sqlite_path=tmp_path / "budget.db")
+
+    counts = export_tables(_spec(), targets)
+
+    # max_rows 13 leaves room for two of the three entries, as in the workbook.
+    assert counts["tracking"] == 2
+    connection = sqlite3.connect(targets.sqlite_path)
+    try:
+        tracking = connection.execute("SELECT * FROM tracking").fetchall()
+        salary = connection.execute(
+            "SELECT month, amount FROM planning WHERE category = 'Salary' AND year = 2024"
+        ).fetchmany(3)
+        planning_rows = connection.execute("SELECT COUNT(*) FROM planning").fetchone()[0]
+    finally:
+        connection.close()
+    assert tracking == [
+        ("2024-01-03", "Expense", "Groceries", 42.5, None),
+        ("2024-01-09", "Income", "Salary", 1500.0, "Jan"),
+    ]
+    assert salary == [("Jan", 1500.0), ("Feb", 1750.0), ("Mar", 0.0)]
+    assert planning_rows == counts["planning"] and planning_rows % 12 == 0
+
+    with (tmp_path / "csv" / "tracking.csv").open(newline="", encoding="utf-8") as stream:
+        rows = list(csv.reader(stream))
+    assert rows == [
+        ["date", "type", "category", "amount", "details"],
+        ["2024-01-03", "Expense", "Groceries", "42.5", ""],
+        ["2024-01-09", "Income", "Salary", "1500.0", "Jan"],
+    ]
+    with (tmp_path / "csv" / "planning.csv").open(newline="", encoding="utf-8") as stream:
+        assert sum(1 for _ in stream) == counts["planning"] + 1
+
+
+def test_sqlite_export_replaces_previous_tables(tmp_path: Path) -> None:
+    target = ExportTargets(sqlite_path=tmp_path / "budget.db")
+    export_tables(_spec(), target)
+    counts = export_tables(_spec(), target)
+
+    connection = sqlite3.connect(target.sqlite_path)
+    try:
+        assert connection.execute("SELECT COUNT(*) FROM tracking").fetchone()[0] == counts["tracking"]
+    finally:
+        connection.close()
+
+
+@pytest.mark.skipif(importlib.util.find_spec("pyarrow") is not None, reason="pyarrow is installed")
+def test_parquet_without_pyarrow_points_at_the_extra(tmp_path: Path) -> None:
+    with pytest.raises(ExportError, match=r"\[parquet\]"):
+        export_tables(_spec(), ExportTargets(parquet_dir=tmp_path / "parquet"))
+
+
+def test_parquet_round_trip(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    export_tables(_spec(), ExportTargets(parquet_dir=tmp_path))
+
+    table = pq.read_table(tmp_path / "tracking.parquet")
+    assert table.column("date").to_pylist() == [date(2024, 1, 3), date(2024, 1, 9)]
+
+
+def test_generate_writes_exports_in_the_same_run(tmp_path: Path) -> None:
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(_spec()), encoding="utf-8")
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "generate",
+            str(spec_path),
+            "-o",
+            str(tmp_path / "budget.xlsx"),
+            "--export-csv",
+            str(tmp_path / "tables"),
+            "--export-sqlite",
+            str(tmp_path / "budget.db"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Exported 2 tracking" in result.output
+    assert (tmp_path / "budget.xlsx").exists()
+    assert (tmp_path / "tables" / "tracking.csv").exists()
+    assert (tmp_path / "budget.db").exists()
+
+
+def test_planning_rows_cover_every_year_with_planned_amounts() -> None:
+    spec = _spec()
+    spec["sheets"]["Budget-Planning"]["planned_amounts"] = {"Income": {"Salary": [[1500] * 12, [1600] * 12]}}
+
+    salary = [row for row in exports.iter_planning_rows(spec) if row[1] == "Salary"]
+
+    assert [(year, amount) for _, _, year, month, amount in salary if month == "Jun"] == [(2024, 1500), (2025, 1600)]
+
+
+def test_sinks_must_implement_begin_and_write() -> None:
+    class Incomplete(exports._Sink):
+        def begin(self, table, columns) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="abstract method.*write"):
+        Incomplete()
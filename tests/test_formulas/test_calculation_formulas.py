@@ -1,20 +1,56 @@
 from __future__ import annotations
 
+import re
+from bisect import bisect_right
+
 from budget_generator.formulas.calculations import (
-    build_choose_month_formula,
-    build_monthly_tracking_sumproduct,
+    build_month_bound_formulas,
+    build_month_lookup_formula,
+    build_tracking_slice_sumifs,
+    build_tracking_sumifs,
+    build_year_choice_formula,
 )
 
 
-def test_build_choose_month_formula_generates_expected_string() -> None:
-    cells = [f"D{13 + idx}" for idx in range(12)]
-    formula = build_choose_month_formula(cells)
-    assert formula == "=CHOOSE(MonthIdx,D13,D14,D15,D16,D17,D18,D19,D20,D21,D22,D23,D24)"
+def test_build_tracking_sumifs_matches_the_month_key() -> None:
+    assert build_tracking_sumifs("Saving", "$AF3", table="tblTracking2025") == (
+        '=SUMIFS(tblTracking2025[Amount],tblTracking2025[Type],"Saving",tblTracking2025[Month Key],$AF3)'
+    )
+    assert build_year_choice_formula(["=A1", "=B1"]) == "=IFERROR(CHOOSE(TrackingYearIdx,A1,B1),0)"
+
+
+def test_build_month_lookup_formula_offsets_by_year_block() -> None:
+    assert build_month_lookup_formula("TrackedMonthly", 2) == "=INDEX(TrackedMonthly,MonthIdx,2)"
+    assert build_month_lookup_formula("TrackedMonthly", 3, year_name="TrackingYearIdx") == (
+        "=IFERROR(INDEX(TrackedMonthly,(TrackingYearIdx-1)*12+MonthIdx,3),0)"
+    )
 
 
-def test_build_monthly_tracking_sumproduct_inserts_type() -> None:
-    formula = build_monthly_tracking_sumproduct("Income")
-    assert (
-        formula
-        == "=SUMPRODUCT((MONTH(tblTracking[Effective Date])=MonthIdx)*(tblTracking[Type]=\"Income\")*tblTracking[Amount])"
+def test_build_tracking_slice_sumifs_sums_each_run_of_rows() -> None:
+    formula = build_tracking_slice_sumifs("Expense", "2", [("$AJ$3", "$AK$4")], table="t", category="$Q4")
+    assert formula == (
+        "=IF($AK$4<$AJ$3,0,SUMIFS(INDEX(t[Amount],$AJ$3):INDEX(t[Amount],$AK$4),"
+        'INDEX(t[Type],$AJ$3):INDEX(t[Type],$AK$4),"Expense",'
+        "INDEX(t[Month Key],$AJ$3):INDEX(t[Month Key],$AK$4),2,"
+        "INDEX(t[Category],$AJ$3):INDEX(t[Category],$AK$4),$Q4))"
     )
+    assert build_tracking_slice_sumifs("Income", "1", [(1, 2), (9, 9)], table="t").count("IF(") == 2
+
+
+def test_month_bounds_cover_every_row_of_the_month_key() -> None:
+    # (Year Month, Month Key) in date order; late income on 2025-02-27 counts in March.
+    ledger = [(202501, 1), (202501, 1), (202502, 2), (202502, 3), (202504, 4), (202504, 4)]
+    keys = [year_month for year_month, _ in ledger]
+
+    def bounds(month: int) -> tuple[int, int]:
+        # Approximate MATCH returns the count of keys <= the value for a sorted column.
+        first, last = build_month_bound_formulas(202500 + month, table="t")
+        assert last == f"=IFERROR(MATCH({202500 + month},t[Year Month],1),0)"
+        wanted = [int(re.search(r"MATCH\((\d+)", formula).group(1)) for formula in (first, last)]
+        return bisect_right(keys, wanted[0]) + 1, bisect_right(keys, wanted[1])
+
+    assert [bounds(month) for month in (1, 2, 3, 4)] == [(1, 2), (3, 4), (5, 4), (5, 6)]
+    for month in range(2, 13):
+        first, last = bounds(month - 1)[0], bounds(month)[1]
+        in_slice = set(range(first, last + 1))
+        assert {index for index, (_, key) in enumerate(ledger, start=1) if key == month} <= in_slice
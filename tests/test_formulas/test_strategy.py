@@ -0,0 +1,152 @@
+"""Formula forms emitted for each ``target_excel``."""
+
+from __future__ import annotations
+
+import operator
+import re
+from typing import Any, Callable
+
+import pytest
+
+from budget_generator.formulas.strategy import (
+    COMPATIBLE_FORMULAS,
+    TARGET_STRATEGIES,
+    formula_strategy,
+)
+
+
+def test_running_balance_per_target() -> None:
+    assert COMPATIBLE_FORMULAS.running_balance("t", "$B$20") == (
+        '=$B$20+SUMPRODUCT((t[Date]<=[@Date])*(t[Type]="Income")*t[Amount])'
+        '-SUMPRODUCT((t[Date]<=[@Date])*((t[Type]="Expense")+(t[Type]="Saving"))*t[Amount])'
+    )
+    conditional = (
+        '=IF([@Date]="",0,SUMIFS(t[Amount],t[Date],"<="&[@Date],t[Type],"Income")'
+        '-SUMIFS(t[Amount],t[Date],"<="&[@Date],t[Type],"Expense")'
+        '-SUMIFS(t[Amount],t[Date],"<="&[@Date],t[Type],"Saving"))'
+    )
+    for target in ("2010", "libreoffice", "365"):
+        assert formula_strategy(target).running_balance("t") == conditional, target
+    assert formula_strategy("2010").running_balance("t", "$B$20").startswith('=$B$20+IF([@Date]="",0,')
+
+
+def test_last_value_per_target() -> None:
+    assert COMPATIBLE_FORMULAS.last_value("t", "Date", "Balance") == (
+        '=IFERROR(LOOKUP(2,1/(t[Date]<>""),t[Balance]),0)'
+    )
+    for target in ("2010", "libreoffice"):
+        assert formula_strategy(target).last_value("t", "Date", "Balance") == (
+            "=IF(COUNTA(t[Date])=0,0,INDEX(t[Balance],COUNTA(t[Date])))"
+        )
+    assert formula_strategy("365").last_value("t", "Date", "Balance") == (
+        '=_xlfn.XLOOKUP(TRUE,t[Date]<>"",t[Balance],0,0,-1)'
+    )
+
+
+def test_every_strategy_signs_the_same_types() -> None:
+    # Each form adds Income and subtracts Expense and Saving, up to the row's date.
+    def signed_types(formula: str) -> set[tuple[str, str]]:
+        terms = re.split(r"(?=[-+](?:SUMPRODUCT|SUMIFS)\()", formula)
+        return {
+            (kind, "-" if term.startswith("-") else "+")
+            for term in terms
+            for kind in re.findall(r'"(Income|Expense|Saving)"', term)
+        }
+
+    expected = {("Income", "+"), ("Expense", "-"), ("Saving", "-")}
+    for strategy in (COMPATIBLE_FORMULAS, *TARGET_STRATEGIES.values()):
+        formula = strategy.running_balance("t")
+        assert signed_types(formula) == expected, strategy.name
+        assert "<=" in formula and "[@Date]" in formula, strategy.name
+
+
+def test_target_names() -> None:
+    assert formula_strategy() is COMPATIBLE_FORMULAS
+    assert formula_strategy(2016) is formula_strategy("2013") is TARGET_STRATEGIES["2010"]
+    assert formula_strategy("LibreOffice") is TARGET_STRATEGIES["libreoffice"]
+    with pytest.raises(ValueError, match="Unknown target_excel '2003'; choose from 2010, libreoffice, 365"):
+        formula_strategy("2003")
+
+
+class _Column(list):
+    """Just enough of a spreadsheet range to evaluate the strategies' formulas."""
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def _apply(self, other: object, op: Callable[[Any, Any], Any]) -> _Column:
+        others = other if isinstance(other, list) else [other] * len(self)
+        return _Column(op(a, b) for a, b in zip(self, others))
+
+    def __le__(self, other: object) -> _Column:  # type: ignore[override]
+        return self._apply(other, operator.le)
+
+    def __eq__(self, other: object) -> _Column:  # type: ignore[override]
+        return self._apply(other, operator.eq)
+
+    def __ne__(self, other: object) -> _Column:  # type: ignore[override]
+        return self._apply(other, operator.ne)
+
+    def __add__(self, other: object) -> _Column:  # type: ignore[override]
+        return self._apply(other, operator.add)
+
+    def __mul__(self, other: object) -> _Column:  # type: ignore[override]
+        return self._apply(other, operator.mul)
+
+    def __rtruediv__(self, other: float) -> _Column:
+        return _Column(other / value if value else None for value in self)
+
+
+def _sumifs(amounts: list[float], *pairs: Any) -> float:
+    def matches(value: Any, criterion: Any) -> bool:
+        if isinstance(criterion, str) and criterion.startswith("<="):
+            return value != "" and value <= criterion[2:]
+        return value == criterion
+
+    rows = zip(amounts, *pairs[::2])
+    return sum(row[0] for row in rows if all(map(matches, row[1:], pairs[1::2])))
+
+
+def _last(keys: list[Any], values: list[Any], missing: Any = None) -> Any:
+    return next((value for key, value in zip(keys[::-1], values[::-1]) if key), missing)
+
+
+_FUNCTIONS = {
+    "SUMPRODUCT": sum,
+    "SUMIFS": _sumifs,
+    "IF": lambda test, then, other: then if test else other,
+    "IFERROR": lambda value, fallback: fallback if value is None else value,
+    "LOOKUP": lambda _, keys, values: _last(keys, values),
+    "XLOOKUP": lambda _, keys, values, missing, *__: _last(keys, values, missing),
+    "INDEX": lambda values, row: values[row - 1],
+    "COUNTA": lambda values: sum(value != "" for value in values),
+}
+
+
+def _evaluate(formula: str, table: dict[str, _Column], row: dict[str, Any] | None = None) -> Any:
+    expression = formula.lstrip("=").replace("_xlfn.", "").replace("<>", "!=").replace("&", "+")
+    expression = re.sub(r"(?<![<>!=])=", "==", expression)
+    expression = re.sub(r"\bt\[([\w ]+)\]", r'table["\1"]', expression)
+    expression = re.sub(r"\[@(\w+)\]", r'row["\1"]', expression)
+    return eval(expression, {**_FUNCTIONS, "TRUE": True, "table": table, "row": row})
+
+
+def test_every_strategy_evaluates_to_the_same_results() -> None:
+    # A ledger filled from the top, with a shared date and two blank rows.
+    ledger = [
+        ("2024-01-03", "Income", 1000.0),
+        ("2024-01-05", "Expense", 120.5),
+        ("2024-01-05", "Saving", 200.0),
+        ("2024-02-01", "Expense", 80.0),
+        ("", "", 0),
+        ("", "", 0),
+    ]
+    table = {name: _Column(values) for name, values in zip(("Date", "Type", "Amount"), zip(*ledger))}
+    results = {}
+    for strategy in (COMPATIBLE_FORMULAS, *TARGET_STRATEGIES.values()):
+        balance = strategy.running_balance("t", "100")
+        table["Balance"] = _Column(_evaluate(balance, table, dict(zip(table, row))) for row in ledger)
+        last = _evaluate(strategy.last_value("t", "Date", "Balance"), table)
+        results[strategy.name] = (table["Balance"], last)
+
+    assert results["compatible"] == ([1100.0, 779.5, 779.5, 699.5, 100, 100], 699.5)
+    assert all(result == results["compatible"] for result in results.values()), results
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import re
+import zipfile
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 
 from budget_generator.generator import BudgetGenerator, GeneratorError, WorkbookNotInitialisedError
+from budget_generator.sheets import tracking
+from budget_generator.sheets.registry import DEFAULT_REGISTRY
+from budget_generator.streaming import StreamingBudgetGenerator
+from budget_generator.utils.transactions import iter_transaction_records
 
 
 def minimal_spec() -> dict:
@@ -71,6 +78,42 @@ def test_save_workbook(tmp_path: Path) -> None:
     assert saved_path.exists()
 
 
+def test_deterministic_save_is_byte_identical(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    outputs = []
+    for name in ("first.xlsx", "second.xlsx"):
+        gen = BudgetGenerator(minimal_spec())
+        gen.create_workbook()
+        gen.create_sheets()
+        gen.build_sheet_contents()
+        outputs.append(gen.save_workbook(tmp_path / name, deterministic=True))
+
+    assert outputs[0].read_bytes() == outputs[1].read_bytes()
+    with zipfile.ZipFile(outputs[0]) as archive:
+        assert archive.namelist()[0] == "[Content_Types].xml"
+        assert {info.date_time for info in archive.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+        core = archive.read("docProps/core.xml").decode()
+    assert "1980-01-01T00:00:00Z</dcterms:modified>" in core
+
+
+def test_deterministic_save_uses_source_date_epoch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    gen = BudgetGenerator(minimal_spec())
+    gen.create_workbook()
+    gen.create_sheets()
+    output = gen.save_workbook(tmp_path / "workbook.xlsx", deterministic=True)
+
+    with zipfile.ZipFile(output) as archive:
+        core = archive.read("docProps/core.xml").decode()
+    assert "<dcterms:created" in core and "2023-11-14T22:13:20Z</dcterms:created>" in core
+
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+    with pytest.raises(GeneratorError, match="SOURCE_DATE_EPOCH"):
+        gen.save_workbook(tmp_path / "other.xlsx", deterministic=True)
+
+
 def test_build_sheet_contents_populates_calculations_sheet() -> None:
     gen = BudgetGenerator(minimal_spec())
     gen.create_workbook()
@@ -80,7 +123,7 @@ def test_build_sheet_contents_populates_calculations_sheet() -> None:
     assert gen.workbook is not None
     calc_ws = gen.workbook["Calculations"]
     assert calc_ws["B2"].value == "Metric"
-    assert calc_ws["F3"].value == "=CHOOSE(MonthIdx,D13,E13,F13,G13,H13,I13,J13,K13,L13,M13,N13,O13)"
+    assert calc_ws["F3"].value == "=INDEX(IncomeTotals,MonthIdx)"
 
     month_idx_ref = gen.workbook.defined_names["MonthIdx"].attr_text
     assert month_idx_ref in {"Calculations!$K$1", "'Calculations'!$K$1"}
@@ -98,3 +141,194 @@ def test_build_sheet_contents_populates_calculations_sheet() -> None:
 
     assert gen.workbook["Dropdown Data"].sheet_state == "hidden"
     assert gen.workbook["Calculations"].sheet_state == "hidden"
+
+
+def test_dashboard_breakdown_lists_every_planning_category() -> None:
+    gen = BudgetGenerator(minimal_spec())
+    gen.create_workbook()
+    gen.create_sheets()
+    gen.build_sheet_contents()
+
+    workbook = gen.workbook
+    assert workbook is not None
+    dashboard, calculations = workbook["Budget Dashboard"], workbook["Calculations"]
+    # 4 income, 10 expense and 5 savings default categories.
+    assert dashboard.max_row == 23 + 19
+    assert dashboard["D42"].value == "=Calculations!$Q$21"
+    assert calculations["Q21"].value == "='Budget-Planning'!$D$59"
+    assert dashboard["F42"].value == "=INDEX(SavingsGrid,5,MonthIdx)"
+    assert workbook.defined_names["CategoryMonthly"].attr_text == "Calculations!$R$3:$AC$21"
+
+
+def test_build_sheet_contents_with_sheet_subset() -> None:
+    gen = BudgetGenerator(minimal_spec(), sheets=["Budget-Planning"])
+    gen.create_workbook()
+    gen.create_sheets()
+    gen.build_sheet_contents()
+
+    assert gen.workbook is not None
+    assert gen.workbook.sheetnames == ["Settings", "Budget-Planning"]
+    assert "IncomeCats" in gen.workbook.defined_names
+    assert "MonthIdx" not in gen.workbook.defined_names
+
+
+@pytest.mark.parametrize(
+    "sheet",
+    ["Settings", "Dropdown Data", "Budget-Planning", "Budget Tracking", "Calculations", "Budget Dashboard"],
+)
+def test_sheet_subsets_have_no_dangling_sheet_references(sheet: str) -> None:
+    gen = BudgetGenerator(minimal_spec(), sheets=[sheet])
+    gen.create_workbook()
+    gen.create_sheets()
+    gen.build_sheet_contents()
+
+    workbook = gen.workbook
+    assert workbook is not None
+    references = {
+        name.strip("'").replace("''", "'")
+        for worksheet in workbook.worksheets
+        for row in worksheet.iter_rows()
+        for cell in row
+        if isinstance(cell.value, str) and cell.value.startswith("=")
+        for name in re.findall(r"('(?:[^']|'')+'|[A-Za-z_][\w.\-]*)!", cell.value)
+    }
+    assert references <= set(workbook.sheetnames)
+
+
+def test_builders_declare_every_name_their_sheet_reads() -> None:
+    gen = BudgetGenerator(minimal_spec())
+    gen.create_workbook()
+    gen.create_sheets()
+    gen.build_sheet_contents()
+
+    workbook = gen.workbook
+    assert workbook is not None
+    names = set(workbook.defined_names) | {
+        table for worksheet in workbook.worksheets for table in worksheet.tables
+    }
+    for builder in DEFAULT_REGISTRY:
+        worksheet = workbook[builder.sheet_name]
+        formulas = [
+            cell.value
+            for row in worksheet.iter_rows()
+            for cell in row
+            if isinstance(cell.value, str) and cell.value.startswith("=")
+        ]
+        formulas += [validation.formula1 or "" for validation in worksheet.data_validations.dataValidation]
+        used = {token for formula in formulas for token in re.findall(r"[A-Za-z_]\w*", formula)} & names
+        declared = builder.provides | builder.consumes | builder.references
+        assert used <= declared, (builder.key, used - declared)
+
+
+@pytest.mark.parametrize("generator_class", [BudgetGenerator, StreamingBudgetGenerator])
+def test_build_reads_the_ledger_once(
+    generator_class: type[BudgetGenerator], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ledger = tmp_path / "ledger.jsonl"
+    ledger.write_text(
+        '{"date": "2024-01-03", "type": "Income", "category": "Salary", "amount": 3000}\n'
+        '{"date": "2025-02-04", "type": "Expense", "category": "Rent", "amount": 950}\n',
+        encoding="utf-8",
+    )
+    reads: list[Path] = []
+
+    def counting_reader(path: Path) -> Iterator[dict]:
+        reads.append(path)
+        return iter_transaction_records(path)
+
+    monkeypatch.setattr(tracking, "iter_transaction_records", counting_reader)
+    spec = minimal_spec()
+    spec["sheets"] = {
+        "Budget Tracking": {"transactions_file": str(ledger), "static_effective_dates": True},
+        "Budget Dashboard": {"charts": {"cache_values": True}},
+    }
+    gen = generator_class(spec)
+    gen.create_workbook()
+    gen.create_sheets()
+    gen.build_sheet_contents()
+    gen.save_workbook(tmp_path / "workbook.xlsx")
+
+    assert reads == [ledger]
+
+
+def test_unknown_sheet_subset_raises() -> None:
+    with pytest.raises(GeneratorError):
+        BudgetGenerator(minimal_spec(), sheets=["Ledger"])
+
+
+def test_lean_profile_keeps_data_and_drops_styling() -> None:
+    gen = BudgetGenerator(minimal_spec(), profile="lean")
+    gen.create_workbook()
+    gen.create_sheets()
+    gen.build_sheet_contents()
+
+    workbook = gen.workbook
+    assert workbook is not None
+    planning, tracking = workbook["Budget-Planning"], workbook["Budget Tracking"]
+    dashboard = workbook["Budget Dashboard"]
+    assert planning["E24"].value.text == "=SUM(E12:E23)"
+    assert planning["E24"].number_format.startswith("_($*")
+    assert not planning["E24"].font.b and planning["E24"].fill.fill_type is None
+    assert not planning.merged_cells.ranges
+    assert "tblTracking" in tracking.tables
+    assert tracking["C12"].number_format == "yyyy-mm-dd"
+    assert tracking.data_validations.dataValidation
+    assert "IncomeCats" in workbook.defined_names
+    for worksheet in workbook:
+        assert not list(worksheet.conditional_formatting), worksheet.title
+    assert not dashboard._charts  # type: ignore[attr-defined]
+    assert not dashboard["B2"].font.b
+
+
+def test_dashboard_charts_can_cache_values() -> None:
+    spec = minimal_spec()
+    spec["sheets"] = {
+        "Settings": {"general": {"starting_year": 2017}},  # the default sample entries' year
+        "Budget-Planning": {"planned_amounts": {"Income": {"Salary": [3000]}}},
+        "Budget Dashboard": {"charts": {"cache_values": True}},
+    }
+    gen = BudgetGenerator(spec)
+    gen.create_workbook()
+    gen.create_sheets()
+    gen.build_sheet_contents()
+
+    charts = gen.workbook["Budget Dashboard"]._charts  # type: ignore[index,attr-defined]
+    budgeted, tracked = charts[0].series
+    assert budgeted.val.numRef.numCache.pt[0].v == 3000
+    assert tracked.val.numRef.numCache.pt[0].v == 7700.5  # default sample income, January
+
+    plain = BudgetGenerator(minimal_spec())
+    plain.create_workbook()
+    plain.create_sheets()
+    plain.build_sheet_contents()
+    series = plain.workbook["Budget Dashboard"]._charts[0].series[0]  # type: ignore[index,attr-defined]
+    assert series.val.numRef.numCache is None
+
+
+def test_target_excel_selects_formula_forms() -> None:
+    spec = minimal_spec()
+    spec["workbook"]["target_excel"] = "365"
+    entries = [
+        {"date": "2024-12-30", "type": "Income", "category": "Salary", "amount": 100},
+        {"date": "2025-01-02", "type": "Expense", "category": "Housing", "amount": 40},
+    ]
+    spec["sheets"] = {"Budget Tracking": {"partition": "year", "sample_entries": entries}}
+    gen = BudgetGenerator(spec)
+    gen.create_workbook()
+    gen.create_sheets()
+    gen.build_sheet_contents()
+
+    workbook = gen.workbook
+    assert workbook is not None
+    tracking, calculations = workbook["Budget Tracking"], workbook["Calculations"]
+    assert tracking["H12"].value.text.startswith('=$B$11+IF([@Date]="",0,SUMIFS(tblTracking2024[Amount],')
+    assert tracking["B33"].value == "=B11+SUM(tblTracking2024[Signed Amount])"
+    assert calculations["C6"].value.startswith("=_xlfn.XLOOKUP(TRUE,tblTracking2025[Date]")
+
+    with pytest.raises(GeneratorError, match="Unknown target_excel"):
+        BudgetGenerator({**spec, "workbook": {**spec["workbook"], "target_excel": "97"}})
+
+
+def test_unknown_profile_raises() -> None:
+    with pytest.raises(GeneratorError, match="Unknown profile"):
+        BudgetGenerator(minimal_spec(), profile="tiny")
@@ -50,3 +50,35 @@ def test_validate_json_structure_reports_all_issues() -> None:
     message = str(exc.value)
     assert "Missing required sheets" in message
     assert "must be an object" in message
+
+
+def test_validate_json_structure_rejects_unknown_target_excel() -> None:
+    spec = load_json_spec(fixture_path("valid_spec.json"))
+    spec["workbook"]["target_excel"] = "365"
+    validate_json_structure(spec)
+
+    spec["workbook"]["target_excel"] = "2003"
+    with pytest.raises(SpecValidationError, match="Unknown target_excel '2003'"):
+        validate_json_structure(spec)
+
+
+def test_load_json_spec_resolves_transactions_file(tmp_path: Path) -> None:
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(
+        '{"sheets": {"Budget Tracking": {"transactions_file": "data/ledger.csv"}}}',
+        encoding="utf-8",
+    )
+
+    spec = load_json_spec(spec_path)
+
+    assert spec["sheets"]["Budget Tracking"]["transactions_file"] == str(
+        tmp_path / "data" / "ledger.csv"
+    )
+
+
+def test_validate_json_structure_reports_missing_transactions_file(tmp_path: Path) -> None:
+    spec = load_json_spec(fixture_path("valid_spec.json"))
+    spec["sheets"]["Budget Tracking"] = {"transactions_file": str(tmp_path / "missing.csv")}
+
+    with pytest.raises(SpecValidationError, match="transactions_file' file not found"):
+        validate_json_structure(spec)
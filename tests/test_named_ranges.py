@@ -46,6 +46,19 @@ def test_duplicate_range_raises() -> None:
         manager.create_range("StartingYear", "Settings", "$E$8")
 
 
+def test_sort_names_orders_alphabetically() -> None:
+    workbook = Workbook()
+    manager = NamedRangeManager(workbook)
+    manager.create_range("YearsList", "Settings", "$B$3:$B$7")
+    manager.create_range("expenseCats", "Settings", "$B$9")
+    manager.create_range("DashYear", "Settings", "$C$2")
+
+    manager.sort_names()
+
+    assert list(workbook.defined_names) == ["DashYear", "expenseCats", "YearsList"]
+    assert workbook.defined_names["YearsList"].attr_text == "Settings!$B$3:$B$7"
+
+
 def test_register_many_is_convenience_wrapper() -> None:
     workbook = Workbook()
     specs = [
@@ -4,7 +4,13 @@ from __future__ import annotations
 
 from openpyxl import Workbook
 
-from budget_generator.sheets.calculations import build_calculations_sheet
+from budget_generator.sheets.calculations import (
+    build_calculations_sheet,
+    category_rows,
+    register_calculations_named_ranges,
+)
+from budget_generator.sheets.tracking import TrackingTable
+from budget_generator.utils.named_ranges import NamedRangeManager
 
 
 def _build_sheet() -> tuple[Workbook, str]:
@@ -69,6 +75,16 @@ def test_month_map_and_idx_formula() -> None:
     )
 
 
+def _tracked_month(column: int, kind: str) -> str:
+    # Years without a block fall back to totalling the whole table.
+    return (
+        f"=IFERROR(INDEX(TrackedMonthly,(TrackingYearIdx-1)*12+MonthIdx,{column}),"
+        f'SUMIFS(tblTracking[Amount],tblTracking[Type],"{kind}",tblTracking[Month Key],MonthIdx,'
+        'tblTracking[Effective Date],">="&DATE(DashYear,1,1),'
+        'tblTracking[Effective Date],"<"&DATE(DashYear+1,1,1)))'
+    )
+
+
 def test_budget_vs_tracked_table_formulas() -> None:
     workbook, sheet_name = _build_sheet()
     ws = workbook[sheet_name]
@@ -77,23 +93,146 @@ def test_budget_vs_tracked_table_formulas() -> None:
     assert headers == ["Section", "BudgetedMonth", "TrackedMonth", "Remaining"]
     assert ws["E2"].fill.start_color.rgb[-6:] == "DEEAF6"
 
-    assert ws["F3"].value == "=CHOOSE(MonthIdx,D13,E13,F13,G13,H13,I13,J13,K13,L13,M13,N13,O13)"
-    assert ws["G3"].value == (
-        "=SUMPRODUCT((MONTH(tblTracking[Effective Date])=MonthIdx)*(tblTracking[Type]=\"Income\")*tblTracking[Amount])"
-    )
+    assert ws["F3"].value == "=INDEX(IncomeTotals,MonthIdx)"
+    assert ws["G3"].value == _tracked_month(1, "Income")
     assert ws["H3"].value == "=F3-G3"
 
-    assert ws["F4"].value == "=CHOOSE(MonthIdx,D26,E26,F26,G26,H26,I26,J26,K26,L26,M26,N26,O26)"
-    assert ws["G4"].value == (
-        "=SUMPRODUCT((MONTH(tblTracking[Effective Date])=MonthIdx)*(tblTracking[Type]=\"Expense\")*tblTracking[Amount])"
-    )
+    assert ws["F4"].value == "=INDEX(ExpenseTotals,MonthIdx)"
+    assert ws["G4"].value == _tracked_month(2, "Expense")
     assert ws["H4"].value == "=F4-G4"
 
-    assert ws["F5"].value == "=CHOOSE(MonthIdx,D34,E34,F34,G34,H34,I34,J34,K34,L34,M34,N34,O34)"
-    assert ws["G5"].value == (
-        "=SUMPRODUCT((MONTH(tblTracking[Effective Date])=MonthIdx)*(tblTracking[Type]=\"Saving\")*tblTracking[Amount])"
-    )
+    assert ws["F5"].value == "=INDEX(SavingsTotals,MonthIdx)"
+    assert ws["G5"].value == _tracked_month(3, "Saving")
     assert ws["H5"].value == "=F5-G5"
 
     for column in (6, 7, 8):
         assert ws.cell(row=3, column=column).number_format.startswith("_($*")
+
+
+def test_tracked_matrix_sums_each_month_with_sumifs() -> None:
+    spec = {"tracking_years": (2024, 2025)}
+    workbook = Workbook()
+    ws = workbook.active
+    ws.title = "Calculations"
+    build_calculations_sheet(ws, spec)
+    register_calculations_named_ranges(NamedRangeManager(workbook), spec)
+
+    assert [ws.cell(row=2, column=col).value for col in range(31, 38)] == [
+        "Year",
+        "Month",
+        "Income",
+        "Expense",
+        "Saving",
+        "First Row",
+        "Last Row",
+    ]
+    # An unpartitioned ledger gets a block per ledger year, picked like a year table.
+    assert [[ws.cell(row=row, column=col).value for col in (13, 14)] for row in (2, 3)] == [
+        [2024, "tblTracking"],
+        [2025, "tblTracking"],
+    ]
+    assert ws["N1"].value == "=MATCH(DashYear,INDEX(TrackingYearMap,0,1),0)"
+    assert [ws["AE3"].value, ws["AE15"].value, ws["AF3"].value, ws["AF26"].value] == [2024, 2025, 1, 12]
+    assert [ws["AJ16"].value, ws["AK16"].value] == [
+        "=IFERROR(MATCH(202501,tblTracking[Year Month],1),0)+1",
+        "=IFERROR(MATCH(202502,tblTracking[Year Month],1),0)",
+    ]
+    # February sums January's rows too (late income); January reaches back into December.
+    assert "INDEX(tblTracking[Amount],$AJ$14):INDEX(tblTracking[Amount],$AK$15)" in ws["AH15"].value
+    assert ws["AH16"].value == (
+        "=IF($AK$16<$AJ$15,0,SUMIFS(INDEX(tblTracking[Amount],$AJ$15):INDEX(tblTracking[Amount],$AK$16),"
+        'INDEX(tblTracking[Type],$AJ$15):INDEX(tblTracking[Type],$AK$16),"Expense",'
+        "INDEX(tblTracking[Month Key],$AJ$15):INDEX(tblTracking[Month Key],$AK$16),$AF16))"
+    )
+    assert "DashYear" not in ws["AH16"].value
+    assert ws["AI26"].number_format.startswith("_($*")
+    assert workbook.defined_names["TrackingYearMap"].attr_text == "Calculations!$M$2:$N$3"
+    assert workbook.defined_names["TrackedMonthly"].attr_text == "Calculations!$AG$3:$AI$26"
+
+    # Without ledger years the single block is the starting year's.
+    workbook, sheet_name = _build_sheet()
+    assert [workbook[sheet_name]["M2"].value, workbook[sheet_name]["AE14"].value] == ["=StartingYear+0"] * 2
+    assert workbook[sheet_name]["AK3"].value == "=IFERROR(MATCH($AE3*100+$AF3,tblTracking[Year Month],1),0)"
+
+
+def test_partitioned_tracking_selects_the_dash_year_table() -> None:
+    partitions = (
+        TrackingTable(2024, "tblTracking2024", 11, 40, 25),
+        TrackingTable(2025, "tblTracking2025", 41, 60, 10),
+    )
+    workbook = Workbook()
+    ws = workbook.active
+    ws.title = "Calculations"
+    build_calculations_sheet(ws, {"tracking_partitions": partitions})
+    register_calculations_named_ranges(NamedRangeManager(workbook), {"tracking_partitions": partitions})
+
+    assert [[ws.cell(row=row, column=col).value for col in (13, 14)] for row in (2, 3)] == [
+        [2024, "tblTracking2024"],
+        [2025, "tblTracking2025"],
+    ]
+    assert ws["N1"].value == "=MATCH(DashYear,INDEX(TrackingYearMap,0,1),0)"
+    assert workbook.defined_names["TrackingYearMap"].attr_text == "Calculations!$M$2:$N$3"
+    assert ws["G3"].value == "=IFERROR(INDEX(TrackedMonthly,(TrackingYearIdx-1)*12+MonthIdx,1),0)"
+    assert [ws["AE3"].value, ws["AE15"].value, ws["AF15"].value] == [2024, 2025, 1]
+    assert [ws["AJ2"].value, ws["AK2"].value] == ["First Row", "Last Row"]
+    assert [ws["AJ15"].value, ws["AK15"].value] == [
+        "=IFERROR(MATCH(202500,tblTracking2025[Year Month],1),0)+1",
+        "=IFERROR(MATCH(202501,tblTracking2025[Year Month],1),0)",
+    ]
+
+    def income(first: str, last: str, month: str, table: str = "tblTracking2025") -> str:
+        def rows(column: str) -> str:
+            return f"INDEX({table}[{column}],{first}):INDEX({table}[{column}],{last})"
+
+        return (
+            f'IF({last}<{first},0,SUMIFS({rows("Amount")},{rows("Type")},"Income",'
+            f'{rows("Month Key")},{month}))'
+        )
+
+    # January also holds the previous December's late income, at the end of
+    # the previous year's table; the first year has none.
+    assert ws["AG15"].value == (
+        f'={income("$AJ$15", "$AK$15", "$AF15")}+{income("$AJ$14", "$AK$14", "$AF15", "tblTracking2024")}'
+    )
+    assert ws["AG3"].value == f'={income("$AJ$3", "$AK$3", "$AF3", "tblTracking2024")}'
+    assert ws["AG16"].value == f'={income("$AJ$15", "$AK$16", "$AF16")}'
+    assert workbook.defined_names["TrackedMonthly"].attr_text == "Calculations!$AG$3:$AI$26"
+    assert ws["C5"].value == "=COUNTA(tblTracking2024[Date],tblTracking2025[Date])"
+    assert ws["C6"].value == "=IFERROR(LOOKUP(2,1/(tblTracking2025[Date]<>\"\"),tblTracking2025[Balance]),0)"
+
+
+def test_category_block_totals_each_category_by_month() -> None:
+    rows = category_rows({"categories": {"Income": ["Salary"], "Expenses": ["Rent", "Food"], "Savings": []}})
+    assert [(row.section, row.index, row.planning_row) for row in rows] == [
+        ("Income", 1, 12),
+        ("Expenses", 1, 33),
+        ("Expenses", 2, 34),
+    ]
+
+    workbook = Workbook()
+    ws = workbook.active
+    ws.title = "Calculations"
+    build_calculations_sheet(ws, {"category_rows": rows})
+    register_calculations_named_ranges(NamedRangeManager(workbook), {"category_rows": rows})
+
+    assert [ws.cell(row=2, column=col).value for col in (16, 17, 18, 29)] == ["Type", "Category", "Jan", "Dec"]
+    assert [ws["P3"].value, ws["Q3"].value] == ["Income", "='Budget-Planning'!$D$12"]
+    assert [ws["P5"].value, ws["Q5"].value] == ["Expense", "='Budget-Planning'!$D$34"]
+    assert ws["S5"].value == (
+        '=SUMIFS(tblTracking[Amount],tblTracking[Type],"Expense",tblTracking[Month Key],2,'
+        "tblTracking[Category],$Q5,"
+        'tblTracking[Effective Date],">="&DATE(DashYear,1,1),'
+        'tblTracking[Effective Date],"<"&DATE(DashYear+1,1,1))'
+    )
+    assert "MonthIdx" not in ws["S5"].value
+    assert ws["AC5"].number_format.startswith("_($*")
+    assert workbook.defined_names["CategoryMonthly"].attr_text == "Calculations!$R$3:$AC$5"
+
+
+def test_category_block_without_rows_is_skipped() -> None:
+    workbook, sheet_name = _build_sheet()
+    ws = workbook[sheet_name]
+    register_calculations_named_ranges(NamedRangeManager(workbook), {})
+
+    assert ws["P2"].value is None
+    assert "CategoryMonthly" not in workbook.defined_names
@@ -5,8 +5,8 @@ from __future__ import annotations
 from openpyxl import Workbook
 from openpyxl.chart import DoughnutChart
 
-from budget_generator.charts import add_dashboard_doughnut_charts
-from budget_generator.sheets.calculations import build_calculations_sheet
+from budget_generator.charts import add_dashboard_doughnut_charts, dashboard_chart_values
+from budget_generator.sheets.calculations import build_calculations_sheet, category_rows
 from budget_generator.sheets.dashboard import build_dashboard_sheet
 
 
@@ -14,6 +14,7 @@ def _build_sheet(spec: dict | None = None):
     wb = Workbook()
     ws = wb.active
     ws.title = "Budget Dashboard"
+    wb.create_sheet("Calculations")
     build_dashboard_sheet(ws, spec or {})
     return wb, ws
 
@@ -75,6 +76,26 @@ def test_dashboard_selector_defaults_can_be_customised() -> None:
     assert ws["C4"].value == "Feb"
 
 
+def test_dashboard_category_breakdown_indexes_the_monthly_block() -> None:
+    rows = category_rows({"categories": {"Income": ["Salary"], "Expenses": ["Rent", "Food"], "Savings": []}})
+    _, ws = _build_sheet({"category_rows": rows})
+
+    header = [ws.cell(row=2, column=col).value for col in range(2, 9)]
+    assert [ws.cell(row=23, column=col).value for col in range(2, 9)] == header
+    assert [ws.cell(row=26, column=col).value for col in range(2, 9)] == [
+        "=DashYear",
+        "=DashPeriod",
+        "=Calculations!$Q$5",
+        "=INDEX(CategoryMonthly,3,MonthIdx)",
+        "=INDEX(ExpenseGrid,2,MonthIdx)",
+        "=IFERROR(E26/F26,0)",
+        "=F26-E26",
+    ]
+    assert ws["E24"].number_format.startswith("_($*")
+    assert ws["G24"].number_format == "0.0%"
+    assert ws.max_row == 26
+
+
 def test_dashboard_charts_created() -> None:
     wb = Workbook()
     calc_ws = wb.active
@@ -105,3 +126,74 @@ def test_dashboard_charts_created() -> None:
     assert first_chart.series[0].dLbls.showVal
 
     wb.close()
+
+
+def test_dashboard_charts_embed_cached_values() -> None:
+    wb = Workbook()
+    calc_ws = wb.active
+    calc_ws.title = "Calculations"
+    build_calculations_sheet(calc_ws, {})
+    dashboard_ws = wb.create_sheet("Budget Dashboard")
+    build_dashboard_sheet(dashboard_ws, {})
+
+    add_dashboard_doughnut_charts(
+        dashboard_ws,
+        {"Income": (3000.0, 2500.0), "Expenses": (1200.0, 900.0), "Savings": (300.0, 0.0)},
+    )
+
+    income = dashboard_ws._charts[0]  # type: ignore[attr-defined]
+    budgeted, tracked = income.series
+    assert [pt.v for pt in budgeted.val.numRef.numCache.pt] == [3000.0]
+    assert [pt.v for pt in tracked.val.numRef.numCache.pt] == [2500.0]
+    assert tracked.val.numRef.f == "'Calculations'!$G$3"
+    assert budgeted.cat.strRef.f == "'Calculations'!$F$2:$G$2"
+    assert [pt.v for pt in budgeted.cat.strRef.strCache.pt] == ["BudgetedMonth", "TrackedMonth"]
+
+    wb.close()
+
+
+def test_dashboard_chart_values_follow_default_selectors() -> None:
+    entries = [
+        {"date": "2026-02-03", "type": "Income", "category": "Salary", "amount": 2000},
+        {"date": "2026-01-28", "type": "Income", "category": "Bonus", "amount": 500},
+        {"date": "2026-02-10", "type": "expense", "category": "Rent", "amount": 800},
+        {"date": "2026-03-01", "type": "Saving", "category": "ETFs", "amount": 100},
+    ]
+    sheet_specs = {
+        "Settings": {"general": {"starting_year": 2025}, "late_income": {"enabled_default": True, "day_default": 25}},
+        "Budget-Planning": {"planned_amounts": {"Income": {"Salary": [[1, 1], [3000, 3100]]}}},
+        "Budget Tracking": {"sample_entries": entries},
+        "Budget Dashboard": {"selectors": {"default_year_formula": "=StartingYear+1", "default_period": "Feb"}},
+    }
+
+    # Year 2 of the plan is not what IncomeTotals reads, and late income
+    # moves the Jan 28 bonus into February.
+    assert dashboard_chart_values(sheet_specs) == {
+        "Income": (1.0, 2500.0),
+        "Expenses": (0.0, 800.0),
+        "Savings": (0.0, 0.0),
+    }
+
+    partitioned = {**sheet_specs, "Budget Tracking": {"sample_entries": entries, "partition": "year"}}
+    assert dashboard_chart_values(partitioned)["Income"] == (1.0, 2500.0)
+    partitioned["Budget Dashboard"] = {"selectors": {"default_year_formula": 2025, "default_period": "Feb"}}
+    assert dashboard_chart_values(partitioned)["Income"] == (1.0, 0.0)  # no 2025 table
+
+    custom = {**sheet_specs, "Budget Dashboard": {"selectors": {"default_year_formula": "=YEAR(TODAY())"}}}
+    assert dashboard_chart_values(custom) is None
+
+
+def test_december_late_income_counts_towards_the_next_january() -> None:
+    entries = [
+        {"date": "2025-01-05", "type": "Income", "category": "Salary", "amount": 100},
+        {"date": "2025-12-31", "type": "Income", "category": "Salary", "amount": 700},
+        {"date": "2026-01-10", "type": "Income", "category": "Salary", "amount": 50},
+    ]
+    for partition in (None, "year"):
+        sheet_specs = {
+            "Settings": {"late_income": {"enabled_default": True, "day_default": 25}},
+            "Budget Tracking": {"sample_entries": entries, "partition": partition},
+        }
+        for year, tracked in ((2025, 100.0), (2026, 750.0)):
+            sheet_specs["Budget Dashboard"] = {"selectors": {"default_year_formula": year}}
+            assert dashboard_chart_values(sheet_specs)["Income"][1] == tracked, (partition, year)
@@ -1,10 +1,37 @@
 from __future__ import annotations
 
-from openpyxl import Workbook
+import struct
+import time
+import zipfile
+from array import array
+from pathlib import Path
 
+import pytest
 from openpyxl import Workbook
+from openpyxl.formula.translate import Translator
+
+from budget_generator.sheets.planning import (
+    PlanningSheetBuilder,
+    build_planning_sheet,
+    planning_layout,
+    register_planning_named_ranges,
+)
+from budget_generator.utils.named_ranges import NamedRangeManager
+
+
+def _write_npz(path: Path, arrays: dict[str, tuple[tuple[int, ...], list[float]]]) -> Path:
+    """Write float64 arrays the way ``numpy.savez`` does, without NumPy."""
 
-from budget_generator.sheets.planning import build_planning_sheet
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, (shape, values) in arrays.items():
+            header = repr({"descr": "<f8", "fortran_order": False, "shape": shape}).encode("latin-1")
+            header += b" " * (-(len(header) + 11) % 64) + b"\n"
+            payload = array("d", values)
+            archive.writestr(
+                f"{name}.npy",
+                b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header + payload.tobytes(),
+            )
+    return path
 
 
 def test_planning_banner_and_headers() -> None:
@@ -32,7 +59,8 @@ def test_planning_sections_and_totals() -> None:
     assert ws["D10"].fill.start_color.rgb[-6:] == "43D40F"
     assert ws["D12"].value == "Salary"
     assert ws["D24"].value == "Total Income"
-    assert ws["E24"].value == "=SUM(E12:E23)"
+    assert ws["E24"].value.text == "=SUM(E12:E23)"
+    assert ws["E24"].value.ref == "E24:Q24" and ws["Q24"].value.si == ws["E24"].value.si
 
     assert ws["D31"].value == "Expenses"
     assert ws["D31"].fill.start_color.rgb[-6:] == "F01010"
@@ -49,7 +77,8 @@ def test_planning_sections_and_totals() -> None:
         assert ws.cell(row=12, column=column).number_format.startswith("_($*")
 
     total_cell = ws.cell(row=12, column=17)
-    assert total_cell.value == "=SUM(E12:P12)"
+    assert total_cell.value.text == "=SUM(E12:P12)"
+    assert total_cell.value.ref == "Q12:Q23"
     assert total_cell.number_format.startswith("_($*")
 
 
@@ -60,11 +89,13 @@ def test_unallocated_row_formulas_and_conditional_formatting() -> None:
 
     build_planning_sheet(ws, {})
 
+    anchor = ws["E7"].value
+    assert (anchor.text, anchor.ref) == ("=E24-E45-E67", "E7:Q7")
     for column in range(5, 18):
         col_letter = ws.cell(row=7, column=column).column_letter
-        assert ws.cell(row=7, column=column).value == (
-            f"={col_letter}24-{col_letter}45-{col_letter}67"
-        )
+        formula = Translator(anchor.text, "E7").translate_formula(f"{col_letter}7")
+        assert formula == f"={col_letter}24-{col_letter}45-{col_letter}67"
+        assert ws.cell(row=7, column=column).value.si == anchor.si
 
     cf_rules = []
     for cf in ws.conditional_formatting:
@@ -99,3 +130,137 @@ def test_scaffold_years_config_creates_additional_headers() -> None:
     assert ws["AG5"].value == "=StartingYear+2"
     headers_year3 = [ws.cell(row=6, column=col).value for col in range(33, 46)]
     assert headers_year3[0] == '=IF(AG7=0,"Jan ✓","Jan")'
+
+
+def test_planned_amounts_fill_the_year_one_grid() -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Budget-Planning"
+
+    planned = {"Income": {"Freelance": [100, None, 250.5], "Side Gig": [40] * 12}}
+    build_planning_sheet(ws, {"planned_amounts": planned})
+
+    assert [ws.cell(row=13, column=column).value for column in range(5, 9)] == [100, 0, 250.5, 0]
+    assert ws["D16"].value == "Side Gig"  # first empty Income row
+    assert ws["P16"].value == 40
+    assert ws["E12"].value == 0
+
+
+def test_large_category_lists_grow_sections_and_move_later_ones() -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Budget-Planning"
+
+    spec = {"categories": {"Income": [f"Source {index}" for index in range(300)]}}
+    build_planning_sheet(ws, spec)
+
+    layout = planning_layout(spec)
+    assert [(s.title_row, s.start_row, s.total_row) for s in layout.sections] == [
+        (10, 12, 312),
+        (319, 321, 333),
+        (341, 343, 355),
+    ]
+    assert ws["D311"].value == "Source 299"
+    assert ws["E312"].value.text == "=SUM(E12:E311)"
+    assert ws["D319"].value == "Expenses"
+    assert ws["D355"].value == "Total Savings"
+    assert ws["E7"].value.text == "=E312-E333-E355"
+    gray = next(rule for cf in ws.conditional_formatting for rule in cf.rules if rule.type == "expression")
+    assert gray.formula == ["AND(E312=0,E333=0,E355=0)"]
+
+    manager = NamedRangeManager(wb)
+    register_planning_named_ranges(manager, spec)
+    assert wb.defined_names["IncomeCats"].attr_text.endswith("!$D$12:$D$311")
+    assert wb.defined_names["SavingsTotals"].attr_text.endswith("!$E$355:$Q$355")
+
+
+def test_planned_amounts_reject_more_than_twelve_months() -> None:
+    wb = Workbook()
+    ws = wb.active
+
+    planned = {"Savings": {"Goal": [1] * 13}}
+    with pytest.raises(ValueError, match="more than 12 monthly amounts"):
+        build_planning_sheet(ws, {"planned_amounts": planned})
+
+
+def test_per_year_planned_amounts_fill_later_year_grids() -> None:
+    wb = Workbook()
+    ws = wb.active
+
+    planned = {"Expenses": {"Housing": [[1200] * 12, [1250] * 12, [1300, 1300]]}}
+    build_planning_sheet(ws, {"scaffold_years": 4, "planned_amounts": planned})
+
+    assert ws["E33"].value == 1200
+    assert ws["S33"].value == 1250  # year 2 block starts at column S
+    assert ws["AG33"].value == 1300 and ws["AI33"].value == 0
+    assert ws["AE33"].value.text == "=SUM(S33:AD33)"
+    assert ws["S45"].value.text == "=SUM(S33:S44)"
+    assert ws["S7"].value.text == "=S24-S45-S67"
+    assert ws["S33"].number_format == ws["E33"].number_format
+    assert ws["AU33"].value is None  # year 4 has no amounts and stays a scaffold
+
+
+def test_planned_amounts_beyond_the_scaffold_years_are_rejected() -> None:
+    wb = Workbook()
+    ws = wb.active
+
+    planned = {"Income": {"Salary": [[1] * 12] * 3}}
+    with pytest.raises(ValueError, match="year 3 but only 2 scaffold years"):
+        build_planning_sheet(ws, {"planned_amounts": planned})
+
+
+def test_planned_amounts_load_from_a_csv_file(tmp_path: Path) -> None:
+    source = tmp_path / "plan.csv"
+    source.write_text(
+        "section,category,year,month,amount\n"
+        "Income,Salary,2030,Jan,3000\n"
+        "Income,Salary,2031,12,3100\n"
+        "Savings,Boat,2030,Mar,75.5\n",
+        encoding="utf-8",
+    )
+    wb = Workbook()
+    ws = wb.active
+
+    spec = {"planned_amounts_file": str(source), "starting_year": 2030, "planned_amounts": {"Income": {"Other": [5]}}}
+    build_planning_sheet(ws, spec)
+
+    assert ws["E12"].value == 3000
+    assert ws["AD12"].value == 3100  # Dec of year 2
+    assert ws["D60"].value == "Boat"
+    assert ws["G60"].value == 75.5
+    assert ws["E15"].value == 5
+
+
+def test_planned_amounts_load_from_an_npz_matrix(tmp_path: Path) -> None:
+    values = [float(year * 100 + row) for year in range(3) for row in range(2) for _ in range(12)]
+    source = _write_npz(tmp_path / "plan.npz", {"Income": ((3, 2, 12), values)})
+    wb = Workbook()
+    ws = wb.active
+
+    build_planning_sheet(ws, {"planned_amounts_file": str(source), "scaffold_years": 3})
+
+    assert [ws["E12"].value, ws["E13"].value, ws["S12"].value, ws["AG13"].value] == [0, 1, 100, 201]
+
+
+def test_planned_amounts_file_errors_surface_as_value_errors(tmp_path: Path) -> None:
+    source = _write_npz(tmp_path / "plan.npz", {"Travel": ((1, 12), [0.0] * 12)})
+
+    with pytest.raises(ValueError, match="unknown section array"):
+        planning_layout({"planned_amounts_file": str(source)})
+    with pytest.raises(ValueError, match="Unable to read planned amounts"):
+        planning_layout({"planned_amounts_file": str(tmp_path / "missing.csv")})
+
+
+def test_sixteen_years_of_five_hundred_categories_load_quickly() -> None:
+    names = [f"Cost {index}" for index in range(500)]
+    planned = {"Expenses": {name: [[float(year)] * 12 for year in range(16)] for name in names}}
+    wb = Workbook()
+    ws = wb.active
+
+    started = time.perf_counter()
+    build_planning_sheet(ws, {"scaffold_years": 16, "categories": {"Expenses": names}, "planned_amounts": planned})
+    elapsed = time.perf_counter() - started
+
+    last_year = PlanningSheetBuilder.year_start_column(15)
+    assert ws.cell(row=33 + 499, column=last_year).value == 15.0
+    assert elapsed < 1.5
@@ -0,0 +1,87 @@
+"""Tests for the sheet builder registry."""
+
+from __future__ import annotations
+
+import pytest
+from openpyxl import Workbook
+
+from budget_generator.sheets.calculations import category_rows
+from budget_generator.sheets.registry import (
+    DEFAULT_REGISTRY,
+    DependencyError,
+    SheetBuilder,
+    SheetRegistry,
+    UnknownSheetError,
+)
+from budget_generator.utils.named_ranges import NamedRangeManager
+
+
+def _noop(worksheet, spec) -> None:
+    return None
+
+
+def test_full_plan_orders_providers_before_consumers() -> None:
+    plan = DEFAULT_REGISTRY.plan()
+    order = [builder.key for builder in plan.builders]
+
+    assert order.index("settings") < order.index("planning")
+    assert order.index("planning") < order.index("tracking")
+    assert order.index("tracking") < order.index("calculations")
+    assert order.index("dashboard") < order.index("calculations")
+    assert [builder.key for builder in plan.waves[0]] == ["settings"]
+
+
+def test_subset_plan_is_dependency_closed() -> None:
+    plan = DEFAULT_REGISTRY.plan(["Tracking", "Calculations"])
+
+    assert set(plan.sheet_names) == {
+        "Settings",
+        "Dropdown Data",
+        "Budget-Planning",
+        "Budget Tracking",
+        "Calculations",
+        "Budget Dashboard",
+    }
+
+    settings_only = DEFAULT_REGISTRY.plan(["settings"])
+    assert settings_only.sheet_names == ("Settings",)
+
+    planning = DEFAULT_REGISTRY.plan(["Budget-Planning"])
+    assert planning.sheet_names == ("Settings", "Budget-Planning")
+
+
+def test_registered_named_ranges_match_declarations() -> None:
+    # Calculations only defines CategoryMonthly when planning has categories.
+    spec = {"category_rows": category_rows(None)}
+    for builder in DEFAULT_REGISTRY:
+        if builder.register is None:
+            continue
+        workbook = Workbook()
+        builder.register(NamedRangeManager(workbook), spec)
+        assert set(workbook.defined_names) == set(builder.provides), builder.key
+
+
+def test_dashboard_plans_pull_in_calculations_without_a_cycle() -> None:
+    plan = DEFAULT_REGISTRY.plan(["Dashboard"])
+
+    assert "Calculations" in plan.sheet_names
+    order = [builder.key for builder in plan.builders]
+    assert order.index("dashboard") < order.index("calculations")
+
+
+def test_unknown_sheet_and_cycles_are_reported() -> None:
+    with pytest.raises(UnknownSheetError):
+        DEFAULT_REGISTRY.plan(["Ledger"])
+
+    registry = SheetRegistry(
+        (
+            SheetBuilder("a", "A", _noop, provides=frozenset({"X"}), consumes=frozenset({"Y"})),
+            SheetBuilder("b", "B", _noop, provides=frozenset({"Y"}), consumes=frozenset({"X"})),
+        )
+    )
+    with pytest.raises(DependencyError):
+        registry.plan()
+
+    orphan = SheetRegistry((SheetBuilder("c", "C", _noop, consumes=frozenset({"Z"})),))
+    with pytest.raises(DependencyError):
+        orphan.plan(["c"])
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import json
+from datetime import datetime
+
+import pytest
 from openpyxl import Workbook
 
 from budget_generator.sheets.tracking import (
@@ -8,6 +12,7 @@ from budget_generator.sheets.tracking import (
     add_tracking_formulas,
     add_tracking_validations,
     build_tracking_sheet,
+    resolve_tracking_config,
 )
 
 
@@ -24,9 +29,9 @@ def test_tracking_table_structure() -> None:
 
     assert "tblTracking" in ws.tables
     table = ws.tables["tblTracking"]
-    assert table.ref == "C11:I20"
+    assert table.ref == "C11:L20"
 
-    headers = [ws.cell(row=11, column=col).value for col in range(3, 10)]
+    headers = [ws.cell(row=11, column=col).value for col in range(3, 13)]
     assert headers == [
         "Date",
         "Type",
@@ -35,6 +40,9 @@ def test_tracking_table_structure() -> None:
         "Details",
         "Balance",
         "Effective Date",
+        "Month Key",
+        "Year Month",
+        "Signed Amount",
     ]
 
     assert ws.column_dimensions["B"].width == 40
@@ -42,6 +50,20 @@ def test_tracking_table_structure() -> None:
     assert ws["F12"].number_format.startswith("_($*")
 
 
+def test_formats_stop_at_the_table() -> None:
+    ws = build_sheet(50)
+
+    # Default sample entries fill rows 12-14; later rows are formatted but blank.
+    assert ws["C20"].value is None and ws["C20"].number_format == "yyyy-mm-dd"
+    assert ws["F50"].number_format.startswith("_($*") and ws["G50"].number_format == "@"
+    assert (20, 4) not in ws._cells and (20, 5) not in ws._cells
+    assert ws["H20"].value.si == ws["H12"].value.si  # one shared formula down the column
+    assert ws["H12"].value.text.startswith("=SUMPRODUCT(")
+    assert ws.column_dimensions["C"].number_format == "General"
+    assert ws["C51"].number_format == "General"
+    assert ws["E12"].value is not None and not ws["E12"].has_style
+
+
 def test_tracking_validations_created() -> None:
     cfg = TrackingConfig(max_rows=12)
     wb = Workbook()
@@ -61,13 +83,22 @@ def test_tracking_formulas_and_conditional_formatting() -> None:
     ws = build_sheet(20)
 
     assert (
-        ws["H12"].value
+        ws["H12"].value.text
         == "=SUMPRODUCT((tblTracking[Date]<=[@Date])*(tblTracking[Type]=\"Income\")*tblTracking[Amount])-SUMPRODUCT((tblTracking[Date]<=[@Date])*((tblTracking[Type]=\"Expense\")+(tblTracking[Type]=\"Saving\"))*tblTracking[Amount])"
     )
     assert (
-        ws["I12"].value
+        ws["I12"].value.text
         == "=IF(AND(LateIncomeEnabled,[@Type]=\"Income\",DAY([@Date])>LateIncomeDay),DATE(YEAR([@Date]),MONTH([@Date])+1,1),[@Date])"
     )
+    assert ws["J12"].value.text == '=IF([@Date]="","",MONTH([@[Effective Date]]))'
+    assert dict(ws["J12"].value) == {"t": "shared", "ref": "J12:J20", "si": str(ws["J12"].value.si)}
+    assert dict(ws["J20"].value) == {"t": "shared", "si": str(ws["J12"].value.si)}
+    assert len({ws[f"{column}12"].value.si for column in "HIJ"}) == 3
+
+    columns = {column.name: column for column in ws.tables["tblTracking"].tableColumns}
+    assert columns["Month Key"].calculatedColumnFormula.attr_text == ws["J12"].value.text[1:]
+    assert columns["Balance"].calculatedColumnFormula.attr_text.startswith("SUMPRODUCT(")
+    assert columns["Amount"].calculatedColumnFormula is None
 
     rules = []
     for cf in ws.conditional_formatting:
@@ -75,3 +106,104 @@ def test_tracking_formulas_and_conditional_formatting() -> None:
 
     assert any(rule.type == "expression" and "ISNA" in rule.formula[0] for rule in rules)
     assert any(rule.type == "expression" and "Income" in rule.formula[0] for rule in rules)
+
+
+def test_static_effective_dates_keep_formulas_for_blank_rows() -> None:
+    entries = [
+        {"date": "2024-02-27", "type": "income", "category": "Salary", "amount": 100},
+        {"date": "2024-03-28", "type": "Expense", "category": "Rent", "amount": 40},
+        {"date": "2024-12-26", "type": "Income", "category": "Salary", "amount": 100},
+    ]
+    late_income = {"enabled_default": True, "day_default": 25}
+    wb = Workbook()
+    ws = wb.active
+    spec = {"max_rows": 20, "sample_entries": entries, "static_effective_dates": True, "late_income": late_income}
+    build_tracking_sheet(ws, spec)
+
+    assert [ws[f"I{row}"].value for row in (12, 13, 14)] == [
+        datetime(2024, 3, 1),
+        datetime(2024, 3, 28),
+        datetime(2025, 1, 1),
+    ]
+    assert ws["I12"].number_format == "yyyy-mm-dd"
+    assert ws["I15"].value.text.startswith("=IF(AND(LateIncomeEnabled,")
+    assert ws["I15"].value.ref == "I15:I20"
+    assert ws["J12"].value.ref == "J12:J20"  # Month Key reads the static dates
+
+    # Without the late income setting only the formula rows differ from the dates.
+    ws = Workbook().active
+    build_tracking_sheet(ws, {**spec, "late_income": {}, "partition": "year", "spare_rows": 1})
+    assert [ws[f"I{row}"].value for row in (12, 13, 14)] == [datetime.fromisoformat(entry["date"]) for entry in entries]
+    assert isinstance(ws["I15"].value, str)  # a single blank row gets a plain formula
+
+
+def test_tracking_reads_transactions_file(tmp_path) -> None:
+    ledger = tmp_path / "ledger.jsonl"
+    ledger.write_text(
+        '{"date": "2025-02-03", "type": "Expense", "category": "Housing", "amount": 950, "details": "Rent"}\n'
+        '{"date": "2025-02-04", "type": "Expense", "category": "Groceries"}\n'
+        '{"date": "2025-02-05", "type": "Income", "category": "Salary", "amount": "3100.5"}\n',
+        encoding="utf-8",
+    )
+    wb = Workbook()
+    ws = wb.active
+    build_tracking_sheet(ws, {"max_rows": 20, "transactions_file": str(ledger)})
+
+    # The entry without an amount is skipped and the default samples are not used.
+    rows = [[ws.cell(row=row, column=col).value for col in range(4, 8)] for row in (12, 13, 14)]
+    assert rows == [
+        ["Expense", "Housing", 950.0, "Rent"],
+        ["Income", "Salary", 3100.5, None],
+        [None, None, None, None],
+    ]
+
+
+def _yearly_entries(*years: int) -> list[dict]:
+    return [
+        {"date": f"{year}-0{month}-10", "type": "Expense", "category": "Groceries", "amount": 10 * month}
+        for year in years
+        for month in (1, 2)
+    ]
+
+
+def test_year_partition_stacks_one_table_per_year() -> None:
+    wb = Workbook()
+    ws = wb.active
+    spec = {"partition": "year", "spare_rows": 3, "sample_entries": _yearly_entries(2023, 2024)}
+    build_tracking_sheet(ws, spec)
+
+    assert dict(ws.tables.items()) == {"tblTracking2023": "C11:L16", "tblTracking2024": "C17:L22"}
+    assert ws["C17"].value == "Date"
+    assert ws["C18"].value.year == 2024
+    assert ws["C16"].value is None  # spare row left for new 2023 entries
+    assert ws["B11"].value == 0
+    assert ws["B17"].value == "=B11+SUM(tblTracking2023[Signed Amount])"
+    assert ws["K18"].value.text == '=IF([@Date]="","",YEAR([@Date])*100+MONTH([@Date]))'
+    assert ws["H18"].value.text.startswith("=$B$17+SUMPRODUCT((tblTracking2024[Date]<=[@Date])")
+    assert ws["H18"].value.ref == "H18:H22" and ws["H12"].value.ref == "H12:H16"
+
+    date_validation = next(v for v in ws.data_validations.dataValidation if v.type == "date")
+    assert str(date_validation.sqref) == "C12:C16 C18:C22"
+
+
+@pytest.mark.parametrize("partition", [None, "year"])
+def test_entries_come_in_date_order(tmp_path, partition) -> None:
+    entries = _yearly_entries(2024) + _yearly_entries(2023)
+    config = resolve_tracking_config({"partition": partition, "sample_entries": entries})
+    # Inline entries are sorted; a ledger file is read as is and must come sorted.
+    assert [entry.date.year for entry in config.entries()] == [2023, 2023, 2024, 2024]
+
+    ledger = tmp_path / "ledger.jsonl"
+    # Months within a year must be in order too.
+    ledger.write_text("\n".join(json.dumps(entry) for entry in _yearly_entries(2024)[::-1]) + "\n")
+    config = resolve_tracking_config({"partition": partition, "transactions_file": str(ledger)})
+    with pytest.raises(ValueError, match="date order; 2024-01-10 follows 2024-02-10"):
+        list(config.entries())
+    if partition:
+        with pytest.raises(ValueError, match="date order"):
+            config.partitions
+
+
+def test_year_partition_rejects_unknown_modes() -> None:
+    with pytest.raises(ValueError, match="Unknown tracking partition"):
+        resolve_tracking_config({"partition": "month"})
@@ -0,0 +1,151 @@
+"""Tests for synthetic dataset generation and transaction files."""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from budget_generator.__main__ import cli
+from budget_generator.estimate import estimate_spec
+from budget_generator.generator import BudgetGenerator
+from budget_generator.synth import (
+    SynthConfig,
+    SynthError,
+    iter_transactions,
+    planning_categories,
+    select_categories,
+    synth_spec,
+    write_synthetic_dataset,
+)
+from budget_generator.utils.json_loader import load_json_spec, validate_json_structure
+from budget_generator.utils.transactions import (
+    TransactionFileError,
+    iter_transaction_records,
+    write_transaction_records,
+)
+
+
+def test_transactions_are_seeded_and_date_ordered() -> None:
+    config = SynthConfig(transactions=600, years=2, seed=7)
+
+    first = list(iter_transactions(config))
+    second = list(iter_transactions(config))
+    other_seed = list(iter_transactions(SynthConfig(transactions=600, years=2, seed=8)))
+
+    assert first == second
+    assert first != other_seed
+    assert len(first) == 600
+    assert [record["date"] for record in first] == sorted(record["date"] for record in first)
+    assert first[0]["date"] >= date(2025, 1, 1)
+    assert first[-1]["date"] <= date(2026, 12, 31)
+
+
+def test_transactions_follow_mix_categories_and_late_income() -> None:
+    config = SynthConfig(
+        transactions=6000,
+        categories=6,
+        type_mix=(1, 1, 0),
+        late_income_share=0.5,
+        late_income_day=20,
+        details=3,
+    )
+    records = list(iter_transactions(config))
+    types = Counter(record["type"] for record in records)
+    income_days = [record["date"].day for record in records if record["type"] == "Income"]
+
+    assert set(types) == {"Income", "Expense"}
+    assert abs(types["Income"] - types["Expense"]) < 600
+    assert {record["category"] for record in records} <= {
+        name for names in select_categories(config).values() for name in names
+    }
+    assert sum(len(names) for names in select_categories(config).values()) == 6
+    late_share = sum(day > 20 for day in income_days) / len(income_days)
+    assert 0.45 < late_share < 0.55
+    assert len({record["details"] for record in records}) == 3
+
+
+def test_categories_come_from_planning_sheet() -> None:
+    available = planning_categories()
+
+    assert set(available) == {"Income", "Expense", "Saving"}
+    with pytest.raises(SynthError, match="Category count"):
+        SynthConfig(categories=2)
+    with pytest.raises(SynthError, match="Type mix"):
+        SynthConfig(type_mix=(0, 0, 0))
+
+
+@pytest.mark.parametrize("suffix", ["csv", "jsonl"])
+def test_transaction_files_round_trip(tmp_path: Path, suffix: str) -> None:
+    path = tmp_path / f"ledger.{suffix}"
+    records = list(iter_transactions(SynthConfig(transactions=50, details=0)))
+
+    assert write_transaction_records(path, records) == 50
+    loaded = list(iter_transaction_records(path))
+
+    assert len(loaded) == 50
+    assert loaded[0]["date"] == records[0]["date"].isoformat()
+    assert float(loaded[0]["amount"]) == records[0]["amount"]
+    assert loaded[0]["details"] is None
+
+
+def test_unknown_transaction_format_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(TransactionFileError, match="Unsupported"):
+        write_transaction_records(tmp_path / "ledger.xlsx", [])
+
+
+def test_synthetic_dataset_builds_workbook(tmp_path: Path) -> None:
+    result = write_synthetic_dataset(SynthConfig(transactions=120, years=1), tmp_path)
+    spec = load_json_spec(result.spec_path)
+    validate_json_structure(spec)
+
+    estimate = estimate_spec(spec)
+    generator = BudgetGenerator(spec)
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    tracking = generator.workbook["Budget Tracking"]
+
+    assert tracking.tables["tblTracking"].ref == "C11:L131"
+    assert tracking["D131"].value is not None
+    assert not estimate.warnings
+    tracking_estimate = next(sheet for sheet in estimate.sheets if sheet.name == "Budget Tracking")
+    assert tracking_estimate.cells == len(tracking._cells)
+
+
+def test_synth_command_writes_dataset(tmp_path: Path) -> None:
+    runner = CliRunner()
+
+    result = runner.invoke(
+        cli,
+        ["synth", str(tmp_path / "out"), "-n", "30", "--format", "jsonl", "--seed", "3"],
+    )
+    bad_mix = runner.invoke(cli, ["synth", str(tmp_path / "bad"), "--type-mix", "a,b,c"])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "out" / "spec.json").exists()
+    assert len((tmp_path / "out" / "transactions.jsonl").read_text().splitlines()) == 30
+    assert bad_mix.exit_code != 0
+
+
+def test_categories_beyond_the_planning_defaults_get_planning_rows(tmp_path: Path) -> None:
+    config = SynthConfig(transactions=300, categories=60, years=7)
+    chosen = select_categories(config)
+    assert sum(len(names) for names in chosen.values()) == 60
+    assert chosen["Saving"][5:7] == ("Saving 001", "Saving 002")
+
+    spec = synth_spec(config, "transactions.csv")
+    planning = spec["sheets"]["Budget-Planning"]
+    for kind, section in (("Income", "Income"), ("Expense", "Expenses"), ("Saving", "Savings")):
+        assert set(chosen[kind]) <= set(planning["categories"][section])
+    assert spec["workbook"]["named_ranges"]["YearsList"]["ref"] == "B3:B9"
+
+    result = write_synthetic_dataset(config, tmp_path)
+    generator = BudgetGenerator(load_json_spec(result.spec_path))
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    assert generator.workbook.defined_names["YearsList"].attr_text == "'Dropdown Data'!$B$3:$B$9"
@@ -0,0 +1,166 @@
+"""Tests for appending transactions to an existing workbook."""
+
+from __future__ import annotations
+
+import copy
+import json
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+import openpyxl
+import pytest
+from click.testing import CliRunner
+
+from budget_generator.__main__ import cli
+from budget_generator.generator import BudgetGenerator
+from budget_generator.sheets.tracking import EFFECTIVE_DATE_FORMULA, MONTH_KEY_FORMULA, TrackingConfig
+from budget_generator.utils.json_loader import load_json_spec
+from budget_generator.xlsx import PackageError, XlsxPackage, append_transactions, diff_workbooks
+
+SPEC_PATH = Path("examples/tutorial_spec.json")
+BASE_ENTRIES = [
+    {"date": "2017-01-01", "type": "Income", "category": "DiDi", "amount": 7700.5},
+    {"date": "2017-03-02", "type": "Saving", "category": "ETFs", "amount": 5000},
+]
+# Same year as the base ledger: a year the workbook has no Calculations block
+# for is totalled by its fallback, which a regenerated workbook would not need.
+NEW_ENTRIES = [
+    {
+        "date": f"2017-04-{day:02d}",
+        "type": "Expense",
+        "category": "Rent",
+        "amount": day * 10.5,
+        "details": "Landlord & Co <flat>",
+    }
+    for day in range(1, 11)
+]
+
+
+def _generate(output: Path, entries: list[dict], max_rows: int, **tracking: object) -> Path:
+    spec = copy.deepcopy(load_json_spec(SPEC_PATH))
+    spec["sheets"]["Budget Tracking"].update(max_rows=max_rows, sample_entries=entries, **tracking)
+    generator = BudgetGenerator(spec)
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    return generator.save_workbook(output, deterministic=True)
+
+
+def _ledger(path: Path) -> Path:
+    path.write_text("\n".join(json.dumps(entry) for entry in NEW_ENTRIES) + "\n")
+    return path
+
+
+def test_appended_rows_match_a_regenerated_workbook(tmp_path: Path) -> None:
+    # 16 rows leaves three blank capacity rows; the rest extend the table.
+    original = _generate(tmp_path / "original.xlsx", BASE_ENTRIES, max_rows=16)
+    entries = TrackingConfig(transactions_file=_ledger(tmp_path / "new.jsonl")).entries()
+
+    result = append_transactions(original, entries, tmp_path / "appended.xlsx")
+    expected = _generate(tmp_path / "expected.xlsx", BASE_ENTRIES + NEW_ENTRIES, max_rows=23)
+
+    assert (result.rows, result.first_row, result.last_row) == (10, 14, 23)
+    assert result.table_ref == "C11:L23"
+    differences = diff_workbooks(expected, result.output).differences
+    # Per-row Category validations become one relative range over the new rows.
+    assert differences and {difference.kind for difference in differences} == {"validation"}
+
+    workbook = openpyxl.load_workbook(result.output)
+    try:
+        tracking = workbook["Budget Tracking"]
+        assert tracking.tables["tblTracking"].ref == "C11:L23"
+        assert tracking["G23"].value == "Landlord & Co <flat>"
+        assert tracking["H23"].value.startswith("=SUMPRODUCT(")
+        sqrefs = {str(validation.sqref) for validation in tracking.data_validations.dataValidation}
+        assert {"C12:C23", "D12:D23", "E16:E23"} <= sqrefs
+        assert str(next(iter(tracking.conditional_formatting)).sqref) == "E12:E23"
+    finally:
+        workbook.close()
+
+
+def test_append_to_a_full_static_date_table_uses_the_calculated_formulas(tmp_path: Path) -> None:
+    # The last filled row holds a static Effective Date, not a formula to copy.
+    original = _generate(tmp_path / "original.xlsx", BASE_ENTRIES, max_rows=13, static_effective_dates=True)
+    entries = TrackingConfig(transactions_file=_ledger(tmp_path / "new.jsonl")).entries()
+
+    result = append_transactions(original, entries, tmp_path / "appended.xlsx")
+
+    assert (result.first_row, result.last_row) == (14, 23)
+    workbook = openpyxl.load_workbook(result.output)
+    try:
+        tracking = workbook["Budget Tracking"]
+        assert isinstance(tracking["I13"].value, datetime)
+        for row in (14, 23):
+            assert tracking[f"I{row}"].value == EFFECTIVE_DATE_FORMULA
+            assert tracking[f"J{row}"].value == MONTH_KEY_FORMULA
+    finally:
+        workbook.close()
+
+
+def test_append_copies_other_parts_byte_for_byte(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    original = _generate(tmp_path / "original.xlsx", BASE_ENTRIES, max_rows=40)
+    entries = TrackingConfig(transactions_file=_ledger(tmp_path / "new.jsonl")).entries()
+    opened: list[str] = []
+    real_open = XlsxPackage.open
+
+    def recording_open(package: XlsxPackage, name: str):
+        opened.append(name)
+        return real_open(package, name)
+
+    monkeypatch.setattr(XlsxPackage, "open", recording_open)
+
+    result = append_transactions(original, entries, tmp_path / "appended.xlsx")
+
+    assert "xl/worksheets/sheet4.xml" not in opened  # only read once, while it is rewritten
+
+    with zipfile.ZipFile(original) as before, zipfile.ZipFile(result.output) as after:
+        assert after.testzip() is None
+        assert before.namelist() == after.namelist()
+        changed = {
+            info.filename
+            for info in after.infolist()
+            if info.CRC != before.getinfo(info.filename).CRC
+        }
+    assert changed == {"xl/worksheets/sheet4.xml"}  # capacity rows absorb the ledger
+    assert result.table_ref == "C11:L40"
+
+
+def test_append_command_updates_workbook_in_place(tmp_path: Path) -> None:
+    workbook = _generate(tmp_path / "budget.xlsx", BASE_ENTRIES, max_rows=13)  # table is full
+    ledger = tmp_path / "new.csv"
+    ledger.write_text("date,type,category,amount,details\n2018-02-01,Income,Salary,100,\n")
+
+    result = CliRunner().invoke(cli, ["append", str(workbook), "--transactions", str(ledger)])
+    unsupported = CliRunner().invoke(
+        cli, ["append", str(workbook), "--transactions", str(workbook)]
+    )
+    unsorted = tmp_path / "unsorted.csv"
+    unsorted.write_text("date,type,category,amount,details\n2018-03-01,Income,A,1,\n2018-02-01,Income,B,1,\n")
+    out_of_order = CliRunner().invoke(cli, ["append", str(workbook), "--transactions", str(unsorted)])
+
+    assert result.exit_code == 0, result.output
+    assert "rows 14-14" in result.output
+    loaded = openpyxl.load_workbook(workbook)
+    try:
+        tracking = loaded["Budget Tracking"]
+        assert tracking.tables["tblTracking"].ref == "C11:L14"
+        assert (tracking["D14"].value, tracking["F14"].value) == ("Income", 100)
+    finally:
+        loaded.close()
+    assert unsupported.exit_code != 0
+    assert out_of_order.exit_code == 2 and "date order" in out_of_order.output
+
+
+def test_append_rejects_year_partitioned_tracking(tmp_path: Path) -> None:
+    spec = copy.deepcopy(load_json_spec(SPEC_PATH))
+    later = {"date": "2018-01-05", "type": "Expense", "category": "Rent", "amount": 10}
+    spec["sheets"]["Budget Tracking"].update(partition="year", sample_entries=[*BASE_ENTRIES, later])
+    generator = BudgetGenerator(spec)
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    workbook = generator.save_workbook(tmp_path / "partitioned.xlsx")
+
+    with pytest.raises(PackageError, match="one tracking table per year .*tblTracking2017, tblTracking2018"):
+        append_transactions(workbook, [])
@@ -0,0 +1,168 @@
+"""Tests for the structural xlsx diff."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import openpyxl
+import pytest
+from click.testing import CliRunner
+from openpyxl.styles import Font, Protection
+
+from budget_generator.__main__ import cli
+from budget_generator.generator import BudgetGenerator
+from budget_generator.utils.json_loader import load_json_spec
+from budget_generator.xlsx import XlsxPackage, diff_workbooks
+
+SPEC_PATH = Path("examples/tutorial_spec.json")
+
+
+@pytest.fixture(scope="module")
+def workbook_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    output = tmp_path_factory.mktemp("diff") / "expected.xlsx"
+    generator = BudgetGenerator(load_json_spec(SPEC_PATH))
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    return generator.save_workbook(output)
+
+
+def _rewrite_part(source: Path, target: Path, part: str, transform) -> Path:
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            data = src.read(info.filename)
+            if info.filename == part:
+                data = transform(data)
+            dst.writestr(info, data)
+    return target
+
+
+def test_identical_packages_are_not_parsed(workbook_path: Path) -> None:
+    result = diff_workbooks(workbook_path, workbook_path)
+
+    assert result.identical
+    assert result.parts_descended == 0
+    assert result.parts_compared > 0
+
+
+def test_timestamps_and_attribute_order_are_ignored(workbook_path: Path, tmp_path: Path) -> None:
+    with zipfile.ZipFile(workbook_path) as archive:
+        core = archive.read("docProps/core.xml").decode()
+    start = core.index("<dcterms:created")
+    end = core.index("</dcterms:created>")
+    stamped = core[:start] + '<dcterms:created xsi:type="dcterms:W3CDTF">1999-01-01T00:00:00Z' + core[end:]
+    retimed = _rewrite_part(workbook_path, tmp_path / "retimed.xlsx", "docProps/core.xml", lambda _: stamped.encode())
+
+    with XlsxPackage(workbook_path) as package:
+        workbook_part = package.workbook_part
+    reordered = _rewrite_part(
+        retimed,
+        tmp_path / "reordered.xlsx",
+        workbook_part,
+        lambda data: data.replace(b'<sheet name="Settings" sheetId="1"', b'<sheet sheetId="1" name="Settings"'),
+    )
+
+    result = diff_workbooks(workbook_path, reordered)
+
+    assert result.identical
+    assert result.parts_descended == 0
+
+
+def test_reports_cell_validation_and_defined_name_changes(workbook_path: Path, tmp_path: Path) -> None:
+    workbook = openpyxl.load_workbook(workbook_path)
+    tracking = workbook["Budget Tracking"]
+    tracking["E12"] = 999
+    tracking["G12"] = "=E12*2"
+    tracking["B12"].font = Font(bold=True, size=30)
+    tracking.data_validations.dataValidation[0].formula1 = '"Income,Expense"'
+    workbook.defined_names["StartingYear"].attr_text = "Settings!$B$9"
+    changed = tmp_path / "changed.xlsx"
+    workbook.save(changed)
+
+    result = diff_workbooks(workbook_path, changed)
+    by_location = {(item.kind, item.location): item for item in result.differences}
+
+    assert by_location[("cell-value", "Budget Tracking!E12")].actual == "999"
+    assert by_location[("cell-formula", "Budget Tracking!G12")].actual == "E12*2"
+    assert ("cell-style", "Budget Tracking!B12") in by_location
+    assert any(item.kind == "validation" for item in result.differences)
+    assert by_location[("defined-name", "StartingYear")].actual == "Settings!$B$9"
+    assert not result.identical
+
+
+def test_openpyxl_resave_is_not_a_change(tmp_path: Path) -> None:
+    # Dashboard charts are left out: openpyxl drops their <c:style> when it reads them back.
+    generator = BudgetGenerator(load_json_spec(SPEC_PATH), sheets=["Budget Tracking"])
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    original = generator.save_workbook(tmp_path / "original.xlsx")
+    workbook = openpyxl.load_workbook(original)
+    workbook.save(tmp_path / "resaved.xlsx")  # renumbers styles and spells out shared formulas
+    workbook = openpyxl.load_workbook(original)
+    workbook["Budget Tracking"]["C12"].protection = Protection(locked=False)
+    workbook.save(tmp_path / "unlocked.xlsx")
+
+    assert diff_workbooks(original, tmp_path / "resaved.xlsx").differences == []
+    unlocked = diff_workbooks(original, tmp_path / "unlocked.xlsx").differences
+    assert [(item.kind, item.location) for item in unlocked] == [("cell-style", "Budget Tracking!C12")]
+
+
+def test_missing_parts_are_reported(workbook_path: Path, tmp_path: Path) -> None:
+    trimmed = tmp_path / "trimmed.xlsx"
+    with zipfile.ZipFile(workbook_path) as src, zipfile.ZipFile(trimmed, "w") as dst:
+        for info in src.infolist():
+            if info.filename != "docProps/app.xml":
+                dst.writestr(info, src.read(info.filename))
+
+    result = diff_workbooks(workbook_path, trimmed)
+
+    assert [(item.kind, item.location, item.actual) for item in result.differences] == [
+        ("part", "docProps/app.xml", None)
+    ]
+
+
+def test_diff_command_exit_status(workbook_path: Path, tmp_path: Path) -> None:
+    workbook = openpyxl.load_workbook(workbook_path)
+    workbook["Settings"]["B2"] = "Changed title"
+    changed = tmp_path / "changed.xlsx"
+    workbook.save(changed)
+    runner = CliRunner()
+
+    same = runner.invoke(cli, ["diff", str(workbook_path), str(workbook_path)])
+    different = runner.invoke(cli, ["diff", str(workbook_path), str(changed)])
+
+    assert same.exit_code == 0
+    assert "0 difference(s)" in same.output
+    assert different.exit_code == 1
+    assert "Settings!B2" in different.output
+
+
+def test_python_m_diff_exits_with_the_command_status(workbook_path: Path, tmp_path: Path) -> None:
+    workbook = openpyxl.load_workbook(workbook_path)
+    workbook["Settings"]["B2"] = "Changed title"
+    changed = tmp_path / "changed.xlsx"
+    workbook.save(changed)
+
+    command = [sys.executable, "-m", "budget_generator", "diff", str(workbook_path), str(changed)]
+    assert subprocess.run(command, capture_output=True).returncode == 1
+
+
+def test_changed_defined_name_attributes_are_named(workbook_path: Path, tmp_path: Path) -> None:
+    with XlsxPackage(workbook_path) as package:
+        workbook_part = package.workbook_part
+    hidden = _rewrite_part(
+        workbook_path,
+        tmp_path / "hidden.xlsx",
+        workbook_part,
+        lambda data: data.replace(b'name="StartingYear"', b'name="StartingYear" hidden="1"'),
+    )
+
+    result = diff_workbooks(workbook_path, hidden)
+
+    assert [(item.kind, item.location, item.expected, item.actual) for item in result.differences] == [
+        ("element", f"{workbook_part}:definedNames/definedName[StartingYear]", None, "hidden='1'")
+    ]
@@ -0,0 +1,150 @@
+"""Tests for streaming tracking and planning records out of a workbook."""
+
+from __future__ import annotations
+
+import csv
+import subprocess
+import sys
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from budget_generator.__main__ import cli
+from budget_generator.generator import BudgetGenerator
+from budget_generator.synth import SynthConfig, write_synthetic_dataset
+from budget_generator.utils.json_loader import load_json_spec
+from budget_generator.utils.transactions import iter_transaction_records
+from budget_generator.xlsx import (
+    PackageError,
+    XlsxPackage,
+    iter_planning_records,
+    iter_table_records,
+    locate_table,
+    split_reference,
+)
+
+SPEC_PATH = Path("examples/tutorial_spec.json")
+
+
+def _generate(spec: dict, output: Path) -> Path:
+    generator = BudgetGenerator(spec)
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    return generator.save_workbook(output)
+
+
+def test_tracking_records_round_trip_a_ledger(tmp_path: Path) -> None:
+    dataset = write_synthetic_dataset(
+        SynthConfig(transactions=80, years=1), tmp_path / "synth", file_format="jsonl"
+    )
+    workbook = _generate(load_json_spec(dataset.spec_path), tmp_path / "budget.xlsx")
+
+    with XlsxPackage(workbook) as package:
+        location = locate_table(package, "TBLTRACKING")
+        records = list(iter_table_records(package, location))
+
+    expected = list(iter_transaction_records(dataset.transactions_path))
+    assert location.sheet == "Budget Tracking"
+    assert location.fieldnames[-4:] == ("effective_date", "month_key", "year_month", "signed_amount")
+    assert len(records) == len(expected) == 80
+    for record, source in zip(records, expected):
+        assert record["date"].isoformat() == source["date"]
+        assert (record["type"], record["category"], record["details"]) == (
+            source["type"],
+            source["category"],
+            source["details"],
+        )
+        assert record["amount"] == pytest.approx(source["amount"])
+        assert record["balance"] is None  # formulas carry no cached value
+
+
+def test_planning_records_cover_each_category_month(tmp_path: Path) -> None:
+    workbook = _generate(load_json_spec(SPEC_PATH), tmp_path / "budget.xlsx")
+
+    with XlsxPackage(workbook) as package:
+        records = list(iter_planning_records(package))
+
+    assert {record["section"] for record in records} == {"Income", "Expenses", "Savings"}
+    assert records[0] == {
+        "section": "Income",
+        "category": "Salary",
+        "year": 2025,
+        "month": "Jan",
+        "amount": 0,
+    }
+    assert {record["month"] for record in records} == {
+        "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+    }
+    assert len(records) % 12 == 0
+
+
+def test_split_reference_and_missing_table(tmp_path: Path) -> None:
+    assert split_reference("'Budget ''Plan'''!$E$12:$Q$23") == ("Budget 'Plan'", (5, 12, 17, 23))
+    assert split_reference("Settings!$E$8") == ("Settings", (5, 8, 5, 8))
+    with pytest.raises(PackageError):
+        split_reference("$E$8")
+
+    workbook = _generate(load_json_spec(SPEC_PATH), tmp_path / "budget.xlsx")
+    with XlsxPackage(workbook) as package, pytest.raises(PackageError, match="no table"):
+        locate_table(package, "tblMissing")
+
+
+def test_ingest_command_writes_jsonl_and_csv(tmp_path: Path) -> None:
+    workbook = _generate(load_json_spec(SPEC_PATH), tmp_path / "budget.xlsx")
+    runner = CliRunner()
+
+    to_stdout = runner.invoke(cli, ["ingest", str(workbook)])
+    to_csv = runner.invoke(
+        cli, ["ingest", str(workbook), "--table", "planning", "-o", str(tmp_path / "plan.csv")]
+    )
+
+    assert to_stdout.exit_code == 0, to_stdout.output
+    lines = [line for line in to_stdout.stdout.splitlines() if line.startswith("{")]
+    assert json.loads(lines[0])["date"] == "2017-01-01"
+    assert to_csv.exit_code == 0, to_csv.output
+    with (tmp_path / "plan.csv").open(newline="") as stream:
+        rows = list(csv.DictReader(stream))
+    assert rows[0] == {
+        "section": "Income",
+        "category": "Salary",
+        "year": "2025",
+        "month": "Jan",
+        "amount": "0",
+    }
+
+
+def test_planning_records_include_later_years(tmp_path: Path) -> None:
+    spec = load_json_spec(SPEC_PATH)
+    planning = spec["sheets"]["Budget-Planning"]
+    planning["scaffold_years"] = 3
+    planning["planned_amounts"] = {"Income": {"Salary": [[100] * 12, [], [300] * 12]}}
+    workbook = _generate(spec, tmp_path / "budget.xlsx")
+
+    with XlsxPackage(workbook) as package:
+        salary = [
+            (record["year"], record["month"], record["amount"])
+            for record in iter_planning_records(package)
+            if record["category"] == "Salary"
+        ]
+
+    assert [year for year, month, _ in salary if month == "Jan"] == [2025, 2026, 2027]
+    assert salary[0] == (2025, "Jan", 100)
+    assert salary[12] == (2026, "Jan", 0)
+    assert salary[-1] == (2027, "Dec", 300)
+
+
+def test_ingest_to_a_closed_pipe_exits_quietly(tmp_path: Path) -> None:
+    workbook = _generate(load_json_spec(SPEC_PATH), tmp_path / "budget.xlsx")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "budget_generator", "ingest", str(workbook), "--table", "planning"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    process.stdout.close()  # type: ignore[union-attr] - like `| head` exiting early
+    _, stderr = process.communicate()
+
+    assert process.returncode == 1
+    assert b"Traceback" not in stderr and b"BrokenPipe" not in stderr
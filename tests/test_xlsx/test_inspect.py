@@ -0,0 +1,77 @@
+"""Tests for workbook inspection."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from budget_generator.__main__ import cli
+from budget_generator.generator import BudgetGenerator
+from budget_generator.utils.json_loader import load_json_spec
+from budget_generator.xlsx import inspect_workbook
+
+SPEC_PATH = Path("examples/tutorial_spec.json")
+
+
+@pytest.fixture(scope="module")
+def workbook_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    output = tmp_path_factory.mktemp("inspect") / "budget.xlsx"
+    generator = BudgetGenerator(load_json_spec(SPEC_PATH))
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    return generator.save_workbook(output)
+
+
+def test_inspect_counts_tracking_objects(workbook_path: Path) -> None:
+    result = inspect_workbook(workbook_path)
+    sheets = {sheet.name: sheet for sheet in result.sheets}
+    tracking = sheets["Budget Tracking"]
+
+    assert [sheet.name for sheet in result.sheets][0] == "Settings"
+    assert tracking.formulas > 0
+    assert tracking.cells >= tracking.formulas
+    # One Category validation per table row plus the Type column validation.
+    assert tracking.data_validations > 100
+    assert tracking.conditional_format_rules == 2
+    assert [(table.name, table.ref) for table in tracking.tables] == [("tblTracking", "C11:L200")]
+    assert tracking.element_bytes["dataValidations"] > tracking.element_bytes["conditionalFormatting"]
+    assert sum(tracking.element_bytes.values()) == tracking.uncompressed_bytes
+
+
+def test_inspect_reports_workbook_totals(workbook_path: Path) -> None:
+    result = inspect_workbook(workbook_path, heaviest=2)
+
+    assert result.defined_names["StartingYear"] == "Settings!$E$8"
+    assert result.cell_styles > 1
+    assert result.differential_styles > 0
+    assert len(result.heaviest_parts) == 2
+    tracking_part = next(sheet.part for sheet in result.sheets if sheet.name == "Budget Tracking")
+    assert result.heaviest_parts[0].name == tracking_part
+    assert result.compressed_bytes < result.uncompressed_bytes
+
+
+def test_inspect_command_outputs_text_and_json(workbook_path: Path) -> None:
+    runner = CliRunner()
+
+    text = runner.invoke(cli, ["inspect", str(workbook_path)])
+    as_json = runner.invoke(cli, ["inspect", str(workbook_path), "--json"])
+
+    assert text.exit_code == 0
+    assert "table tblTracking C11:L200" in text.output
+    assert "heaviest non-cell element: dataValidations" in text.output
+    assert as_json.exit_code == 0
+    assert json.loads(as_json.output)["sheets"][0]["name"] == "Settings"
+
+
+def test_inspect_rejects_non_xlsx(tmp_path: Path) -> None:
+    bogus = tmp_path / "bogus.xlsx"
+    bogus.write_text("not a zip")
+
+    result = CliRunner().invoke(cli, ["inspect", str(bogus)])
+
+    assert result.exit_code != 0
+    assert "Cannot open" in result.output
@@ -0,0 +1,81 @@
+"""Tests for rolling an existing workbook over to the next planning year."""
+
+from __future__ import annotations
+
+import copy
+import zipfile
+from pathlib import Path
+
+import openpyxl
+from click.testing import CliRunner
+
+from budget_generator.__main__ import cli
+from budget_generator.generator import BudgetGenerator
+from budget_generator.utils.json_loader import load_json_spec
+from budget_generator.xlsx import diff_workbooks, rollover_workbook
+
+SPEC_PATH = Path("examples/tutorial_spec.json")
+
+
+def _generate(output: Path, scaffold_years: int, year_count: int) -> Path:
+    spec = copy.deepcopy(load_json_spec(SPEC_PATH))
+    spec["sheets"]["Budget-Planning"]["scaffold_years"] = scaffold_years
+    spec["sheets"]["Dropdown Data"]["years"]["count"] = year_count
+    generator = BudgetGenerator(spec)
+    generator.create_workbook()
+    generator.create_sheets()
+    generator.build_sheet_contents()
+    return generator.save_workbook(output, deterministic=True)
+
+
+def test_rollover_matches_a_workbook_generated_with_one_more_year(tmp_path: Path) -> None:
+    original = _generate(tmp_path / "original.xlsx", scaffold_years=5, year_count=5)
+
+    result = rollover_workbook(original, tmp_path / "rolled.xlsx")
+    expected = _generate(tmp_path / "expected.xlsx", scaffold_years=6, year_count=6)
+
+    assert (result.offset, result.columns) == (5, "BW:CI")
+    assert result.years_list == "'Dropdown Data'!$B$3:$B$8"
+    # Cells, merges and names all match; only byte-level serialisation differs.
+    differences = diff_workbooks(expected, result.output).differences
+    assert {difference.kind for difference in differences} <= {"part"}
+    with zipfile.ZipFile(original) as before, zipfile.ZipFile(result.output) as after:
+        changed = {
+            info.filename
+            for info in after.infolist()
+            if info.CRC != before.getinfo(info.filename).CRC
+        }
+    assert changed == {"xl/workbook.xml", "xl/worksheets/sheet2.xml", "xl/worksheets/sheet3.xml"}
+
+
+def test_years_list_grows_to_cover_the_new_planning_year(tmp_path: Path) -> None:
+    original = _generate(tmp_path / "original.xlsx", scaffold_years=7, year_count=3)
+
+    result = rollover_workbook(original)
+
+    assert result.output == original
+    assert result.years_list == "'Dropdown Data'!$B$3:$B$10"
+    workbook = openpyxl.load_workbook(original)
+    try:
+        assert workbook.defined_names["YearsList"].attr_text == result.years_list
+        dropdown = workbook["Dropdown Data"]
+        assert [dropdown[f"B{row}"].value for row in (5, 10)] == ["=StartingYear+2", "=StartingYear+7"]
+        assert dropdown["C10"].value == "Aug"
+        planning = workbook["Budget-Planning"]
+        assert planning["CY6"].value == '=IF(CY7=0,"Jan ✓","Jan")'
+        assert planning["CY8"].value == "Year 8 scaffold – extend rows as needed"
+        assert "CY5:DK5" in {str(cells) for cells in planning.merged_cells.ranges}
+    finally:
+        workbook.close()
+
+
+def test_rollover_command_reports_the_new_block(tmp_path: Path) -> None:
+    workbook = _generate(tmp_path / "budget.xlsx", scaffold_years=1, year_count=5)
+
+    result = CliRunner().invoke(cli, ["rollover", str(workbook)])
+    missing = CliRunner().invoke(cli, ["rollover", str(workbook), "-o", str(tmp_path / "x" / "y.xlsx")])
+
+    assert result.exit_code == 0, result.output
+    assert "planning year 2 in columns S:AE" in result.output
+    assert "$B$3:$B$8" in result.output
+    assert missing.exit_code != 0
@@ -0,0 +1,125 @@
+"""Tests for the workbook save pipeline."""
+
+from __future__ import annotations
+
+import re
+import zipfile
+from pathlib import Path
+
+import openpyxl
+import pytest
+from click.testing import CliRunner
+
+from budget_generator.__main__ import cli
+from budget_generator.generator import BudgetGenerator
+from budget_generator.utils.json_loader import load_json_spec
+from budget_generator.xlsx import SaveError, SaveOptions, XlsxPackage
+
+SPEC_PATH = Path("examples/tutorial_spec.json")
+
+
+def _build() -> BudgetGenerator:
+    spec = load_json_spec(SPEC_PATH)
+    spec["sheets"]["Budget Tracking"]["max_rows"] = 2000
+    gen = BudgetGenerator(spec)
+    gen.create_workbook()
+    gen.create_sheets()
+    gen.build_sheet_contents()
+    return gen
+
+
+def _contents(path: Path) -> dict[str, bytes]:
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_compression_modes_write_the_same_parts(tmp_path: Path) -> None:
+    # openpyxl adjusts sheet properties on save, so each mode saves a fresh build.
+    deflated = _build().save_workbook(tmp_path / "deflate.xlsx", deterministic=True)
+    stored = _build().save_workbook(
+        tmp_path / "store.xlsx", deterministic=True, options=SaveOptions(compression="store")
+    )
+    parallel = _build().save_workbook(
+        tmp_path / "parallel.xlsx",
+        deterministic=True,
+        options=SaveOptions(level=1, workers=3, chunk_bytes=64 * 1024),
+    )
+
+    assert _contents(deflated) == _contents(stored) == _contents(parallel)
+    assert stored.stat().st_size > deflated.stat().st_size
+    with zipfile.ZipFile(stored) as archive:
+        assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
+    with zipfile.ZipFile(parallel) as archive:
+        sheet = max(archive.infolist(), key=lambda info: info.file_size)
+        assert sheet.file_size > 3 * 64 * 1024
+        assert sheet.compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_saved_workbook_opens_in_openpyxl(tmp_path: Path) -> None:
+    output = _build().save_workbook(tmp_path / "budget.xlsx", options=SaveOptions(workers=2))
+
+    workbook = openpyxl.load_workbook(output)
+    try:
+        tracking = workbook["Budget Tracking"]
+        assert next(iter(tracking.tables.values())).ref == "C11:L2000"
+        assert workbook.defined_names["StartingYear"].attr_text == "Settings!$E$8"
+    finally:
+        workbook.close()
+
+
+def test_row_formulas_are_stored_once_per_run(tmp_path: Path) -> None:
+    output = _build().save_workbook(tmp_path / "budget.xlsx")
+
+    with XlsxPackage(output) as package:
+        part = package.sheet_parts()["Budget Tracking"]
+        xml = package.read(part)
+        assert xml.count(b"SUMPRODUCT(") == 2  # the Balance anchor only
+        assert b'<f t="shared" ref="H12:H2000" si="0">' in xml
+        assert re.search(rb'<c r="H2000" s="\d+"><f t="shared" si="0" />', xml)
+        assert b"<calculatedColumnFormula>SUMPRODUCT(" in package.read(package.table_parts(part)[0])
+        planning_part = package.sheet_parts()["Budget-Planning"]
+        planning = {cell.ref: cell.formula for cell in package.iter_cells(planning_part)}
+        assert planning["Q12"] == "SUM(E12:P12)" and planning["Q23"] == "SUM(E23:P23)"
+        assert planning["P24"] == "SUM(P12:P23)"
+        # The anchor sits above min_row but still spells out the rows read.
+        last = {cell.ref: cell.formula for _, cells in package.iter_rows(part, min_row=2000) for cell in cells}
+        assert last["H2000"].startswith("SUMPRODUCT((tblTracking[Date]<=[@Date])")
+
+    workbook = openpyxl.load_workbook(output)
+    try:
+        assert workbook["Budget-Planning"]["H7"].value == "=H24-H45-H67"
+        assert workbook["Budget Tracking"]["J2000"].value == '=IF([@Date]="","",MONTH([@[Effective Date]]))'
+    finally:
+        workbook.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"compression": "bzip2"}, {"level": 10}, {"workers": 0}, {"chunk_bytes": 1024}],
+)
+def test_invalid_save_options_raise(kwargs: dict) -> None:
+    with pytest.raises(SaveError):
+        SaveOptions(**kwargs)
+
+
+def test_generate_command_accepts_save_options(tmp_path: Path) -> None:
+    output = tmp_path / "budget.xlsx"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "generate",
+            str(SPEC_PATH),
+            "-o",
+            str(output),
+            "--compression",
+            "store",
+            "--save-workers",
+            "2",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    with zipfile.ZipFile(output) as archive:
+        assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}